@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: precompiled classifier vs. the previous per-call scans
+
+Usage: python scripts/bench_classifier.py [iterations]
+"""
+
+import re
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from krs_reminder.classifier import (  # noqa: E402
+    classify,
+    extract_description_highlights,
+    extract_facilitator,
+    profile_for_class_type,
+)
+
+SAMPLES = [
+    ('📚 Cloud Computing', 'Lab. Artificial Intelligen',
+     '📚 Mata Kuliah: Cloud Computing\n👨‍🏫 Dosen: Ibu Erina Rahmazani\n🔢 Kode: IF4021\n📖 Tipe: Praktikum'),
+    ('📚 Kewarganegaraan', 'Ruang 3.12 Gedung B',
+     '📚 Mata Kuliah: Kewarganegaraan\n👨‍🏫 Dosen: Pak Budi Santoso\n🔢 Kode: UM1002'),
+    ('Seminar Proposal', 'Zoom Meeting', 'Pengajar: Dr. Sari\n- Bawa draft proposal\n- Slide maksimal 10'),
+    ('📚 Basis Data', 'Ruang 2.1', ''),
+]
+
+
+ROWS = [
+    {'course_name': 'Cloud Computing', 'location': 'Lab. Artificial Intelligen',
+     'facilitator': 'Ibu Erina Rahmazani', 'course_code': 'IF4021', 'class_type': 'Praktikum'},
+    {'course_name': 'Kewarganegaraan', 'location': 'Ruang 3.12 Gedung B',
+     'facilitator': 'Pak Budi Santoso', 'course_code': 'UM1002', 'class_type': 'Kuliah Teori'},
+]
+
+
+def legacy_profile(summary, location, description):
+    base_text = ' '.join(filter(None, [summary, location, description])).lower()
+    if any(keyword in base_text for keyword in ['praktikum', 'laboratorium', 'lab ', 'lab.']):
+        label = 'Praktikum'
+    elif any(keyword in base_text for keyword in ['seminar', 'kuliah tamu', 'guest lecture']):
+        label = 'Seminar'
+    elif any(keyword in base_text for keyword in ['workshop', 'project', 'studio']):
+        label = 'Workshop / Studio'
+    elif any(keyword in base_text for keyword in ['ujian', 'evaluasi', 'quiz']):
+        label = 'Evaluasi / Ujian'
+    else:
+        label = 'Kuliah Teori'
+    online = any(keyword in base_text for keyword in ['zoom', 'teams', 'online', 'daring', 'virtual'])
+    return {'category_label': label, 'online': online}
+
+
+def legacy_facilitator(description):
+    if not description:
+        return None
+    for pattern in [r'dosen\s*[:\-]\s*(.+)', r'pengajar\s*[:\-]\s*(.+)',
+                    r'instructor\s*[:\-]\s*(.+)', r'speaker\s*[:\-]\s*(.+)']:
+        match = re.search(pattern, description, flags=re.IGNORECASE)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def legacy_highlights(description, limit=2):
+    if not description:
+        return []
+    highlights = []
+    for line in [line.strip() for line in description.split('\n') if line.strip()]:
+        clean_line = re.sub(r'^[•\-\d\)\.\s]+', '', line)
+        if not clean_line:
+            continue
+        if clean_line.lower().startswith(('dosen', 'pengajar', 'instructor', 'speaker')):
+            continue
+        highlights.append(clean_line)
+        if len(highlights) >= limit:
+            break
+    return highlights
+
+
+def legacy_row(row):
+    """Previous multi-user path: fake description, then classify it again"""
+    parts = [f"📚 Mata Kuliah: {row['course_name']}"]
+    if row.get('facilitator'):
+        parts.append(f"👨‍🏫 Dosen: {row['facilitator']}")
+    if row.get('course_code'):
+        parts.append(f"🔢 Kode: {row['course_code']}")
+    if row.get('location'):
+        parts.append(f"📍 Lokasi: {row['location']}")
+    if row.get('class_type'):
+        parts.append(f"📖 Tipe: {row['class_type']}")
+    description = '\n'.join(parts)
+    summary = f"📚 {row['course_name']}"
+    return legacy_profile(summary, row['location'], description), legacy_facilitator(description)
+
+
+def stored_row(row):
+    """Current path: classification stored on the row at import"""
+    summary = f"📚 {row['course_name']}"
+    return profile_for_class_type(row['class_type'], summary, row['location']), row['facilitator']
+
+
+def run_legacy():
+    for summary, location, description in SAMPLES:
+        legacy_profile(summary, location, description)
+        legacy_facilitator(description)
+        legacy_highlights(description)
+
+
+def run_compiled():
+    for summary, location, description in SAMPLES:
+        classify(summary, location, description)
+        extract_facilitator(description)
+        extract_description_highlights(description)
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    for summary, location, description in SAMPLES:
+        assert classify(summary, location, description)['category_label'] == \
+            legacy_profile(summary, location, description)['category_label']
+        assert extract_facilitator(description) == legacy_facilitator(description)
+        assert extract_description_highlights(description) == legacy_highlights(description)
+
+    legacy = min(timeit.repeat(run_legacy, number=iterations, repeat=3))
+    compiled = min(timeit.repeat(run_compiled, number=iterations, repeat=3))
+    per_event = 1e6 / (iterations * len(SAMPLES))
+
+    row_legacy = min(timeit.repeat(lambda: [legacy_row(row) for row in ROWS], number=iterations, repeat=3))
+    row_stored = min(timeit.repeat(lambda: [stored_row(row) for row in ROWS], number=iterations, repeat=3))
+    per_row = 1e6 / (iterations * len(ROWS))
+
+    print("=" * 60)
+    print("⚡ Classifier micro-benchmark")
+    print("=" * 60)
+    print(f"Calendar events (profile + facilitator + highlights), {iterations * len(SAMPLES):,} runs")
+    print(f"  Legacy          : {legacy * per_event:.2f} µs/event")
+    print(f"  Precompiled     : {compiled * per_event:.2f} µs/event")
+    print(f"  Speedup         : {legacy / compiled:.2f}x")
+    print(f"Schedule rows (profile + facilitator), {iterations * len(ROWS):,} runs")
+    print(f"  Fake description: {row_legacy * per_row:.2f} µs/row")
+    print(f"  Stored columns  : {row_stored * per_row:.2f} µs/row")
+    print(f"  Speedup         : {row_legacy / row_stored:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,16 +2,26 @@
 Admin module for KRS Reminder Bot
 Handles admin operations: user management, schedule import, etc.
 """
+import datetime
 import json
+import logging
 from typing import Optional, Dict, List
-from datetime import datetime
 import pytz
 
+from .classifier import classify, extract_facilitator
+from .clock import SYSTEM_CLOCK, Clock
+from .events import parse_event_datetime
+from .metrics import CALENDAR_REQUEST_ERRORS, CALENDAR_REQUEST_SECONDS, track
+
+logger = logging.getLogger(__name__)
+
 
 class AdminManager:
     """Manages admin operations for KRS Reminder Bot"""
     
-    def __init__(self, db_client, auth_manager, calendar_service_getter):
+    clock: Clock = SYSTEM_CLOCK
+    
+    def __init__(self, db_client, auth_manager, calendar_service_getter, clock: Optional[Clock] = None):
         """
         Initialize AdminManager
         
@@ -19,7 +29,10 @@ class AdminManager:
             db_client: SupabaseClient instance
             auth_manager: AuthManager instance
             calendar_service_getter: Function to get Google Calendar service
+            clock: Time source (default: system clock)
         """
+        if clock is not None:
+            self.clock = clock
         self.db = db_client
         self.auth = auth_manager
         self.get_calendar_service = calendar_service_getter
@@ -204,16 +217,17 @@ class AdminManager:
         # Get events from Google Calendar
         try:
             service = self.get_calendar_service()
-            now = datetime.now(self.tz)
-            end_time = now + pytz.timedelta(days=days_ahead)
+            now = self.clock.now(self.tz)
+            end_time = now + datetime.timedelta(days=days_ahead)
             
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=now.isoformat(),
-                timeMax=end_time.isoformat(),
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
+            with track(CALENDAR_REQUEST_SECONDS, CALENDAR_REQUEST_ERRORS, call='events.list'):
+                events_result = service.events().list(
+                    calendarId='primary',
+                    timeMin=now.isoformat(),
+                    timeMax=end_time.isoformat(),
+                    singleEvents=True,
+                    orderBy='startTime'
+                ).execute()
             
             events = events_result.get('items', [])
             
@@ -266,25 +280,15 @@ class AdminManager:
             if not start or not end:
                 return None
             
-            start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-            end_dt = datetime.fromisoformat(end.replace('Z', '+00:00'))
-            
             # Convert to Jakarta timezone
-            if start_dt.tzinfo is None:
-                start_dt = self.tz.localize(start_dt)
-            else:
-                start_dt = start_dt.astimezone(self.tz)
-            
-            if end_dt.tzinfo is None:
-                end_dt = self.tz.localize(end_dt)
-            else:
-                end_dt = end_dt.astimezone(self.tz)
+            start_dt = parse_event_datetime(start, self.tz)
+            end_dt = parse_event_datetime(end, self.tz)
             
-            # Extract course info from description
-            description = event.get('description', '')
-            facilitator = self._extract_facilitator(description)
+            # Classify once at import; rendering uses the stored columns
+            description = event.get('description', '') or ''
+            facilitator = extract_facilitator(description) or self._extract_facilitator(description)
             course_code = self._extract_course_code(description)
-            class_type = self._infer_class_type(event.get('summary', ''), event.get('location', ''))
+            class_type = classify(event.get('summary', ''), event.get('location', ''), description)['category_label']
             
             return {
                 'course_name': event.get('summary', 'No Title').replace('📚 ', ''),
@@ -299,7 +303,7 @@ class AdminManager:
             }
         
         except Exception as e:
-            print(f"❌ Error parsing event: {e}")
+            logger.error("Error parsing event: %s", e)
             return None
     
     @staticmethod
@@ -317,17 +321,3 @@ class AdminManager:
             if 'Kode:' in line or '🔢' in line:
                 return line.split(':')[-1].strip()
         return ''
-    
-    @staticmethod
-    def _infer_class_type(summary: str, location: str) -> str:
-        """Infer class type from summary and location"""
-        summary_lower = summary.lower()
-        location_lower = location.lower()
-        
-        if 'lab' in location_lower or 'praktikum' in summary_lower:
-            return 'Praktikum'
-        elif 'seminar' in summary_lower:
-            return 'Seminar'
-        else:
-            return 'Kuliah Teori'
-
@@ -0,0 +1,195 @@
+"""Admission control for inbound Telegram updates.
+
+Every chat, logged in or not, has a token bucket that refills at a steady
+rate. An update costs tokens according to what it triggers: a day button
+answered from memory costs 1, while /login (bcrypt against every user) and
+/stats (a one-second CPU sample) cost several. A chat can therefore keep
+tapping buttons for a while, but can only repeat the expensive commands
+every few seconds. An update the chat cannot pay for is dropped before it
+touches the database, and the chat gets a single notice until it is
+admitted again.
+
+When the inbound backlog passes the shed threshold, only the cheapest
+updates are handled, for every chat. The backlog counts the updates fetched
+but not yet handled.
+"""
+
+from __future__ import annotations
+
+import datetime
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from .clock import SYSTEM_CLOCK, Clock
+
+# Tokens charged per dispatcher branch (see update_label); others cost DEFAULT_COST
+COMMAND_COSTS: Dict[str, float] = {
+    '/login': 5,
+    '/stats': 5,
+    'callback:stats': 5,
+    '/jadwal': 2,
+    'callback:jadwal_weekly': 2,
+    'callback:jadwal_daily_menu': 2,
+    '/admin_add_user': 3,
+    '/admin_list_users': 3,
+    '/admin_delete_user': 3,
+    '/admin_import_schedule': 5,
+}
+DEFAULT_COST = 1.0
+# While shedding, only updates costing at most this much are handled
+SHED_MAX_COST = 1.0
+
+THROTTLED_NOTICE = "⏳ Terlalu banyak permintaan. Tunggu sebentar, lalu coba lagi."
+SHED_NOTICE = "⏳ Bot sedang sibuk. Silakan coba lagi beberapa saat lagi."
+
+
+def parse_command(text: str, entities: List[Dict]) -> Tuple[str, str]:
+    """
+    Command of a message text, as the dispatcher reads it
+
+    Args:
+        text: Stripped, non-empty message text
+        entities: Telegram message entities
+
+    Returns:
+        (command, command_text): lower-cased first word without @botname,
+        and the text of the bot_command entity (the whole text without one)
+    """
+    command_text = text
+    # Trim to the command entity if Telegram sent metadata
+    for entity in entities or ():
+        if entity.get('type') == 'bot_command':
+            offset = entity.get('offset', 0)
+            length = entity.get('length', len(text))
+            command_text = text[offset:offset + length]
+            break
+
+    command = command_text.split()[0].lower()
+    if '@' in command:
+        command = command.split('@', 1)[0]
+    return command, command_text
+
+
+def update_label(update: Dict) -> str:
+    """Dispatcher branch of an update: '/cmd', 'callback:<data>', 'text' or 'other'"""
+    callback_query = update.get('callback_query')
+    if callback_query:
+        return f"callback:{callback_query.get('data', '')}"
+    message = update.get('message') or update.get('edited_message') or {}
+    text = (message.get('text') or '').strip()
+    if not text:
+        return 'other'
+    command, _ = parse_command(text, message.get('entities', []))
+    return command if command.startswith('/') else 'text'
+
+
+def update_chat_id(update: Dict) -> Optional[int]:
+    """Chat an update comes from (None if it has none)"""
+    callback_query = update.get('callback_query')
+    message = (callback_query or {}).get('message') or update.get('message') or update.get('edited_message') or {}
+    return (message.get('chat') or {}).get('id')
+
+
+class _ChatBudget:
+    __slots__ = ('tokens', 'updated', 'noticed')
+
+    def __init__(self, tokens: float, updated: datetime.datetime):
+        self.tokens = tokens
+        self.updated = updated
+        # A notice went out since the chat was last admitted
+        self.noticed = False
+
+
+class AdmissionControl:
+    """Per-chat token buckets charged by command cost, plus global load shedding"""
+
+    # Time source for the refill
+    clock: Clock = SYSTEM_CLOCK
+
+    def __init__(
+        self,
+        burst: float,
+        rate: float,
+        shed_backlog: int = 0,
+        max_chats: int = 10000,
+        clock: Optional[Clock] = None,
+    ):
+        """
+        Args:
+            burst: Bucket size (tokens a fresh chat can spend at once)
+            rate: Tokens added per second (0 disables per-chat limits)
+            shed_backlog: Pending updates above which only cheap updates are
+                handled (0 disables shedding)
+            max_chats: Buckets kept; the least recently seen chat is forgotten
+            clock: Time source (default: system clock)
+        """
+        if clock is not None:
+            self.clock = clock
+        self.burst = max(1.0, burst)
+        self.rate = max(0.0, rate)
+        self.shed_backlog = shed_backlog
+        self.max_chats = max_chats
+        # Updates fetched but not yet handled (set by the dispatcher loop)
+        self.backlog = 0
+        self._chats: 'OrderedDict[Hashable, _ChatBudget]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def shedding(self) -> bool:
+        return bool(self.shed_backlog) and self.backlog > self.shed_backlog
+
+    def cost(self, label: str) -> float:
+        """Tokens charged for a dispatcher branch (never more than a full bucket)"""
+        return min(COMMAND_COSTS.get(label, DEFAULT_COST), self.burst)
+
+    def admit(self, chat_id: Hashable, label: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Charge an update to its chat
+
+        Args:
+            chat_id: Chat the update comes from
+            label: Dispatcher branch (update_label)
+
+        Returns:
+            (reason, notice): reason is None when admitted, else 'throttled'
+            or 'shed'; notice is the text to send the chat, only for the
+            first rejection since it was last admitted
+        """
+        cost = self.cost(label)
+        if self.shedding and cost > SHED_MAX_COST:
+            return 'shed', self._reject(chat_id, SHED_NOTICE)
+        if not self.rate:
+            return None, None
+
+        with self._lock:
+            budget = self._budget(chat_id)
+            if budget.tokens >= cost:
+                budget.tokens -= cost
+                budget.noticed = False
+                return None, None
+        return 'throttled', self._reject(chat_id, THROTTLED_NOTICE)
+
+    def _budget(self, chat_id: Hashable) -> _ChatBudget:
+        """Bucket of a chat, refilled up to now (caller holds the lock)"""
+        now = self.clock.utcnow()
+        budget = self._chats.get(chat_id)
+        if budget is None:
+            budget = self._chats[chat_id] = _ChatBudget(self.burst, now)
+            while len(self._chats) > self.max_chats:
+                self._chats.popitem(last=False)
+            return budget
+        self._chats.move_to_end(chat_id)
+        elapsed = max(0.0, (now - budget.updated).total_seconds())
+        budget.tokens = min(self.burst, budget.tokens + elapsed * self.rate)
+        budget.updated = now
+        return budget
+
+    def _reject(self, chat_id: Hashable, notice: str) -> Optional[str]:
+        """Notice for a rejected update, once per run of rejections"""
+        with self._lock:
+            budget = self._budget(chat_id)
+            if budget.noticed:
+                return None
+            budget.noticed = True
+            return notice
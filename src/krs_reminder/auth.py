@@ -3,6 +3,7 @@ Authentication module for KRS Reminder Bot
 Handles user authentication, session management, and encryption
 """
 import bcrypt
+import logging
 import secrets
 from typing import Optional, Dict
 from cryptography.fernet import Fernet
@@ -10,18 +11,27 @@ from datetime import datetime
 import base64
 import hashlib
 
+from .clock import SYSTEM_CLOCK, Clock
+
+logger = logging.getLogger(__name__)
+
 
 class AuthManager:
     """Manages authentication and encryption for KRS Reminder Bot"""
     
-    def __init__(self, db_client, encryption_key: Optional[str] = None):
+    clock: Clock = SYSTEM_CLOCK
+    
+    def __init__(self, db_client, encryption_key: Optional[str] = None, clock: Optional[Clock] = None):
         """
         Initialize AuthManager
         
         Args:
             db_client: SupabaseClient instance
             encryption_key: Base64-encoded encryption key (generated if not provided)
+            clock: Time source for session expiry (default: system clock)
         """
+        if clock is not None:
+            self.clock = clock
         self.db = db_client
         
         # Initialize encryption
@@ -67,7 +77,7 @@ class AuthManager:
         try:
             return bcrypt.checkpw(secret_key.encode('utf-8'), hashed.encode('utf-8'))
         except Exception as e:
-            print(f"❌ Error verifying secret key: {e}")
+            logger.error("Error verifying secret key: %s", e)
             return False
     
     # ============================================================
@@ -88,7 +98,7 @@ class AuthManager:
             encrypted = self.cipher.encrypt(token.encode('utf-8'))
             return base64.b64encode(encrypted).decode('utf-8')
         except Exception as e:
-            print(f"❌ Error encrypting token: {e}")
+            logger.error("Error encrypting token: %s", e)
             raise
     
     def decrypt_calendar_token(self, encrypted_token: str) -> str:
@@ -106,7 +116,7 @@ class AuthManager:
             decrypted = self.cipher.decrypt(encrypted_bytes)
             return decrypted.decode('utf-8')
         except Exception as e:
-            print(f"❌ Error decrypting token: {e}")
+            logger.error("Error decrypting token: %s", e)
             raise
     
     # ============================================================
@@ -227,12 +237,12 @@ class AuthManager:
                 expires_at_str = f"{parts[0]}.{microseconds}+{microseconds_and_tz[1]}"
 
             expires_at = datetime.fromisoformat(expires_at_str)
-            if datetime.utcnow() > expires_at.replace(tzinfo=None):
+            if self.clock.utcnow() > expires_at.replace(tzinfo=None):
                 # Session expired, invalidate it
                 self.db.invalidate_session(session['session_id'])
                 return None
         except (ValueError, IndexError) as e:
-            print(f"⚠️  Error parsing session expiry: {e}")
+            logger.warning("Error parsing session expiry: %s", e)
             return None
         
         return session
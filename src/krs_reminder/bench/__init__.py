@@ -0,0 +1,24 @@
+"""Offline, deterministic benchmarks of the KRS Reminder bot.
+
+The bot runs against in-process fakes of Telegram, Supabase (PostgREST) and
+Google Calendar with configurable injected latency, so the scenarios run in
+CI and are reproducible. Run ``python -m krs_reminder.bench --help``.
+"""
+
+from .fakes import FakeCalendarService, FakePostgREST, FakeTelegramSession, Latency
+from .runner import BenchResult, compare, load_baseline, percentile, save_baseline
+from .scenarios import SCENARIOS, BenchEnv
+
+__all__ = [
+    "BenchEnv",
+    "BenchResult",
+    "FakeCalendarService",
+    "FakePostgREST",
+    "FakeTelegramSession",
+    "Latency",
+    "SCENARIOS",
+    "compare",
+    "load_baseline",
+    "percentile",
+    "save_baseline",
+]
@@ -0,0 +1,98 @@
+"""Run the offline benchmarks: python -m krs_reminder.bench [scenario ...]
+
+Without Telegram credentials on disk, set KRS_TELEGRAM_TOKEN and KRS_CHAT_ID
+(any value; nothing is sent).
+"""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import json
+import sys
+from pathlib import Path
+
+from krs_reminder.bench.runner import DEFAULT_BASELINE, DEFAULT_TOLERANCE, BenchResult, compare, load_baseline, save_baseline
+from krs_reminder.bench.scenarios import SCENARIOS, run
+from krs_reminder.logging_setup import configure_logging, stop_logging
+
+_PARAMS = ('users', 'events', 'iterations')
+# BenchEnv options; part of the recorded parameters so baselines only meet like runs
+_ENVIRONMENT = ('telegram_latency', 'db_latency', 'calendar_latency', 'jitter', 'seed', 'storage')
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m krs_reminder.bench', description=__doc__.splitlines()[0])
+    parser.add_argument('scenarios', nargs='*', metavar='scenario',
+                        help=f"Scenarios to run (default: all of {', '.join(sorted(SCENARIOS))})")
+    parser.add_argument('--users', type=int, help='Users per scenario (scenario default if unset)')
+    parser.add_argument('--events', type=int, help='Events per user or calendar')
+    parser.add_argument('--iterations', type=int, help='Repetitions of the measured operation')
+    parser.add_argument('--telegram-latency', type=float, default=0.0, help='Seconds per Bot API call')
+    parser.add_argument('--db-latency', type=float, default=0.0, help='Seconds per PostgREST call')
+    parser.add_argument('--calendar-latency', type=float, default=0.0, help='Seconds per events.list call')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra seconds per call')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--storage', choices=('postgrest', 'sqlite'), default='postgrest',
+                        help='Multi-user backend: fake PostgREST or in-memory SQLite (default: %(default)s)')
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='Baseline JSON file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Allowed regression as a fraction of the baseline (default: %(default)s)')
+    parser.add_argument('--update-baseline', action='store_true', help='Store this run as the new baseline')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args(argv)
+    unknown = sorted(set(args.scenarios) - set(SCENARIOS))
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    return args
+
+
+def _scenario_params(name: str, args: argparse.Namespace) -> dict:
+    """Scenario defaults, overridden by the --users/--events/--iterations given"""
+    params = {
+        key: parameter.default
+        for key, parameter in inspect.signature(SCENARIOS[name]).parameters.items()
+        if parameter.default is not inspect.Parameter.empty
+    }
+    for key in _PARAMS:
+        if key in params and getattr(args, key) is not None:
+            params[key] = getattr(args, key)
+    return params
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    # Only warnings; per-operation info lines would swamp the report
+    configure_logging(level='WARNING', json_format=False, stream=sys.stderr)
+    try:
+        results = []
+        environment = {key: getattr(args, key) for key in _ENVIRONMENT}
+        for name in args.scenarios or sorted(SCENARIOS):
+            params = _scenario_params(name, args)
+            durations, items = run(name, params, **environment)
+            results.append(BenchResult(name, {**params, **environment}, durations, items))
+    finally:
+        stop_logging()
+
+    baseline = load_baseline(args.baseline)
+    regressions = [problem for result in results for problem in compare(result, baseline.get(result.name), args.tolerance)]
+
+    if args.json:
+        print(json.dumps({
+            'results': {result.name: result.to_dict() for result in results},
+            'regressions': regressions,
+        }, indent=2))
+    else:
+        for result in results:
+            print(result.summary())
+        for problem in regressions:
+            print(f"REGRESSION {problem}")
+
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        return 0
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""In-process fakes of the bot's remote services.
+
+Each fake answers the calls the bot really makes, with an injected,
+seeded latency instead of the network:
+
+* :class:`FakeTelegramSession`: Telegram Bot API through the bot's
+  ``http_session`` (``sendMessage``, ``answerCallbackQuery``, ``getUpdates``,
+  ``getChat``)
+* :class:`FakePostgREST`: PostgREST/Supabase through ``SupabaseClient``'s
+  ``session`` (eq/gt/gte/lt/lte/``and=(...)`` filters, ``order``, ``limit``)
+* :class:`FakeCalendarService`: ``service.events().list(...).execute()``
+"""
+
+from __future__ import annotations
+
+import datetime
+import functools
+import json
+import random
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+
+class Latency:
+    """Seeded delay of ``base`` seconds plus up to ``jitter`` seconds"""
+
+    def __init__(self, base: float = 0.0, jitter: float = 0.0, seed: int = 0):
+        self.base = base
+        self.jitter = jitter
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample(self) -> float:
+        if not self.jitter:
+            return self.base
+        with self._lock:
+            return self.base + self._random.uniform(0, self.jitter)
+
+    def wait(self):
+        delay = self.sample()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class FakeResponse:
+    """The parts of requests.Response the bot reads"""
+
+    def __init__(self, payload: Any = None, status_code: int = 200, url: str = ''):
+        self.status_code = status_code
+        self.url = url
+        self.text = json.dumps(payload) if payload is not None else ''
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} for {self.url}", response=self)
+
+
+class FakeTelegramSession:
+    """Telegram Bot API stand-in for ``KRSReminderBotV2.http_session``"""
+
+    def __init__(self, latency: Optional[Latency] = None):
+        self.latency = latency or Latency()
+        self.sent: List[Dict] = []
+        self.updates: List[Dict] = []
+        self.calls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def post(self, url: str, data: Optional[Dict] = None, json: Optional[Dict] = None, **kwargs) -> FakeResponse:
+        return self._call(url, data or json or {})
+
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> FakeResponse:
+        return self._call(url, params or {})
+
+    def close(self):
+        pass
+
+    def _call(self, url: str, payload: Dict) -> FakeResponse:
+        self.latency.wait()
+        method = url.rsplit('/', 1)[-1]
+        with self._lock:
+            self.calls[method] = self.calls.get(method, 0) + 1
+            if method == 'sendMessage':
+                self.sent.append(dict(payload))
+                result: Any = {'message_id': len(self.sent), 'chat': {'id': payload.get('chat_id')}}
+            elif method == 'getUpdates':
+                result, self.updates = self.updates, []
+            elif method == 'getChat':
+                result = {'id': payload.get('chat_id'), 'type': 'private'}
+            else:
+                result = True
+        return FakeResponse({'ok': True, 'result': result}, url=url)
+
+
+def _coerce(value: Any) -> Any:
+    """Comparable form of a column or filter value (timestamps as aware datetimes)"""
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    return _coerce_text(str(value))
+
+
+@functools.lru_cache(maxsize=65536)
+def _coerce_text(text: str) -> Any:
+    if text in ('true', 'false'):
+        return text == 'true'
+    if len(text) >= 19 and text[4] == '-' and text[10] == 'T':
+        try:
+            parsed = datetime.datetime.fromisoformat(text.replace('Z', '+00:00'))
+        except ValueError:
+            return text
+        # PostgREST compares timestamptz; naive values are UTC
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=datetime.timezone.utc)
+    return text
+
+
+_OPERATORS = {
+    'gt': lambda left, right: left > right,
+    'gte': lambda left, right: left >= right,
+    'lt': lambda left, right: left < right,
+    'lte': lambda left, right: left <= right,
+}
+
+
+class _Filter:
+    """One ``column=op.operand`` condition, operand parsed once per query"""
+
+    __slots__ = ('column', 'op', 'operand', 'right')
+
+    def __init__(self, column: str, op: str, operand: str):
+        if op not in ('eq', 'in') and op not in _OPERATORS:
+            raise ValueError(f"Unsupported PostgREST operator: {op}")
+        self.column = column
+        self.op = op
+        self.operand = operand
+        # in.(a,b,c): compared as text, like eq
+        self.right = frozenset(operand.strip('()').split(',')) if op == 'in' else _coerce(operand)
+
+    def __call__(self, row: Dict) -> bool:
+        value = row.get(self.column)
+        if self.op == 'in':
+            return str(value) in self.right
+        if self.op == 'eq':
+            if isinstance(value, bool):
+                return value == (self.operand == 'true')
+            return str(value) == self.operand
+        if value is None:
+            return False
+        left, right = _coerce(value), self.right
+        if type(left) is not type(right):
+            left, right = str(value), self.operand
+        return _OPERATORS[self.op](left, right)
+
+
+def _parse_filters(params: Dict[str, str], skip: str = '') -> List[_Filter]:
+    """Every filter in the query string (except column `skip`)"""
+    filters = []
+    for column, condition in params.items():
+        if column in _RESERVED_PARAMS or column == skip:
+            continue
+        op, _, operand = condition.partition('.')
+        filters.append(_Filter(column, op, operand))
+    # and=(start_time.gte.X,start_time.lte.Y); timestamps contain no commas
+    combined = params.get('and')
+    if combined:
+        for clause in combined.strip('()').split(','):
+            filters.append(_Filter(*clause.split('.', 2)))
+    return filters
+
+
+_RESERVED_PARAMS = frozenset({'order', 'limit', 'select', 'and'})
+_PRIMARY_KEYS = {'users': 'user_id', 'schedules': 'schedule_id', 'sessions': 'session_id',
+                 'admins': 'admin_id', 'reminders': 'reminder_id'}
+
+
+class FakePostgREST:
+    """PostgREST stand-in for ``SupabaseClient(session=...)``, tables held in memory"""
+
+    def __init__(self, latency: Optional[Latency] = None):
+        self.latency = latency or Latency()
+        self.tables: Dict[str, List[Dict]] = {name: [] for name in _PRIMARY_KEYS}
+        # Rows per user_id, like the user_id indexes of the real tables
+        self._by_user: Dict[str, Dict[str, List[Dict]]] = {name: {} for name in _PRIMARY_KEYS}
+        self.calls: Dict[Tuple[str, str], int] = {}
+        # Set to simulate an outage: every request raises ConnectionError
+        self.down = False
+        self._lock = threading.Lock()
+
+    def client(self, clock=None):
+        """SupabaseClient talking to this fake"""
+        from ..database import SupabaseClient
+
+        return SupabaseClient(
+            config={'url': 'http://postgrest.invalid', 'service_role_key': 'bench'},
+            session=self,
+            clock=clock
+        )
+
+    def insert(self, table: str, rows) -> List[Dict]:
+        """Add rows directly (fixture setup; no latency)"""
+        with self._lock:
+            return self._insert(table, rows)
+
+    # HTTP verbs used by SupabaseClient._request ---------------------------------
+    def get(self, url: str, params: Optional[Dict] = None, **kwargs) -> FakeResponse:
+        return self._call('GET', url, params, None)
+
+    def post(self, url: str, json: Any = None, **kwargs) -> FakeResponse:
+        return self._call('POST', url, None, json)
+
+    def patch(self, url: str, json: Any = None, params: Optional[Dict] = None, **kwargs) -> FakeResponse:
+        return self._call('PATCH', url, params, json)
+
+    def delete(self, url: str, params: Optional[Dict] = None, **kwargs) -> FakeResponse:
+        return self._call('DELETE', url, params, None)
+
+    def _call(self, method: str, url: str, params: Optional[Dict], body: Any) -> FakeResponse:
+        self.latency.wait()
+        if self.down:
+            raise requests.ConnectionError(f"{url}: connection refused (fake outage)")
+        table = urlsplit(url).path.rsplit('/', 1)[-1]
+        if table not in self.tables:
+            return FakeResponse({'message': f'relation "{table}" does not exist'}, 404, url)
+
+        params = {key: str(value) for key, value in (params or {}).items()}
+        with self._lock:
+            self.calls[(method, table)] = self.calls.get((method, table), 0) + 1
+            if method == 'POST':
+                return FakeResponse(self._insert(table, body), 201, url)
+
+            candidates, indexed = self._candidates(table, params)
+            filters = _parse_filters(params, skip=indexed)
+            rows = [row for row in candidates if all(check(row) for check in filters)]
+            if method == 'GET':
+                return FakeResponse(self._shape(rows, params), url=url)
+            if method == 'PATCH':
+                for row in rows:
+                    row.update(body or {})
+                return FakeResponse([dict(row) for row in rows], url=url)
+            deleted = {id(row) for row in rows}
+            self.tables[table] = [row for row in self.tables[table] if id(row) not in deleted]
+            self._by_user[table] = {}
+            for row in self.tables[table]:
+                self._index(table, row)
+            return FakeResponse([dict(row) for row in rows], url=url)
+
+    def _insert(self, table: str, rows) -> List[Dict]:
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        created = []
+        for row in rows if isinstance(rows, list) else [rows]:
+            row = dict(row)
+            row.setdefault(_PRIMARY_KEYS[table], str(uuid.uuid4()))
+            row.setdefault('created_at', now)
+            self.tables[table].append(row)
+            self._index(table, row)
+            created.append(dict(row))
+        return created
+
+    def _index(self, table: str, row: Dict):
+        if row.get('user_id') is not None:
+            self._by_user[table].setdefault(str(row['user_id']), []).append(row)
+
+    def _candidates(self, table: str, params: Dict[str, str]) -> Tuple[List[Dict], str]:
+        """Rows to filter, and the column whose filter the index already applied"""
+        condition = params.get('user_id', '')
+        if condition.startswith('eq.'):
+            return self._by_user[table].get(condition[3:], []), 'user_id'
+        return self.tables[table], ''
+
+    @staticmethod
+    def _shape(rows: List[Dict], params: Dict[str, str]) -> List[Dict]:
+        order = params.get('order')
+        if order:
+            for clause in reversed(order.split(',')):
+                column, _, direction = clause.partition('.')
+                rows = sorted(rows, key=lambda row: _coerce(row.get(column)) or '', reverse=direction == 'desc')
+        if 'limit' in params:
+            rows = rows[:int(params['limit'])]
+        return [dict(row) for row in rows]
+
+
+class _EventsResource:
+    def __init__(self, service: 'FakeCalendarService'):
+        self._service = service
+
+    def list(self, calendarId: str = 'primary', timeMin: Optional[str] = None,
+             timeMax: Optional[str] = None, **kwargs) -> '_ListRequest':
+        return _ListRequest(self._service, timeMin, timeMax)
+
+
+class _ListRequest:
+    def __init__(self, service: 'FakeCalendarService', time_min: Optional[str], time_max: Optional[str]):
+        self._service = service
+        self._min = _coerce(time_min) if time_min else None
+        self._max = _coerce(time_max) if time_max else None
+
+    def execute(self) -> Dict:
+        service = self._service
+        service.latency.wait()
+        with service._lock:
+            service.calls += 1
+            items = []
+            for event in service.items:
+                start = event['start']
+                if 'dateTime' not in start:
+                    items.append(event)  # All-day events overlap any range that reaches them
+                    continue
+                begins = _coerce(start['dateTime'])
+                if (self._min is None or begins >= self._min) and (self._max is None or begins < self._max):
+                    items.append(event)
+        items.sort(key=lambda event: event['start'].get('dateTime') or event['start'].get('date'))
+        return {'kind': 'calendar#events', 'items': items}
+
+
+class FakeCalendarService:
+    """Google Calendar v3 stand-in for ``KRSReminderBotV2(calendar_service=...)``"""
+
+    def __init__(self, items: Optional[List[Dict]] = None, latency: Optional[Latency] = None):
+        self.items = list(items or [])
+        self.latency = latency or Latency()
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def events(self) -> _EventsResource:
+        return _EventsResource(self)
@@ -0,0 +1,202 @@
+"""Replay of recorded Telegram traffic against the in-process fakes.
+
+A recording (see :mod:`krs_reminder.recording`) is fed update by update into
+``KRSReminderBotV2.handle_update`` in recorded order, at the recorded pace
+(``speed=1``), N times faster, or back to back (``speed=0``). The fake
+database is seeded with one logged-in user per recorded chat and one
+logged-out user per pseudonymized ``/login`` secret, so commands take the
+same code paths they took live.
+
+Per command (``/jadwal``, ``callback:day_1``, ...) the report lists the
+handling latency, the number of updates that raised or logged an error, and,
+when paced, how far dispatch fell behind the recorded schedule.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from ..admission import update_chat_id, update_label
+from ..clock import VirtualClock
+from ..recording import SECRET_PREFIX
+from .runner import percentile
+from .scenarios import BenchEnv
+
+
+class _CommandStats:
+    __slots__ = ('durations', 'errors')
+
+    def __init__(self):
+        self.durations: List[float] = []
+        self.errors = 0
+
+
+class ReplayReport:
+    """Per-command latency and error counts of one replay"""
+
+    def __init__(self, speed: float):
+        self.speed = speed
+        self.commands: Dict[str, _CommandStats] = {}
+        self.lag: List[float] = []
+        self.wall_seconds = 0.0
+        self.recorded_seconds = 0.0
+
+    def stats(self, label: str) -> _CommandStats:
+        if label not in self.commands:
+            self.commands[label] = _CommandStats()
+        return self.commands[label]
+
+    @property
+    def updates(self) -> int:
+        return sum(len(stats.durations) for stats in self.commands.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(stats.errors for stats in self.commands.values())
+
+    def to_dict(self) -> Dict:
+        return {
+            'speed': self.speed or 'max',
+            'updates': self.updates,
+            'errors': self.errors,
+            'recorded_seconds': round(self.recorded_seconds, 3),
+            'wall_seconds': round(self.wall_seconds, 3),
+            'max_lag_ms': round(max(self.lag, default=0) * 1000, 3),
+            'p95_lag_ms': round(percentile(self.lag, 0.95) * 1000, 3),
+            'commands': {
+                label: {
+                    'count': len(stats.durations),
+                    'errors': stats.errors,
+                    'error_rate': round(stats.errors / len(stats.durations), 4) if stats.durations else 0.0,
+                    'p50_ms': round(percentile(stats.durations, 0.50) * 1000, 3),
+                    'p95_ms': round(percentile(stats.durations, 0.95) * 1000, 3),
+                    'p99_ms': round(percentile(stats.durations, 0.99) * 1000, 3),
+                    'max_ms': round(max(stats.durations, default=0) * 1000, 3),
+                }
+                for label, stats in sorted(self.commands.items())
+            },
+        }
+
+    def summary(self) -> str:
+        data = self.to_dict()
+        lines = [
+            f"Replayed {data['updates']} updates ({data['recorded_seconds']:.1f}s recorded) "
+            f"in {data['wall_seconds']:.1f}s at speed {data['speed']}; errors={data['errors']} "
+            f"lag p95={data['p95_lag_ms']:.1f}ms max={data['max_lag_ms']:.1f}ms"
+        ]
+        for label, entry in data['commands'].items():
+            lines.append(
+                f"{label:<28} n={entry['count']:<5} err={entry['error_rate']:.1%} "
+                f"p50={entry['p50_ms']:.1f}ms p95={entry['p95_ms']:.1f}ms p99={entry['p99_ms']:.1f}ms"
+            )
+        return '\n'.join(lines)
+
+
+class _ErrorCounter(logging.Handler):
+    """Counts error log records against the update being dispatched"""
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.label: Optional[str] = None
+        self.failed = False
+        self._thread = threading.get_ident()
+
+    def emit(self, record: logging.LogRecord):
+        # Only the dispatching thread; scheduler threads are not part of the update
+        if self.label is not None and record.thread == self._thread:
+            self.failed = True
+
+
+def seed_recorded_users(env: BenchEnv, records: List[Dict], events: int = 10, logged_in: bool = True):
+    """
+    Seed the fake database for a recording
+
+    Args:
+        env: Environment to seed
+        records: Recording records
+        events: Classes per seeded user over the next week
+        logged_in: Give every recorded chat an active session
+    """
+    chats: Dict[int, None] = {}
+    login_secrets: Dict[str, None] = {}
+    for record in records:
+        update = record['update']
+        chat_id = update_chat_id(update)
+        if chat_id is not None:
+            chats[chat_id] = None
+        if update_label(update) == '/login':
+            message = update.get('message') or update.get('edited_message')
+            login_secrets.update((arg, None) for arg in message['text'].split()[1:2] if arg.startswith(SECRET_PREFIX))
+
+    starts = env.class_times(events)
+    for index, chat_id in enumerate(chats):
+        env.add_user(f'chat{index:05d}', f'unused-{index:05d}', chat_id if logged_in else None, starts)
+    for index, secret in enumerate(login_secrets):
+        env.add_user(f'login{index:05d}', secret, None, starts)
+
+
+def replay(records: Iterable[Dict], speed: float = 1.0, env: Optional[BenchEnv] = None, **seed_options) -> ReplayReport:
+    """
+    Feed recorded updates into the dispatcher
+
+    Args:
+        records: Recording records ({'ts', 'update'}), oldest first
+        speed: Pace multiplier (1 = as recorded, 10 = ten times faster, 0 = no waiting)
+        env: Environment to replay against (default: fresh BenchEnv, seeded from the recording)
+        **seed_options: seed_recorded_users options for the default environment
+
+    Returns:
+        ReplayReport
+    """
+    records = list(records)
+    owned = env is None
+    if env is None:
+        env = BenchEnv()
+        seed_recorded_users(env, records, **seed_options)
+
+    report = ReplayReport(speed)
+    counter = _ErrorCounter()
+    package_logger = logging.getLogger('krs_reminder')
+    package_logger.addHandler(counter)
+    bot = env.bot
+    try:
+        first_ts = records[0]['ts'] if records else 0.0
+        # Repeated button taps and chat budgets are judged by recorded time, whatever the speed
+        recorded_clock = VirtualClock(datetime.datetime.fromtimestamp(first_ts, datetime.timezone.utc))
+        bot.recent_callbacks.clock = recorded_clock
+        bot.admission.clock = recorded_clock
+        started = time.perf_counter()
+        for record in records:
+            update = record['update']
+            offset = record['ts'] - first_ts
+            report.recorded_seconds = offset
+            recorded_clock.set(datetime.datetime.fromtimestamp(record['ts'], datetime.timezone.utc))
+            if speed > 0:
+                due = started + offset / speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                report.lag.append(max(0.0, time.perf_counter() - due))
+
+            label = update_label(update)
+            stats = report.stats(label)
+            counter.label, counter.failed = label, False
+            dispatch_started = time.perf_counter()
+            try:
+                bot.last_update_id = update.get('update_id') or bot.last_update_id
+                bot.handle_update(update)
+            except Exception:
+                counter.failed = True
+            stats.durations.append(time.perf_counter() - dispatch_started)
+            stats.errors += counter.failed
+            counter.label = None
+        report.wall_seconds = time.perf_counter() - started
+    finally:
+        package_logger.removeHandler(counter)
+        if owned:
+            env.close()
+    return report
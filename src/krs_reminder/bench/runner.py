@@ -0,0 +1,137 @@
+"""Benchmark statistics and baseline comparison.
+
+A baseline file maps scenario names to the parameters they ran with and the
+numbers they produced::
+
+    {
+      "sweep": {"params": {"users": 20, "events": 10, "iterations": 10,
+                           "db_latency": 0.0, "storage": "postgrest", ...},
+                "p95_ms": 120.0, "throughput": 180.0}
+    }
+
+A run regresses when its p95 latency grows, or its throughput drops, by more
+than the tolerance (a fraction of the baseline). Latency changes below
+``MIN_DELTA_MS`` are timer noise and never count. Baselines recorded with
+different parameters (scenario arguments, or the environment: latencies,
+jitter, seed and storage backend) are not compared. The numbers depend on
+the machine, so record the baseline where the comparison runs
+(``--update-baseline``).
+"""
+
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_BASELINE: Path = Path(__file__).with_name('baseline.json')
+DEFAULT_TOLERANCE = 0.25
+MIN_DELTA_MS = 0.5
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile of `values` (fraction in 0..1)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class BenchResult:
+    """Latency percentiles and throughput of one scenario run"""
+
+    __slots__ = ('name', 'params', 'durations', 'items')
+
+    def __init__(self, name: str, params: Dict, durations: List[float], items: int):
+        """
+        Args:
+            name: Scenario name
+            params: Scenario parameters the run used
+            durations: Seconds per measured operation
+            items: Units of work done (users swept, messages sent, ...)
+        """
+        self.name = name
+        self.params = dict(params)
+        self.durations = list(durations)
+        self.items = items
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.durations)
+
+    @property
+    def throughput(self) -> float:
+        """Items per second of measured time"""
+        total = self.total_seconds
+        return self.items / total if total > 0 else 0.0
+
+    def percentile_ms(self, fraction: float) -> float:
+        return percentile(self.durations, fraction) * 1000
+
+    def to_dict(self) -> Dict:
+        return {
+            'params': self.params,
+            'operations': len(self.durations),
+            'items': self.items,
+            'p50_ms': round(self.percentile_ms(0.50), 3),
+            'p95_ms': round(self.percentile_ms(0.95), 3),
+            'p99_ms': round(self.percentile_ms(0.99), 3),
+            'max_ms': round(max(self.durations, default=0) * 1000, 3),
+            'throughput': round(self.throughput, 2),
+        }
+
+    def summary(self) -> str:
+        data = self.to_dict()
+        return (
+            f"{self.name:<15} ops={data['operations']:<4} p50={data['p50_ms']:.1f}ms "
+            f"p95={data['p95_ms']:.1f}ms p99={data['p99_ms']:.1f}ms "
+            f"throughput={data['throughput']:.1f}/s"
+        )
+
+
+def compare(result: BenchResult, baseline: Optional[Dict], tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Regressions of a run against its baseline entry
+
+    Args:
+        result: Current run
+        baseline: Baseline entry of the same scenario (None: nothing to compare)
+        tolerance: Allowed relative slowdown (0.25 = 25%)
+
+    Returns:
+        Human-readable regression descriptions (empty when within tolerance)
+    """
+    if not baseline or baseline.get('params') != result.params:
+        return []
+
+    current = result.to_dict()
+    problems = []
+    p95 = baseline.get('p95_ms')
+    if p95 and current['p95_ms'] > p95 * (1 + tolerance) and current['p95_ms'] - p95 >= MIN_DELTA_MS:
+        problems.append(f"{result.name}: p95 {current['p95_ms']:.1f}ms > baseline {p95:.1f}ms +{tolerance:.0%}")
+    throughput = baseline.get('throughput')
+    if throughput and current['throughput'] < throughput * (1 - tolerance):
+        problems.append(
+            f"{result.name}: throughput {current['throughput']:.1f}/s < baseline {throughput:.1f}/s -{tolerance:.0%}"
+        )
+    return problems
+
+
+def load_baseline(path: Path = DEFAULT_BASELINE) -> Dict[str, Dict]:
+    if not Path(path).exists():
+        return {}
+    with Path(path).open('r', encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def save_baseline(results: Sequence[BenchResult], path: Path = DEFAULT_BASELINE):
+    """Write (or update) baseline entries for the given results"""
+    data = load_baseline(path)
+    for result in results:
+        entry = result.to_dict()
+        data[result.name] = {key: entry[key] for key in ('params', 'p95_ms', 'throughput')}
+    with Path(path).open('w', encoding='utf-8') as handle:
+        json.dump(data, handle, indent=2, sort_keys=True)
+        handle.write('\n')
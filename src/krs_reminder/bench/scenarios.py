@@ -0,0 +1,318 @@
+"""Benchmark scenarios run against the in-process fakes.
+
+Every scenario builds a fresh bot wired to :mod:`.fakes`, seeds the fake
+database or calendar with generated classes (placed relative to now, so the
+amount of work does not depend on the time of day) and returns one duration
+per measured operation.
+"""
+
+from __future__ import annotations
+
+import datetime
+import gc
+import random
+import time
+from typing import Callable, Dict, List, Optional
+
+import bcrypt
+
+from .fakes import FakeCalendarService, FakePostgREST, FakeTelegramSession, Latency
+
+COURSES = (
+    ('Algoritma dan Pemrograman', 'IF101'), ('Basis Data', 'IF202'), ('Jaringan Komputer', 'IF303'),
+    ('Sistem Operasi', 'IF204'), ('Kalkulus', 'MA101'), ('Statistika', 'MA205'),
+    ('Rekayasa Perangkat Lunak', 'IF305'), ('Kecerdasan Buatan', 'IF407'),
+)
+CLASS_TYPES = ('Kuliah Teori', 'Praktikum', 'Tutorial', 'Seminar')
+ROOMS = ('Gedung A 201', 'Gedung B 105', 'Lab Komputer 3', 'Aula Utama', 'Online (Zoom)')
+
+# Cheapest bcrypt cost; login time is then dominated by the bot, not the hash
+BCRYPT_ROUNDS = 4
+
+
+class BenchEnv:
+    """A bot wired to fake Telegram, PostgREST and Calendar services"""
+
+    def __init__(
+        self,
+        multi_user: bool = True,
+        telegram_latency: float = 0.0,
+        db_latency: float = 0.0,
+        calendar_latency: float = 0.0,
+        jitter: float = 0.0,
+        seed: int = 0,
+        storage: str = 'postgrest',
+    ):
+        """
+        Args:
+            multi_user: Wire the fake database (else single-user Calendar mode)
+            telegram_latency: Seconds added to every Bot API call
+            db_latency: Seconds added to every PostgREST call (fake PostgREST only)
+            calendar_latency: Seconds added to every events.list call
+            jitter: Up to this many extra seconds per call (seeded)
+            seed: Seed of the fixture data and latency jitter
+            storage: 'postgrest' (SupabaseClient on the fake) or 'sqlite'
+                (in-memory SQLiteStorage: the bot's overhead without
+                HTTP serialisation)
+        """
+        from ..bot import KRSReminderBotV2
+        from ..sqlite_storage import SQLiteStorage
+
+        self.random = random.Random(seed)
+        self.telegram = FakeTelegramSession(Latency(telegram_latency, jitter, seed))
+        self.postgrest = FakePostgREST(Latency(db_latency, jitter, seed + 1))
+        self.calendar = FakeCalendarService(latency=Latency(calendar_latency, jitter, seed + 2))
+        if storage == 'sqlite':
+            # Same insert() as the fake, so seeding works on either backend
+            self.store = SQLiteStorage(':memory:', seed_owner=False)
+            db = self.store
+        elif storage == 'postgrest':
+            self.store = self.postgrest
+            db = self.postgrest.client()
+        else:
+            raise ValueError(f"Unknown storage: {storage!r}")
+        self.bot = KRSReminderBotV2(
+            db=db,
+            http_session=self.telegram,
+            calendar_service=self.calendar
+        )
+        # Benchmarks measure sweeps, not snapshot writes (tests opt in with a temp path)
+        self.bot.snapshot_path = None
+        if not multi_user:
+            self.bot.db = self.bot.auth = self.bot.admin = self.bot.cmd_handler = None
+            self.bot.multi_user_enabled = False
+        self.now = self.bot.clock.now(self.bot.tz).replace(second=0, microsecond=0)
+
+    def class_times(self, count: int, first_hours: float = 6, span_hours: float = 144) -> List[datetime.datetime]:
+        """`count` class starts spread evenly from now + first_hours over span_hours"""
+        step = span_hours / max(count, 1)
+        return [self.now + datetime.timedelta(hours=first_hours + index * step) for index in range(count)]
+
+    def schedule_rows(self, user_id: str, starts: List[datetime.datetime], shared: bool = False) -> List[Dict]:
+        """
+        Schedule rows for one user
+
+        Args:
+            user_id: Owner of the rows
+            starts: Class start times
+            shared: Deterministic course per slot, so every user attends the
+                same sessions (reminder fan-out); random otherwise
+        """
+        rows = []
+        for index, start in enumerate(starts):
+            pick = random.Random(index) if shared else self.random
+            name, code = pick.choice(COURSES)
+            rows.append({
+                'user_id': user_id,
+                'course_name': name,
+                'course_code': code,
+                'class_type': pick.choice(CLASS_TYPES),
+                'location': pick.choice(ROOMS),
+                'facilitator': f'Dosen {code}',
+                'day_of_week': start.weekday(),
+                'start_time': start.astimezone(datetime.timezone.utc).isoformat(),
+                'end_time': (start + datetime.timedelta(minutes=100)).astimezone(datetime.timezone.utc).isoformat(),
+                'google_event_id': f'{user_id[:8]}-{index}' if not shared else f'shared-{index}',
+            })
+        return rows
+
+    def add_users(
+        self,
+        count: int,
+        events: int,
+        logged_in: bool = True,
+        shared: bool = False,
+        first_hours: float = 6,
+        span_hours: float = 144,
+    ) -> List[Dict]:
+        """
+        Seed users with schedules and (optionally) an active session each
+
+        Returns:
+            Created user rows with the plain 'secret_key' added
+        """
+        starts = self.class_times(events, first_hours, span_hours)
+        users = []
+        for index in range(count):
+            secret = f'secret-{index:04d}'
+            user = self.add_user(f'mhs{index:04d}', secret, 900000 + index if logged_in else None, starts, shared)
+            users.append({**user, 'secret_key': secret, 'chat_id': 900000 + index})
+        return users
+
+    def add_user(
+        self,
+        username: str,
+        secret: str,
+        chat_id: Optional[int],
+        starts: List[datetime.datetime],
+        shared: bool = False,
+    ) -> Dict:
+        """
+        Seed one user with classes at `starts`
+
+        Args:
+            username: Username
+            secret: Plain secret key (/login argument)
+            chat_id: Chat with an active 24h session (None: logged out)
+            starts: Class start times
+            shared: See schedule_rows
+
+        Returns:
+            Created user row
+        """
+        user = self.store.insert('users', {
+            'username': username,
+            'secret_key_hash': bcrypt.hashpw(secret.encode(), bcrypt.gensalt(BCRYPT_ROUNDS)).decode(),
+        })[0]
+        self.store.insert('schedules', self.schedule_rows(user['user_id'], starts, shared))
+        if chat_id is not None:
+            self.store.insert('sessions', {
+                'user_id': user['user_id'],
+                'telegram_chat_id': chat_id,
+                'session_token': f'token-{username}',
+                'expires_at': (datetime.datetime.utcnow() + datetime.timedelta(hours=24)).isoformat(),
+                'is_active': True,
+            })
+        return user
+
+    def calendar_events(self, count: int, first_hours: float = 1, span_hours: float = 144) -> List[Dict]:
+        """Seed the fake Calendar with Google-style events"""
+        items = []
+        for index, start in enumerate(self.class_times(count, first_hours, span_hours)):
+            name, code = self.random.choice(COURSES)
+            items.append({
+                'id': f'evt{index:05d}',
+                'summary': f'{name} ({code})',
+                'location': self.random.choice(ROOMS),
+                'description': f'Dosen: Dosen {code}\nJenis: {self.random.choice(CLASS_TYPES)}',
+                'start': {'dateTime': start.isoformat()},
+                'end': {'dateTime': (start + datetime.timedelta(minutes=100)).isoformat()},
+            })
+        self.calendar.items.extend(items)
+        return items
+
+    def lookahead_hours(self) -> float:
+        """Width of the window one sweep reads"""
+        return self.bot.sweep_planner.lookahead.total_seconds() / 3600
+
+    def close(self):
+        self.bot.scheduler.remove_all_jobs()
+        if self.bot.write_buffer is not None:
+            self.bot.write_buffer.close()
+        if self.store is not self.postgrest:
+            self.store.close()
+
+
+def _timed(operation: Callable[[], object]) -> float:
+    started = time.perf_counter()
+    operation()
+    return time.perf_counter() - started
+
+
+def _repeat(operation: Callable[[], object], iterations: int) -> List[float]:
+    """Time `iterations` runs after one untimed warm-up run, without GC pauses"""
+    operation()
+    gc.collect()
+    gc.disable()
+    try:
+        return [_timed(operation) for _ in range(iterations)]
+    finally:
+        gc.enable()
+
+
+# Scenarios: (env options, parameters) -> (durations, items processed) ----------
+
+def sweep(env: BenchEnv, users: int = 20, events: int = 10, iterations: int = 10):
+    """Multi-user sweep over `users` × `events` (timed re-sweeps after the first, scheduling one)"""
+    env.add_users(users, events, span_hours=env.lookahead_hours() - 7)
+    return _repeat(env.bot.check_and_schedule_events, iterations), users * iterations
+
+
+def sweep_single(env: BenchEnv, events: int = 50, iterations: int = 10):
+    """Single-user sweep reading events from the Calendar API"""
+    env.calendar_events(events, span_hours=env.lookahead_hours() - 2)
+    return _repeat(env.bot.check_and_schedule_events, iterations), events * iterations
+
+
+def weekly_render(env: BenchEnv, events: int = 30, iterations: int = 100):
+    """/jadwal in single-user mode: Calendar fetch plus weekly sections"""
+    env.calendar_events(events)
+    bot = env.bot
+
+    def render():
+        fetched, range_start, range_end = bot.get_weekly_events(bot._get_calendar_service())
+        return bot.format_weekly_schedule_message(fetched, range_start, range_end)
+
+    return _repeat(render, iterations), iterations
+
+
+def daily_render(env: BenchEnv, users: int = 5, events: int = 30, iterations: int = 100):
+    """Multi-user day view, cache invalidated before each render (login check, day query, format)"""
+    people = env.add_users(users, events)
+    bot = env.bot
+    target = env.now + datetime.timedelta(days=1)
+
+    turns = iter(range(iterations + 1))
+
+    def render():
+        user = people[next(turns) % len(people)]
+        bot.schedule_cache.bump(user['user_id'])
+        return bot.cmd_handler.handle_jadwal_sections(user['chat_id'], target)
+
+    return _repeat(render, iterations), iterations
+
+
+def login(env: BenchEnv, users: int = 20):
+    """/login of every one of `users` users (each login scans all secret hashes)"""
+    people = env.add_users(users, 1, logged_in=False)
+    handler = env.bot.cmd_handler
+    durations = [
+        _timed(lambda: handler.handle_login(user['chat_id'], ['/login', user['secret_key']]))
+        for user in people
+    ]
+    return durations, len(people)
+
+
+def reminder_burst(env: BenchEnv, users: int = 50, events: int = 4):
+    """Deliver every reminder group at once; `users` chats share the same classes"""
+    env.add_users(users, events, shared=True, first_hours=6, span_hours=12)
+    bot = env.bot
+    bot.check_and_schedule_events()
+    # The scheduler is not started, so re-added jobs are still listed once per add
+    groups = list(dict.fromkeys(job.id for job in bot.scheduler.get_jobs() if job.id != 'periodic_check'))
+    sent_before = len(env.telegram.sent)
+    durations = [_timed(lambda: bot.send_reminder(group)) for group in groups]
+    return durations, len(env.telegram.sent) - sent_before
+
+
+SCENARIOS: Dict[str, Callable] = {
+    'sweep': sweep,
+    'sweep_single': sweep_single,
+    'weekly_render': weekly_render,
+    'daily_render': daily_render,
+    'login': login,
+    'reminder_burst': reminder_burst,
+}
+
+# Scenarios that run the bot in single-user (Calendar) mode
+SINGLE_USER = frozenset({'sweep_single', 'weekly_render'})
+
+
+def run(name: str, params: Optional[Dict] = None, **env_options):
+    """
+    Run one scenario in a fresh environment
+
+    Args:
+        name: Key of SCENARIOS
+        params: Scenario parameters (users, events, iterations)
+        **env_options: BenchEnv latency/seed options
+
+    Returns:
+        (durations in seconds, items processed)
+    """
+    scenario = SCENARIOS[name]
+    env = BenchEnv(multi_user=name not in SINGLE_USER, **env_options)
+    try:
+        return scenario(env, **(params or {}))
+    finally:
+        env.close()
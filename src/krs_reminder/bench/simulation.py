@@ -0,0 +1,359 @@
+"""Time-warp simulation of a semester of reminders.
+
+The bot runs on a :class:`~krs_reminder.clock.VirtualClock` with a
+:class:`VirtualScheduler` in place of APScheduler. The fakes from
+:mod:`.fakes` stand in for Supabase and Telegram. The simulation imports a
+weekly timetable for every teaching week of the semester, then jumps from one
+scheduled job (sweep or reminder) to the next. A whole semester therefore
+runs in seconds. Every delivered reminder is recorded with its timing error
+(send time minus scheduled fire time); expected reminders that never went out
+are reported as missed.
+
+Run ``python -m krs_reminder.bench.simulation --help``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import heapq
+import itertools
+import random
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from apscheduler.jobstores.base import JobLookupError
+
+from .. import config
+from ..bot import KRSReminderBotV2
+from ..clock import VirtualClock
+from ..semester import SemesterCalendar
+from .fakes import FakePostgREST, FakeTelegramSession
+from .runner import percentile
+
+# Weekly timetable: (course, code, weekday, start HH:MM, minutes, room, class type)
+DEFAULT_TIMETABLE = (
+    ('Algoritma dan Pemrograman', 'IF101', 0, '07:30', 150, 'Gedung A 201', 'Kuliah Teori'),
+    ('Basis Data', 'IF202', 0, '13:00', 100, 'Lab Komputer 3', 'Praktikum'),
+    ('Jaringan Komputer', 'IF303', 1, '08:00', 100, 'Gedung B 105', 'Kuliah Teori'),
+    ('Sistem Operasi', 'IF204', 2, '10:00', 100, 'Gedung A 201', 'Kuliah Teori'),
+    ('Kalkulus', 'MA101', 2, '15:30', 100, 'Aula Utama', 'Kuliah Teori'),
+    ('Statistika', 'MA205', 3, '09:00', 100, 'Gedung B 105', 'Tutorial'),
+    ('Rekayasa Perangkat Lunak', 'IF305', 4, '13:30', 150, 'Lab Komputer 3', 'Praktikum'),
+    ('Kecerdasan Buatan', 'IF407', 5, '08:00', 100, 'Online (Zoom)', 'Seminar'),
+)
+
+
+class VirtualJob:
+    """A DateTrigger job held by the virtual scheduler"""
+
+    __slots__ = ('id', 'func', 'args', 'next_run_time', 'seq')
+
+    def __init__(self, job_id: str, func: Callable, args: Sequence, run_date: datetime.datetime, seq: int):
+        self.id = job_id
+        self.func = func
+        self.args = tuple(args)
+        self.next_run_time = run_date
+        self.seq = seq
+
+
+class VirtualScheduler:
+    """The part of APScheduler's API the bot uses, driven by a VirtualClock"""
+
+    def __init__(self, clock: VirtualClock):
+        self.clock = clock
+        self.executed = 0
+        self._jobs: Dict[str, VirtualJob] = {}
+        self._queue: List[tuple] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    def add_job(self, func: Callable, trigger, args: Sequence = (), id: Optional[str] = None,
+                replace_existing: bool = False, **kwargs) -> VirtualJob:
+        job_id = id or f'job-{next(self._seq)}'
+        with self._lock:
+            if job_id in self._jobs and not replace_existing:
+                raise ValueError(f"Job {job_id} already exists")
+            job = VirtualJob(job_id, func, args or (), trigger.run_date, next(self._seq))
+            self._jobs[job_id] = job
+            heapq.heappush(self._queue, (job.next_run_time, job.seq, job_id))
+        return job
+
+    def remove_job(self, job_id: str):
+        with self._lock:
+            if self._jobs.pop(job_id, None) is None:
+                raise JobLookupError(job_id)
+
+    def get_job(self, job_id: str) -> Optional[VirtualJob]:
+        return self._jobs.get(job_id)
+
+    def get_jobs(self) -> List[VirtualJob]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: (job.next_run_time, job.seq))
+
+    def start(self):
+        pass
+
+    def shutdown(self, wait: bool = True):
+        pass
+
+    def remove_all_jobs(self):
+        with self._lock:
+            self._jobs.clear()
+            self._queue.clear()
+
+    def _pop_due(self, until: datetime.datetime) -> Optional[VirtualJob]:
+        with self._lock:
+            while self._queue and self._queue[0][0] <= until:
+                _, seq, job_id = heapq.heappop(self._queue)
+                job = self._jobs.get(job_id)
+                if job is not None and job.seq == seq:  # Skip replaced and removed entries
+                    del self._jobs[job_id]
+                    return job
+        return None
+
+    def run_until(self, until: datetime.datetime) -> int:
+        """Run every job due up to `until` in fire-time order, moving the clock along"""
+        ran = 0
+        while True:
+            job = self._pop_due(until)
+            if job is None:
+                break
+            self.clock.set(job.next_run_time)
+            job.func(*job.args)
+            ran += 1
+        self.clock.set(until)
+        self.executed += ran
+        return ran
+
+
+class _SimulatedBot(KRSReminderBotV2):
+    """Bot that also records sweeps and each delivery with its virtual send time"""
+
+    deliveries: List[tuple]
+    sweeps = 0
+
+    def check_and_schedule_events(self):
+        self.sweeps += 1
+        super().check_and_schedule_events()
+
+    def _record_delivery(self, delivered):
+        super()._record_delivery(delivered)
+        sent_at = self.clock.now(self.tz)
+        for item in delivered:
+            self.deliveries.append((item.key, item.fire_time, sent_at))
+
+
+class SimulationReport:
+    """Scheduling correctness and engine throughput of one simulated semester"""
+
+    def __init__(self, expected: Dict[str, datetime.datetime], deliveries: List[tuple],
+                 sweeps: int, jobs: int, messages: int, wall_seconds: float, virtual_days: float):
+        self.expected = len(expected)
+        self.delivered = len(deliveries)
+        seen: Dict[str, int] = {}
+        for key, _, _ in deliveries:
+            seen[key] = seen.get(key, 0) + 1
+        self.duplicates = sum(count - 1 for count in seen.values())
+        self.missed = sorted(key for key in expected if key not in seen)
+        self.unexpected = sorted(key for key in seen if key not in expected)
+        # Seconds; negative = sent early with a combined (coalesced) message
+        self.errors = [(sent_at - fire_time).total_seconds() for _, fire_time, sent_at in deliveries]
+        self.sweeps = sweeps
+        self.jobs = jobs
+        self.messages = messages
+        self.wall_seconds = wall_seconds
+        self.virtual_days = virtual_days
+
+    @property
+    def throughput(self) -> float:
+        """Reminders delivered per wall-clock second"""
+        return self.delivered / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict:
+        late = [error for error in self.errors if error > 0]
+        return {
+            'virtual_days': round(self.virtual_days, 1),
+            'wall_seconds': round(self.wall_seconds, 3),
+            'expected': self.expected,
+            'delivered': self.delivered,
+            'missed': len(self.missed),
+            'duplicates': self.duplicates,
+            'unexpected': len(self.unexpected),
+            'messages': self.messages,
+            'sweeps': self.sweeps,
+            'jobs': self.jobs,
+            'early': sum(1 for error in self.errors if error < 0),
+            'late': len(late),
+            'error_p50_s': percentile(self.errors, 0.50),
+            'error_p99_s': percentile(self.errors, 0.99),
+            'max_late_s': max(late, default=0.0),
+            'throughput': round(self.throughput, 1),
+        }
+
+    def summary(self) -> str:
+        data = self.to_dict()
+        return (
+            f"{data['virtual_days']} days in {data['wall_seconds']}s: {data['delivered']}/{data['expected']} "
+            f"reminders ({data['missed']} missed, {data['duplicates']} duplicate, {data['early']} early, "
+            f"{data['late']} late), {data['messages']} messages, {data['sweeps']} sweeps, "
+            f"{data['throughput']} reminders/s"
+        )
+
+
+class SemesterSimulation:
+    """Replay a semester of imported schedules on virtual time"""
+
+    def __init__(
+        self,
+        users: int = 20,
+        courses_per_user: int = 5,
+        timetable: Sequence[tuple] = DEFAULT_TIMETABLE,
+        semester_calendar: Optional[SemesterCalendar] = None,
+        weeks: Optional[int] = None,
+        session_hours: Optional[float] = None,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            users: Simulated students, each logged in from one chat
+            courses_per_user: Timetable entries each student takes (seeded pick)
+            timetable: Weekly classes, see DEFAULT_TIMETABLE
+            semester_calendar: Semester to simulate (default: the configured one)
+            weeks: Simulate only the first `weeks` weeks
+            session_hours: Session lifetime from the start (default: whole semester)
+            seed: Seed of the course assignment
+        """
+        self.users = users
+        self.courses_per_user = min(courses_per_user, len(timetable))
+        self.timetable = tuple(timetable)
+        self.weeks = weeks
+        self.session_hours = session_hours
+        self.random = random.Random(seed)
+
+        self.postgrest = FakePostgREST()
+        self.telegram = FakeTelegramSession()
+        # Clock is placed at the semester start once the calendar is known
+        self.clock = VirtualClock(datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc))
+        self.bot = _SimulatedBot(db=self.postgrest.client(clock=self.clock), http_session=self.telegram, clock=self.clock)
+        self.bot.deliveries = []
+        self.bot.snapshot_path = None
+        # Users are swept inline and in order: reproducible, and no thread pool per sweep
+        self.bot.sweep_workers = 0
+        self.scheduler = VirtualScheduler(self.clock)
+        self.bot.scheduler = self.scheduler
+        if semester_calendar is not None:
+            self.bot.semester_calendar = semester_calendar
+
+        semester = self.bot.semester_calendar.semesters[0]
+        self.start = self.bot.tz.localize(datetime.datetime.combine(semester.start, datetime.time()))
+        self.clock.set(self.start - datetime.timedelta(days=1))
+        self.expected: Dict[str, datetime.datetime] = {}
+        self.end = self.start
+        self._seed(semester.weeks if weeks is None else min(weeks, semester.weeks))
+
+    def _class_rows(self, user_id: str, weeks: int) -> List[Dict]:
+        rows = []
+        calendar = self.bot.semester_calendar
+        for entry in self.random.sample(self.timetable, self.courses_per_user):
+            name, code, weekday, start_hm, minutes, room, class_type = entry
+            hour, minute = (int(part) for part in start_hm.split(':'))
+            for week in range(weeks):
+                day = self.start.date() + datetime.timedelta(days=week * 7 + weekday)
+                if calendar.status(day)['week_type'] not in ('VA', 'VB'):
+                    continue  # UTS/UAS weeks have no regular classes
+                start = self.bot.tz.localize(datetime.datetime.combine(day, datetime.time(hour, minute)))
+                rows.append({
+                    'user_id': user_id,
+                    'course_name': name,
+                    'course_code': code,
+                    'class_type': class_type,
+                    'location': room,
+                    'facilitator': f'Dosen {code}',
+                    'day_of_week': weekday,
+                    'start_time': start.astimezone(datetime.timezone.utc).isoformat(),
+                    'end_time': (start + datetime.timedelta(minutes=minutes)).astimezone(datetime.timezone.utc).isoformat(),
+                    'google_event_id': f'{code}-w{week + 1}',
+                })
+        return rows
+
+    def _seed(self, weeks: int):
+        now = self.clock.now(self.bot.tz)
+        lifetime = (
+            datetime.timedelta(hours=self.session_hours) if self.session_hours is not None
+            else datetime.timedelta(weeks=weeks + 1)
+        )
+        slots = [(hours, f'{hours}h') for hours in config.REMINDER_HOURS]
+        if config.INCLUDE_EXACT_TIME_REMINDER:
+            slots.append((0, 'exact'))
+
+        for index in range(self.users):
+            user = self.postgrest.insert('users', {'username': f'mhs{index:04d}', 'secret_key_hash': '-'})[0]
+            chat_id = 700000 + index
+            self.postgrest.insert('sessions', {
+                'user_id': user['user_id'],
+                'telegram_chat_id': chat_id,
+                'session_token': f'sim-{index}',
+                'expires_at': (self.clock.utcnow() + lifetime).isoformat(),
+                'is_active': True,
+            })
+            rows = self.postgrest.insert('schedules', self._class_rows(user['user_id'], weeks))
+            for row in rows:
+                start = datetime.datetime.fromisoformat(row['start_time']).astimezone(self.bot.tz)
+                self.end = max(self.end, start + datetime.timedelta(hours=1))
+                for hours, slot in slots:
+                    fire_time = start - datetime.timedelta(hours=hours)
+                    if fire_time > now:
+                        self.expected[f"{chat_id}:{row['google_event_id']}_{slot}"] = fire_time
+
+    def run(self) -> SimulationReport:
+        """Sweep once, then run every job until the last class has started"""
+        began_at = self.clock.now(self.bot.tz)
+        started = time.perf_counter()
+        self.bot.check_and_schedule_events()
+        jobs = self.scheduler.run_until(self.end)
+        wall = time.perf_counter() - started
+
+        return SimulationReport(
+            self.expected,
+            self.bot.deliveries,
+            sweeps=self.bot.sweeps,
+            jobs=jobs,
+            messages=self.telegram.calls.get('sendMessage', 0),
+            wall_seconds=wall,
+            virtual_days=(self.clock.now(self.bot.tz) - began_at).total_seconds() / 86400,
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m krs_reminder.bench.simulation',
+                                     description='Simulate a semester of reminders on virtual time')
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--courses', type=int, default=5, help='Courses per user')
+    parser.add_argument('--weeks', type=int, help='Only the first N weeks of the semester')
+    parser.add_argument('--session-hours', type=float, help='Session lifetime (default: whole semester)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    from ..logging_setup import configure_logging, stop_logging
+
+    configure_logging(level='WARNING', json_format=False, stream=sys.stderr)
+    try:
+        report = SemesterSimulation(
+            users=args.users,
+            courses_per_user=args.courses,
+            weeks=args.weeks,
+            session_hours=args.session_hours,
+            seed=args.seed,
+        ).run()
+    finally:
+        stop_logging()
+
+    print(report.summary())
+    return 1 if report.missed or report.duplicates else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
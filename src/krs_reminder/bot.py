@@ -2,15 +2,16 @@
 
 import datetime
 import html
-import json
-import re
+import logging
+import sqlite3
+import threading
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
 
-import psutil
 import pytz
 import requests
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.date import DateTrigger
 from google.auth.transport.requests import Request
@@ -18,37 +19,183 @@ from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 
 from . import config
-from .database import SupabaseClient
+from .storage import Storage, open_storage
 from .auth import AuthManager
 from .admin import AdminManager
+from .admission import AdmissionControl, parse_command, update_chat_id, update_label
 from .commands import CommandHandler
+from .chunking import chunk_blocks, split_message
+from .clock import SYSTEM_CLOCK, Clock
+from .delivery import DedupStats, PendingReminder, ReminderCoalescer, build_coalesced_messages
+from .events import EventView, as_event_view, to_event_views
+from .rendering import COUNTDOWN_MARKER, ReminderRenderCache, ReminderTemplate, reminder_slot
+from .metrics import (
+    CALENDAR_REQUEST_ERRORS,
+    CALENDAR_REQUEST_SECONDS,
+    CALLBACKS_DEDUPED,
+    DISPATCH_QUEUE_DEPTH,
+    INBOUND_BACKLOG,
+    REMINDER_LATENESS_SECONDS,
+    REMINDERS_SENT,
+    SWEEP_DURATION_SECONDS,
+    TELEGRAM_REQUEST_ERRORS,
+    TELEGRAM_REQUEST_SECONDS,
+    UPDATES_REJECTED,
+    MetricsServer,
+    track,
+)
+from .monitoring import MetricsSampler
+from .recording import UpdateRecorder
+from .schedule_cache import RenderedScheduleCache, WeekPrefetchBuffer
+from .resilience import stale_since
+from .semester import load_semester_calendar
+from .singleflight import RecentCallbacks, SingleFlight
+from .snapshot import SINGLE_USER, ScheduleSnapshot, load_snapshot, write_snapshot
+from .ui_assets import (
+    DAILY_MENU_KEYBOARD,
+    DAILY_MENU_TEXT,
+    DAY_CALLBACKS,
+    MAIN_MENU_KEYBOARD,
+    QUICK_COMMAND_FOOTER,
+    format_date_id,
+    format_short_date,
+    main_menu_message,
+    reminder_theme,
+    serialize_markup,
+    welcome_message,
+)
+from .sweep import SweepPlanner, SweepReport, UserSweepResult, run_user_sweep
+from .write_behind import BufferedStorage, WriteBehindBuffer
+
+logger = logging.getLogger(__name__)
+
 
 class KRSReminderBotV2:
-    def __init__(self):
+    # Source of "now" for scheduling, rendering and stats
+    clock: Clock = SYSTEM_CLOCK
+    # Raw update recorder (KRS_RECORD_UPDATES); None when not recording
+    update_recorder: Optional[UpdateRecorder] = None
+    # Buffer behind self.db for delivery bookkeeping (KRS_WRITE_BEHIND_MS); None when writing through
+    write_buffer: Optional[WriteBehindBuffer] = None
+    # Write delivered reminders to the reminders table (KRS_REMINDER_LOG, needs write_buffer)
+    log_deliveries: bool = config.REMINDER_LOG_ENABLED
+    # Local schedule snapshot (KRS_SNAPSHOT_FILE); None when disabled
+    snapshot_path: Optional[str] = None
+    # Reminder keys restored from the snapshot, until the first complete sweep reconciles them
+    _restored_keys: Optional[set] = None
+    # Raw items of the last successful Calendar read (single-user snapshot)
+    last_calendar_events: Optional[List[Dict]] = None
+
+    def __init__(
+        self,
+        db: Optional[Storage] = None,
+        http_session=None,
+        calendar_service=None,
+        clock: Optional[Clock] = None
+    ):
+        """
+        Args:
+            db: Storage backend (default: KRS_STORAGE, Supabase from configs/supabase)
+            http_session: HTTP session for the Telegram Bot API (default: requests.Session)
+            calendar_service: Prebuilt Calendar service, used instead of the OAuth token
+            clock: Time source (default: system clock; simulations pass a VirtualClock)
+        """
+        if clock is not None:
+            self.clock = clock
         self.tz = pytz.timezone(config.TIMEZONE)
         self.scheduler = BackgroundScheduler(
             timezone=config.TIMEZONE,
             job_defaults={"max_instances": 1, "coalesce": True}
         )
         self.sent_reminders = set()
-        self.start_time = datetime.datetime.now(self.tz)
+        # (user_id, schedule_id, slot, fire time) already logged: one row however many chats got it
+        self._logged_deliveries: Dict[Tuple[str, str, str, datetime.datetime], datetime.datetime] = {}
+        self._delivery_log_lock = threading.Lock()
+        self.start_time = self.clock.now(self.tz)
         self.total_reminders_sent = 0
         self.total_events_checked = 0
         self.last_update_id = 0
-        self.http_session = requests.Session()
-        self.calendar_service = None
+        self.http_session = http_session if http_session is not None else requests.Session()
+        self.calendar_service = calendar_service
         self.calendar_service_expiry: Optional[datetime.datetime] = None
+        if calendar_service is not None:
+            # Injected services are never rebuilt from the token
+            self.calendar_service_expiry = datetime.datetime.max.replace(tzinfo=datetime.timezone.utc)
+
+        # Adaptive sweep scheduling
+        self.sweep_planner = SweepPlanner(
+            min_minutes=config.SWEEP_MIN_MINUTES,
+            max_minutes=config.SWEEP_MAX_MINUTES,
+            lookahead_hours=config.SWEEP_LOOKAHEAD_HOURS,
+            reminder_hours=config.REMINDER_HOURS
+        )
+        self.next_sweep_time: Optional[datetime.datetime] = None
+        self.sweep_workers = config.SWEEP_WORKERS
+        self.last_sweep_report: Optional[SweepReport] = None
+        self._sweep_lock = threading.Lock()
+        self._sweep_requested = False
+
+        # Reminder texts rendered at schedule time, shared across users
+        self.reminder_cache = ReminderRenderCache(config.REMINDER_RENDER_CACHE_SIZE)
+        # Reminders of one chat due close together are sent as one message
+        self.coalescer = ReminderCoalescer(config.COALESCE_WINDOW_SECONDS, self._cancel_reminder_job)
+        self.dedup_stats = DedupStats()
+        self.schedule_cache = RenderedScheduleCache(config.SCHEDULE_CACHE_MAX_BYTES)
+        self.metrics = MetricsSampler(
+            self._collect_scheduler_metrics,
+            interval_seconds=config.METRICS_SAMPLE_SECONDS,
+            history_seconds=config.METRICS_HISTORY_SECONDS,
+            tz=self.tz,
+            clock=self.clock
+        )
+        self.week_prefetch = WeekPrefetchBuffer(config.WEEK_PREFETCH_TTL_SECONDS)
+        # Identical concurrent Calendar reads share one request; double taps are answered once
+        self.calendar_flights = SingleFlight('calendar')
+        self.recent_callbacks = RecentCallbacks(config.CALLBACK_DEDUPE_SECONDS, clock=self.clock)
+        # Per-chat budgets for inbound updates, checked before any database work
+        self.admission = AdmissionControl(
+            burst=config.ADMISSION_BURST,
+            rate=config.ADMISSION_RATE,
+            shed_backlog=config.ADMISSION_SHED_BACKLOG,
+            clock=self.clock
+        )
+        INBOUND_BACKLOG.set_function(lambda: self.admission.backlog)
+        DISPATCH_QUEUE_DEPTH.set_function(lambda: self.coalescer.queue_depth)
+        # Optional Prometheus endpoint (KRS_METRICS_PORT); started with the bot
+        self.metrics_server: Optional[MetricsServer] = None
+        self.snapshot_path = config.SNAPSHOT_FILE or None
+        if config.UPDATE_RECORD_FILE:
+            self.update_recorder = UpdateRecorder(
+                config.UPDATE_RECORD_FILE,
+                salt=config.UPDATE_RECORD_SALT or None,
+                clock=self.clock
+            )
+            logger.info("Recording Telegram updates to %s", config.UPDATE_RECORD_FILE)
+        # VA/VB weeks of the configured semesters, precomputed once
+        self.semester_calendar = load_semester_calendar(
+            config.SEMESTER_CALENDAR_FILE,
+            default_start=config.SEMESTER_START,
+            default_weeks=config.SEMESTER_WEEKS
+        )
 
         # Multi-user support
         try:
-            self.db = SupabaseClient()
-            self.auth = AuthManager(self.db)
-            self.admin = AdminManager(self.db, self.auth, self._get_calendar_service)
+            self.db = db if db is not None else open_storage(clock=self.clock)
+            if config.WRITE_BEHIND_INTERVAL_MS > 0:
+                self.write_buffer = WriteBehindBuffer(
+                    self.db,
+                    interval_seconds=config.WRITE_BEHIND_INTERVAL_MS / 1000,
+                    max_rows=config.WRITE_BEHIND_MAX_ROWS,
+                    spill_path=config.WRITE_BEHIND_SPILL_FILE
+                )
+                self.db = BufferedStorage(self.db, self.write_buffer, clock=self.clock)
+            self.auth = AuthManager(self.db, clock=self.clock)
+            self.admin = AdminManager(self.db, self.auth, self._get_calendar_service, clock=self.clock)
             self.cmd_handler = CommandHandler(self)
             self.multi_user_enabled = True
-            print("✅ Multi-user support enabled")
+            logger.info("Multi-user support enabled")
         except Exception as e:
-            print(f"⚠️  Multi-user support disabled: {e}")
+            logger.warning("Multi-user support disabled: %s", e)
             self.db = None
             self.auth = None
             self.admin = None
@@ -65,24 +212,21 @@ class KRSReminderBotV2:
             try:
                 creds = Credentials.from_authorized_user_file(str(token_path), config.SCOPES)
             except Exception as e:
-                print(f"⚠️  Error loading token: {e}")
-                print("🔄 Removing invalid token file...")
+                logger.warning("Error loading token, removing invalid token file: %s", e)
                 token_path.unlink(missing_ok=True)
                 creds = None
 
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
                 try:
-                    print("🔄 Refreshing expired token...")
+                    logger.info("Refreshing expired token")
                     creds.refresh(Request())
-                    print("✅ Token refreshed successfully")
+                    logger.info("Token refreshed successfully")
                 except Exception as e:
-                    print(f"❌ Failed to refresh token: {e}")
-                    print("❌ Please run: python3 scripts/auth/auth_final.py")
+                    logger.error("Failed to refresh token (run python3 scripts/auth/auth_final.py): %s", e)
                     raise Exception("Token refresh failed. Run scripts/auth/auth_final.py to generate new token.")
             else:
-                print("❌ No valid token found!")
-                print("❌ Please run: python3 scripts/auth/auth_final.py")
+                logger.error("No valid token found, run python3 scripts/auth/auth_final.py")
                 raise Exception("No token found. Run scripts/auth/auth_final.py to generate token.")
 
             with token_path.open('w', encoding='utf-8') as token:
@@ -93,7 +237,7 @@ class KRSReminderBotV2:
     def _get_calendar_service(self, force_refresh: bool = False):
         """Reuse Google Calendar service object for faster access."""
 
-        now_utc = datetime.datetime.now(datetime.timezone.utc)
+        now_utc = self.clock.now(datetime.timezone.utc)
         if force_refresh or not self.calendar_service or not self.calendar_service_expiry or now_utc >= self.calendar_service_expiry:
             creds = self.authenticate_google_calendar()
             self.calendar_service = build('calendar', 'v3', credentials=creds, cache_discovery=False)
@@ -101,72 +245,66 @@ class KRSReminderBotV2:
 
         return self.calendar_service
 
-    def get_todays_events(self, service):
+    def get_todays_events(self, service) -> List[EventView]:
         """Ambil semua event hari ini dan besok (untuk reminder yang cross-day)"""
-        now = datetime.datetime.now(self.tz)
+        now = self.clock.now(self.tz)
         start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
 
         # Ambil sampai besok untuk cover reminder 5h yang cross-day
         # Contoh: Kuliah Jumat 08:00, reminder 5h = Kamis 03:00
-        end_time = now + datetime.timedelta(hours=36)  # +36 jam dari sekarang
+        end_time = self.sweep_planner.window_end(now)
 
         try:
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=now.isoformat(),  # Dari sekarang
-                timeMax=end_time.isoformat(),  # Sampai 36 jam ke depan
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-
-            events = events_result.get('items', [])
+            # Dari sekarang sampai batas lookahead sweep
+            events = self._list_calendar_events(service, now, end_time)
             self.total_events_checked += len(events)
+            self.last_calendar_events = events
+
+            # Parse once; the scheduler consumes the views directly
+            views = to_event_views(events, self.tz)
 
             # Separate today and tomorrow events for logging
-            today_events = []
-            tomorrow_events = []
             end_of_today = now.replace(hour=23, minute=59, second=59, microsecond=0)
+            timed = [view for view in views if not view.all_day]
+            today_count = sum(1 for view in timed if view.start <= end_of_today)
 
-            for event in events:
-                start_time = event['start'].get('dateTime', None)
-                if start_time:
-                    start_dt = datetime.datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-                    if start_dt.tzinfo is None:
-                        start_dt = self.tz.localize(start_dt)
-                    else:
-                        start_dt = start_dt.astimezone(self.tz)
-
-                    if start_dt <= end_of_today:
-                        today_events.append(event)
-                    else:
-                        tomorrow_events.append(event)
-
-            print(f"✅ Found {len(today_events)} events today, {len(tomorrow_events)} events tomorrow")
-            print(f"   Total to process: {len(events)} events")
-            return events
+            logger.info(
+                "Found %d events today, %d events tomorrow (%d to process)",
+                today_count, len(timed) - today_count, len(events)
+            )
+            return views
         except Exception as e:
-            print(f"❌ Error getting events: {e}")
+            logger.error("Error getting events: %s", e)
+            self.last_calendar_events = None
             return []
 
+    def _list_calendar_events(self, service, time_min: datetime.datetime, time_max: datetime.datetime) -> List[Dict]:
+        """Items of the primary calendar in [time_min, time_max); concurrent identical reads share one request"""
+        def fetch():
+            with track(CALENDAR_REQUEST_SECONDS, CALENDAR_REQUEST_ERRORS, call='events.list'):
+                events_result = service.events().list(
+                    calendarId='primary',
+                    timeMin=time_min.isoformat(),
+                    timeMax=time_max.isoformat(),
+                    singleEvents=True,
+                    orderBy='startTime'
+                ).execute()
+            return events_result.get('items', [])
+
+        key = (id(service), time_min.isoformat(), time_max.isoformat())
+        return self.calendar_flights.do(key, fetch)
+
     def get_weekly_events(self, service):
         """Ambil event untuk 7 hari ke depan"""
-        now = datetime.datetime.now(self.tz)
+        now = self.clock.now(self.tz)
         range_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
         range_end = range_start + datetime.timedelta(days=7)
 
         try:
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=range_start.isoformat(),
-                timeMax=range_end.isoformat(),
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-
-            events = events_result.get('items', [])
+            events = self._list_calendar_events(service, range_start, range_end)
             return events, range_start, range_end
         except Exception as e:
-            print(f"❌ Error getting weekly events: {e}")
+            logger.error("Error getting weekly events: %s", e)
             return [], range_start, range_end
 
     def _escape_html(self, value):
@@ -175,286 +313,57 @@ class KRSReminderBotV2:
         return html.escape(value, quote=False)
 
     def _format_date_id(self, dt):
-        day_names = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
-        month_names = [
-            'Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
-            'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember'
-        ]
-        return f"{day_names[dt.weekday()]}, {dt.day:02d} {month_names[dt.month - 1]} {dt.year}"
+        return format_date_id(dt)
 
     def _format_time_id(self, dt):
         return dt.strftime('%H:%M')
 
     def _format_short_date(self, dt):
-        month_short = [
-            'Jan', 'Feb', 'Mar', 'Apr', 'Mei', 'Jun',
-            'Jul', 'Agu', 'Sep', 'Okt', 'Nov', 'Des'
-        ]
-        day_short = ['Sen', 'Sel', 'Rab', 'Kam', 'Jum', 'Sab', 'Min']
-        return f"{day_short[dt.weekday()]} {dt.day:02d} {month_short[dt.month - 1]}"
+        return format_short_date(dt)
 
-    def _extract_facilitator(self, description: str) -> Optional[str]:
-        if not description:
-            return None
-
-        patterns = [
-            r'dosen\s*[:\-]\s*(.+)',
-            r'pengajar\s*[:\-]\s*(.+)',
-            r'instructor\s*[:\-]\s*(.+)',
-            r'speaker\s*[:\-]\s*(.+)'
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, description, flags=re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-        return None
-
-    def _extract_description_highlights(self, description: str, limit: int = 2) -> List[str]:
-        if not description:
-            return []
-
-        raw_lines = [line.strip() for line in description.split('\n') if line.strip()]
-        highlights: List[str] = []
-
-        for line in raw_lines:
-            clean_line = re.sub(r'^[•\-\d\)\.\s]+', '', line)
-            if not clean_line:
-                continue
-            lower = clean_line.lower()
-            if lower.startswith(('dosen', 'pengajar', 'instructor', 'speaker')):
-                continue
-            highlights.append(clean_line)
-            if len(highlights) >= limit:
-                break
-
-        return highlights
-
-    def _infer_class_profile(self, summary: str, location: str, description: str) -> Dict[str, str]:
-        base_text = ' '.join(filter(None, [summary, location, description])).lower()
-
-        if any(keyword in base_text for keyword in ['praktikum', 'laboratorium', 'lab ', 'lab.']):
-            category_icon = '🔬'
-            category_label = 'Praktikum'
-        elif any(keyword in base_text for keyword in ['seminar', 'kuliah tamu', 'guest lecture']):
-            category_icon = '🎤'
-            category_label = 'Seminar'
-        elif any(keyword in base_text for keyword in ['workshop', 'project', 'studio']):
-            category_icon = '🛠️'
-            category_label = 'Workshop / Studio'
-        elif any(keyword in base_text for keyword in ['ujian', 'evaluasi', 'quiz']):
-            category_icon = '📝'
-            category_label = 'Evaluasi / Ujian'
-        else:
-            category_icon = '🏛️'
-            category_label = 'Kuliah Teori'
-
-        if any(keyword in base_text for keyword in ['zoom', 'teams', 'online', 'daring', 'virtual']):
-            delivery_icon = '🌐'
-            delivery_label = 'Sesi Daring'
-        else:
-            delivery_icon = '🏫'
-            delivery_label = 'Sesi Tatap Muka'
-
-        return {
-            'category_icon': category_icon,
-            'category_label': category_label,
-            'delivery_icon': delivery_icon,
-            'delivery_label': delivery_label
-        }
-
-    def _get_reminder_theme(self, hours_before: Optional[int]) -> Dict[str, object]:
-        if hours_before is None:
-            return {
-                'headline': '🔔 <b>KULIAH DIMULAI SEKARANG</b>',
-                'tagline': 'Sesi telah dibuka — fokus penuh di kelas dan catat poin penting.',
-                'checklist_title': 'Fokus Di Kelas',
-                'checklist': [
-                    'Lakukan absensi di awal sesi',
-                    'Aktif dalam diskusi dan tanya jawab',
-                    'Catat insight utama langsung di laptop/notes'
-                ],
-                'cta': '🎯 Tetap engaged dan follow up setelah kelas'
-            }
-        if hours_before >= 5:
-            return {
-                'headline': '🟢 <b>PREP MODE • 5 JAM LAGI</b>',
-                'tagline': 'Waktu longgar — persiapkan materi dan kebutuhan logistik dari sekarang.',
-                'checklist_title': 'Modal Awal',
-                'checklist': [
-                    'Review silabus & catatan pekan lalu',
-                    'Pastikan transport & outfit sudah siap',
-                    'Sync jadwal dengan teman satu kelas'
-                ],
-                'cta': '💡 Semakin siap sekarang, semakin tenang nanti'
-            }
-        if hours_before >= 3:
-            return {
-                'headline': '🟡 <b>FOCUS MODE • 3 JAM LAGI</b>',
-                'tagline': 'Masuk fase belajar inti — review materi dan susun pertanyaan.',
-                'checklist_title': 'Perdalam Materi',
-                'checklist': [
-                    'Highlight konsep penting & rumus kunci',
-                    'Rangkum pertanyaan untuk dosen',
-                    'Update progress kelompok bila ada proyek'
-                ],
-                'cta': '📝 Mantapkan pemahaman sebelum sesi dimulai'
-            }
-        if hours_before >= 2:
-            return {
-                'headline': '🟠 <b>SET MODE • 2 JAM LAGI</b>',
-                'tagline': 'Final gear check — siap-siapkan perangkat dan file pendukung.',
-                'checklist_title': 'Persiapan Teknis',
-                'checklist': [
-                    'Charge laptop & perangkat pendukung',
-                    'Unduh materi/slide terbaru dari LMS',
-                    'Konfirmasi lokasi kelas & akses gedung'
-                ],
-                'cta': '📦 Lengkapi perlengkapan sebelum berangkat'
-            }
-        return {
-            'headline': '🔴 <b>RUSH MODE • 1 JAM LAGI</b>',
-            'tagline': 'Hitung mundur final — waktunya berangkat dan hindari keterlambatan.',
-            'checklist_title': 'Prioritas Sekarang',
-            'checklist': [
-                'Berangkat menuju kampus/ruang kelas',
-                'Pastikan baterai perangkat aman',
-                'Info kelompok jika ada perubahan'
-            ],
-            'cta': '🚀 Bergerak sekarang untuk tiba tepat waktu'
-        }
+    def _get_reminder_theme(self, hours_before: Optional[int]) -> Mapping[str, object]:
+        return reminder_theme(hours_before)
 
     def _build_quick_command_footer(self):
-        return '🔁 /start • /jadwal • /stats'
+        return QUICK_COMMAND_FOOTER
 
     def _get_week_number(self, date_obj: datetime.datetime) -> int:
-        """
-        Get week number relative to semester start date.
-        Semester starts: September 29, 2025 (Week 1 = VA)
-        """
-        # Semester start date: September 29, 2025
-        semester_start = datetime.datetime(2025, 9, 29, 0, 0, 0, tzinfo=self.tz)
-
-        # Calculate days since semester start
-        days_diff = (date_obj.date() - semester_start.date()).days
-
-        # Calculate week number (1-based)
-        # Week 1 = Sept 29 - Oct 5
-        # Week 2 = Oct 6 - Oct 12
-        # etc.
-        week_num = (days_diff // 7) + 1
-
-        return max(1, week_num)  # Ensure at least week 1
+        """Week number within the semester (Week 1 = first week of the semester)"""
+        return self.semester_calendar.week_number(date_obj)
 
     def _is_va_week(self, date_obj: datetime.datetime) -> bool:
         """
         Determine if the given date is in a VA (Virtual Attendance) week.
-        VA = Odd weeks (1, 3, 5, 7, 9, 11, 13, 15) = Online classes
-        VB = Even weeks (2, 4, 6, 8, 10, 12, 14, 16) = Onsite classes
+        VA = Odd teaching weeks = Online classes
+        VB = Even teaching weeks = Onsite classes
 
-        Week 1 (starting Sept 29, 2025) = VA = Online
+        Break weeks (UTS/UAS) configured in the semester calendar are neither.
         """
-        week_num = self._get_week_number(date_obj)
-        return week_num % 2 == 1  # Odd week = VA
+        return self.semester_calendar.is_va_week(date_obj)
 
     def _get_week_start_end(self, date_obj: datetime.datetime) -> tuple:
         """Get the start and end dates for the week containing date_obj"""
-        week_num = self._get_week_number(date_obj)
-        semester_start = datetime.datetime(2025, 9, 29, 0, 0, 0, tzinfo=self.tz)
-
-        # Calculate week start (Monday)
-        week_start = semester_start + datetime.timedelta(days=(week_num - 1) * 7)
-        week_end = week_start + datetime.timedelta(days=6)
-
-        return (week_start, week_end)
+        week_start, week_end = self.semester_calendar.week_range(date_obj)
+        return (
+            self.tz.localize(datetime.datetime.combine(week_start, datetime.time())),
+            self.tz.localize(datetime.datetime.combine(week_end, datetime.time())),
+        )
 
-    def _get_va_vb_status(self, date_obj: datetime.datetime) -> dict:
+    def _get_va_vb_status(self, date_obj: datetime.datetime):
         """
         Get VA/VB status for a given date.
-        Returns dict with: is_va, week_type, week_num, icon, label, description, detailed_info
+        Returns a shared read-only mapping with: is_va, week_type, week_num, icon,
+        label, description, detailed_header, detailed_info, week_start, week_end
         """
-        is_va = self._is_va_week(date_obj)
-        week_num = self._get_week_number(date_obj)
-        week_start, week_end = self._get_week_start_end(date_obj)
-
-        # Format date range
-        date_range = f"{week_start.strftime('%d %b')} - {week_end.strftime('%d %b %Y')}"
-
-        if is_va:
-            return {
-                'is_va': True,
-                'week_type': 'VA',
-                'week_num': week_num,
-                'icon': '🏠',
-                'label': 'Online - Minggu VA',
-                'description': 'Semua kelas online (tidak ada tatap muka)',
-                'detailed_header': '🏠 MINGGU VA - KELAS ONLINE',
-                'detailed_info': [
-                    f'📅 Minggu ke-{week_num} ({date_range})',
-                    '💻 Semua kelas dilaksanakan secara ONLINE',
-                    '⚠️ TIDAK ADA tatap muka di kampus minggu ini',
-                    '🏠 Kuliah dari rumah'
-                ]
-            }
-        else:
-            return {
-                'is_va': False,
-                'week_type': 'VB',
-                'week_num': week_num,
-                'icon': '🏫',
-                'label': 'Tatap Muka - Minggu VB',
-                'description': 'Semua kelas dilaksanakan tatap muka',
-                'detailed_header': '🏫 MINGGU VB - TATAP MUKA',
-                'detailed_info': [
-                    f'📅 Minggu ke-{week_num} ({date_range})',
-                    '🏫 Semua kelas dilaksanakan TATAP MUKA di kampus',
-                    '✅ Hadir ke lokasi sesuai jadwal',
-                    '📍 Cek lokasi ruangan di jadwal'
-                ]
-            }
+        return self.semester_calendar.status(date_obj)
 
     def _create_main_menu_keyboard(self):
-        """Create main menu inline keyboard"""
-        return {
-            'inline_keyboard': [
-                [
-                    {'text': '📅 Lihat Jadwal - Mingguan', 'callback_data': 'jadwal_weekly'}
-                ],
-                [
-                    {'text': '📆 Lihat Jadwal - Harian', 'callback_data': 'jadwal_daily_menu'}
-                ],
-                [
-                    {'text': '📊 Stats', 'callback_data': 'stats'}
-                ]
-            ]
-        }
+        """Main menu inline keyboard (shared, pre-serialized)"""
+        return MAIN_MENU_KEYBOARD
 
     def _create_daily_menu_keyboard(self):
-        """Create daily schedule menu with day buttons"""
-        days = [
-            ('Senin', 'day_monday'),
-            ('Selasa', 'day_tuesday'),
-            ('Rabu', 'day_wednesday'),
-            ('Kamis', 'day_thursday'),
-            ('Jumat', 'day_friday'),
-            ('Sabtu', 'day_saturday'),
-            ('Minggu', 'day_sunday')
-        ]
-
-        keyboard = []
-        # Add days in rows of 2
-        for i in range(0, len(days), 2):
-            row = []
-            for j in range(2):
-                if i + j < len(days):
-                    day_name, callback = days[i + j]
-                    row.append({'text': day_name, 'callback_data': callback})
-            keyboard.append(row)
-
-        # Add back button
-        keyboard.append([{'text': '🔙 Kembali ke Menu', 'callback_data': 'back_to_main'}])
-
-        return {'inline_keyboard': keyboard}
+        """Daily schedule menu with day buttons (shared, pre-serialized)"""
+        return DAILY_MENU_KEYBOARD
 
     def format_daily_schedule_message(self, events, target_date: datetime.datetime):
         """Format pesan jadwal harian untuk hari tertentu"""
@@ -463,58 +372,20 @@ class KRSReminderBotV2:
         # Get VA/VB status for the target date
         va_vb_status = self._get_va_vb_status(target_date)
 
-        # Build detailed VA/VB info
-        detailed_info = '\n'.join(va_vb_status['detailed_info'])
-
         header = [
             f"📆 <b>JADWAL {day_name_id.upper()}</b>",
             "",
             f"<b>{va_vb_status['detailed_header']}</b>",
-            detailed_info,
+            va_vb_status['detailed_text'],
             ""
         ]
 
         # Filter events for the target date
         target_date_only = target_date.date()
-        day_events = []
-
-        for event in events:
-            start_info = event.get('start', {})
-            start_raw = start_info.get('dateTime') or start_info.get('date')
-
-            if not start_raw:
-                continue
-
-            is_all_day = 'date' in start_info
-
-            if 'T' in start_raw:
-                start_dt = datetime.datetime.fromisoformat(start_raw.replace('Z', '+00:00'))
-                if start_dt.tzinfo is None:
-                    start_dt = self.tz.localize(start_dt)
-                else:
-                    start_dt = start_dt.astimezone(self.tz)
-            else:
-                start_dt = datetime.datetime.fromisoformat(start_raw)
-                start_dt = self.tz.localize(start_dt)
-
-            if start_dt.date() == target_date_only:
-                end_info = event.get('end', {})
-                end_raw = end_info.get('dateTime') or end_info.get('date')
-
-                if end_raw:
-                    if 'T' in end_raw:
-                        end_dt = datetime.datetime.fromisoformat(end_raw.replace('Z', '+00:00'))
-                        if end_dt.tzinfo is None:
-                            end_dt = self.tz.localize(end_dt)
-                        else:
-                            end_dt = end_dt.astimezone(self.tz)
-                    else:
-                        end_dt = datetime.datetime.fromisoformat(end_raw)
-                        end_dt = self.tz.localize(end_dt)
-                else:
-                    end_dt = start_dt
-
-                day_events.append((start_dt, end_dt, event, is_all_day))
+        day_events = [
+            view for view in to_event_views(events, self.tz)
+            if view.start.date() == target_date_only
+        ]
 
         if not day_events:
             header.extend([
@@ -525,36 +396,22 @@ class KRSReminderBotV2:
             return '\n'.join(header).strip()
 
         # Sort events by time
-        day_events.sort(key=lambda x: x[0])
+        day_events.sort(key=lambda view: view.start)
 
         message_lines = header.copy()
 
-        for start_dt, end_dt, event, is_all_day in day_events:
-            summary_raw = event.get('summary', 'Kuliah')
-            summary = self._escape_html(summary_raw)
-            location_raw = event.get('location', '').strip()
-            location = self._escape_html(location_raw)
-
-            description = event.get('description', '') or ''
-            facilitator = self._extract_facilitator(description)
-            class_profile = self._infer_class_profile(summary_raw, location_raw, description)
-
-            if is_all_day:
-                time_info = 'Sepanjang hari'
-            else:
-                time_info = f"{self._format_time_id(start_dt)}—{self._format_time_id(end_dt)}"
-
+        for view in day_events:
             # Modern card-style layout
-            message_lines.append(f"⏰ <b>{time_info}</b>")
-            message_lines.append(f"📚 {summary}")
+            message_lines.append(f"⏰ <b>{view.time_range}</b>")
+            message_lines.append(f"📚 {view.summary}")
 
-            if location:
-                message_lines.append(f"📍 {location}")
+            if view.location:
+                message_lines.append(f"📍 {view.location}")
 
-            if facilitator:
-                message_lines.append(f"👤 {self._escape_html(facilitator)}")
+            if view.facilitator:
+                message_lines.append(f"👤 {self._escape_html(view.facilitator)}")
 
-            message_lines.append(f"{class_profile['category_icon']} {class_profile['category_label']}")
+            message_lines.append(f"{view.profile['category_icon']} {view.profile['category_label']}")
             message_lines.append('')  # Spacing between events
 
         message_lines.extend(['━━━━━━━━━━━━━━━━━━━', '', self._build_quick_command_footer()])
@@ -563,15 +420,16 @@ class KRSReminderBotV2:
 
     def format_weekly_schedule_message(self, events, range_start, range_end):
         """Format pesan jadwal mingguan - Mobile-first, modern design"""
+        return list(self.iter_weekly_schedule_sections(events, range_start, range_end))
+
+    def iter_weekly_schedule_sections(self, events, range_start, range_end) -> Iterator[str]:
+        """Yield weekly schedule sections as soon as each one is complete"""
         display_end = range_end - datetime.timedelta(days=1)
 
         # Get VA/VB status for the current week
-        now = datetime.datetime.now(self.tz)
+        now = self.clock.now(self.tz)
         va_vb_status = self._get_va_vb_status(now)
 
-        # Build detailed VA/VB info
-        detailed_info = '\n'.join(va_vb_status['detailed_info'])
-
         header = [
             "📅 <b>JADWAL MINGGUAN</b>",
             "",
@@ -579,7 +437,7 @@ class KRSReminderBotV2:
             f"🌍 {config.TIMEZONE}",
             "",
             f"<b>{va_vb_status['detailed_header']}</b>",
-            detailed_info,
+            va_vb_status['detailed_text'],
             ""
         ]
 
@@ -589,180 +447,86 @@ class KRSReminderBotV2:
                 "",
                 self._build_quick_command_footer()
             ])
-            return ['\n'.join(header).strip()]
+            yield '\n'.join(header).strip()
+            return
 
         events_by_date = {}
 
-        for event in events:
-            start_info = event.get('start', {})
-            end_info = event.get('end', {})
+        for view in to_event_views(events, self.tz):
+            events_by_date.setdefault(view.start.date(), []).append(view)
 
-            start_raw = start_info.get('dateTime') or start_info.get('date')
-            end_raw = end_info.get('dateTime') or end_info.get('date')
+        def blocks():
+            for event_date in sorted(events_by_date.keys()):
+                day_dt = datetime.datetime.combine(event_date, datetime.time())
+                day_header = ['', f"━━━ <b>{self._format_date_id(day_dt)}</b> ━━━", '']
 
-            if not start_raw:
-                continue
+                day_events = sorted(events_by_date[event_date], key=lambda view: view.start)
 
-            is_all_day = 'date' in start_info
+                for view in day_events:
+                    # Modern card-style layout
+                    lines = [
+                        f"⏰ <b>{view.time_range}</b>",
+                        f"📚 {view.summary}"
+                    ]
 
-            if 'T' in start_raw:
-                start_dt = datetime.datetime.fromisoformat(start_raw.replace('Z', '+00:00'))
-                if start_dt.tzinfo is None:
-                    start_dt = self.tz.localize(start_dt)
-                else:
-                    start_dt = start_dt.astimezone(self.tz)
-            else:
-                start_dt = datetime.datetime.fromisoformat(start_raw)
-                start_dt = self.tz.localize(start_dt)
-
-            if end_raw:
-                if 'T' in end_raw:
-                    end_dt = datetime.datetime.fromisoformat(end_raw.replace('Z', '+00:00'))
-                    if end_dt.tzinfo is None:
-                        end_dt = self.tz.localize(end_dt)
-                    else:
-                        end_dt = end_dt.astimezone(self.tz)
-                else:
-                    end_dt = datetime.datetime.fromisoformat(end_raw)
-                    end_dt = self.tz.localize(end_dt)
-            else:
-                end_dt = start_dt
-
-            event_date = start_dt.date()
-            events_by_date.setdefault(event_date, []).append((start_dt, end_dt, event, is_all_day))
-
-        max_len = 3500
-        continuation_header = ["🗓️ <b>JADWAL (LANJUTAN)</b>"]
-        sections = []
-        current_lines = header.copy()
+                    if view.location:
+                        lines.append(f"📍 {view.location}")
 
-        def flush_current():
-            if current_lines:
-                sections.append('\n'.join(current_lines).strip())
+                    if view.facilitator:
+                        lines.append(f"👤 {self._escape_html(view.facilitator)}")
 
-        def reset_to(header_lines):
-            nonlocal current_lines
-            current_lines = header_lines.copy()
-
-        def add_line(line: str):
-            nonlocal current_lines
-            if line == '' and not current_lines:
-                return
-            candidate = '\n'.join(current_lines + [line])
-            if len(candidate) > max_len:
-                flush_current()
-                reset_to(continuation_header)
-                if line == '':
-                    return
-                candidate = '\n'.join(current_lines + [line])
-                if len(candidate) > max_len:
-                    # if single line still too long, truncate gracefully
-                    chunks = [segment.strip() for segment in line.split('\n') if segment.strip()]
-                    for chunk in chunks:
-                        add_line(chunk)
-                    return
-            current_lines.append(line)
+                    lines.append(f"{view.profile['category_icon']} {view.profile['category_label']}")
+                    lines.append('')  # Spacing between events
 
-        def add_lines(lines):
-            for line in lines:
-                add_line(line)
+                    # Keep the day header together with its first class
+                    yield day_header + lines
+                    day_header = []
 
-        for event_date in sorted(events_by_date.keys()):
-            day_dt = datetime.datetime.combine(event_date, datetime.time())
-            add_lines(['', f"━━━ <b>{self._format_date_id(day_dt)}</b> ━━━", ''])
+            yield ['', '━━━━━━━━━━━━━━━━━━━', '', self._build_quick_command_footer()]
 
-            day_events = sorted(events_by_date[event_date], key=lambda item: item[0])
-
-            for start_dt, end_dt, event, is_all_day in day_events:
-                summary_raw = event.get('summary', 'Kuliah')
-                summary = self._escape_html(summary_raw)
-                location_raw = event.get('location', '').strip()
-                location = self._escape_html(location_raw)
-
-                description = event.get('description', '') or ''
-                facilitator = self._extract_facilitator(description)
-                class_profile = self._infer_class_profile(summary_raw, location_raw, description)
-                highlights = self._extract_description_highlights(description, limit=1)
-                if facilitator and highlights:
-                    highlights = [h for h in highlights if facilitator.lower() not in h.lower()]
-
-                if is_all_day:
-                    time_info = 'Sepanjang hari'
-                else:
-                    time_info = f"{self._format_time_id(start_dt)}—{self._format_time_id(end_dt)}"
-
-                # Modern card-style layout
-                add_line(f"⏰ <b>{time_info}</b>")
-                add_line(f"📚 {summary}")
-
-                if location:
-                    add_line(f"📍 {location}")
-
-                if facilitator:
-                    add_line(f"👤 {self._escape_html(facilitator)}")
-
-                add_line(f"{class_profile['category_icon']} {class_profile['category_label']}")
-
-                add_line('')  # Spacing between events
-
-        add_lines(['', '━━━━━━━━━━━━━━━━━━━', '', self._build_quick_command_footer()])
-        flush_current()
-
-        return sections
+        yield from chunk_blocks(blocks(), header, ["🗓️ <b>JADWAL (LANJUTAN)</b>"])
 
     def format_reminder_message(self, event, hours_before=None):
         """Format pesan reminder - Mobile-first, modern design"""
-        start_time = event['start'].get('dateTime', event['start'].get('date'))
-        if 'T' in start_time:
-            start_dt = datetime.datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-            if start_dt.tzinfo is None:
-                start_dt = self.tz.localize(start_dt)
-            else:
-                start_dt = start_dt.astimezone(self.tz)
-        else:
-            start_dt = datetime.datetime.fromisoformat(start_time)
-            start_dt = self.tz.localize(start_dt)
+        template = self.get_reminder_template(event, hours_before)
+        return template.render(self.clock.now(self.tz))
+
+    def get_reminder_template(self, event, hours_before=None) -> ReminderTemplate:
+        """Cached reminder template for an event (raw or EventView) and reminder slot"""
+        view = as_event_view(event, self.tz)
+        key = (view.fingerprint, reminder_slot(hours_before))
+        return self.reminder_cache.get_or_render(
+            key,
+            lambda: self._render_reminder_template(view, hours_before)
+        )
 
-        summary_raw = event.get('summary', 'Kuliah')
-        summary = self._escape_html(summary_raw)
-        location_raw = event.get('location', '') or 'Lokasi belum ditentukan'
-        location = self._escape_html(location_raw)
-        description_raw = event.get('description', '') or ''
+    def _render_reminder_template(self, view: EventView, hours_before=None) -> ReminderTemplate:
+        """Render the reminder with a placeholder for the countdown"""
+        start_dt = view.start
+        summary = view.summary
+        location = view.location or 'Lokasi belum ditentukan'
 
         theme = self._get_reminder_theme(hours_before)
 
         time_str = f"{self._format_time_id(start_dt)} WIB"
         date_str = self._format_date_id(start_dt)
 
-        now = datetime.datetime.now(self.tz)
-        time_diff = start_dt - now
-
-        if time_diff.total_seconds() > 0:
-            hours_left = int(time_diff.total_seconds() // 3600)
-            minutes_left = int((time_diff.total_seconds() % 3600) // 60)
-            countdown = f"{hours_left}j {minutes_left}m"
-        else:
-            countdown = "Dimulai sekarang!"
-
-        class_profile = self._infer_class_profile(summary_raw, location_raw, description_raw)
-        facilitator = self._extract_facilitator(description_raw)
-
         # Modern card-style reminder
         message_lines = [
             theme['headline'],
             "",
             f"📚 <b>{summary}</b>",
-            f"{class_profile['category_icon']} {class_profile['category_label']}",
+            f"{view.profile['category_icon']} {view.profile['category_label']}",
             "",
             f"⏰ {time_str}",
             f"📅 {date_str}",
-            f"⏳ <b>{countdown}</b>",
+            f"⏳ <b>{COUNTDOWN_MARKER}</b>",
             "",
             f"📍 {location}"
         ]
 
-        if facilitator:
-            message_lines.append(f"👤 {self._escape_html(facilitator)}")
+        if view.facilitator:
+            message_lines.append(f"👤 {self._escape_html(view.facilitator)}")
 
         # Action items - cleaner format
         message_lines.extend([
@@ -780,11 +544,44 @@ class KRSReminderBotV2:
             self._build_quick_command_footer()
         ])
 
-        return '\n'.join(message_lines).strip()
+        compact_lines = [
+            theme['headline'],
+            f"📚 <b>{summary}</b>",
+            f"⏰ {time_str} • ⏳ <b>{COUNTDOWN_MARKER}</b>",
+            f"📍 {location}"
+        ]
+
+        return ReminderTemplate('\n'.join(message_lines).strip(), start_dt, '\n'.join(compact_lines))
 
     def send_telegram_message(self, message, *, chat_id=None, reply_markup=None, count_as_reminder=True):
-        """Kirim pesan ke Telegram"""
-        url = f"https://api.telegram.org/bot{config.TELEGRAM_BOT_TOKEN}/sendMessage"
+        """Kirim pesan ke Telegram (dipecah otomatis jika melebihi batas Telegram)"""
+        parts = split_message(message)
+        if len(parts) > 1:
+            logger.info("Splitting long message into %d parts", len(parts))
+            results = [
+                self._post_telegram_message(
+                    part,
+                    chat_id=chat_id,
+                    reply_markup=reply_markup if index == len(parts) - 1 else None,
+                    count_as_reminder=count_as_reminder
+                )
+                for index, part in enumerate(parts)
+            ]
+            return all(results)
+        return self._post_telegram_message(
+            message, chat_id=chat_id, reply_markup=reply_markup, count_as_reminder=count_as_reminder
+        )
+
+    def _telegram_request(self, http_method: str, api_method: str, **kwargs):
+        """Call the Bot API, recording latency and failures per API method"""
+        url = f"https://api.telegram.org/bot{config.TELEGRAM_BOT_TOKEN}/{api_method}"
+        with track(TELEGRAM_REQUEST_SECONDS, TELEGRAM_REQUEST_ERRORS, method=api_method):
+            response = getattr(self.http_session, http_method)(url, **kwargs)
+        if response.status_code != 200:
+            TELEGRAM_REQUEST_ERRORS.inc(method=api_method)
+        return response
+
+    def _post_telegram_message(self, message, *, chat_id=None, reply_markup=None, count_as_reminder=True):
         payload = {
             'chat_id': str(chat_id or config.CHAT_ID),
             'text': message,
@@ -792,50 +589,71 @@ class KRSReminderBotV2:
         }
 
         if reply_markup:
-            payload['reply_markup'] = json.dumps(reply_markup)
+            payload['reply_markup'] = serialize_markup(reply_markup)
 
         try:
-            response = self.http_session.post(
-                url,
+            response = self._telegram_request(
+                'post',
+                'sendMessage',
                 data=payload,
                 timeout=config.TELEGRAM_REQUEST_TIMEOUT
             )
             if response.status_code == 200:
                 if count_as_reminder:
                     self.total_reminders_sent += 1
-                print(f"✅ Message sent to Telegram")
+                logger.debug("Message sent to Telegram")
                 return True
             else:
-                print(f"❌ Failed: {response.text}")
+                logger.error("sendMessage failed: %s", response.text)
                 return False
         except requests.RequestException as e:
-            print(f"❌ Error: {e}")
+            logger.error("sendMessage error: %s", e)
             return False
 
+    def _collect_scheduler_metrics(self) -> Dict:
+        """Scheduler figures recorded by the metrics sampler"""
+        now = self.clock.now(self.tz)
+        jobs = self.scheduler.get_jobs()
+        next_runs = [job.next_run_time for job in jobs if job.next_run_time]
+        return {
+            'jobs': len(jobs),
+            'pending_jobs': len([run for run in next_runs if run > now]),
+            'next_run': min(next_runs) if next_runs else None,
+            'queue_depth': self.coalescer.queue_depth,
+        }
+
     def get_stats_message(self):
         """Generate stats message"""
-        now = datetime.datetime.now(self.tz)
+        now = self.clock.now(self.tz)
         uptime = now - self.start_time
 
-        # System stats
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        memory_percent = memory.percent
-        process = psutil.Process()
-
-        # Scheduler stats
-        jobs = self.scheduler.get_jobs()
-        pending_jobs = len([j for j in jobs if j.next_run_time and j.next_run_time > now])
+        # System and scheduler stats from the background sampler (no blocking)
+        sample = self.metrics.snapshot()
+        cpu_1m = self.metrics.average('cpu_percent', 60)
+        cpu_5m = self.metrics.average('cpu_percent', 300)
+        cpu_trend = f" (1m {cpu_1m:.0f}%, 5m {cpu_5m:.0f}%)" if cpu_1m is not None and cpu_5m is not None else ''
 
-        next_runs = [job.next_run_time.astimezone(self.tz) for job in jobs if job.next_run_time]
-        if next_runs:
-            next_run = min(next_runs)
+        if sample.next_run:
+            next_run = sample.next_run.astimezone(self.tz)
             next_delta = next_run - now
             next_in = f"{int(next_delta.total_seconds() // 60)} menit" if next_delta.total_seconds() > 60 else "< 1 menit"
             next_run_info = f"{next_run.strftime('%Y-%m-%d %H:%M:%S')} ({next_in})"
         else:
             next_run_info = 'Belum ada jadwal aktif'
 
+        if self.next_sweep_time:
+            sweep_delta = max(0, int((self.next_sweep_time - now).total_seconds() // 60))
+            next_sweep_info = f"{self.next_sweep_time.astimezone(self.tz).strftime('%H:%M')} ({sweep_delta} menit)"
+        else:
+            next_sweep_info = f"adaptif {config.SWEEP_MIN_MINUTES}–{config.SWEEP_MAX_MINUTES} menit"
+
+        report = self.last_sweep_report
+        if report:
+            failed = len(report.failures) + len(report.timeouts)
+            sweep_info = f"{report.users} user, {failed} gagal, {report.duration * 1000:.0f} ms"
+        else:
+            sweep_info = 'Belum ada'
+
         uptime_hours = uptime.seconds // 3600
         uptime_minutes = (uptime.seconds // 60) % 60
 
@@ -850,21 +668,27 @@ class KRSReminderBotV2:
             '━━━━━━━━━━━━━━━━━━━',
             '',
             '<b>🤖 Status</b>',
-            f'  Jobs aktif: {len(jobs)}',
+            f'  Jobs aktif: {sample.jobs}',
             f'  Reminder terkirim: {self.total_reminders_sent}',
-            f'  Jobs pending: {pending_jobs}',
+            f'  Reminder digabung: {self.coalescer.merged}',
+            f'  Render dibagi: {self.dedup_stats.ratio:.1f}x',
+            f'  Cache jadwal: {self.schedule_cache.hits} hit, {self.schedule_cache.misses} miss '
+            f'({self.schedule_cache.bytes // 1024} KB)',
+            f'  Jobs pending: {sample.pending_jobs}',
+            f'  Antrian reminder: {sample.queue_depth}',
             '',
             '<b>⏰ Reminder Berikutnya</b>',
             f'  {next_run_info}',
             '',
             '<b>💻 Resource</b>',
-            f'  CPU: {cpu_percent}%',
-            f'  Memory: {memory_percent}%',
-            f'  Process: {process.memory_info().rss // (1024**2)} MB',
+            f'  CPU: {sample.cpu_percent}%{cpu_trend}',
+            f'  Memory: {sample.memory_percent}%',
+            f'  Process: {sample.rss_bytes // (1024**2)} MB',
             '',
             '<b>⚙️ Konfigurasi</b>',
             f'  Interval: {reminder_config}',
-            f'  Cek kalender: {config.CHECK_INTERVAL_MINUTES} menit',
+            f'  Cek kalender: {next_sweep_info}',
+            f'  Sweep terakhir: {sweep_info}',
             f'  Timezone: {config.TIMEZONE}',
             '',
             '<b>🔗 Koneksi</b>',
@@ -880,15 +704,14 @@ class KRSReminderBotV2:
 
     def answer_callback_query(self, callback_query_id, text=None):
         """Answer a callback query to remove the loading state"""
-        url = f"https://api.telegram.org/bot{config.TELEGRAM_BOT_TOKEN}/answerCallbackQuery"
         payload = {'callback_query_id': callback_query_id}
         if text:
             payload['text'] = text
 
         try:
-            self.http_session.post(url, data=payload, timeout=5)
+            self._telegram_request('post', 'answerCallbackQuery', data=payload, timeout=5)
         except Exception as e:
-            print(f"⚠️  Failed to answer callback query: {e}")
+            logger.warning("Failed to answer callback query: %s", e)
 
     def handle_callback_query(self, callback_query):
         """Handle inline keyboard button clicks"""
@@ -901,7 +724,7 @@ class KRSReminderBotV2:
         if not chat_id:
             return
 
-        print(f"🔘 Callback received: {data} from {chat_id}")
+        logger.info("Callback received: %s from %s", data, chat_id)
 
         # Answer the callback query immediately to remove loading state
         self.answer_callback_query(callback_id)
@@ -934,17 +757,13 @@ class KRSReminderBotV2:
         try:
             if data == 'jadwal_weekly':
                 # Show weekly schedule
-                print(f"📅 Weekly schedule requested from {chat_id}")
+                logger.info("Weekly schedule requested from %s", chat_id)
 
                 # Use multi-user database if enabled
                 if self.multi_user_enabled and self.cmd_handler:
-                    success, msg, events = self.cmd_handler.handle_jadwal_multiuser(chat_id)
-                    if success and events:
-                        # Format and send schedule
-                        now = datetime.datetime.now(self.tz)
-                        range_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-                        range_end = range_start + datetime.timedelta(days=7)
-                        schedule_sections = self.format_weekly_schedule_message(events, range_start, range_end)
+                    success, msg, schedule_sections = self.cmd_handler.handle_jadwal_sections(chat_id)
+                    if success and schedule_sections:
+                        # Send (cached) rendered schedule
                         for section in schedule_sections:
                             self.send_telegram_message(
                                 section,
@@ -962,7 +781,7 @@ class KRSReminderBotV2:
                     # Fallback to Google Calendar (legacy mode)
                     service = self._get_calendar_service()
                     events, range_start, range_end = self.get_weekly_events(service)
-                    schedule_sections = self.format_weekly_schedule_message(events, range_start, range_end)
+                    schedule_sections = self.iter_weekly_schedule_sections(events, range_start, range_end)
                     for section in schedule_sections:
                         self.send_telegram_message(
                             section,
@@ -972,33 +791,22 @@ class KRSReminderBotV2:
 
             elif data == 'jadwal_daily_menu':
                 # Show daily menu with day buttons
-                menu_msg = (
-                    "📆 <b>PILIH HARI</b>\n"
-                    "\n"
-                    "Pilih hari untuk melihat jadwal:"
-                )
                 self.send_telegram_message(
-                    menu_msg,
+                    DAILY_MENU_TEXT,
                     chat_id=chat_id,
                     reply_markup=self._create_daily_menu_keyboard(),
                     count_as_reminder=False
                 )
 
+                # Day taps of this interaction are answered from the prefetched week
+                if self.multi_user_enabled and self.cmd_handler:
+                    self.cmd_handler.prefetch_week(chat_id)
+
             elif data.startswith('day_'):
                 # Show schedule for specific day
-                day_map = {
-                    'day_monday': 0,
-                    'day_tuesday': 1,
-                    'day_wednesday': 2,
-                    'day_thursday': 3,
-                    'day_friday': 4,
-                    'day_saturday': 5,
-                    'day_sunday': 6
-                }
-
-                day_offset = day_map.get(data)
+                day_offset = DAY_CALLBACKS.get(data)
                 if day_offset is not None:
-                    now = datetime.datetime.now(self.tz)
+                    now = self.clock.now(self.tz)
                     # Calculate the target date (next occurrence of that day)
                     current_weekday = now.weekday()
                     days_ahead = (day_offset - current_weekday) % 7
@@ -1008,11 +816,10 @@ class KRSReminderBotV2:
 
                     # Use multi-user database if enabled
                     if self.multi_user_enabled and self.cmd_handler:
-                        success, msg, events = self.cmd_handler.handle_jadwal_multiuser(chat_id)
-                        if success and events:
-                            daily_msg = self.format_daily_schedule_message(events, target_date)
+                        success, msg, sections = self.cmd_handler.handle_jadwal_sections(chat_id, target_date)
+                        if success and sections:
                             self.send_telegram_message(
-                                daily_msg,
+                                sections[0],
                                 chat_id=chat_id,
                                 reply_markup=self._create_daily_menu_keyboard(),
                                 count_as_reminder=False
@@ -1038,7 +845,7 @@ class KRSReminderBotV2:
 
             elif data == 'stats':
                 # Show stats
-                print(f"📊 Stats requested from {chat_id}")
+                logger.info("Stats requested from %s", chat_id)
                 stats_msg = self.get_stats_message()
                 self.send_telegram_message(
                     stats_msg,
@@ -1048,31 +855,16 @@ class KRSReminderBotV2:
 
             elif data == 'back_to_main':
                 # Show main menu
-                now = datetime.datetime.now(self.tz)
-                va_vb_status = self._get_va_vb_status(now)
-
-                # Build detailed VA/VB info
-                detailed_info = '\n'.join(va_vb_status['detailed_info'])
-
-                menu_msg = (
-                    "🏠 <b>MENU UTAMA</b>\n"
-                    "\n"
-                    f"<b>{va_vb_status['detailed_header']}</b>\n"
-                    f"{detailed_info}\n"
-                    "\n"
-                    "━━━━━━━━━━━━━━━━━━━\n"
-                    "\n"
-                    "💡 <b>Pilih menu di bawah ini:</b>"
-                )
+                now = self.clock.now(self.tz)
                 self.send_telegram_message(
-                    menu_msg,
+                    main_menu_message(self._get_va_vb_status(now)),
                     chat_id=chat_id,
                     reply_markup=self._create_main_menu_keyboard(),
                     count_as_reminder=False
                 )
 
         except Exception as e:
-            print(f"❌ Error handling callback {data}: {e}")
+            logger.exception("Error handling callback %s: %s", data, e)
             error_msg = "❌ Terjadi kesalahan. Silakan coba lagi."
             self.send_telegram_message(
                 error_msg,
@@ -1082,7 +874,6 @@ class KRSReminderBotV2:
 
     def check_telegram_updates(self):
         """Check for Telegram commands and callback queries"""
-        url = f"https://api.telegram.org/bot{config.TELEGRAM_BOT_TOKEN}/getUpdates"
         params = {
             'offset': self.last_update_id + 1,
             'timeout': config.TELEGRAM_POLL_TIMEOUT,
@@ -1090,339 +881,593 @@ class KRSReminderBotV2:
         }
 
         try:
-            response = self.http_session.get(
-                url,
+            response = self._telegram_request(
+                'get',
+                'getUpdates',
                 params=params,
                 timeout=config.TELEGRAM_REQUEST_TIMEOUT
             )
             if response.status_code != 200:
-                print(f"❌ Failed to fetch updates: {response.text}")
+                logger.error("Failed to fetch updates: %s", response.text)
                 return
 
             data = response.json()
             if not data.get('ok'):
-                print(f"❌ Telegram API returned error: {data}")
+                logger.error("Telegram API returned error: %s", data)
                 return
 
-            for update in data.get('result', []):
+            updates = data.get('result', [])
+            if updates and self.update_recorder is not None:
+                self.update_recorder.record(updates)
+
+            for index, update in enumerate(updates):
                 self.last_update_id = update['update_id']
+                self.admission.backlog = len(updates) - index
+                self.handle_update(update)
+            self.admission.backlog = 0
+        except requests.Timeout as e:
+            # Timeout is expected with long polling, only log if it's not a read timeout
+            if "Read timed out" not in str(e):
+                logger.warning("Telegram polling timeout: %s", e)
+        except requests.RequestException as e:
+            logger.warning("Telegram polling error: %s", e)
+        except Exception as e:
+            logger.exception("Unexpected error in check_telegram_updates: %s", e)
 
-                # Handle callback queries (button clicks)
-                callback_query = update.get('callback_query')
-                if callback_query:
-                    self.handle_callback_query(callback_query)
-                    continue
+    def _is_repeated_callback(self, update) -> bool:
+        """True (after answering it) if the update repeats a button the chat just pressed"""
+        callback_query = update.get('callback_query')
+        chat_id = update_chat_id(update)
+        if not callback_query or chat_id is None:
+            return False
+        data = callback_query.get('data', '')
+        # A double tap sends the same callback twice; the first one is already being answered
+        if not self.recent_callbacks.is_repeat(chat_id, data):
+            return False
+        CALLBACKS_DEDUPED.inc()
+        logger.info("Ignoring repeated callback %s from %s", data, chat_id)
+        self.answer_callback_query(callback_query.get('id'))
+        return True
+
+    def _admit_update(self, update) -> bool:
+        """Charge an update to its chat's budget; False (after at most one notice) if rejected"""
+        chat_id = update_chat_id(update)
+        if chat_id is None:
+            return True
+        reason, notice = self.admission.admit(chat_id, update_label(update))
+        if reason is None:
+            return True
+
+        UPDATES_REJECTED.inc(reason=reason)
+        if notice:
+            logger.info("Rejecting updates from %s (%s)", chat_id, reason)
+        callback_query = update.get('callback_query')
+        if callback_query:
+            # Clears the button's loading state; the notice is shown as a toast
+            self.answer_callback_query(callback_query.get('id'), notice)
+        elif notice:
+            self.send_telegram_message(notice, chat_id=chat_id, count_as_reminder=False)
+        return False
+
+    def handle_update(self, update):
+        """Dispatch one Telegram update (command message or button click)"""
+        # Repeats are dropped before they are charged to the chat
+        if self._is_repeated_callback(update) or not self._admit_update(update):
+            return
 
-                # Handle regular messages
-                message = update.get('message') or update.get('edited_message')
-                if not message:
-                    continue
+        # Handle callback queries (button clicks)
+        callback_query = update.get('callback_query')
+        if callback_query:
+            self.handle_callback_query(callback_query)
+            return
 
-                text = (message.get('text') or '').strip()
-                if not text:
-                    continue
+        # Handle regular messages
+        message = update.get('message') or update.get('edited_message')
+        if not message:
+            return
 
-                chat = message.get('chat', {})
-                chat_id = chat.get('id')
-                if chat_id is None:
-                    continue
+        text = (message.get('text') or '').strip()
+        if not text:
+            return
 
-                entities = message.get('entities', [])
-                command_text = text
-                if entities:
-                    # Trim to the command entity if Telegram sent metadata
-                    for entity in entities:
-                        if entity.get('type') == 'bot_command':
-                            offset = entity.get('offset', 0)
-                            length = entity.get('length', len(text))
-                            command_text = text[offset:offset + length]
-                            break
-
-                command = command_text.split()[0].lower()
-                if '@' in command:
-                    command = command.split('@', 1)[0]
-
-                if command == '/start':
-                    print(f"👋 Start command received from {chat_id}")
-
-                    # Try multi-user handler first
-                    if self.multi_user_enabled and self.cmd_handler:
-                        welcome_msg = self.cmd_handler.handle_start(chat_id)
-                        if welcome_msg:
-                            # Multi-user mode: use authentication-aware message
-                            self.send_telegram_message(
-                                welcome_msg,
-                                chat_id=chat_id,
-                                reply_markup=self._create_main_menu_keyboard(),
-                                count_as_reminder=False
-                            )
-                            continue
-
-                    # Fallback to single-user mode
-                    # Get VA/VB status for current week
-                    now = datetime.datetime.now(self.tz)
-                    va_vb_status = self._get_va_vb_status(now)
-
-                    # Build detailed VA/VB info
-                    detailed_info = '\n'.join(va_vb_status['detailed_info'])
-
-                    welcome_msg = (
-                        "👋 <b>Selamat Datang!</b>\n"
-                        "\n"
-                        "🎓 <b>KRS Reminder Bot</b>\n"
-                        "Asisten pintar untuk jadwal kuliahmu\n"
-                        "\n"
-                        "━━━━━━━━━━━━━━━━━━━\n"
-                        "\n"
-                        f"<b>{va_vb_status['detailed_header']}</b>\n"
-                        f"{detailed_info}\n"
-                        "\n"
-                        "━━━━━━━━━━━━━━━━━━━\n"
-                        "\n"
-                        "<b>✨ Fitur Utama</b>\n"
-                        "  🔔 Reminder otomatis (5j, 3j, 2j, 1j sebelum)\n"
-                        "  📅 Sinkronisasi Google Calendar\n"
-                        "  ⏰ Notifikasi tepat waktu\n"
-                        "  📊 Monitoring real-time\n"
-                        "\n"
-                        "━━━━━━━━━━━━━━━━━━━\n"
-                        "\n"
-                        "💡 <b>Pilih menu di bawah ini:</b>"
-                    )
+        chat = message.get('chat', {})
+        chat_id = chat.get('id')
+        if chat_id is None:
+            return
+
+        command, command_text = parse_command(text, message.get('entities', []))
+
+        if command == '/start':
+            logger.info("Start command received from %s", chat_id)
+
+            # Try multi-user handler first
+            if self.multi_user_enabled and self.cmd_handler:
+                welcome_msg = self.cmd_handler.handle_start(chat_id)
+                if welcome_msg:
+                    # Multi-user mode: use authentication-aware message
                     self.send_telegram_message(
                         welcome_msg,
                         chat_id=chat_id,
                         reply_markup=self._create_main_menu_keyboard(),
                         count_as_reminder=False
                     )
-                elif command == '/stats':
-                    print(f"📊 Stats command received from {chat_id}")
+                    return
 
-                    # Check authentication in multi-user mode
-                    if self.multi_user_enabled and self.auth:
-                        is_logged_in, user, error_msg = self.auth.require_login(chat_id)
-                        if not is_logged_in:
-                            self.send_telegram_message(
-                                error_msg,
-                                chat_id=chat_id,
-                                count_as_reminder=False
-                            )
-                            continue
+            # Fallback to single-user mode
+            # Get VA/VB status for current week
+            now = self.clock.now(self.tz)
+            welcome_msg = welcome_message(self._get_va_vb_status(now))
+            self.send_telegram_message(
+                welcome_msg,
+                chat_id=chat_id,
+                reply_markup=self._create_main_menu_keyboard(),
+                count_as_reminder=False
+            )
+        elif command == '/stats':
+            logger.info("Stats command received from %s", chat_id)
 
-                    stats_msg = self.get_stats_message()
+            # Check authentication in multi-user mode
+            if self.multi_user_enabled and self.auth:
+                is_logged_in, user, error_msg = self.auth.require_login(chat_id)
+                if not is_logged_in:
                     self.send_telegram_message(
-                        stats_msg,
+                        error_msg,
                         chat_id=chat_id,
                         count_as_reminder=False
                     )
-                elif command == '/jadwal':
-                    print(f"🗓️ Jadwal command received from {chat_id}")
-
-                    # Try multi-user first
-                    if self.multi_user_enabled and self.cmd_handler:
-                        success, msg, events = self.cmd_handler.handle_jadwal_multiuser(chat_id)
-                        if success:
-                            # Use events from database
-                            now = datetime.datetime.now(self.tz)
-                            range_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-                            range_end = range_start + datetime.timedelta(days=7)
-                            schedule_sections = self.format_weekly_schedule_message(events, range_start, range_end)
-                            for section in schedule_sections:
-                                self.send_telegram_message(section, chat_id=chat_id, count_as_reminder=False)
-                        else:
-                            self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
-                    else:
-                        # Fallback to single-user mode
-                        try:
-                            service = self._get_calendar_service()
-                            events, range_start, range_end = self.get_weekly_events(service)
-                            schedule_sections = self.format_weekly_schedule_message(events, range_start, range_end)
-                            for section in schedule_sections:
-                                self.send_telegram_message(section, chat_id=chat_id, count_as_reminder=False)
-                        except Exception as e:
-                            print(f"❌ Error preparing weekly schedule: {e}")
-                            error_msg = "❌ <b>Gagal memuat jadwal.</b>\nSilakan coba lagi nanti."
-                            self.send_telegram_message(error_msg, chat_id=chat_id, count_as_reminder=False)
-
-                # Multi-user commands
-                elif command == '/login':
-                    if self.multi_user_enabled and self.cmd_handler:
-                        # Use full text for argument parsing, not just command_text
-                        msg = self.cmd_handler.handle_login(chat_id, text.split())
-                        self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
-                elif command == '/logout':
-                    if self.multi_user_enabled and self.cmd_handler:
-                        msg = self.cmd_handler.handle_logout(chat_id)
-                        self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
+                    return
 
-                # Admin commands
-                elif command == '/admin_add_user':
-                    if self.multi_user_enabled and self.cmd_handler:
-                        # Use full text for argument parsing, not just command_text
-                        msg = self.cmd_handler.handle_admin_add_user(chat_id, text.split())
-                        self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
-                elif command == '/admin_list_users':
-                    if self.multi_user_enabled and self.cmd_handler:
-                        msg = self.cmd_handler.handle_admin_list_users(chat_id)
-                        self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
-                elif command == '/admin_import_schedule':
-                    if self.multi_user_enabled and self.cmd_handler:
-                        msg = self.cmd_handler.handle_admin_import_schedule(chat_id, command_text.split())
-                        self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
-                elif command == '/admin_delete_user':
-                    if self.multi_user_enabled and self.cmd_handler:
-                        msg = self.cmd_handler.handle_admin_delete_user(chat_id, command_text.split())
-                        self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
+            stats_msg = self.get_stats_message()
+            self.send_telegram_message(
+                stats_msg,
+                chat_id=chat_id,
+                count_as_reminder=False
+            )
+        elif command == '/jadwal':
+            logger.info("Jadwal command received from %s", chat_id)
+
+            # Try multi-user first
+            if self.multi_user_enabled and self.cmd_handler:
+                success, msg, schedule_sections = self.cmd_handler.handle_jadwal_sections(chat_id)
+                if success:
+                    # Rendered from the database, cached per schedule version
+                    for section in schedule_sections:
+                        self.send_telegram_message(section, chat_id=chat_id, count_as_reminder=False)
                 else:
-                    print(f"ℹ️  Unhandled command/text from {chat_id}: {text}")
-        except requests.Timeout as e:
-            # Timeout is expected with long polling, only log if it's not a read timeout
-            if "Read timed out" not in str(e):
-                print(f"⚠️  Telegram polling timeout: {e}")
-        except requests.RequestException as e:
-            print(f"⚠️  Telegram polling error: {e}")
-        except Exception as e:
-            print(f"❌ Unexpected error in check_telegram_updates: {e}")
+                    self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
+            else:
+                # Fallback to single-user mode
+                try:
+                    service = self._get_calendar_service()
+                    events, range_start, range_end = self.get_weekly_events(service)
+                    schedule_sections = self.iter_weekly_schedule_sections(events, range_start, range_end)
+                    for section in schedule_sections:
+                        self.send_telegram_message(section, chat_id=chat_id, count_as_reminder=False)
+                except Exception as e:
+                    logger.error("Error preparing weekly schedule: %s", e)
+                    error_msg = "❌ <b>Gagal memuat jadwal.</b>\nSilakan coba lagi nanti."
+                    self.send_telegram_message(error_msg, chat_id=chat_id, count_as_reminder=False)
+
+        # Multi-user commands
+        elif command == '/login':
+            if self.multi_user_enabled and self.cmd_handler:
+                # Use full text for argument parsing, not just command_text
+                msg = self.cmd_handler.handle_login(chat_id, text.split())
+                self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
+        elif command == '/logout':
+            if self.multi_user_enabled and self.cmd_handler:
+                msg = self.cmd_handler.handle_logout(chat_id)
+                self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
+
+        # Admin commands
+        elif command == '/admin_add_user':
+            if self.multi_user_enabled and self.cmd_handler:
+                # Use full text for argument parsing, not just command_text
+                msg = self.cmd_handler.handle_admin_add_user(chat_id, text.split())
+                self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
+        elif command == '/admin_list_users':
+            if self.multi_user_enabled and self.cmd_handler:
+                msg = self.cmd_handler.handle_admin_list_users(chat_id)
+                self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
+        elif command == '/admin_import_schedule':
+            if self.multi_user_enabled and self.cmd_handler:
+                msg = self.cmd_handler.handle_admin_import_schedule(chat_id, command_text.split())
+                self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
+        elif command == '/admin_delete_user':
+            if self.multi_user_enabled and self.cmd_handler:
+                msg = self.cmd_handler.handle_admin_delete_user(chat_id, command_text.split())
+                self.send_telegram_message(msg, chat_id=chat_id, count_as_reminder=False)
+        else:
+            logger.info("Unhandled command/text from %s: %s", chat_id, text)
 
-    def schedule_reminders(self, events):
-        """Schedule reminders untuk events"""
-        now = datetime.datetime.now(self.tz)
-        scheduled_count = 0
+    def schedule_reminders(self, events, chat_id=None) -> Dict[str, datetime.datetime]:
+        """
+        Schedule reminders untuk events
 
-        print(f"\n⏰ Scheduling reminders from {now.strftime('%Y-%m-%d %H:%M')}...")
+        Args:
+            events: Calendar-style events or already parsed EventViews
+            chat_id: Target chat (default: owner chat from config)
 
-        for event in events:
-            start_time = event['start'].get('dateTime', None)
-            if not start_time:
-                print(f"⚠️  Skipping all-day event: {event.get('summary', 'No title')}")
+        Returns:
+            Dict of reminder key -> fire time for every future reminder
+        """
+        now = self.clock.now(self.tz)
+        scheduled_count = 0
+        skipped_count = 0
+        pending: Dict[str, datetime.datetime] = {}
+        # Reminder keys are per chat in multi-user mode (users may share event ids)
+        key_prefix = f"{chat_id}:" if chat_id is not None else ''
+
+        for event in to_event_views(events, self.tz):
+            if event.all_day:
+                logger.debug("Skipping all-day event: %s", event.summary_raw)
                 continue
 
-            start_dt = datetime.datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-            if start_dt.tzinfo is None:
-                start_dt = self.tz.localize(start_dt)
-            else:
-                start_dt = start_dt.astimezone(self.tz)
-
-            event_id = event.get('id', '')
-            event_summary = event.get('summary', 'Kuliah')
-
-            print(f"\n📚 Event: {event_summary}")
-            print(f"   Start: {start_dt.strftime('%Y-%m-%d %H:%M %Z')}")
+            start_dt = event.start
+            event_id = event.event_id
 
             # Schedule multi-jam reminder
             for hours in config.REMINDER_HOURS:
                 reminder_time = start_dt - datetime.timedelta(hours=hours)
-                reminder_key = f"{event_id}_{hours}h"
+                reminder_key = f"{key_prefix}{event_id}_{hours}h"
 
                 if reminder_time > now and reminder_key not in self.sent_reminders:
+                    pending[reminder_key] = reminder_time
                     try:
-                        self.scheduler.add_job(
-                            func=self.send_reminder,
-                            trigger=DateTrigger(run_date=reminder_time),
-                            args=[event, hours],
-                            id=reminder_key,
-                            replace_existing=True
-                        )
+                        self._schedule_reminder_job(event, hours, reminder_time, reminder_key, chat_id)
                         scheduled_count += 1
-                        print(f"   ✅ {hours}h before → {reminder_time.strftime('%Y-%m-%d %H:%M')}")
+                        logger.debug("Scheduled %s (%dh before) at %s", event_id, hours, reminder_time)
                     except Exception as e:
-                        print(f"   ❌ Error scheduling {hours}h: {e}")
-                elif reminder_time <= now:
-                    print(f"   ⏭️  {hours}h before → Already passed")
+                        logger.error("Error scheduling %dh reminder for %s: %s", hours, event.summary_raw, e)
                 else:
-                    print(f"   🔁 {hours}h before → Already scheduled/sent")
+                    # Already passed, or already scheduled/sent
+                    skipped_count += 1
 
             # Exact time reminder
             if config.INCLUDE_EXACT_TIME_REMINDER:
-                reminder_key = f"{event_id}_exact"
+                reminder_key = f"{key_prefix}{event_id}_exact"
                 if start_dt > now and reminder_key not in self.sent_reminders:
+                    pending[reminder_key] = start_dt
                     try:
-                        self.scheduler.add_job(
-                            func=self.send_reminder,
-                            trigger=DateTrigger(run_date=start_dt),
-                            args=[event, None],
-                            id=reminder_key,
-                            replace_existing=True
-                        )
+                        self._schedule_reminder_job(event, None, start_dt, reminder_key, chat_id)
                         scheduled_count += 1
-                        print(f"   ✅ Exact time → {start_dt.strftime('%Y-%m-%d %H:%M')}")
+                        logger.debug("Scheduled %s (exact) at %s", event_id, start_dt)
                     except Exception as e:
-                        print(f"   ❌ Error scheduling exact time: {e}")
-                elif start_dt <= now:
-                    print(f"   ⏭️  Exact time → Already passed")
+                        logger.error("Error scheduling exact reminder for %s: %s", event.summary_raw, e)
                 else:
-                    print(f"   🔁 Exact time → Already scheduled/sent")
+                    skipped_count += 1
 
-        print(f"\n✅ Total {scheduled_count} new reminders scheduled")
+        logger.debug(
+            "Scheduled %d new reminders for chat %s (%d passed or existing)",
+            scheduled_count, chat_id or config.CHAT_ID, skipped_count
+        )
+        return pending
+
+    def _schedule_reminder_job(self, event: EventView, hours_before, fire_time, reminder_key, chat_id=None):
+        """Render the reminder and register it with its shared delivery group"""
+        template = self.get_reminder_template(event, hours_before)
+        target_chat = str(config.CHAT_ID if chat_id is None else chat_id)
+        # Identical course sessions share one job and one render
+        group = f"{event.fingerprint}_{reminder_slot(hours_before)}"
+        self.scheduler.add_job(
+            func=self.send_reminder,
+            trigger=DateTrigger(run_date=fire_time),
+            args=[group],
+            id=group,
+            replace_existing=True
+        )
+        source = (event.user_id, event.schedule_id) if event.schedule_id else None
+        self.coalescer.register(
+            PendingReminder(reminder_key, group, target_chat, fire_time, hours_before, template, source)
+        )
 
-    def send_reminder(self, event, hours_before):
-        """Send reminder"""
-        message = self.format_reminder_message(event, hours_before)
-        if self.send_telegram_message(message):
-            event_id = event.get('id', '')
-            reminder_key = f"{event_id}_{hours_before}h" if hours_before else f"{event_id}_exact"
-            self.sent_reminders.add(reminder_key)
+    def _cancel_reminder_job(self, group: str):
+        """Remove a group job whose reminders were all delivered early"""
+        try:
+            self.scheduler.remove_job(group)
+        except JobLookupError:
+            pass  # Already running or gone
+
+    def send_reminder(self, group: str):
+        """
+        Deliver a reminder group
+
+        The shared text is rendered once and fanned out to every subscribed
+        chat; chats with more reminders due soon get one combined message.
+        """
+        now = self.clock.now(self.tz)
+        by_chat = self.coalescer.take_group(group, now)
+        if not by_chat:
+            return  # Every subscriber got it with an earlier combined message
+
+        shared_chats = [chat_id for chat_id, due in by_chat.items() if len(due) == 1]
+        renders = 0
+
+        if shared_chats:
+            shared_text = by_chat[shared_chats[0]][0].template.render(now)
+            renders += 1
+            for chat_id in shared_chats:
+                if self.send_telegram_message(shared_text, chat_id=chat_id):
+                    self.sent_reminders.add(by_chat[chat_id][0].key)
+                    self._record_delivery(by_chat[chat_id])
+
+        for chat_id, due in by_chat.items():
+            if len(due) == 1:
+                continue
+            logger.info("Coalescing %d reminders for chat %s", len(due), chat_id)
+            messages = build_coalesced_messages(
+                due, now, config.COALESCE_MAX_MESSAGE_LENGTH, self._build_quick_command_footer()
+            )
+            renders += 1
+            delivered = all([
+                self.send_telegram_message(message, chat_id=chat_id)
+                for message in messages
+            ])
+            if delivered:
+                self.sent_reminders.update(item.key for item in due)
+                self._record_delivery(due)
+
+        self.dedup_stats.record(renders, len(by_chat))
+        if len(by_chat) > 1:
+            logger.info("Reminder %s fanned out to %d chats with %d render(s)", group[:12], len(by_chat), renders)
+
+    def _record_delivery(self, delivered: List[PendingReminder]):
+        """Count delivered reminders and how late each went out, and log them when buffered"""
+        sent_at = self.clock.now(self.tz)
+        for item in delivered:
+            REMINDERS_SENT.inc()
+            REMINDER_LATENESS_SECONDS.observe((sent_at - item.fire_time).total_seconds())
+        # The reminders table is only written behind a buffer: never a round trip per send
+        if self.log_deliveries and self.write_buffer is not None:
+            for user_id, schedule_id, slot, fire_time in self._unlogged_deliveries(delivered, sent_at):
+                reminder = self.db.create_reminder(user_id, schedule_id, slot, fire_time)
+                if reminder:
+                    self.db.mark_reminder_sent(reminder['reminder_id'])
+
+    def _unlogged_deliveries(self, delivered: List[PendingReminder], sent_at: datetime.datetime) -> List[Tuple]:
+        """Schedule reminders in `delivered` not yet logged for another chat of the same user"""
+        with self._delivery_log_lock:
+            logged = self._logged_deliveries
+            # Entries are in delivery order; a day later a reminder can no longer repeat
+            horizon = sent_at - datetime.timedelta(days=1)
+            while logged:
+                oldest_key, fire_time = next(iter(logged.items()))
+                if fire_time >= horizon:
+                    break
+                del logged[oldest_key]
+            fresh = []
+            for item in delivered:
+                if item.source is None:
+                    continue
+                key = (*item.source, reminder_slot(item.hours_before), item.fire_time)
+                if key not in logged:
+                    logged[key] = item.fire_time
+                    fresh.append(key)
+            return fresh
 
     def check_and_schedule_events(self):
         """Check events dan schedule reminders - Multi-user support"""
-        print(f"\n🔄 Checking events... ({datetime.datetime.now(self.tz).strftime('%Y-%m-%d %H:%M:%S')})")
+        logger.debug("Checking events")
+
+        with self._sweep_lock:
+            self._sweep_requested = False
+
+        pending: Dict[str, datetime.datetime] = {}
+        complete = False
+        sweep_started = time.perf_counter()
+        try:
+            if self.multi_user_enabled:
+                # Multi-user mode: check all users
+                previous = self.last_sweep_report
+                pending = self.check_and_schedule_multiuser()
+                report = self.last_sweep_report
+                complete = report is not previous and report.complete
+            else:
+                # Single-user mode: use Google Calendar directly
+                try:
+                    service = self._get_calendar_service()
+                    now = self.clock.now(self.tz)
+                    events = self.get_todays_events(service)
+                    if events:
+                        pending = self.schedule_reminders(events)
+                        logger.info(
+                            "Sweep: %d events, %d reminders pending", len(events), len(pending),
+                            extra={'events': len(events), 'pending': len(pending)}
+                        )
+                    else:
+                        logger.info("No events today")
+                    complete = self.last_calendar_events is not None
+                    if complete:
+                        self._after_complete_sweep(pending, ScheduleSnapshot(
+                            'single', now, self.sweep_planner.window_end(now), [], [],
+                            {SINGLE_USER: self.last_calendar_events}
+                        ))
+                except Exception as e:
+                    logger.error("Error checking calendar events: %s", e)
+        finally:
+            SWEEP_DURATION_SECONDS.observe(
+                time.perf_counter() - sweep_started, mode='multi' if self.multi_user_enabled else 'single'
+            )
+            self._plan_next_sweep(pending, complete)
 
+    def _after_complete_sweep(self, pending: Dict[str, datetime.datetime], snapshot: ScheduleSnapshot):
+        """Reconcile reminders restored at startup and save the sweep as the local snapshot"""
+        restored, self._restored_keys = self._restored_keys, None
+        if restored:
+            dropped = self.coalescer.discard(restored - pending.keys())
+            logger.info("Snapshot reconciled with the first sweep: %d removed reminder(s) dropped", dropped)
+
+        if not self.snapshot_path:
+            return
+        started = time.perf_counter()
+        try:
+            size = write_snapshot(self.snapshot_path, snapshot)
+        except (OSError, sqlite3.Error) as e:
+            logger.warning("Could not write schedule snapshot %s: %s", self.snapshot_path, e)
+            return
+        logger.debug(
+            "Snapshot written: %d events, %d bytes in %.1f ms",
+            snapshot.event_count, size, (time.perf_counter() - started) * 1000
+        )
+
+    def restore_snapshot(self) -> Optional[int]:
+        """
+        Register reminders from the local snapshot, before the first sweep
+
+        Reads the snapshot also become the fallback while the database is
+        unreachable. The first complete sweep reconciles the restored reminders.
+
+        Returns:
+            Number of reminders registered, None without a usable snapshot
+        """
+        if not self.snapshot_path:
+            return None
+        started = time.perf_counter()
+        snapshot = load_snapshot(self.snapshot_path)
+        mode = 'multi' if self.multi_user_enabled else 'single'
+        if snapshot is None or snapshot.mode != mode:
+            return None
+
+        pending: Dict[str, datetime.datetime] = {}
         if self.multi_user_enabled:
-            # Multi-user mode: check all users
-            self.check_and_schedule_multiuser()
+            self.db.prime_reads(snapshot.users, snapshot.sessions, snapshot.events, snapshot.written_at)
+            now = self.clock.now(datetime.timezone.utc)
+            for user_id, rows in snapshot.events.items():
+                views = to_event_views(rows, self.tz)
+                for chat_id in snapshot.chats_of(user_id, now):
+                    pending.update(self.schedule_reminders(views, chat_id=chat_id))
         else:
-            # Single-user mode: use Google Calendar directly
-            try:
-                service = self._get_calendar_service()
-                events = self.get_todays_events(service)
-                if events:
-                    self.schedule_reminders(events)
-                else:
-                    print("📭 No events today")
-            except Exception as e:
-                print(f"❌ Error: {e}")
+            pending = self.schedule_reminders(snapshot.events.get(SINGLE_USER, []))
+
+        self._restored_keys = set(pending)
+        logger.info(
+            "Restored %d reminders from the snapshot of %s (%d events) in %.1f ms",
+            len(pending), snapshot.written_at.isoformat(), snapshot.event_count,
+            (time.perf_counter() - started) * 1000
+        )
+        return len(pending)
 
-    def check_and_schedule_multiuser(self):
+    def _plan_next_sweep(self, pending: Dict[str, datetime.datetime], complete: bool = True):
+        """Register the next sweep based on what the last sweep found (complete: every user read)"""
+        now = self.clock.now(self.tz)
+        try:
+            next_run = self.sweep_planner.plan(now, pending, complete)
+        except Exception as e:
+            logger.warning("Sweep planning failed, using fixed interval: %s", e)
+            next_run = now + datetime.timedelta(minutes=config.CHECK_INTERVAL_MINUTES)
+
+        with self._sweep_lock:
+            if self._sweep_requested:
+                # A manual trigger arrived while this sweep was running
+                self._sweep_requested = False
+                next_run = now
+
+        self._schedule_sweep_at(next_run)
+        minutes = max(0, int((next_run - now).total_seconds() // 60))
+        logger.info(
+            "Next sweep: %s (%s menit, %s perubahan)",
+            next_run.strftime('%Y-%m-%d %H:%M:%S'), minutes, self.sweep_planner.last_changes
+        )
+
+    def _schedule_sweep_at(self, run_date: datetime.datetime):
+        """(Re)register the sweep job to run at run_date"""
+        self.scheduler.add_job(
+            func=self.check_and_schedule_events,
+            trigger=DateTrigger(run_date=run_date),
+            id='periodic_check',
+            replace_existing=True
+        )
+        self.next_sweep_time = run_date
+
+    def request_sweep(self, reason: str = ''):
+        """
+        Run an event sweep as soon as possible
+
+        Used after schedule data changes (e.g. /admin_import_schedule) so new
+        classes get their reminders without waiting for the planned sweep.
+
+        Args:
+            reason: Short description for the log
+        """
+        with self._sweep_lock:
+            self._sweep_requested = True
+        logger.info("Sweep requested: %s", reason or "-")
+        self._schedule_sweep_at(self.clock.now(self.tz))
+
+    def check_and_schedule_multiuser(self) -> Dict[str, datetime.datetime]:
         """Check and schedule reminders for all users"""
+        pending: Dict[str, datetime.datetime] = {}
         try:
             users = self.db.list_all_users()
-            print(f"👥 Checking {len(users)} users...")
-
-            now = datetime.datetime.now(self.tz)
-            end_time = now + datetime.timedelta(hours=36)
-
-            total_events = 0
-            for user in users:
-                # Get user's schedules
-                schedules = self.db.get_user_schedules(user['user_id'], now, end_time)
-
-                if schedules:
-                    print(f"  👤 {user['username']}: {len(schedules)} events")
-                    # Convert to event format
-                    events = self.cmd_handler._schedules_to_events(schedules)
-                    # Schedule reminders with user context
-                    self.schedule_reminders_for_user(events, user)
-                    total_events += len(schedules)
-
-            if total_events == 0:
-                print("📭 No events for any user")
-            else:
-                print(f"✅ Processed {total_events} events")
+            logger.debug("Checking %d users", len(users))
 
-        except Exception as e:
-            print(f"❌ Error in multi-user scheduling: {e}")
+            now = self.clock.now(self.tz)
+            end_time = self.sweep_planner.window_end(now)
 
-    def schedule_reminders_for_user(self, events, user):
-        """Schedule reminders for a specific user"""
-        # Get user's active session to get chat_id
-        sessions = self.db.get_active_session(user.get('telegram_chat_id', 0))
+            report = run_user_sweep(
+                users,
+                lambda user: self._sweep_user(user, now, end_time),
+                max_workers=self.sweep_workers,
+                timeout=config.SWEEP_USER_TIMEOUT_SECONDS,
+                deadline=config.SWEEP_DEADLINE_SECONDS
+            )
+            report.users_stale = stale_since(users) is not None
+            self.last_sweep_report = report
+            pending = report.pending
+
+            for result in report.failures + report.timeouts:
+                logger.error("Sweep failed for %s: %s", result.username, result.error)
+
+            if report.events == 0:
+                logger.info("No events for any user")
+            logger.info(report.summary(), extra=report.fields())
+
+            if report.complete:
+                self._after_complete_sweep(pending, ScheduleSnapshot(
+                    'multi', now, end_time, users,
+                    [session for result in report.results for session in result.sessions],
+                    {result.user_id: result.schedules for result in report.results if result.schedules}
+                ))
+                # Deactivate expired sessions (queued until the next flush with write-behind)
+                self.db.cleanup_expired_sessions()
+
+        except Exception as e:
+            logger.exception("Error in multi-user scheduling: %s", e)
+
+        return pending
+
+    def _sweep_user(self, user, start_time, end_time) -> UserSweepResult:
+        """Fetch, convert and schedule one user's upcoming events"""
+        result = UserSweepResult(user)
+        schedules = self.db.get_user_schedules(user['user_id'], start_time, end_time)
+        result.schedules = schedules
+        result.stale = stale_since(schedules) is not None
+
+        if schedules:
+            logger.debug("User %s: %d events", user['username'], len(schedules))
+            sessions = self.db.get_active_sessions_for_user(user['user_id'])
+            result.sessions = sessions
+            result.stale = result.stale or stale_since(sessions) is not None
+            # Schedule reminders with user context (rows are parsed once)
+            result.pending = self.schedule_reminders_for_user(schedules, user, sessions)
+            result.events = len(schedules)
+
+        return result
+
+    def schedule_reminders_for_user(self, events, user, sessions=None) -> Dict[str, datetime.datetime]:
+        """Schedule reminders for a specific user (sessions: the user's active sessions, read if None)"""
+        # Get user's active sessions to get the chats to remind
+        if sessions is None:
+            sessions = self.db.get_active_sessions_for_user(user['user_id'])
         if not sessions:
-            print(f"  ⚠️  No active session for {user['username']}")
-            return
+            logger.debug("No active session for %s", user['username'])
+            return {}
 
-        # Use existing schedule_reminders but with user context
-        # For now, just use the default scheduling
-        self.schedule_reminders(events)
+        pending: Dict[str, datetime.datetime] = {}
+        views = to_event_views(events, self.tz)
+        for chat_id in dict.fromkeys(session['telegram_chat_id'] for session in sessions):
+            pending.update(self.schedule_reminders(views, chat_id=chat_id))
+        return pending
 
     def _notify_admin_unauthorized_access(self, chat_id: int, action: str):
         """
@@ -1437,8 +1482,7 @@ class KRSReminderBotV2:
 
         try:
             # Get user info from Telegram
-            url = f"https://api.telegram.org/bot{config.TELEGRAM_BOT_TOKEN}/getChat"
-            response = self.http_session.get(url, params={'chat_id': chat_id}, timeout=5)
+            response = self._telegram_request('get', 'getChat', params={'chat_id': chat_id}, timeout=5)
 
             user_info = {}
             if response.status_code == 200:
@@ -1457,18 +1501,14 @@ class KRSReminderBotV2:
             full_name = f"{first_name} {last_name}".strip()
 
             # Get admin's telegram_chat_id from admins table
-            try:
-                admins = self.db._request('GET', 'admins', params={'limit': '1'})
-                if not admins:
-                    print(f"⚠️  Cannot notify admin: no admins found in database")
-                    return
+            admins = self.db.list_admins(limit=1)
+            if not admins:
+                logger.warning("Cannot notify admin: no admins found in database")
+                return
 
-                admin_telegram_id = admins[0].get('telegram_chat_id')
-                if not admin_telegram_id:
-                    print(f"⚠️  Cannot notify admin: admin telegram_chat_id not found")
-                    return
-            except Exception as e:
-                print(f"⚠️  Cannot notify admin: error fetching admin - {e}")
+            admin_telegram_id = admins[0].get('telegram_chat_id')
+            if not admin_telegram_id:
+                logger.warning("Cannot notify admin: admin telegram_chat_id not found")
                 return
 
             # Send notification to admin
@@ -1489,52 +1529,57 @@ class KRSReminderBotV2:
                 count_as_reminder=False
             )
 
-            print(f"✅ Admin notified about unauthorized access from {chat_id}")
+            logger.info("Admin notified about unauthorized access from %s", chat_id)
 
         except Exception as e:
-            print(f"⚠️  Failed to notify admin about unauthorized access: {e}")
+            logger.warning("Failed to notify admin about unauthorized access: %s", e)
 
     def start(self):
         """Start bot"""
-        print("="*50)
-        print("🚀 KRS REMINDER BOT V2 - STARTED")
-        print("="*50)
-        print(f"📱 Telegram: @krs_reminderbot")
-        print(f"👤 Chat ID: {config.CHAT_ID}")
-        print(f"🌍 Timezone: {config.TIMEZONE}")
-        print(f"⏰ Intervals: {config.REMINDER_HOURS} hours before")
-        print(f"🔔 Exact Time: {'✅' if config.INCLUDE_EXACT_TIME_REMINDER else '❌'}")
-        print(f"🔄 Check: Every {config.CHECK_INTERVAL_MINUTES} min")
-        print("="*50)
+        logger.info(
+            "KRS Reminder Bot V2 started",
+            extra={
+                'chat_id': config.CHAT_ID,
+                'timezone': config.TIMEZONE,
+                'reminder_hours': config.REMINDER_HOURS,
+                'exact_time': config.INCLUDE_EXACT_TIME_REMINDER,
+                'sweep_minutes': [config.SWEEP_MIN_MINUTES, config.SWEEP_MAX_MINUTES],
+            }
+        )
 
         # Startup notification
         startup_msg = (
             "🚀 <b>KRS REMINDER BOT V2 ONLINE</b>\n"
             "────────────────────────────\n"
             "✅ Monitoring kalender aktif\n"
-            f"⏰ Auto check tiap {config.CHECK_INTERVAL_MINUTES} menit\n"
+            f"⏰ Auto check adaptif ({config.SWEEP_MIN_MINUTES}–{config.SWEEP_MAX_MINUTES} menit)\n"
             "📡 Reminder multi-jam siap jalan\n"
             f"{self._build_quick_command_footer()}"
         )
 
         self.send_telegram_message(startup_msg, count_as_reminder=False)
 
-        # Initial check
-        self.check_and_schedule_events()
-
-        # Schedule periodic tasks
-        self.scheduler.add_job(
-            func=self.check_and_schedule_events,
-            trigger='interval',
-            minutes=config.CHECK_INTERVAL_MINUTES,
-            id='periodic_check',
-            replace_existing=True
-        )
+        # Initial check (also plans the next adaptive sweep). With a local snapshot the
+        # reminders are registered from it at once and the sweep runs in the background.
+        restored = self.restore_snapshot()
+        if restored is None:
+            self.check_and_schedule_events()
 
         # Start scheduler
         self.scheduler.start()
-        print("\n✅ Scheduler started! Commands: /start, /jadwal, /stats")
-        print("Press Ctrl+C to stop.\n")
+        if restored is not None:
+            threading.Thread(target=self.check_and_schedule_events, name='krs-first-sweep', daemon=True).start()
+        if self.write_buffer is not None:
+            self.write_buffer.start()
+        self.metrics.start()
+        if config.METRICS_PORT:
+            try:
+                self.metrics_server = MetricsServer(host=config.METRICS_HOST, port=config.METRICS_PORT)
+                self.metrics_server.start()
+                logger.info("Metrics endpoint on http://%s:%d/metrics", config.METRICS_HOST, self.metrics_server.port)
+            except OSError as e:
+                logger.warning("Metrics endpoint disabled: %s", e)
+        logger.info("Scheduler started, polling for /start, /jadwal, /stats")
 
         # Polling interval: use configured interval since long polling handles the wait
         poll_interval = config.TELEGRAM_POLL_INTERVAL_SECONDS
@@ -1544,15 +1589,20 @@ class KRSReminderBotV2:
                 self.check_telegram_updates()
                 time.sleep(poll_interval)
         except (KeyboardInterrupt, SystemExit):
-            print("\n⏹️ Stopping...")
+            logger.info("Stopping")
+            self.metrics.stop()
+            if self.metrics_server:
+                self.metrics_server.stop()
             self.scheduler.shutdown()
 
             shutdown_msg = "⏹️ <b>KRS REMINDER BOT STOPPED</b>\n\nBot has been shut down."
             self.send_telegram_message(shutdown_msg, count_as_reminder=False)
-            print("👋 Goodbye!")
+            logger.info("Stopped")
         finally:
+            if self.write_buffer is not None:
+                self.write_buffer.close()
             self.http_session.close()
 
 if __name__ == "__main__":
-    bot = KRSReminderBotV2()
-    bot.start()
+    from .cli import main
+    main()
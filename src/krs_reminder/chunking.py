@@ -0,0 +1,215 @@
+"""Streaming message chunker for long Telegram outputs.
+
+Telegram rejects messages longer than 4096 UTF-16 code units; emoji outside
+the BMP count as two units, so Python's ``len()`` undercounts. The chunker
+keeps a running UTF-16 length while blocks of lines are appended and only
+splits between blocks (days, events, list entries), so each section is built
+in a single pass. Sections are yielded as soon as they are complete; callers
+can start sending before the rest is rendered.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# Units an oversized line may be cut between: whole HTML tags, whole entities, single characters
+_HTML_TOKEN = re.compile(r'<[^<>]*>|&(?:#\d+|#x[0-9a-fA-F]+|\w+);|.', re.S)
+_TAG_NAME = re.compile(r'</?\s*([a-zA-Z][\w-]*)')
+
+
+def utf16_len(text: str) -> int:
+    """Length of text in UTF-16 code units, as counted by Telegram"""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def _apply_tag(open_tags: List[Tuple[str, str]], token: str) -> List[Tuple[str, str]]:
+    """Open (name, tag) pairs after token: pushed by an opening tag, popped by its closing tag"""
+    match = _TAG_NAME.match(token) if token.startswith('<') and len(token) > 1 else None
+    if match is None or token.endswith('/>'):
+        return open_tags
+    name = match.group(1).lower()
+    if not token.startswith('</'):
+        return open_tags + [(name, token)]
+    for index in range(len(open_tags) - 1, -1, -1):
+        if open_tags[index][0] == name:
+            return open_tags[:index] + open_tags[index + 1:]
+    return open_tags
+
+
+def _closing_tags(open_tags: List[Tuple[str, str]]) -> str:
+    return ''.join(f'</{name}>' for name, _ in reversed(open_tags))
+
+
+class MessageChunker:
+    """Pack blocks of lines into sections below the Telegram limit"""
+
+    def __init__(
+        self,
+        header: Sequence[str] = (),
+        continuation_header: Sequence[str] = (),
+        limit: int = TELEGRAM_MESSAGE_LIMIT,
+    ):
+        """
+        Args:
+            header: Lines starting the first section
+            continuation_header: Lines starting every following section
+            limit: Maximum section length in UTF-16 code units
+        """
+        self.limit = limit
+        self.continuation_header = list(continuation_header)
+        self._lines: List[str] = []
+        self._length = 0
+        self._has_body = False
+        self._start(header)
+
+    def _start(self, header_lines: Sequence[str]):
+        self._lines = []
+        self._length = 0
+        self._has_body = False
+        for line in header_lines:
+            self._append(line)
+
+    def _append(self, line: str, units: int = -1):
+        if units < 0:
+            units = utf16_len(line)
+        if self._lines:
+            self._length += 1  # newline separator
+        self._lines.append(line)
+        self._length += units
+
+    def _fits(self, units: int) -> bool:
+        separator = 1 if self._lines else 0
+        return self._length + separator + units <= self.limit
+
+    def _room(self) -> int:
+        """Units still free in the current section"""
+        separator = 1 if self._lines else 0
+        return self.limit - self._length - separator
+
+    def _flush(self) -> Iterator[str]:
+        section = '\n'.join(self._lines).strip()
+        if section and self._has_body:
+            yield section
+        self._start(self.continuation_header)
+
+    def _add_oversized_line(self, line: str) -> Iterator[str]:
+        """
+        Hard-split a line longer than a whole section
+
+        Pieces start a fresh section each and fill what the header leaves.
+        Cuts fall between tags, entities and characters only; tags open at a
+        cut are closed at the end of the piece and reopened in the next.
+        """
+        if self._has_body:
+            yield from self._flush()
+
+        open_tags: List[Tuple[str, str]] = []
+        piece: List[str] = []
+        size = 0
+        has_text = False
+        for token in _HTML_TOKEN.findall(line):
+            units = utf16_len(token)
+            after = _apply_tag(open_tags, token)
+            if has_text and size + units + utf16_len(_closing_tags(after)) > self._room():
+                self._append(''.join(piece) + _closing_tags(open_tags))
+                self._has_body = True
+                yield from self._flush()
+                piece = [tag for _, tag in open_tags]
+                size = utf16_len(''.join(piece))
+                has_text = False
+            piece.append(token)
+            size += units
+            open_tags = after
+            has_text = True
+
+        if piece:
+            self._append(''.join(piece) + _closing_tags(open_tags))
+            self._has_body = True
+
+    def add_block(self, lines: Sequence[str]) -> Iterator[str]:
+        """
+        Append lines that should stay in one section if possible
+
+        Yields:
+            Sections completed because the block did not fit
+        """
+        sizes = [utf16_len(line) for line in lines]
+        block_units = sum(sizes) + max(len(lines) - 1, 0)
+
+        if not self._fits(block_units) and self._has_body:
+            yield from self._flush()
+            # Leading spacing is dropped at the top of a continuation section
+            while lines and lines[0] == '':
+                lines, sizes = lines[1:], sizes[1:]
+            block_units = sum(sizes) + max(len(lines) - 1, 0)
+
+        if self._fits(block_units):
+            for line, units in zip(lines, sizes):
+                self._append(line, units)
+            self._has_body = self._has_body or bool(lines)
+            return
+
+        # Block larger than a whole section: fall back to line granularity
+        for line, units in zip(lines, sizes):
+            if not self._fits(units) and self._has_body:
+                yield from self._flush()
+                if line == '':
+                    continue
+            if self._fits(units):
+                self._append(line, units)
+                self._has_body = True
+            else:
+                yield from self._add_oversized_line(line)
+
+    def close(self) -> Iterator[str]:
+        """Yield the last section (unless it holds only a header)"""
+        section = '\n'.join(self._lines).strip()
+        if section and self._has_body:
+            yield section
+        self._start(())
+
+
+def chunk_blocks(
+    blocks: Iterable[Sequence[str]],
+    header: Sequence[str] = (),
+    continuation_header: Sequence[str] = (),
+    limit: int = TELEGRAM_MESSAGE_LIMIT,
+) -> Iterator[str]:
+    """
+    Lazily pack blocks of lines into Telegram-sized sections
+
+    Args:
+        blocks: Iterable of line groups, consumed as sections are produced
+        header: Lines starting the first section
+        continuation_header: Lines starting every following section
+        limit: Maximum section length in UTF-16 code units
+
+    Yields:
+        Section texts
+    """
+    chunker = MessageChunker(header, continuation_header, limit)
+    for block in blocks:
+        yield from chunker.add_block(block)
+    yield from chunker.close()
+
+
+def split_message(text: str, limit: int = TELEGRAM_MESSAGE_LIMIT) -> List[str]:
+    """Split an already rendered message on paragraph boundaries"""
+    if utf16_len(text) <= limit:
+        return [text]
+
+    def paragraphs():
+        block: List[str] = []
+        for line in text.split('\n'):
+            if line == '' and block:
+                yield block + ['']
+                block = []
+            else:
+                block.append(line)
+        if block:
+            yield block
+
+    return list(chunk_blocks(paragraphs(), limit=limit))
@@ -0,0 +1,143 @@
+"""Precompiled class classifier for the KRS Reminder bot.
+
+The keyword table below is compiled once at import time into a single
+alternation regex. Classifying an event is one scan over the lowercased
+text instead of up to 20 substring scans, and the result is one of a handful
+of shared read-only profiles. Facilitator and highlight parsing use patterns
+precompiled at import as well.
+
+Schedules imported into the database store the classification
+(``class_type``, ``facilitator``), so rendering rows never classifies.
+"""
+
+from __future__ import annotations
+
+import re
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+# (icon, label, keywords) in priority order; the last entry is the default
+CATEGORY_RULES: Tuple[Tuple[str, str, Tuple[str, ...]], ...] = (
+    ('🔬', 'Praktikum', ('praktikum', 'laboratorium', 'lab ', 'lab.')),
+    ('🎤', 'Seminar', ('seminar', 'kuliah tamu', 'guest lecture')),
+    ('🛠️', 'Workshop / Studio', ('workshop', 'project', 'studio')),
+    ('📝', 'Evaluasi / Ujian', ('ujian', 'evaluasi', 'quiz')),
+    ('🏛️', 'Kuliah Teori', ()),
+)
+
+ONLINE_KEYWORDS: Tuple[str, ...] = ('zoom', 'teams', 'online', 'daring', 'virtual')
+ONLINE_DELIVERY = ('🌐', 'Sesi Daring')
+OFFLINE_DELIVERY = ('🏫', 'Sesi Tatap Muka')
+
+FACILITATOR_KEYWORDS: Tuple[str, ...] = ('dosen', 'pengajar', 'instructor', 'speaker')
+
+_DEFAULT_CATEGORY = len(CATEGORY_RULES) - 1
+
+
+def _build_keyword_index() -> Dict[str, Tuple[int, bool]]:
+    """keyword -> (best category rank, online) of every table keyword it starts with"""
+    ranks: Dict[str, int] = {}
+    for rank, (_, _, keywords) in enumerate(CATEGORY_RULES):
+        for keyword in keywords:
+            ranks.setdefault(keyword, rank)
+    index: Dict[str, Tuple[int, bool]] = {}
+    for keyword in set(ranks) | set(ONLINE_KEYWORDS):
+        prefixes = [other for other in ranks if keyword.startswith(other)]
+        rank = min((ranks[other] for other in prefixes), default=_DEFAULT_CATEGORY)
+        index[keyword] = (rank, any(keyword.startswith(other) for other in ONLINE_KEYWORDS))
+    return index
+
+
+_KEYWORD_INDEX = _build_keyword_index()
+# Lookahead: every start position is tried, so overlapping keywords all count
+# (e.g. 'teamseminar' is both online and a seminar); the longest keyword at a
+# position carries the hits of the keywords it starts with
+_KEYWORD_RE = re.compile('(?=(' + '|'.join(
+    re.escape(keyword) for keyword in sorted(_KEYWORD_INDEX, key=len, reverse=True)
+) + '))')
+_ONLINE_RE = re.compile('|'.join(re.escape(keyword) for keyword in ONLINE_KEYWORDS))
+# Kept as separate patterns: keyword priority wins over position in the text
+_FACILITATOR_RES = tuple(
+    re.compile(keyword + r'\s*[:\-]\s*(.+)', re.IGNORECASE) for keyword in FACILITATOR_KEYWORDS
+)
+_BULLET_PREFIX_RE = re.compile(r'^[•\-\d\)\.\s]+')
+
+_PROFILES: Dict[Tuple[int, bool], Mapping[str, str]] = {
+    (rank, online): MappingProxyType({
+        'category_icon': icon,
+        'category_label': label,
+        'delivery_icon': (ONLINE_DELIVERY if online else OFFLINE_DELIVERY)[0],
+        'delivery_label': (ONLINE_DELIVERY if online else OFFLINE_DELIVERY)[1],
+    })
+    for rank, (icon, label, _) in enumerate(CATEGORY_RULES)
+    for online in (False, True)
+}
+_RANK_BY_LABEL = {label: rank for rank, (_, label, _) in enumerate(CATEGORY_RULES)}
+
+
+def classify(summary: str, location: str, description: str) -> Mapping[str, str]:
+    """
+    Class profile (category and delivery) of an event
+
+    Args:
+        summary: Event title
+        location: Event location
+        description: Event description
+
+    Returns:
+        Shared read-only mapping with category_icon/label and delivery_icon/label
+    """
+    text = ' '.join(filter(None, [summary, location, description])).lower()
+    rank = _DEFAULT_CATEGORY
+    online = False
+    for match in _KEYWORD_RE.finditer(text):
+        found, found_online = _KEYWORD_INDEX[match.group(1)]
+        rank = min(rank, found)
+        online = online or found_online
+        if online and rank == 0:
+            break
+    return _PROFILES[(rank, online)]
+
+
+def profile_for_class_type(class_type: Optional[str], summary: str, location: str) -> Mapping[str, str]:
+    """
+    Profile for a stored class type
+
+    Unknown types, and the default 'Kuliah Teori' (also the fallback of rows
+    imported before the full classification was stored), are classified from
+    the text.
+    """
+    rank = _RANK_BY_LABEL.get(class_type)
+    if rank is None or rank == _DEFAULT_CATEGORY:
+        return classify(summary, location, '')
+    online = _ONLINE_RE.search(' '.join(filter(None, [summary, location])).lower()) is not None
+    return _PROFILES[(rank, online)]
+
+
+def extract_facilitator(description: str) -> Optional[str]:
+    if not description:
+        return None
+
+    for pattern in _FACILITATOR_RES:
+        match = pattern.search(description)
+        if match:
+            return match.group(1).strip()
+    return None
+
+
+def extract_description_highlights(description: str, limit: int = 2) -> List[str]:
+    if not description:
+        return []
+
+    highlights: List[str] = []
+    for line in description.split('\n'):
+        clean_line = _BULLET_PREFIX_RE.sub('', line.strip())
+        if not clean_line:
+            continue
+        if clean_line.lower().startswith(FACILITATOR_KEYWORDS):
+            continue
+        highlights.append(clean_line)
+        if len(highlights) >= limit:
+            break
+
+    return highlights
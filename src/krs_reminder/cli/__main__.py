@@ -1,14 +1,29 @@
-"""Main entry point for running the bot via python -m krs_reminder.cli"""
+"""Main entry point for running the bot via python -m krs_reminder.cli
+
+``python -m krs_reminder.cli replay <recording>`` replays recorded updates
+against the offline fakes instead (see krs_reminder.cli.replay).
+"""
+
+import sys
 
 from krs_reminder.bot import KRSReminderBotV2
+from krs_reminder.logging_setup import setup_logging, stop_logging
 
 
-def main():
-    """Launch the bot runtime."""
-    bot = KRSReminderBotV2()
-    bot.start()
+def main(argv=None):
+    """Launch the bot runtime, or run a subcommand."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'replay':
+        from krs_reminder.cli.replay import main as replay_main
+        return replay_main(argv[1:])
 
+    setup_logging()
+    try:
+        bot = KRSReminderBotV2()
+        bot.start()
+    finally:
+        stop_logging()
 
-if __name__ == "__main__":
-    main()
 
+if __name__ == "__main__":
+    sys.exit(main())
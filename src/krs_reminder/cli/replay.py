@@ -0,0 +1,75 @@
+"""Replay recorded Telegram updates: python -m krs_reminder.cli replay <recording>
+
+Recordings are written by the bot when KRS_RECORD_UPDATES is set. The replay
+runs against in-process fakes (nothing is sent); without Telegram credentials
+on disk, set KRS_TELEGRAM_TOKEN and KRS_CHAT_ID (any value).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from krs_reminder.bench.replay import replay, seed_recorded_users
+from krs_reminder.bench.scenarios import BenchEnv
+from krs_reminder.logging_setup import configure_logging, stop_logging
+from krs_reminder.recording import read_recording
+
+
+def _speed(value: str) -> float:
+    if value.lower() == 'max':
+        return 0.0
+    speed = float(value.lower().rstrip('x'))
+    if speed <= 0:
+        raise argparse.ArgumentTypeError("speed must be positive or 'max'")
+    return speed
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m krs_reminder.cli replay', description=__doc__.splitlines()[0])
+    parser.add_argument('recording', type=Path, help='Recorded updates (.jsonl.gz)')
+    parser.add_argument('--speed', type=_speed, default=1.0,
+                        help="Pace: 1 = as recorded, 10 (or 10x) = ten times faster, 'max' = no waiting")
+    parser.add_argument('--events', type=int, default=10, help='Classes per seeded user')
+    parser.add_argument('--logged-out', action='store_true', help='Recorded chats start without a session')
+    parser.add_argument('--telegram-latency', type=float, default=0.0, help='Seconds per Bot API call')
+    parser.add_argument('--db-latency', type=float, default=0.0, help='Seconds per PostgREST call')
+    parser.add_argument('--calendar-latency', type=float, default=0.0, help='Seconds per events.list call')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra seconds per call')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--storage', choices=('postgrest', 'sqlite'), default='postgrest',
+                        help='Multi-user backend: fake PostgREST or in-memory SQLite (default: %(default)s)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    records = list(read_recording(args.recording))
+    # Only warnings; per-update info lines would swamp the report
+    configure_logging(level='WARNING', json_format=False, stream=sys.stderr)
+    env = None
+    try:
+        env = BenchEnv(
+            telegram_latency=args.telegram_latency,
+            db_latency=args.db_latency,
+            calendar_latency=args.calendar_latency,
+            jitter=args.jitter,
+            seed=args.seed,
+            storage=args.storage,
+        )
+        seed_recorded_users(env, records, events=args.events, logged_in=not args.logged_out)
+        report = replay(records, speed=args.speed, env=env)
+    finally:
+        if env is not None:
+            env.close()
+        stop_logging()
+
+    print(json.dumps(report.to_dict(), indent=2) if args.json else report.summary())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 from krs_reminder.bot import KRSReminderBotV2
+from krs_reminder.logging_setup import setup_logging, stop_logging
 
 
 def main() -> None:
     """Launch the bot runtime."""
-    bot = KRSReminderBotV2()
-    bot.start()
+    setup_logging()
+    try:
+        bot = KRSReminderBotV2()
+        bot.start()
+    finally:
+        stop_logging()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,65 @@
+"""Injectable clock for the KRS Reminder bot.
+
+The bot, auth/session expiry, the database layer and the VA/VB lookups ask a
+:class:`Clock` for the current time instead of calling ``datetime.now()``
+directly. Production uses :data:`SYSTEM_CLOCK`; simulations and tests use a
+:class:`VirtualClock` that only moves when told to, so a semester of
+reminders can be replayed in seconds.
+"""
+
+from __future__ import annotations
+
+import datetime
+import threading
+from typing import Optional
+
+
+class Clock:
+    """System wall clock"""
+
+    def now(self, tz: Optional[datetime.tzinfo] = None) -> datetime.datetime:
+        """Current time in `tz` (naive local time if None, like datetime.now)"""
+        return datetime.datetime.now(tz)
+
+    def utcnow(self) -> datetime.datetime:
+        """Current UTC time as a naive datetime (database timestamps)"""
+        return datetime.datetime.utcnow()
+
+
+class VirtualClock(Clock):
+    """Clock that stands still until set or advanced"""
+
+    def __init__(self, start: datetime.datetime):
+        """
+        Args:
+            start: Initial time (timezone-aware)
+        """
+        if start.tzinfo is None:
+            raise ValueError("VirtualClock needs a timezone-aware start time")
+        self._now = start.astimezone(datetime.timezone.utc)
+        self._lock = threading.Lock()
+
+    def now(self, tz: Optional[datetime.tzinfo] = None) -> datetime.datetime:
+        with self._lock:
+            current = self._now
+        if tz is None:
+            return current.astimezone().replace(tzinfo=None)
+        return current.astimezone(tz)
+
+    def utcnow(self) -> datetime.datetime:
+        with self._lock:
+            return self._now.replace(tzinfo=None)
+
+    def set(self, when: datetime.datetime):
+        """Jump to `when` (timezone-aware); time never moves backwards"""
+        when = when.astimezone(datetime.timezone.utc)
+        with self._lock:
+            if when > self._now:
+                self._now = when
+
+    def advance(self, delta: datetime.timedelta):
+        with self._lock:
+            self._now += max(delta, datetime.timedelta(0))
+
+
+SYSTEM_CLOCK = Clock()
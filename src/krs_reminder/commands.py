@@ -2,7 +2,10 @@
 Command handlers for multi-user KRS Reminder Bot
 """
 import datetime
-from typing import Dict, Optional
+from typing import Optional
+
+from .events import to_event_views
+from .resilience import stale_since
 
 
 class CommandHandler:
@@ -18,6 +21,14 @@ class CommandHandler:
     # HELPER METHODS
     # ============================================================
 
+    def _stale_notice(self, since: datetime.datetime) -> str:
+        """Note appended to a schedule answered from data read before an outage"""
+        read_at = since.astimezone(self.bot.tz).strftime('%d/%m %H:%M')
+        return (
+            "⚠️ <i>Database sedang tidak dapat dihubungi. "
+            f"Jadwal di atas dari data terakhir ({read_at}) dan mungkin belum terbaru.</i>"
+        )
+
     def _get_onboarding_message(self) -> str:
         """
         Get onboarding message for unauthenticated users
@@ -109,6 +120,12 @@ class CommandHandler:
 
         # Try to login - search for user by secret_key hash
         users = self.db.list_all_users()
+        if stale_since(users):
+            # No session can be created now, and stale rows may lack the hashes
+            return (
+                "⚠️ <b>Database sedang tidak dapat dihubungi.</b>\n\n"
+                "Silahkan coba login lagi beberapa saat lagi."
+            )
 
         matched_user = None
         for user in users:
@@ -171,7 +188,7 @@ class CommandHandler:
             return (False, onboarding_msg, [])
         
         # Get schedules from database
-        now = datetime.datetime.now(self.bot.tz)
+        now = self.bot.clock.now(self.bot.tz)
         end_time = now + datetime.timedelta(days=7)
         
         schedules = self.db.get_user_schedules(
@@ -188,40 +205,121 @@ class CommandHandler:
             )
             return (False, msg, [])
         
-        # Convert schedules to event format for compatibility
-        events = self._schedules_to_events(schedules)
+        # Formatters and the scheduler consume schedule rows natively
+        events = to_event_views(schedules, self.bot.tz)
         return (True, "", events)
     
-    def _schedules_to_events(self, schedules: list) -> list:
-        """Convert database schedules to Google Calendar event format"""
-        events = []
-        for schedule in schedules:
-            event = {
-                'id': schedule.get('google_event_id', schedule['schedule_id']),
-                'summary': f"📚 {schedule['course_name']}",
-                'start': {'dateTime': schedule['start_time']},
-                'end': {'dateTime': schedule['end_time']},
-                'location': schedule.get('location', ''),
-                'description': self._build_description(schedule)
-            }
-            events.append(event)
-        return events
-    
-    def _build_description(self, schedule: Dict) -> str:
-        """Build event description from schedule"""
-        parts = [
-            f"📚 Mata Kuliah: {schedule['course_name']}",
-        ]
-        if schedule.get('facilitator'):
-            parts.append(f"👨‍🏫 Dosen: {schedule['facilitator']}")
-        if schedule.get('course_code'):
-            parts.append(f"🔢 Kode: {schedule['course_code']}")
-        if schedule.get('location'):
-            parts.append(f"📍 Lokasi: {schedule['location']}")
-        if schedule.get('class_type'):
-            parts.append(f"📖 Tipe: {schedule['class_type']}")
-        
-        return '\n'.join(parts)
+    def handle_jadwal_sections(self, chat_id: int, target_date: Optional[datetime.datetime] = None) -> tuple[bool, str, list]:
+        """
+        Rendered weekly (or daily, with target_date) schedule for multi-user
+
+        Sections are served from the rendered schedule cache; the database
+        is only queried and the formatter only run on a miss.
+
+        Returns: (success, message, sections)
+        """
+        if not self.bot.multi_user_enabled:
+            return (False, "Multi-user disabled", [])
+
+        is_logged_in, user, error_msg = self.auth.require_login(chat_id)
+        if not is_logged_in:
+            self.bot._notify_admin_unauthorized_access(chat_id, "Command: /jadwal")
+            return (False, self._get_onboarding_message(), [])
+
+        now = self.bot.clock.now(self.bot.tz)
+        range_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        range_end = range_start + datetime.timedelta(days=7)
+        week = self.bot._get_va_vb_status(target_date or now)
+
+        cache = self.bot.schedule_cache
+        key = cache.key(
+            user['user_id'],
+            'daily' if target_date else 'weekly',
+            range_start.date(),
+            f"{week['week_type']}{week['week_num']}",
+            target_date.date() if target_date else None
+        )
+        sections = cache.get(key)
+        if sections is not None:
+            return (True, "", sections)
+
+        if target_date:
+            events, stale = self._load_day_events(chat_id, user['user_id'], key[1], target_date)
+            sections = [self.bot.format_daily_schedule_message(events, target_date)]
+            if stale:
+                # Not cached: the next request should try the database again
+                return (True, "", sections + [self._stale_notice(stale)])
+            return (True, "", cache.put(key, sections))
+
+        # Whole local days, so the rendered result only depends on the date
+        schedules = self.db.get_user_schedules(
+            user_id=user['user_id'],
+            start_time=range_start,
+            end_time=range_end
+        )
+        if not schedules:
+            msg = (
+                "📭 <b>Tidak ada jadwal</b>\n\n"
+                "Belum ada jadwal untuk 7 hari ke depan.\n"
+                "Hubungi admin untuk import jadwal."
+            )
+            return (False, msg, [])
+
+        events = to_event_views(schedules, self.bot.tz)
+        sections = self.bot.format_weekly_schedule_message(events, range_start, range_end)
+        stale = stale_since(schedules)
+        if stale:
+            return (True, "", sections + [self._stale_notice(stale)])
+        return (True, "", cache.put(key, sections))
+
+    def _load_day_events(self, chat_id: int, user_id: str, version: int, target_date: datetime.datetime) -> tuple:
+        """
+        One day's events from the chat's prefetched week, else a day-scoped query
+
+        Returns: (events, stale_since of the query or None)
+        """
+        events = self.bot.week_prefetch.get_day(chat_id, user_id, version, target_date.date())
+        if events is not None:
+            return events, None
+
+        day_start = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        day_start = self.bot.tz.normalize(day_start)
+        schedules = self.db.get_user_schedules_for_day(
+            user_id, day_start, day_start + datetime.timedelta(days=1)
+        )
+        return to_event_views(schedules, self.bot.tz), stale_since(schedules)
+
+    def prefetch_week(self, chat_id: int):
+        """Load the week once when the daily menu opens; day taps read from memory"""
+        if not self.bot.multi_user_enabled:
+            return
+
+        user = self.auth.get_user_from_session(chat_id)
+        if not user:
+            return
+
+        now = self.bot.clock.now(self.bot.tz)
+        range_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        range_end = range_start + datetime.timedelta(days=7)
+        version = self.bot.schedule_cache.version(user['user_id'])
+        if self.bot.week_prefetch.is_fresh(chat_id, user['user_id'], version, range_start.date()):
+            return
+
+        schedules = self.db.get_user_schedules(
+            user_id=user['user_id'],
+            start_time=range_start,
+            end_time=range_end
+        )
+        if stale_since(schedules):
+            return  # Day taps query (and get the stale notice) themselves
+        self.bot.week_prefetch.put(
+            chat_id,
+            user['user_id'],
+            version,
+            range_start.date(),
+            range_end.date(),
+            to_event_views(schedules, self.bot.tz)
+        )
     
     # ============================================================
     # ADMIN COMMANDS
@@ -314,6 +412,9 @@ class CommandHandler:
         
         if result['success']:
             count = result.get('count', 0)
+            # Rendered schedules are stale; schedule reminders right away
+            self.bot.schedule_cache.bump(user_id)
+            self.bot.request_sweep(f"import jadwal {user_id}")
             return (
                 f"✅ <b>Import Berhasil!</b>\n\n"
                 f"📅 Total jadwal: <b>{count}</b>\n"
@@ -343,6 +444,7 @@ class CommandHandler:
         result = self.admin.delete_user(user_id)
         
         if result['success']:
+            self.bot.schedule_cache.bump(user_id)
             return f"✅ {result['message']}"
         else:
             return result['message']
@@ -55,7 +55,11 @@ def _load_telegram_credentials(path: Path) -> Tuple[str, str]:
 
 
 TELEGRAM_FILE: Path = TELEGRAM_DIR / "tele.txt"
-TELEGRAM_BOT_TOKEN, CHAT_ID = _load_telegram_credentials(TELEGRAM_FILE)
+# KRS_TELEGRAM_TOKEN / KRS_CHAT_ID stand in for tele.txt (CI, offline benchmarks)
+if os.getenv("KRS_TELEGRAM_TOKEN") and os.getenv("KRS_CHAT_ID"):
+    TELEGRAM_BOT_TOKEN, CHAT_ID = os.environ["KRS_TELEGRAM_TOKEN"], os.environ["KRS_CHAT_ID"]
+else:
+    TELEGRAM_BOT_TOKEN, CHAT_ID = _load_telegram_credentials(TELEGRAM_FILE)
 
 # Telegram polling & networking ------------------------------------------------
 # Long polling timeout: how long Telegram server should wait for updates before returning
@@ -64,6 +68,12 @@ TELEGRAM_POLL_TIMEOUT = int(os.getenv("KRS_TELEGRAM_POLL_TIMEOUT", "30"))
 TELEGRAM_REQUEST_TIMEOUT = float(os.getenv("KRS_TELEGRAM_TIMEOUT", str(TELEGRAM_POLL_TIMEOUT + 10)))
 # Interval between polling cycles (only used if polling returns early)
 TELEGRAM_POLL_INTERVAL_SECONDS = float(os.getenv("KRS_TELEGRAM_POLL_INTERVAL", "1.0"))
+# Inbound admission control: per-chat token bucket (size, tokens refilled per second;
+# rate 0 = unlimited), and the backlog of fetched updates above which only cheap
+# updates are handled (0 = never shed)
+ADMISSION_BURST = float(os.getenv("KRS_ADMISSION_BURST", "10"))
+ADMISSION_RATE = float(os.getenv("KRS_ADMISSION_RATE", "0.5"))
+ADMISSION_SHED_BACKLOG = int(os.getenv("KRS_ADMISSION_SHED_BACKLOG", "50"))
 
 # Google Calendar configuration -------------------------------------------------
 SCOPES = ["https://www.googleapis.com/auth/calendar.readonly"]
@@ -88,3 +98,84 @@ INCLUDE_EXACT_TIME_REMINDER = True
 
 # Scheduler configuration ------------------------------------------------------
 CHECK_INTERVAL_MINUTES = int(os.getenv("KRS_CHECK_INTERVAL_MINUTES", "30"))
+
+# Adaptive sweep bounds: the next event sweep is planned between these limits
+# from the next pending reminder and how often recent sweeps found changes.
+# CHECK_INTERVAL_MINUTES stays the fallback when planning is not possible.
+SWEEP_MIN_MINUTES = int(os.getenv("KRS_SWEEP_MIN_MINUTES", "5"))
+SWEEP_MAX_MINUTES = int(os.getenv("KRS_SWEEP_MAX_MINUTES", "180"))
+# Event window read per sweep (widened automatically to cover the max interval)
+SWEEP_LOOKAHEAD_HOURS = int(os.getenv("KRS_SWEEP_LOOKAHEAD_HOURS", "36"))
+
+# Multi-user storage: "supabase" (configs/supabase/config.json) or "sqlite" (local
+# file with the schema of migrations/001_initial_schema.sql, no network)
+STORAGE_BACKEND = os.getenv("KRS_STORAGE", "supabase").lower()
+SQLITE_PATH: Path = Path(os.getenv("KRS_SQLITE_PATH", str(BASE_DIR / "var" / "krs_reminder.db")))
+
+# Write-behind for reminder bookkeeping and expired-session writes: flush period
+# (0 = write through), batch size, and the file holding writes while the database is down
+WRITE_BEHIND_INTERVAL_MS = int(os.getenv("KRS_WRITE_BEHIND_MS", "500"))
+WRITE_BEHIND_MAX_ROWS = int(os.getenv("KRS_WRITE_BEHIND_ROWS", "200"))
+WRITE_BEHIND_SPILL_FILE: Path = Path(os.getenv("KRS_WRITE_BEHIND_SPILL", str(BASE_DIR / "var" / "write_behind.jsonl")))
+# Log delivered reminders to the reminders table (one row per user, class and slot,
+# written behind the buffer only); off by default
+REMINDER_LOG_ENABLED = os.getenv("KRS_REMINDER_LOG", "0") == "1"
+
+# Supabase circuit breaker: consecutive failures that open it, seconds before a probe
+# request, and how many last-good reads (sessions, users, schedules) are kept for outages
+DB_BREAKER_FAILURES = int(os.getenv("KRS_DB_BREAKER_FAILURES", "5"))
+DB_BREAKER_RESET_SECONDS = float(os.getenv("KRS_DB_BREAKER_RESET_SECONDS", "30"))
+DB_STALE_CACHE_ENTRIES = int(os.getenv("KRS_DB_STALE_ENTRIES", "4096"))
+
+# Local snapshot of upcoming schedules and chat bindings, written after each complete
+# sweep and loaded at startup (empty = disabled)
+SNAPSHOT_FILE = os.getenv("KRS_SNAPSHOT_FILE", str(BASE_DIR / "var" / "schedule_snapshot.db"))
+
+# Multi-user sweep concurrency: users swept in parallel (0 = inline, no timeout), per-user
+# timeout, and the limit on the whole sweep (users not swept by then count as timeouts)
+SWEEP_WORKERS = int(os.getenv("KRS_SWEEP_WORKERS", "4"))
+SWEEP_USER_TIMEOUT_SECONDS = float(os.getenv("KRS_SWEEP_USER_TIMEOUT", "20"))
+SWEEP_DEADLINE_SECONDS = float(os.getenv("KRS_SWEEP_DEADLINE", "120"))
+
+# Reminder templates rendered at schedule time (shared across users)
+REMINDER_RENDER_CACHE_SIZE = int(os.getenv("KRS_REMINDER_RENDER_CACHE_SIZE", "2048"))
+
+# Reminder coalescing: reminders for one chat due within this window are sent
+# together as one combined message, each bounded in UTF-16 code units (Telegram).
+COALESCE_WINDOW_SECONDS = float(os.getenv("KRS_COALESCE_WINDOW_SECONDS", "300"))
+COALESCE_MAX_MESSAGE_LENGTH = int(os.getenv("KRS_COALESCE_MAX_MESSAGE_LENGTH", "4096"))
+
+# Rendered /jadwal and day schedules per user (invalidated on import/sync)
+SCHEDULE_CACHE_MAX_BYTES = int(os.getenv("KRS_SCHEDULE_CACHE_MAX_BYTES", str(4 * 1024 * 1024)))
+# Week prefetched when the daily menu opens, reused by the following day taps
+WEEK_PREFETCH_TTL_SECONDS = float(os.getenv("KRS_WEEK_PREFETCH_TTL_SECONDS", "120"))
+# Repeated presses of the same button by one chat within this window are answered
+# once (0 = process every press)
+CALLBACK_DEDUPE_SECONDS = float(os.getenv("KRS_CALLBACK_DEDUPE_SECONDS", "2"))
+
+# Background metrics sampler behind /stats
+METRICS_SAMPLE_SECONDS = float(os.getenv("KRS_METRICS_SAMPLE_SECONDS", "5"))
+METRICS_HISTORY_SECONDS = float(os.getenv("KRS_METRICS_HISTORY_SECONDS", "900"))
+# Local Prometheus endpoint (/metrics); 0 disables it
+METRICS_HOST = os.getenv("KRS_METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("KRS_METRICS_PORT", "0"))
+
+# Logging: JSON lines (or "text") written by a background thread. Per-module
+# levels as "krs_reminder.database=WARNING,apscheduler=ERROR"; debug lines of
+# the same template are sampled 1 in KRS_LOG_DEBUG_SAMPLE.
+LOG_LEVEL = os.getenv("KRS_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("KRS_LOG_FORMAT", "json").lower()
+LOG_MODULE_LEVELS = os.getenv("KRS_LOG_LEVELS", "apscheduler=WARNING")
+LOG_DEBUG_SAMPLE_RATE = int(os.getenv("KRS_LOG_DEBUG_SAMPLE", "10"))
+
+# Update recording for load replay (python -m krs_reminder.cli replay). Empty
+# disables it; ids and command arguments are pseudonymized with KRS_RECORD_SALT
+# (random per process when unset).
+UPDATE_RECORD_FILE = os.getenv("KRS_RECORD_UPDATES", "")
+UPDATE_RECORD_SALT = os.getenv("KRS_RECORD_SALT", "")
+
+# Semester calendar (VA/VB weeks). The JSON file may list several semesters with
+# break weeks; without it a single semester starts at KRS_SEMESTER_START.
+SEMESTER_CALENDAR_FILE: Path = Path(os.getenv("KRS_SEMESTER_CALENDAR", str(CONFIG_DIR / "semester.json")))
+SEMESTER_START = os.getenv("KRS_SEMESTER_START", "2025-09-29")
+SEMESTER_WEEKS = int(os.getenv("KRS_SEMESTER_WEEKS", "16"))
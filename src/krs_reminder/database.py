@@ -2,21 +2,90 @@
 Database module for KRS Reminder Bot - Multi-User Support
 Handles all Supabase database operations
 """
+import itertools
 import json
+import logging
 import os
-from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Callable, Hashable
+from datetime import datetime, timedelta, timezone
 import requests
 
+from . import config as settings
+from .clock import SYSTEM_CLOCK, Clock
+from .metrics import DB_CIRCUIT_STATE, DB_REQUEST_ERRORS, DB_REQUEST_SECONDS, DB_STALE_READS, track
+from .resilience import CircuitBreaker, CircuitOpenError, StaleCache, is_transient, mark_stale
+from .singleflight import SingleFlight
+from .storage import Storage
 
-class SupabaseClient:
-    """Supabase database client for KRS Reminder Bot"""
+logger = logging.getLogger(__name__)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Aware UTC datetime (naive values are UTC, as in Postgres)"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _parse_time(value: str) -> datetime:
+    return _as_utc(datetime.fromisoformat(value.replace('Z', '+00:00')))
+
+
+class SupabaseClient(Storage):
+    """Supabase database client for KRS Reminder Bot (PostgREST storage backend)"""
+
+    # HTTP client with requests' get/post/patch/delete API
+    http = requests
+    # Time source for session expiry and timestamps
+    clock: Clock = SYSTEM_CLOCK
+    # Circuit breaker around requests and last-good read cache (None: plain requests)
+    breaker: Optional[CircuitBreaker] = None
+    stale_cache: Optional[StaleCache] = None
+    # Identical concurrent GETs share one request (None: every read is sent)
+    flights: Optional[SingleFlight] = None
+    # Bumped by every write; part of the read key so later reads see the write
+    _write_generation = 0
     
-    def __init__(self, config_path: str = 'configs/supabase/config.json'):
-        """Initialize Supabase client"""
+    def __init__(
+        self,
+        config_path: str = 'configs/supabase/config.json',
+        config: Optional[Dict] = None,
+        session: Optional[Any] = None,
+        clock: Optional[Clock] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
+        """
+        Initialize Supabase client
+
+        Args:
+            config_path: JSON file with url and service_role_key
+            config: Settings dict used instead of config_path
+            session: HTTP client used instead of requests (e.g. a
+                requests.Session, or an in-process fake for benchmarks)
+            clock: Time source (default: system clock)
+            breaker: Circuit breaker around requests (default: one from
+                KRS_DB_BREAKER_FAILURES / KRS_DB_BREAKER_RESET_SECONDS)
+        """
+        if clock is not None:
+            self.clock = clock
+        # Fail fast while Supabase is down; reads fall back to their last good result
+        self.breaker = breaker or CircuitBreaker(
+            'supabase',
+            failure_threshold=settings.DB_BREAKER_FAILURES,
+            reset_seconds=settings.DB_BREAKER_RESET_SECONDS,
+            clock=self.clock
+        )
+        self.stale_cache = StaleCache(settings.DB_STALE_CACHE_ENTRIES, clock=self.clock)
+        self.flights = SingleFlight('supabase')
+        self._writes = itertools.count(1)
+        DB_CIRCUIT_STATE.set_function(lambda: CircuitBreaker.STATE_VALUES[self.breaker.state])
         # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = json.load(f)
+        if config is None:
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+        self.config = config
+        if session is not None:
+            self.http = session
         
         self.url = self.config['url']
         self.service_key = self.config['service_role_key']
@@ -31,29 +100,176 @@ class SupabaseClient:
         }
     
     def _request(self, method: str, endpoint: str, data: Optional[Dict] = None, params: Optional[Dict] = None) -> Dict:
-        """Make HTTP request to Supabase"""
+        """Make HTTP request to Supabase (identical concurrent GETs share one request)"""
+        if self.flights is None:
+            return self._send(method, endpoint, data, params)
+        if method != 'GET':
+            try:
+                return self._send(method, endpoint, data, params)
+            finally:
+                self._write_generation = next(self._writes)
+
+        # A read issued after a write never joins one that started before it
+        key = (self._write_generation, endpoint, tuple(sorted((params or {}).items())))
+        return self.flights.do(key, lambda: self._send(method, endpoint, data, params))
+
+    def _send(self, method: str, endpoint: str, data: Optional[Dict], params: Optional[Dict]) -> Dict:
         url = f"{self.base_url}/{endpoint}"
+        breaker = self.breaker
+        if breaker is not None:
+            breaker.before_call()
         
         try:
-            if method == 'GET':
-                response = requests.get(url, headers=self.headers, params=params, timeout=10)
-            elif method == 'POST':
-                response = requests.post(url, headers=self.headers, json=data, timeout=10)
-            elif method == 'PATCH':
-                response = requests.patch(url, headers=self.headers, json=data, params=params, timeout=10)
-            elif method == 'DELETE':
-                response = requests.delete(url, headers=self.headers, params=params, timeout=10)
-            else:
-                raise ValueError(f"Unsupported method: {method}")
-            
-            response.raise_for_status()
-            return response.json() if response.text else {}
+            with track(DB_REQUEST_SECONDS, DB_REQUEST_ERRORS, endpoint=endpoint, method=method):
+                if method == 'GET':
+                    response = self.http.get(url, headers=self.headers, params=params, timeout=10)
+                elif method == 'POST':
+                    response = self.http.post(url, headers=self.headers, json=data, timeout=10)
+                elif method == 'PATCH':
+                    response = self.http.patch(url, headers=self.headers, json=data, params=params, timeout=10)
+                elif method == 'DELETE':
+                    response = self.http.delete(url, headers=self.headers, params=params, timeout=10)
+                else:
+                    raise ValueError(f"Unsupported method: {method}")
+
+                response.raise_for_status()
+            result = response.json() if response.text else {}
         
         except requests.exceptions.RequestException as e:
-            print(f"❌ Database request error: {e}")
-            if hasattr(e, 'response') and e.response is not None:
-                print(f"   Response: {e.response.text}")
+            if breaker is not None:
+                if is_transient(e):
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+            response_text = e.response.text if getattr(e, 'response', None) is not None else None
+            logger.error(
+                "Database request error: %s", e,
+                extra={'method': method, 'endpoint': endpoint, 'response': response_text}
+            )
             raise
+        except Exception:
+            # Any other error (e.g. a body that is not JSON) counts as a failure, so a probe is never left running
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+        if breaker is not None:
+            breaker.record_success()
+        return result
+
+    def _read(self, key: Hashable, fetch: Callable[[], Any]) -> Any:
+        """
+        Run a read, falling back to its last good result while Supabase is unreachable
+
+        Args:
+            key: Cache key of the read (first item: table)
+            fetch: Performs the request
+
+        Returns:
+            Fresh result, or a StaleList/StaleDict copy of the cached one
+        """
+        if self.stale_cache is None:
+            return fetch()
+        try:
+            value = fetch()
+        except Exception as e:
+            return self._stale(key, e)
+        self.stale_cache.put(key, value)
+        return value
+
+    def _stale(self, key: Hashable, error: Exception, select: Optional[Callable[[Dict], bool]] = None):
+        """Cached result of a failed read (rows filtered by select), or re-raise error"""
+        cached = self.stale_cache.get(key) if is_transient(error) else None
+        if cached is None:
+            raise error
+        read_at, value = cached
+        if select is not None:
+            value = [row for row in value if select(row)]
+        DB_STALE_READS.inc(table=key[0])
+        # One warning when the request fails, not one per call the open breaker refuses
+        log = logger.debug if isinstance(error, CircuitOpenError) else logger.warning
+        log("Database unreachable, serving %s read from %s: %s", key[0], read_at.isoformat(), error)
+        return mark_stale(value, read_at)
+
+    @staticmethod
+    def _first(result) -> Optional[Dict]:
+        return result[0] if result else None
+
+    @staticmethod
+    def _rows(result) -> List[Dict]:
+        return result if isinstance(result, list) else []
+
+    def _read_schedules(self, user_id: str, start: Optional[datetime], end: Optional[datetime],
+                        end_inclusive: bool, fetch: Callable[[], List[Dict]]) -> List[Dict]:
+        """
+        Schedule read with a per-user fallback
+
+        Every good read replaces the user's known rows inside its window, so
+        an outage can be answered for any window covered by earlier reads.
+        """
+        def in_window(row: Dict) -> bool:
+            started = _parse_time(row['start_time'])
+            return (
+                (start is None or started >= _as_utc(start))
+                and (end is None or started < _as_utc(end) or (end_inclusive and started == _as_utc(end)))
+            )
+
+        if self.stale_cache is None:
+            return fetch()
+        key = ('schedules', user_id)
+        try:
+            rows = fetch()
+        except Exception as e:
+            return self._stale(key, e, select=in_window)
+
+        # Past classes are never asked for again
+        horizon = _as_utc(self.clock.utcnow()) - timedelta(days=1)
+        cached = self.stale_cache.get(key)
+        known = [
+            row for row in cached[1]
+            if not in_window(row) and _parse_time(row['start_time']) >= horizon
+        ] if cached else []
+        self.stale_cache.put(key, sorted(known + rows, key=lambda row: _parse_time(row['start_time'])))
+        return rows
+
+    def prime_reads(self, users: List[Dict], sessions: List[Dict], schedules: Dict[str, List[Dict]], read_at: datetime):
+        """Seed the outage fallback with earlier reads; fresher cached reads are kept"""
+        if self.stale_cache is None:
+            return
+        read_at = _as_utc(read_at)
+        by_chat: Dict[Hashable, Dict] = {}
+        by_user: Dict[Hashable, List[Dict]] = {}
+        for session in sessions:
+            by_chat.setdefault(('sessions', 'chat', session['telegram_chat_id']), session)
+            by_user.setdefault(('sessions', 'user', session['user_id']), []).append(session)
+        entries: Dict[Hashable, Any] = {('users', 'user_id', user['user_id']): user for user in users}
+        entries[('users', 'all')] = users
+        entries.update(by_chat)
+        entries.update(by_user)
+        entries.update((('schedules', user_id), rows) for user_id, rows in schedules.items())
+        for key, value in entries.items():
+            if self.stale_cache.get(key) is None:
+                self.stale_cache.put(key, value, read_at=read_at)
+
+    def _forget_user(self, user_id: str):
+        """Drop cached reads of a changed or deleted user"""
+        if self.stale_cache is None:
+            return
+        self.stale_cache.discard_where(lambda key, value: key[0] == 'users' and (
+            key[1] == 'all' or (isinstance(value, dict) and value.get('user_id') == user_id)
+        ))
+        self.stale_cache.discard(('schedules', user_id))
+        self.stale_cache.discard(('sessions', 'user', user_id))
+
+    def _forget_sessions(self, column: str, value):
+        """Drop cached session reads containing a session that was just invalidated"""
+        if self.stale_cache is None:
+            return
+
+        def holds(rows) -> bool:
+            rows = [rows] if isinstance(rows, dict) else rows
+            return any(str(row.get(column)) == str(value) for row in rows)
+
+        self.stale_cache.discard_where(lambda key, cached: key[0] == 'sessions' and holds(cached))
     
     # ============================================================
     # USER OPERATIONS
@@ -69,27 +285,31 @@ class SupabaseClient:
             result = self._request('POST', 'users', data=data)
             return result[0] if isinstance(result, list) and result else result
         except Exception as e:
-            print(f"❌ Error creating user: {e}")
+            logger.error("Error creating user: %s", e)
             return None
     
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         """Get user by username"""
         try:
             params = {'username': f'eq.{username}', 'limit': 1}
-            result = self._request('GET', 'users', params=params)
-            return result[0] if result else None
+            return self._read(
+                ('users', 'username', username),
+                lambda: self._first(self._request('GET', 'users', params=params))
+            )
         except Exception as e:
-            print(f"❌ Error getting user: {e}")
+            logger.error("Error getting user: %s", e)
             return None
     
     def get_user_by_id(self, user_id: str) -> Optional[Dict]:
         """Get user by ID"""
         try:
             params = {'user_id': f'eq.{user_id}', 'limit': 1}
-            result = self._request('GET', 'users', params=params)
-            return result[0] if result else None
+            return self._read(
+                ('users', 'user_id', user_id),
+                lambda: self._first(self._request('GET', 'users', params=params))
+            )
         except Exception as e:
-            print(f"❌ Error getting user: {e}")
+            logger.error("Error getting user: %s", e)
             return None
     
     def update_user_calendar_token(self, user_id: str, encrypted_token: str) -> bool:
@@ -98,9 +318,10 @@ class SupabaseClient:
             data = {'google_calendar_token_encrypted': encrypted_token}
             params = {'user_id': f'eq.{user_id}'}
             self._request('PATCH', 'users', data=data, params=params)
+            self._forget_user(user_id)
             return True
         except Exception as e:
-            print(f"❌ Error updating calendar token: {e}")
+            logger.error("Error updating calendar token: %s", e)
             return False
     
     def delete_user(self, user_id: str) -> bool:
@@ -108,18 +329,18 @@ class SupabaseClient:
         try:
             params = {'user_id': f'eq.{user_id}'}
             self._request('DELETE', 'users', params=params)
+            self._forget_user(user_id)
             return True
         except Exception as e:
-            print(f"❌ Error deleting user: {e}")
+            logger.error("Error deleting user: %s", e)
             return False
     
     def list_all_users(self) -> List[Dict]:
         """List all users"""
         try:
-            result = self._request('GET', 'users')
-            return result if isinstance(result, list) else []
+            return self._read(('users', 'all'), lambda: self._rows(self._request('GET', 'users')))
         except Exception as e:
-            print(f"❌ Error listing users: {e}")
+            logger.error("Error listing users: %s", e)
             return []
     
     # ============================================================
@@ -136,7 +357,7 @@ class SupabaseClient:
             result = self._request('POST', 'schedules', data=data)
             return result[0] if isinstance(result, list) and result else result
         except Exception as e:
-            print(f"❌ Error creating schedule: {e}")
+            logger.error("Error creating schedule: %s", e)
             return None
     
     def get_user_schedules(self, user_id: str, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> List[Dict]:
@@ -144,15 +365,49 @@ class SupabaseClient:
         try:
             params = {'user_id': f'eq.{user_id}', 'order': 'start_time.asc'}
             
+            # Both bounds on start_time must be combined; a plain dict key holds only one
+            filters = []
             if start_time:
-                params['start_time'] = f'gte.{start_time.isoformat()}'
+                filters.append(f'start_time.gte.{start_time.isoformat()}')
             if end_time:
-                params['start_time'] = f'lte.{end_time.isoformat()}'
+                filters.append(f'start_time.lte.{end_time.isoformat()}')
+            if filters:
+                params['and'] = f"({','.join(filters)})"
             
-            result = self._request('GET', 'schedules', params=params)
-            return result if isinstance(result, list) else []
+            return self._read_schedules(
+                user_id, start_time, end_time, True,
+                lambda: self._rows(self._request('GET', 'schedules', params=params))
+            )
+        except Exception as e:
+            logger.error("Error getting schedules: %s", e)
+            return []
+    
+    def get_user_schedules_for_day(self, user_id: str, day_start: datetime, day_end: datetime) -> List[Dict]:
+        """
+        Get schedules starting within one local day
+        
+        Args:
+            user_id: User ID
+            day_start: Local midnight of the day (timezone-aware)
+            day_end: Local midnight of the next day (exclusive)
+        
+        Returns:
+            Schedules ordered by start time (served by idx_schedules_user_start)
+        """
+        try:
+            start_utc = day_start.astimezone(timezone.utc).isoformat()
+            end_utc = day_end.astimezone(timezone.utc).isoformat()
+            params = {
+                'user_id': f'eq.{user_id}',
+                'and': f'(start_time.gte.{start_utc},start_time.lt.{end_utc})',
+                'order': 'start_time.asc'
+            }
+            return self._read_schedules(
+                user_id, day_start, day_end, False,
+                lambda: self._rows(self._request('GET', 'schedules', params=params))
+            )
         except Exception as e:
-            print(f"❌ Error getting schedules: {e}")
+            logger.error("Error getting day schedules: %s", e)
             return []
     
     def delete_user_schedules(self, user_id: str) -> bool:
@@ -160,9 +415,11 @@ class SupabaseClient:
         try:
             params = {'user_id': f'eq.{user_id}'}
             self._request('DELETE', 'schedules', params=params)
+            if self.stale_cache is not None:
+                self.stale_cache.discard(('schedules', user_id))
             return True
         except Exception as e:
-            print(f"❌ Error deleting schedules: {e}")
+            logger.error("Error deleting schedules: %s", e)
             return False
     
     def bulk_create_schedules(self, schedules: List[Dict]) -> bool:
@@ -171,7 +428,7 @@ class SupabaseClient:
             self._request('POST', 'schedules', data=schedules)
             return True
         except Exception as e:
-            print(f"❌ Error bulk creating schedules: {e}")
+            logger.error("Error bulk creating schedules: %s", e)
             return False
     
     # ============================================================
@@ -180,7 +437,7 @@ class SupabaseClient:
     
     def create_session(self, user_id: str, telegram_chat_id: int, session_token: str, expires_hours: int = 24) -> Optional[Dict]:
         """Create a new session"""
-        expires_at = datetime.utcnow() + timedelta(hours=expires_hours)
+        expires_at = self.clock.utcnow() + timedelta(hours=expires_hours)
         data = {
             'user_id': user_id,
             'telegram_chat_id': telegram_chat_id,
@@ -192,13 +449,13 @@ class SupabaseClient:
             result = self._request('POST', 'sessions', data=data)
             return result[0] if isinstance(result, list) and result else result
         except Exception as e:
-            print(f"❌ Error creating session: {e}")
+            logger.error("Error creating session: %s", e)
             return None
     
     def get_active_session(self, telegram_chat_id: int) -> Optional[Dict]:
         """Get active session for a Telegram chat"""
         try:
-            now = datetime.utcnow().isoformat()
+            now = self.clock.utcnow().isoformat()
             params = {
                 'telegram_chat_id': f'eq.{telegram_chat_id}',
                 'is_active': 'eq.true',
@@ -206,21 +463,42 @@ class SupabaseClient:
                 'limit': 1,
                 'order': 'created_at.desc'
             }
-            result = self._request('GET', 'sessions', params=params)
-            return result[0] if result else None
+            return self._read(
+                ('sessions', 'chat', telegram_chat_id),
+                lambda: self._first(self._request('GET', 'sessions', params=params))
+            )
         except Exception as e:
-            print(f"❌ Error getting session: {e}")
+            logger.error("Error getting session: %s", e)
             return None
     
+    def get_active_sessions_for_user(self, user_id: str) -> List[Dict]:
+        """Get all active sessions of a user (one per logged-in chat)"""
+        try:
+            now = self.clock.utcnow().isoformat()
+            params = {
+                'user_id': f'eq.{user_id}',
+                'is_active': 'eq.true',
+                'expires_at': f'gt.{now}',
+                'order': 'created_at.desc'
+            }
+            return self._read(
+                ('sessions', 'user', user_id),
+                lambda: self._rows(self._request('GET', 'sessions', params=params))
+            )
+        except Exception as e:
+            logger.error("Error getting user sessions: %s", e)
+            return []
+    
     def invalidate_session(self, session_id: str) -> bool:
         """Invalidate a session"""
         try:
             data = {'is_active': False}
             params = {'session_id': f'eq.{session_id}'}
             self._request('PATCH', 'sessions', data=data, params=params)
+            self._forget_sessions('session_id', session_id)
             return True
         except Exception as e:
-            print(f"❌ Error invalidating session: {e}")
+            logger.error("Error invalidating session: %s", e)
             return False
     
     def invalidate_user_sessions(self, telegram_chat_id: int) -> bool:
@@ -229,21 +507,22 @@ class SupabaseClient:
             data = {'is_active': False}
             params = {'telegram_chat_id': f'eq.{telegram_chat_id}'}
             self._request('PATCH', 'sessions', data=data, params=params)
+            self._forget_sessions('telegram_chat_id', telegram_chat_id)
             return True
         except Exception as e:
-            print(f"❌ Error invalidating sessions: {e}")
+            logger.error("Error invalidating sessions: %s", e)
             return False
     
     def cleanup_expired_sessions(self) -> int:
         """Cleanup expired sessions"""
         try:
-            now = datetime.utcnow().isoformat()
+            now = self.clock.utcnow().isoformat()
             data = {'is_active': False}
             params = {'expires_at': f'lt.{now}', 'is_active': 'eq.true'}
             self._request('PATCH', 'sessions', data=data, params=params)
             return 0  # Can't get count from PATCH
         except Exception as e:
-            print(f"❌ Error cleaning up sessions: {e}")
+            logger.error("Error cleaning up sessions: %s", e)
             return 0
     
     # ============================================================
@@ -257,7 +536,7 @@ class SupabaseClient:
             result = self._request('GET', 'admins', params=params)
             return bool(result)
         except Exception as e:
-            print(f"❌ Error checking admin: {e}")
+            logger.error("Error checking admin: %s", e)
             return False
     
     def add_admin(self, telegram_chat_id: int, permissions: Optional[Dict] = None) -> bool:
@@ -278,9 +557,19 @@ class SupabaseClient:
             self._request('POST', 'admins', data=data)
             return True
         except Exception as e:
-            print(f"❌ Error adding admin: {e}")
+            logger.error("Error adding admin: %s", e)
             return False
     
+    def list_admins(self, limit: Optional[int] = None) -> List[Dict]:
+        """List admins"""
+        try:
+            params = {'limit': str(limit)} if limit else None
+            result = self._request('GET', 'admins', params=params)
+            return result if isinstance(result, list) else []
+        except Exception as e:
+            logger.error("Error listing admins: %s", e)
+            return []
+    
     # ============================================================
     # REMINDER OPERATIONS
     # ============================================================
@@ -298,17 +587,32 @@ class SupabaseClient:
             result = self._request('POST', 'reminders', data=data)
             return result[0] if isinstance(result, list) and result else result
         except Exception as e:
-            print(f"❌ Error creating reminder: {e}")
+            logger.error("Error creating reminder: %s", e)
             return None
     
     def mark_reminder_sent(self, reminder_id: str) -> bool:
         """Mark reminder as sent"""
         try:
-            data = {'status': 'sent', 'sent_at': datetime.utcnow().isoformat()}
+            data = {'status': 'sent', 'sent_at': self.clock.utcnow().isoformat()}
             params = {'reminder_id': f'eq.{reminder_id}'}
             self._request('PATCH', 'reminders', data=data, params=params)
             return True
         except Exception as e:
-            print(f"❌ Error marking reminder sent: {e}")
+            logger.error("Error marking reminder sent: %s", e)
             return False
 
+
+    # ============================================================
+    # BATCH WRITES
+    # ============================================================
+
+    def bulk_insert(self, table: str, rows: List[Dict]):
+        """Insert rows in one POST (raises on failure)"""
+        if rows:
+            self._request('POST', table, data=rows)
+
+    def bulk_update(self, table: str, data: Dict, column: str, values: List):
+        """PATCH every row whose column is in values (raises on failure)"""
+        if values:
+            params = {column: f"in.({','.join(str(value) for value in values)})"}
+            self._request('PATCH', table, data=data, params=params)
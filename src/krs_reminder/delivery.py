@@ -0,0 +1,208 @@
+"""Reminder delivery stage for the KRS Reminder bot.
+
+Every class fires several reminders (5h/3h/2h/1h/exact). A student with
+back-to-back classes would receive many separate messages, often within
+the same minute. :class:`ReminderCoalescer` tracks the pending reminders
+per chat; when one fires, all reminders of the same chat due within the
+coalescing window are taken along and delivered as one combined message.
+
+Reminders with identical content (same course session and slot) share a
+group and a single scheduler job. When the group fires, its text is
+rendered once and fanned out to every subscribed chat; :class:`DedupStats`
+keeps track of how much rendering that saves.
+"""
+
+from __future__ import annotations
+
+import datetime
+import threading
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from .chunking import chunk_blocks
+from .rendering import ReminderTemplate
+
+COALESCED_SEPARATOR = '━━━━━━━━━━━━━━━━━━━'
+
+
+class PendingReminder:
+    """A scheduled reminder waiting to be delivered"""
+
+    __slots__ = ('key', 'group', 'chat_id', 'fire_time', 'hours_before', 'template', 'source')
+
+    def __init__(
+        self,
+        key: str,
+        group: str,
+        chat_id: str,
+        fire_time: datetime.datetime,
+        hours_before: Optional[int],
+        template: ReminderTemplate,
+        source: Optional[Tuple[str, str]] = None,
+    ):
+        self.key = key
+        self.group = group
+        self.chat_id = chat_id
+        self.fire_time = fire_time
+        self.hours_before = hours_before
+        self.template = template
+        # (user_id, schedule_id) of a schedules row; None for Calendar events
+        self.source = source
+
+
+class DedupStats:
+    """Counters for shared reminder renders"""
+
+    def __init__(self):
+        self.renders = 0
+        self.deliveries = 0
+        self._lock = threading.Lock()
+
+    def record(self, renders: int, deliveries: int):
+        with self._lock:
+            self.renders += renders
+            self.deliveries += deliveries
+
+    @property
+    def ratio(self) -> float:
+        """Chats served per render (1.0 = no sharing)"""
+        return self.deliveries / self.renders if self.renders else 1.0
+
+
+class ReminderCoalescer:
+    """Merge reminders of the same chat that are due close together"""
+
+    def __init__(self, window_seconds: float, cancel_job: Callable[[str], None]):
+        """
+        Initialize ReminderCoalescer
+
+        Args:
+            window_seconds: Reminders due within this many seconds are merged
+            cancel_job: Callback removing a group's scheduler job by group key
+        """
+        self.window = datetime.timedelta(seconds=max(0, window_seconds))
+        self.cancel_job = cancel_job
+        self._pending: Dict[str, PendingReminder] = {}
+        self._by_chat: Dict[str, Set[str]] = {}
+        self._groups: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.delivered = 0
+        self.merged = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def register(self, reminder: PendingReminder):
+        """Track a reminder registered with the scheduler (replaces same key)"""
+        with self._lock:
+            previous = self._pop(reminder.key)
+            if previous is not None and previous.group != reminder.group and not self._groups.get(previous.group):
+                # Content changed; the old group's job has nobody left to notify
+                self.cancel_job(previous.group)
+            self._pending[reminder.key] = reminder
+            self._by_chat.setdefault(reminder.chat_id, set()).add(reminder.key)
+            self._groups.setdefault(reminder.group, set()).add(reminder.key)
+
+    def discard(self, keys) -> int:
+        """
+        Forget reminders that no longer exist (e.g. their class was removed)
+
+        Args:
+            keys: Reminder keys to drop; unknown keys are ignored
+
+        Returns:
+            Number of reminders dropped
+        """
+        emptied: List[str] = []
+        dropped = 0
+        with self._lock:
+            for key in keys:
+                reminder = self._pop(key)
+                if reminder is None:
+                    continue
+                dropped += 1
+                if reminder.group not in self._groups:
+                    emptied.append(reminder.group)
+        for group in dict.fromkeys(emptied):
+            self.cancel_job(group)
+        return dropped
+
+    def _pop(self, key: str) -> Optional[PendingReminder]:
+        reminder = self._pending.pop(key, None)
+        if reminder is not None:
+            for index, index_key in ((self._by_chat, reminder.chat_id), (self._groups, reminder.group)):
+                keys = index.get(index_key)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del index[index_key]
+        return reminder
+
+    def take_group(self, group: str, now: datetime.datetime) -> Dict[str, List[PendingReminder]]:
+        """
+        Claim a firing group plus each subscriber's reminders due within the window
+
+        Args:
+            group: Group key of the job that fired
+            now: Current time
+
+        Returns:
+            Chat id -> reminders to deliver together (sorted by class start).
+            Chats whose reminder was already delivered with an earlier
+            combined message are absent.
+        """
+        emptied: List[str] = []
+        by_chat: Dict[str, List[PendingReminder]] = {}
+        with self._lock:
+            horizon = now + self.window
+            for key in list(self._groups.get(group, ())):
+                reminder = self._pop(key)
+                if reminder is None:
+                    continue  # Taken along with a reminder of the same chat
+                due = by_chat.setdefault(reminder.chat_id, [])
+                due.append(reminder)
+                for other_key in list(self._by_chat.get(reminder.chat_id, ())):
+                    other = self._pending[other_key]
+                    if other.fire_time <= horizon:
+                        due.append(self._pop(other_key))
+                        if other.group != group and other.group not in self._groups:
+                            emptied.append(other.group)
+
+            for due in by_chat.values():
+                due.sort(key=lambda item: (item.template.start_dt, item.fire_time))
+                self.delivered += len(due)
+                self.merged += len(due) - 1
+
+        for other_group in emptied:
+            self.cancel_job(other_group)
+
+        return by_chat
+
+
+def build_coalesced_messages(
+    reminders: List[PendingReminder],
+    now: datetime.datetime,
+    max_length: int,
+    footer: str,
+) -> List[str]:
+    """
+    Combine several reminders of one chat into as few messages as possible
+
+    Args:
+        reminders: Reminders to combine (already sorted)
+        now: Time used for the countdowns
+        max_length: Upper bound on each message in UTF-16 code units
+        footer: Quick command footer appended to the last message
+
+    Returns:
+        List of message texts
+    """
+    header = [f"🔔 <b>{len(reminders)} PENGINGAT KULIAH</b>"]
+    continuation = ["🔔 <b>PENGINGAT KULIAH (LANJUTAN)</b>"]
+
+    blocks = [
+        ['', COALESCED_SEPARATOR, '', reminder.template.render_compact(now)]
+        for reminder in reminders
+    ]
+    blocks.append(['', COALESCED_SEPARATOR, '', footer])
+    return list(chunk_blocks(blocks, header, continuation, limit=max_length))
@@ -0,0 +1,173 @@
+"""Parsed event model for the KRS Reminder bot.
+
+Calendar events arrive as Google Calendar dicts with ISO timestamps, and
+multi-user schedules as structured ``schedules`` rows. Every stage (sweep,
+reminder scheduling, daily/weekly formatting) used to parse the same strings
+and re-run the facilitator and class profile inference. :class:`EventView`
+does that work once per raw event or row; formatters and the scheduler
+consume views instead of raw dicts. Rows use their ``facilitator`` and
+``class_type`` columns directly.
+"""
+
+from __future__ import annotations
+
+import datetime
+import html
+from typing import Dict, Iterable, List, Optional
+
+from .classifier import classify, extract_description_highlights, extract_facilitator, profile_for_class_type
+from .rendering import content_fingerprint, event_fingerprint
+
+
+def escape_html(value: Optional[str]) -> str:
+    if not value:
+        return ''
+    return html.escape(value, quote=False)
+
+
+def parse_event_datetime(raw: str, tz) -> datetime.datetime:
+    """
+    Parse a Google Calendar timestamp or date into tz
+
+    Args:
+        raw: ``dateTime`` (may end in ``Z``) or all-day ``date`` value
+        tz: pytz timezone
+
+    Returns:
+        Localized datetime
+    """
+    if 'T' in raw:
+        parsed = datetime.datetime.fromisoformat(raw.replace('Z', '+00:00'))
+        if parsed.tzinfo is None:
+            return tz.localize(parsed)
+        return parsed.astimezone(tz)
+    return tz.localize(datetime.datetime.fromisoformat(raw))
+
+
+class EventView:
+    """
+    An event parsed once: localized times, escaped text and class profile
+
+    Built from either a Google Calendar event (:meth:`from_event`) or a
+    ``schedules`` row (:meth:`from_schedule`); formatters and the scheduler
+    only see this interface.
+    """
+
+    __slots__ = (
+        'event_id', 'summary_raw', 'summary', 'location_raw', 'location',
+        'description', 'start', 'end', 'all_day', 'facilitator', 'profile',
+        'highlights', 'fingerprint', 'schedule_id', 'user_id',
+    )
+
+    def __init__(self, event: Dict, tz):
+        """
+        Args:
+            event: Google Calendar style event dict or schedules row
+            tz: pytz timezone used for display
+
+        Raises:
+            ValueError: If the event has no start time
+        """
+        if 'course_name' in event:
+            self._load_schedule(event, tz)
+        else:
+            self._load_event(event, tz)
+
+    @classmethod
+    def from_event(cls, event: Dict, tz) -> 'EventView':
+        view = cls.__new__(cls)
+        view._load_event(event, tz)
+        return view
+
+    @classmethod
+    def from_schedule(cls, schedule: Dict, tz) -> 'EventView':
+        view = cls.__new__(cls)
+        view._load_schedule(schedule, tz)
+        return view
+
+    def _set_text(self, summary_raw: str, location_raw: Optional[str]):
+        self.summary_raw = summary_raw
+        self.summary = escape_html(summary_raw)
+        self.location_raw = (location_raw or '').strip()
+        self.location = escape_html(self.location_raw)
+
+    def _load_event(self, event: Dict, tz):
+        start_info = event.get('start', {})
+        end_info = event.get('end', {})
+        start_raw = start_info.get('dateTime') or start_info.get('date')
+        end_raw = end_info.get('dateTime') or end_info.get('date')
+        if not start_raw:
+            raise ValueError(f"Event without start: {event.get('summary', 'No title')}")
+
+        self.event_id = event.get('id', '')
+        self.all_day = 'date' in start_info
+        self.start = parse_event_datetime(start_raw, tz)
+        self.end = parse_event_datetime(end_raw, tz) if end_raw else self.start
+
+        self._set_text(event.get('summary', 'Kuliah'), event.get('location', ''))
+        self.description = event.get('description', '') or ''
+
+        self.facilitator = extract_facilitator(self.description)
+        self.profile = classify(self.summary_raw, self.location_raw, self.description)
+        highlights = extract_description_highlights(self.description)
+        if self.facilitator:
+            highlights = [h for h in highlights if self.facilitator.lower() not in h.lower()]
+        self.highlights = highlights
+        self.fingerprint = event_fingerprint(event)
+        self.schedule_id = None
+        self.user_id = None
+
+    def _load_schedule(self, schedule: Dict, tz):
+        start_raw = schedule.get('start_time')
+        if not start_raw:
+            raise ValueError(f"Schedule without start: {schedule.get('course_name', 'No title')}")
+
+        self.event_id = schedule.get('google_event_id') or schedule.get('schedule_id', '')
+        # Row this view came from (reminder bookkeeping references it)
+        self.schedule_id = schedule.get('schedule_id')
+        self.user_id = schedule.get('user_id')
+        self.all_day = False
+        self.start = parse_event_datetime(start_raw, tz)
+        end_raw = schedule.get('end_time')
+        self.end = parse_event_datetime(end_raw, tz) if end_raw else self.start
+
+        self._set_text(f"📚 {schedule['course_name']}", schedule.get('location'))
+        self.description = ''
+        self.facilitator = schedule.get('facilitator') or None
+        self.profile = profile_for_class_type(schedule.get('class_type'), self.summary_raw, self.location_raw)
+        course_code = schedule.get('course_code')
+        self.highlights = [f"Kode: {course_code}"] if course_code else []
+        self.fingerprint = content_fingerprint((
+            self.summary_raw,
+            start_raw,
+            end_raw or '',
+            self.location_raw,
+            self.facilitator or '',
+            schedule.get('class_type') or '',
+            course_code or '',
+        ))
+
+    @property
+    def time_range(self) -> str:
+        """``HH:MM—HH:MM`` or ``Sepanjang hari`` for all-day events"""
+        if self.all_day:
+            return 'Sepanjang hari'
+        return f"{self.start.strftime('%H:%M')}—{self.end.strftime('%H:%M')}"
+
+
+def as_event_view(event, tz) -> EventView:
+    """Return event as a view, parsing it only if it is still a raw dict"""
+    if isinstance(event, EventView):
+        return event
+    return EventView(event, tz)
+
+
+def to_event_views(events: Iterable, tz) -> List[EventView]:
+    """Parse events into views, skipping entries without a start time"""
+    views = []
+    for event in events:
+        try:
+            views.append(as_event_view(event, tz))
+        except ValueError:
+            continue
+    return views
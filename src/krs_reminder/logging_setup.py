@@ -0,0 +1,149 @@
+"""Non-blocking structured logging for the KRS Reminder bot.
+
+Every module logs through ``logging.getLogger(__name__)``. The root logger
+only has a :class:`~logging.handlers.QueueHandler`, so a log call on the
+polling, scheduler or sweep threads just enqueues the record. A
+:class:`~logging.handlers.QueueListener` thread formats the records (one JSON
+object per line by default) and writes them to stdout, which ``botctl.sh``
+redirects to the log file.
+
+High-volume debug lines (per reminder slot, per user) are sampled: only one
+in ``sample_rate`` records of each debug message template is kept.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from typing import Dict, Optional, TextIO
+
+# LogRecord attributes that are not user-supplied structured fields
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record; ``extra={...}`` keys become fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keep every record at INFO and above, and 1 in ``rate`` debug records per message template"""
+
+    def __init__(self, rate: int = 1):
+        super().__init__()
+        self.rate = max(1, rate)
+        self._counts: Dict[tuple, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or self.rate == 1:
+            return True
+        key = (record.name, record.msg)
+        count = self._counts.get(key, 0)
+        self._counts[key] = count + 1
+        return count % self.rate == 0
+
+
+def parse_module_levels(spec: str) -> Dict[str, str]:
+    """``"krs_reminder.database=WARNING,apscheduler=ERROR"`` -> {logger: level}"""
+    levels: Dict[str, str] = {}
+    for item in spec.split(','):
+        if '=' not in item:
+            continue
+        name, level = (part.strip() for part in item.split('=', 1))
+        if name and level:
+            levels[name] = level.upper()
+    return levels
+
+
+def configure_logging(
+    level: str = 'INFO',
+    json_format: bool = True,
+    module_levels: Optional[Dict[str, str]] = None,
+    debug_sample_rate: int = 1,
+    stream: Optional[TextIO] = None,
+) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue to a background writer thread
+
+    Args:
+        level: Root log level
+        json_format: JSON lines if True, plain text otherwise
+        module_levels: Per-logger levels (e.g. {'apscheduler': 'WARNING'})
+        debug_sample_rate: Keep 1 in N debug records per message template
+        stream: Output stream (default: stdout)
+
+    Returns:
+        The running QueueListener (replaces a previous one)
+    """
+    global _listener
+
+    handler = logging.StreamHandler(stream or sys.stdout)
+    if json_format:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(SamplingFilter(debug_sample_rate))
+
+    with _lock:
+        _stop_listener()
+        root = logging.getLogger()
+        for existing in list(root.handlers):
+            root.removeHandler(existing)
+        root.addHandler(queue_handler)
+        root.setLevel(level.upper())
+        for name, module_level in (module_levels or {}).items():
+            logging.getLogger(name).setLevel(module_level)
+
+        _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        return _listener
+
+
+def _stop_listener():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Configure logging from the KRS_LOG_* settings"""
+    from . import config
+
+    return configure_logging(
+        level=config.LOG_LEVEL,
+        json_format=config.LOG_FORMAT == 'json',
+        module_levels=parse_module_levels(config.LOG_MODULE_LEVELS),
+        debug_sample_rate=config.LOG_DEBUG_SAMPLE_RATE,
+    )
+
+
+def stop_logging():
+    """Flush queued records and stop the writer thread"""
+    with _lock:
+        _stop_listener()
@@ -0,0 +1,329 @@
+"""Metrics registry and Prometheus endpoint for the KRS Reminder bot.
+
+Counters, gauges and fixed-bucket histograms live in a process-wide
+:data:`REGISTRY`. The instruments below cover every I/O path (Supabase,
+Telegram and Google Calendar requests), sweep duration, the reminder dispatch
+queue and reminder lateness (actual send time minus scheduled time).
+
+:class:`MetricsServer` optionally serves the registry in the Prometheus text
+format on a local port (``KRS_METRICS_PORT``); recording never depends on it.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SWEEP_BUCKETS: Tuple[float, ...] = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# Coalesced reminders go out before their own fire time, hence the negative buckets
+LATENESS_BUCKETS: Tuple[float, ...] = (-300, -60, 0, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, object]) -> LabelValues:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError:
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}") from None
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self._render_samples())
+        return lines
+
+    @abstractmethod
+    def _render_samples(self) -> List[str]:
+        """Sample lines of the exposition format"""
+
+
+class Counter(_Metric):
+    """Monotonic counter"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}' for key, value in items]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down, or is read from a callback at scrape time"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def set_function(self, function: Optional[Callable[[], float]]):
+        """Read the (unlabelled) value from `function` on every scrape"""
+        self._function = function
+
+    def value(self, **labels) -> float:
+        if self._function is not None and not labels:
+            return self._function()
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def _render_samples(self) -> List[str]:
+        if self._function is not None:
+            try:
+                return [f'{self.name} {_format_value(self._function())}']
+            except Exception:
+                return []
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}' for key, value in items]
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram (cumulative buckets, sum and count on render)"""
+
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts (last one is +Inf), sum, count]
+        self._values: Dict[LabelValues, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of the block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, (list(state[0]), state[1], state[2])) for key, state in self._values.items())
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics; registering a name twice returns the existing metric"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge, name, help_text, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, help_text, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+@contextmanager
+def track(histogram: Histogram, errors: Optional[Counter] = None, **labels) -> Iterator[None]:
+    """Time a call into `histogram` and count it in `errors` if it raises"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        if errors is not None:
+            errors.inc(**labels)
+        raise
+    finally:
+        histogram.observe(time.perf_counter() - start, **labels)
+
+
+REGISTRY = MetricsRegistry()
+
+DB_REQUEST_SECONDS = REGISTRY.histogram(
+    'krs_db_request_seconds', 'Database request latency (Supabase REST or SQLite)', ('endpoint', 'method'))
+DB_REQUEST_ERRORS = REGISTRY.counter(
+    'krs_db_request_errors_total', 'Failed database requests (Supabase REST or SQLite)', ('endpoint', 'method'))
+DB_CIRCUIT_STATE = REGISTRY.gauge(
+    'krs_db_circuit_state', 'Supabase circuit breaker (0 closed, 1 open, 2 half-open)')
+DB_STALE_READS = REGISTRY.counter(
+    'krs_db_stale_reads_total', 'Reads answered from the last good result while Supabase was unreachable', ('table',))
+SINGLE_FLIGHT_SHARED = REGISTRY.counter(
+    'krs_single_flight_shared_total', 'Reads answered by joining an identical call already in flight', ('source',))
+CALLBACKS_DEDUPED = REGISTRY.counter(
+    'krs_callbacks_deduped_total', 'Repeated button callbacks from the same chat that were not processed again')
+TELEGRAM_REQUEST_SECONDS = REGISTRY.histogram(
+    'krs_telegram_request_seconds', 'Telegram Bot API request latency (getUpdates includes long polling)', ('method',))
+TELEGRAM_REQUEST_ERRORS = REGISTRY.counter(
+    'krs_telegram_request_errors_total', 'Failed Telegram Bot API requests', ('method',))
+CALENDAR_REQUEST_SECONDS = REGISTRY.histogram(
+    'krs_calendar_request_seconds', 'Google Calendar API request latency', ('call',))
+CALENDAR_REQUEST_ERRORS = REGISTRY.counter(
+    'krs_calendar_request_errors_total', 'Failed Google Calendar API requests', ('call',))
+SWEEP_DURATION_SECONDS = REGISTRY.histogram(
+    'krs_sweep_duration_seconds', 'Duration of one event sweep', ('mode',), buckets=SWEEP_BUCKETS)
+DISPATCH_QUEUE_DEPTH = REGISTRY.gauge(
+    'krs_dispatch_queue_depth', 'Reminders registered and waiting for delivery')
+INBOUND_BACKLOG = REGISTRY.gauge(
+    'krs_inbound_backlog', 'Telegram updates fetched but not yet handled')
+UPDATES_REJECTED = REGISTRY.counter(
+    'krs_updates_rejected_total', 'Inbound updates dropped by admission control', ('reason',))
+REMINDER_LATENESS_SECONDS = REGISTRY.histogram(
+    'krs_reminder_lateness_seconds', 'Reminder send time minus scheduled time', buckets=LATENESS_BUCKETS)
+REMINDERS_SENT = REGISTRY.counter(
+    'krs_reminders_sent_total', 'Reminders delivered to a chat')
+WRITE_BEHIND_ROWS = REGISTRY.counter(
+    'krs_write_behind_rows_total', 'Buffered database writes by outcome (written, dropped, spilled)', ('table', 'outcome'))
+WRITE_BEHIND_PENDING = REGISTRY.gauge(
+    'krs_write_behind_pending', 'Buffered database writes not yet written')
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes are not worth a log line each
+
+
+class MetricsServer:
+    """Serve ``/metrics`` on a local port from a daemon thread"""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY, host: str = '127.0.0.1', port: int = 9464):
+        handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+        self._server = ThreadingHTTPServer((host, port), handler)
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(target=self._server.serve_forever, name='krs-metrics-http', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,147 @@
+"""Background metrics sampler for the KRS Reminder bot.
+
+``/stats`` used to call ``psutil.cpu_percent(interval=1)``, which blocks the
+Telegram polling thread for a second, and walked every scheduler job on each
+request. :class:`MetricsSampler` runs a daemon thread instead. Every few
+seconds it records CPU, memory, job counts, queue depths and the next run
+time into a ring buffer. ``/stats`` reads the latest sample in O(1) and gets
+short-term averages from the same buffer.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+import psutil
+
+from .clock import SYSTEM_CLOCK, Clock
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsSample:
+    """One point-in-time snapshot of the bot's health"""
+
+    __slots__ = (
+        'taken_at', 'monotonic', 'cpu_percent', 'memory_percent', 'rss_bytes',
+        'jobs', 'pending_jobs', 'next_run', 'queue_depth',
+    )
+
+    def __init__(
+        self,
+        taken_at: datetime.datetime,
+        cpu_percent: float,
+        memory_percent: float,
+        rss_bytes: int,
+        jobs: int = 0,
+        pending_jobs: int = 0,
+        next_run: Optional[datetime.datetime] = None,
+        queue_depth: int = 0,
+    ):
+        self.taken_at = taken_at
+        self.monotonic = time.monotonic()
+        self.cpu_percent = cpu_percent
+        self.memory_percent = memory_percent
+        self.rss_bytes = rss_bytes
+        self.jobs = jobs
+        self.pending_jobs = pending_jobs
+        self.next_run = next_run
+        self.queue_depth = queue_depth
+
+
+class MetricsSampler:
+    """Periodically sample system and scheduler metrics into a ring buffer"""
+
+    # Source of the sample timestamps
+    clock: Clock = SYSTEM_CLOCK
+
+    def __init__(
+        self,
+        collect_app: Callable[[], Dict],
+        interval_seconds: float = 5,
+        history_seconds: float = 900,
+        tz=None,
+        clock: Optional[Clock] = None,
+    ):
+        """
+        Initialize MetricsSampler
+
+        Args:
+            collect_app: Returns jobs, pending_jobs, next_run and queue_depth
+            interval_seconds: Time between samples
+            history_seconds: How much history the ring buffer keeps
+            tz: Timezone for sample timestamps
+            clock: Time source of the timestamps (default: system clock)
+        """
+        if clock is not None:
+            self.clock = clock
+        self.collect_app = collect_app
+        self.interval = max(0.5, interval_seconds)
+        self.tz = tz
+        capacity = max(2, int(history_seconds / self.interval) + 1)
+        self._samples: Deque[MetricsSample] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._process = psutil.Process()
+        # Prime the counter; the first non-blocking call always returns 0.0
+        psutil.cpu_percent(interval=None)
+
+    @property
+    def latest(self) -> Optional[MetricsSample]:
+        with self._lock:
+            return self._samples[-1] if self._samples else None
+
+    def sample_once(self) -> MetricsSample:
+        """Take one sample (non-blocking) and append it to the buffer"""
+        try:
+            app = self.collect_app() or {}
+        except Exception as e:
+            logger.warning("Metrics collection failed: %s", e)
+            app = {}
+
+        sample = MetricsSample(
+            taken_at=self.clock.now(self.tz),
+            cpu_percent=psutil.cpu_percent(interval=None),
+            memory_percent=psutil.virtual_memory().percent,
+            rss_bytes=self._process.memory_info().rss,
+            **app
+        )
+        with self._lock:
+            self._samples.append(sample)
+        return sample
+
+    def snapshot(self) -> MetricsSample:
+        """Latest sample, taking one now if the sampler has not run yet"""
+        return self.latest or self.sample_once()
+
+    def average(self, field: str, seconds: float) -> Optional[float]:
+        """Mean of a sample field over the last `seconds`"""
+        cutoff = time.monotonic() - seconds
+        with self._lock:
+            values = [getattr(sample, field) for sample in reversed(self._samples) if sample.monotonic >= cutoff]
+        if not values:
+            return None
+        return sum(values) / len(values)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='krs-metrics', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.interval)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample_once()
+            self._stop.wait(self.interval)
@@ -0,0 +1,170 @@
+"""Recording of incoming Telegram updates for load replay.
+
+When ``KRS_RECORD_UPDATES`` names a file, every batch returned by
+``getUpdates`` is appended to it as gzip-compressed JSON lines::
+
+    {"ts": 1727571600.123, "update": {...}}
+
+Updates are scrubbed before they reach the disk. Only the fields the
+dispatcher reads are kept (an allowlist, so new Telegram fields never leak):
+chat and user ids are replaced by keyed pseudonyms, names and usernames are
+dropped, command arguments (login secrets, usernames) become pseudonym tokens
+and free text keeps only its length. The same value always maps to the same
+pseudonym within one salt, so a replay still sees who sent what.
+
+Each batch is written as its own gzip member, so a crash loses at most the
+batch being written and :func:`read_recording` still reads everything before it.
+"""
+
+from __future__ import annotations
+
+import datetime
+import gzip
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from .clock import SYSTEM_CLOCK, Clock
+
+logger = logging.getLogger(__name__)
+
+# Prefix of pseudonymized /login secrets; replay seeds users with these keys
+SECRET_PREFIX = 'secret-'
+
+
+class UpdateScrubber:
+    """Removes personal data from Telegram updates, keeping their shape"""
+
+    def __init__(self, salt: Optional[str] = None):
+        """
+        Args:
+            salt: Pseudonym key (default: random, so pseudonyms differ per process)
+        """
+        self._key = (salt or secrets.token_hex(16)).encode('utf-8')
+
+    def _digest(self, value) -> str:
+        return hmac.new(self._key, str(value).encode('utf-8'), hashlib.sha256).hexdigest()
+
+    def pseudo_id(self, value: Optional[int]) -> Optional[int]:
+        """Stable pseudonym of a chat/user id (sign kept: group chats are negative)"""
+        if value is None:
+            return None
+        pseudonym = 10 ** 9 + int(self._digest(value)[:12], 16) % (9 * 10 ** 9)
+        return -pseudonym if int(value) < 0 else pseudonym
+
+    def pseudo_token(self, value: str, prefix: str = 'arg-') -> str:
+        return f"{prefix}{self._digest(value)[:10]}"
+
+    def scrub_text(self, text: str) -> str:
+        """Command kept, arguments pseudonymized; other text reduced to its length"""
+        stripped = text.strip()
+        if not stripped.startswith('/'):
+            return f"<text {len(stripped)}>"
+        command, *args = stripped.split()
+        prefix = SECRET_PREFIX if command.split('@', 1)[0].lower() == '/login' else 'arg-'
+        return ' '.join([command] + [self.pseudo_token(arg, prefix) for arg in args])
+
+    def scrub_message(self, message: Dict) -> Dict:
+        chat = message.get('chat') or {}
+        sender = message.get('from') or {}
+        scrubbed = {
+            'message_id': message.get('message_id'),
+            'date': message.get('date'),
+            'chat': {'id': self.pseudo_id(chat.get('id')), 'type': chat.get('type')},
+        }
+        if sender:
+            scrubbed['from'] = {'id': self.pseudo_id(sender.get('id')), 'is_bot': sender.get('is_bot', False)}
+        text = message.get('text')
+        if text:
+            scrubbed['text'] = self.scrub_text(text)
+            command = scrubbed['text'].split()[0]
+            # Only a leading command entity survives; its span is the (unchanged) command
+            if command.startswith('/') and any(
+                entity.get('type') == 'bot_command' and entity.get('offset', 0) == 0
+                for entity in message.get('entities') or []
+            ):
+                scrubbed['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(command)}]
+        return scrubbed
+
+    def scrub(self, update: Dict) -> Dict:
+        """Allowlisted copy of one update"""
+        scrubbed: Dict = {'update_id': update.get('update_id')}
+        for kind in ('message', 'edited_message'):
+            if update.get(kind):
+                scrubbed[kind] = self.scrub_message(update[kind])
+        callback_query = update.get('callback_query')
+        if callback_query:
+            message = callback_query.get('message') or {}
+            sender = callback_query.get('from') or {}
+            scrubbed['callback_query'] = {
+                'id': self.pseudo_token(callback_query.get('id', ''), 'cb-'),
+                'data': callback_query.get('data', ''),
+                'from': {'id': self.pseudo_id(sender.get('id'))},
+                'message': {
+                    'message_id': message.get('message_id'),
+                    'chat': {
+                        'id': self.pseudo_id((message.get('chat') or {}).get('id')),
+                        'type': (message.get('chat') or {}).get('type'),
+                    },
+                },
+            }
+        return scrubbed
+
+
+class UpdateRecorder:
+    """Appends scrubbed update batches to a gzip JSONL file"""
+
+    def __init__(self, path, salt: Optional[str] = None, clock: Clock = SYSTEM_CLOCK):
+        """
+        Args:
+            path: Recording file (created with its directory; appended to if it exists)
+            salt: Pseudonym key (see UpdateScrubber)
+            clock: Time source for the record timestamps
+        """
+        self.path = Path(path)
+        self.scrubber = UpdateScrubber(salt)
+        self.clock = clock
+        self.recorded = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def record(self, updates: List[Dict]):
+        """Append one getUpdates batch; failures are logged, never raised"""
+        ts = self.clock.now(datetime.timezone.utc).timestamp()
+        try:
+            lines = ''.join(
+                json.dumps({'ts': ts, 'update': self.scrubber.scrub(update)}, ensure_ascii=False) + '\n'
+                for update in updates
+            )
+            with self._lock:
+                with gzip.open(self.path, 'at', encoding='utf-8') as handle:
+                    handle.write(lines)
+                self.recorded += len(updates)
+        except Exception as e:
+            logger.warning("Failed to record %d update(s) to %s: %s", len(updates), self.path, e)
+
+
+def read_recording(path) -> Iterator[Dict]:
+    """
+    Records of a recording file, oldest first
+
+    Args:
+        path: File written by UpdateRecorder
+
+    Returns:
+        Iterator of {'ts': epoch seconds, 'update': scrubbed update}; a batch
+        cut short by a crash ends the iteration instead of raising
+    """
+    with gzip.open(path, 'rt', encoding='utf-8') as handle:
+        try:
+            for line in handle:
+                if line.strip():
+                    yield json.loads(line)
+        except (EOFError, zlib.error, json.JSONDecodeError) as e:
+            logger.warning("Recording %s ends with a truncated batch: %s", path, e)
@@ -0,0 +1,129 @@
+"""Pre-rendered reminder messages for the KRS Reminder bot.
+
+Reminder text depends on the event and the reminder slot only, except for
+the countdown. Messages are therefore rendered once when the reminder is
+scheduled into an immutable :class:`ReminderTemplate`; at fire time only
+the countdown is filled in. Templates live in a :class:`ReminderRenderCache`
+keyed by event fingerprint and slot, so users with identical events share
+the same render.
+"""
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+COUNTDOWN_MARKER = '\x00countdown\x00'
+
+
+def format_countdown(start_dt: datetime.datetime, now: datetime.datetime) -> str:
+    """Countdown text shown in reminders (e.g. ``2j 15m``)"""
+    seconds = (start_dt - now).total_seconds()
+    if seconds > 0:
+        hours_left = int(seconds // 3600)
+        minutes_left = int((seconds % 3600) // 60)
+        return f"{hours_left}j {minutes_left}m"
+    return "Dimulai sekarang!"
+
+
+def event_fingerprint(event: Dict) -> str:
+    """
+    Content fingerprint of an event
+
+    Two events with the same title, time, location and description render
+    to the same reminder text, regardless of which user they belong to.
+    """
+    start = event.get('start', {})
+    end = event.get('end', {})
+    return content_fingerprint((
+        event.get('summary', '') or '',
+        start.get('dateTime') or start.get('date') or '',
+        end.get('dateTime') or end.get('date') or '',
+        event.get('location', '') or '',
+        event.get('description', '') or '',
+    ))
+
+
+def content_fingerprint(parts: Tuple[str, ...]) -> str:
+    """Stable hash of the text fields a reminder is rendered from"""
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def reminder_slot(hours_before: Optional[int]) -> str:
+    """Slot name used in cache keys (``5h`` ... ``exact``)"""
+    return f"{hours_before}h" if hours_before else 'exact'
+
+
+class ReminderTemplate:
+    """Rendered reminder with a hole for the countdown"""
+
+    __slots__ = ('prefix', 'suffix', 'compact_prefix', 'compact_suffix', 'start_dt')
+
+    def __init__(self, text: str, start_dt: datetime.datetime, compact: Optional[str] = None):
+        """
+        Args:
+            text: Fully rendered message containing COUNTDOWN_MARKER once
+            start_dt: Localized class start time
+            compact: Short block used when several reminders are combined
+        """
+        prefix, _, suffix = text.partition(COUNTDOWN_MARKER)
+        compact_prefix, _, compact_suffix = (compact if compact is not None else text).partition(COUNTDOWN_MARKER)
+        object.__setattr__(self, 'prefix', prefix)
+        object.__setattr__(self, 'suffix', suffix)
+        object.__setattr__(self, 'compact_prefix', compact_prefix)
+        object.__setattr__(self, 'compact_suffix', compact_suffix)
+        object.__setattr__(self, 'start_dt', start_dt)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ReminderTemplate is immutable")
+
+    def render(self, now: datetime.datetime) -> str:
+        """Fill in the countdown relative to now"""
+        return self.prefix + format_countdown(self.start_dt, now) + self.suffix
+
+    def render_compact(self, now: datetime.datetime) -> str:
+        """Short block for combined reminders, countdown filled in"""
+        return self.compact_prefix + format_countdown(self.start_dt, now) + self.compact_suffix
+
+
+class ReminderRenderCache:
+    """Thread-safe LRU cache of reminder templates"""
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Hashable, ReminderTemplate]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_render(self, key: Tuple[str, str], render: Callable[[], ReminderTemplate]) -> ReminderTemplate:
+        """
+        Return the cached template for key, rendering it on a miss
+
+        Args:
+            key: (event fingerprint, slot)
+            render: Callable building the template
+        """
+        with self._lock:
+            template = self._entries.get(key)
+            if template is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return template
+
+        # Render outside the lock; a duplicate render on a race is harmless
+        template = render()
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = template
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return template
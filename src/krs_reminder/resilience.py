@@ -0,0 +1,201 @@
+"""Failure handling for the hosted database.
+
+:class:`CircuitBreaker` stops calling a backend that keeps failing: after
+``failure_threshold`` consecutive transient failures it opens and every call
+fails at once with :class:`CircuitOpenError` instead of waiting for its
+timeout. After ``reset_seconds`` a single probe call is let through
+(half-open); its success closes the breaker, its failure opens it again.
+
+:class:`StaleCache` keeps the last good result of reads so they can still be
+answered while the backend is unreachable. Such answers are returned as
+:class:`StaleList` / :class:`StaleDict`, which behave like the plain list or
+dict but carry the time the data was read; :func:`stale_since` tells callers
+(e.g. to show a notice, or not to cache a render of it).
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Hashable, Optional
+
+import requests
+
+from .clock import SYSTEM_CLOCK, Clock
+
+logger = logging.getLogger(__name__)
+
+
+def is_transient(error: Exception) -> bool:
+    """True for failures worth retrying later (unreachable or overloaded database)"""
+    if isinstance(error, requests.HTTPError):
+        status = error.response.status_code if error.response is not None else 0
+        return status >= 500 or status == 429
+    return isinstance(error, (requests.ConnectionError, requests.Timeout, sqlite3.OperationalError, OSError))
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Call refused without contacting the backend because the breaker is open"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with half-open probing"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    # Exported as a gauge
+    STATE_VALUES = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+    # Time source for the reset timeout
+    clock: Clock = SYSTEM_CLOCK
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 30.0, clock: Optional[Clock] = None):
+        """
+        Args:
+            name: Backend name used in log lines and errors
+            failure_threshold: Consecutive transient failures that open the breaker
+            reset_seconds: Time the breaker stays open before a probe call
+            clock: Time source (default: system clock)
+        """
+        if clock is not None:
+            self.clock = clock
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self._state = self.CLOSED
+        self._opened_at: Optional[datetime] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def before_call(self):
+        """
+        Admit a call or refuse it
+
+        Raises:
+            CircuitOpenError: While open, and in half-open state while the probe runs
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            if self._state == self.OPEN:
+                if self.clock.utcnow() - self._opened_at < timedelta(seconds=self.reset_seconds):
+                    raise CircuitOpenError(f"{self.name}: circuit open")
+                self._state = self.HALF_OPEN
+                self._probing = False
+            if self._probing:
+                raise CircuitOpenError(f"{self.name}: circuit half-open, probe in progress")
+            self._probing = True
+        logger.info("%s circuit half-open, probing", self.name)
+
+    def record_success(self):
+        """The backend answered (any non-transient outcome)"""
+        with self._lock:
+            recovered = self._state != self.CLOSED
+            self._state = self.CLOSED
+            self.failures = 0
+            self._probing = False
+        if recovered:
+            logger.info("%s circuit closed, backend reachable again", self.name)
+
+    def record_failure(self):
+        """The backend was unreachable, timed out or overloaded"""
+        with self._lock:
+            self.failures += 1
+            opened = self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self.failures >= self.failure_threshold
+            )
+            if opened:
+                self._state = self.OPEN
+                self._opened_at = self.clock.utcnow()
+            self._probing = False
+        if opened:
+            logger.warning(
+                "%s circuit open after %d failure(s), failing fast for %.0fs",
+                self.name, self.failures, self.reset_seconds
+            )
+
+
+class StaleList(list):
+    """List read earlier, served while the backend is unreachable"""
+
+    def __init__(self, rows, since: datetime):
+        super().__init__(rows)
+        self.stale_since = since
+
+
+class StaleDict(dict):
+    """Row read earlier, served while the backend is unreachable"""
+
+    def __init__(self, row, since: datetime):
+        super().__init__(row)
+        self.stale_since = since
+
+
+def stale_since(value) -> Optional[datetime]:
+    """When a stale answer was read (UTC), None for a fresh one"""
+    return getattr(value, 'stale_since', None)
+
+
+def mark_stale(value, since: datetime):
+    """Copy of a cached list of rows or row, marked as stale"""
+    if isinstance(value, dict):
+        return StaleDict(value, since)
+    return StaleList([dict(row) if isinstance(row, dict) else row for row in value], since)
+
+
+class StaleCache:
+    """Bounded last-known-good store of read results (least recently used evicted)"""
+
+    # Time source for the read timestamps
+    clock: Clock = SYSTEM_CLOCK
+
+    def __init__(self, max_entries: int = 4096, clock: Optional[Clock] = None):
+        if clock is not None:
+            self.clock = clock
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def put(self, key: Hashable, value, read_at: Optional[datetime] = None):
+        """Remember a good read (made now, or at read_at); None (nothing found) forgets the key"""
+        if value is None:
+            self.discard(key)
+            return
+        read_at = read_at or self.clock.utcnow().replace(tzinfo=timezone.utc)
+        with self._lock:
+            self._entries[key] = (read_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: Hashable) -> Optional[tuple]:
+        """(read_at, value) of the last good read, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def discard(self, key: Hashable):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def discard_where(self, predicate: Callable[[Hashable, object], bool]):
+        """Forget every entry for which predicate(key, value) is true"""
+        with self._lock:
+            for key in [key for key, (_, value) in self._entries.items() if predicate(key, value)]:
+                del self._entries[key]
@@ -0,0 +1,165 @@
+"""Rendered schedule cache for the KRS Reminder bot.
+
+A user's schedule only changes when an admin imports it, yet every
+``/jadwal``, weekly button and day button used to query Supabase and
+re-render everything. :class:`RenderedScheduleCache`
+keeps the rendered sections keyed by user, schedule version, local date and
+VA/VB week. Bumping a user's version makes the old entries unreachable; they
+are dropped right away and the cache stays bounded by an LRU byte budget.
+
+:class:`WeekPrefetchBuffer` holds the parsed week for a chat that just
+opened the daily menu, so the day taps that follow need no query either.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+ScheduleCacheKey = Tuple
+
+
+def _sections_size(key: ScheduleCacheKey, sections: Tuple[str, ...]) -> int:
+    """Approximate memory held by one entry (strings, list and key)"""
+    return (
+        sys.getsizeof(sections)
+        + sum(sys.getsizeof(section) for section in sections)
+        + sys.getsizeof(key)
+    )
+
+
+class RenderedScheduleCache:
+    """Thread-safe LRU of rendered schedule sections with per-user versions"""
+
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024):
+        """
+        Args:
+            max_bytes: Memory budget for all cached sections
+        """
+        self.max_bytes = max(0, max_bytes)
+        self._entries: "OrderedDict[ScheduleCacheKey, Tuple[Tuple[str, ...], int]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def version(self, user_id: str) -> int:
+        return self._versions.get(user_id, 0)
+
+    def bump(self, user_id: str) -> int:
+        """Invalidate a user's rendered schedules (after import/sync)"""
+        with self._lock:
+            version = self._versions.get(user_id, 0) + 1
+            self._versions[user_id] = version
+            for key in [key for key in self._entries if key[0] == user_id]:
+                self._drop(key)
+        return version
+
+    def key(self, user_id: str, kind: str, local_date, week_label: str, target_date=None) -> ScheduleCacheKey:
+        """Cache key; user_id first so a version bump can find its entries"""
+        return (user_id, self.version(user_id), kind, local_date, target_date, week_label)
+
+    def get(self, key: ScheduleCacheKey) -> Optional[Tuple[str, ...]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: ScheduleCacheKey, sections: List[str]) -> Tuple[str, ...]:
+        """Store rendered sections (kept as an immutable tuple) and return them"""
+        sections = tuple(sections)
+        size = _sections_size(key, sections)
+        with self._lock:
+            if key[1] != self._versions.get(key[0], 0):
+                return sections  # Rendered from rows that were replaced meanwhile
+            if key in self._entries:
+                self._drop(key)
+            if size > self.max_bytes:
+                return sections
+            self._entries[key] = (sections, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+        return sections
+
+    def _drop(self, key: ScheduleCacheKey):
+        _, size = self._entries.pop(key)
+        self.bytes -= size
+
+
+class WeekPrefetchBuffer:
+    """
+    Short-lived per-chat copy of the week's parsed schedules
+
+    Opening the daily menu loads the week once; the following day taps of
+    the same interaction are answered from memory instead of the database.
+    """
+
+    def __init__(self, ttl_seconds: float = 120):
+        self.ttl = ttl_seconds
+        self._entries: Dict[str, Tuple[float, str, int, object, object, list]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def put(self, chat_id, user_id: str, version: int, range_start, range_end, views: list):
+        """
+        Args:
+            chat_id: Chat that opened the daily menu
+            user_id: Logged-in user of the chat
+            version: Schedule version the views were loaded at
+            range_start: First local date covered
+            range_end: Day after the last local date covered
+            views: Parsed EventViews of the range
+        """
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[str(chat_id)] = (expires, user_id, version, range_start, range_end, views)
+            # Keep the buffer small: drop whatever already expired
+            now = time.monotonic()
+            for key in [key for key, entry in self._entries.items() if entry[0] <= now]:
+                del self._entries[key]
+
+    def is_fresh(self, chat_id, user_id: str, version: int, range_start) -> bool:
+        """True if the chat already holds an unexpired copy of this week"""
+        with self._lock:
+            entry = self._entries.get(str(chat_id))
+        return (
+            entry is not None
+            and entry[0] > time.monotonic()
+            and entry[1:4] == (user_id, version, range_start)
+        )
+
+    def get_day(self, chat_id, user_id: str, version: int, day) -> Optional[list]:
+        """Views of one local date, or None if the buffer cannot answer"""
+        with self._lock:
+            entry = self._entries.get(str(chat_id))
+            if entry is None:
+                return None
+            expires, buffered_user, buffered_version, range_start, range_end, views = entry
+            if expires <= time.monotonic():
+                del self._entries[str(chat_id)]
+                return None
+            if buffered_user != user_id or buffered_version != version:
+                return None
+            if not range_start <= day < range_end:
+                return None
+            self.hits += 1
+        return [view for view in views if view.start.date() == day]
+
+    def discard(self, chat_id):
+        with self._lock:
+            self._entries.pop(str(chat_id), None)
@@ -0,0 +1,262 @@
+"""Semester calendar for VA/VB week computation.
+
+The bot used to hardcode the semester start (29 September 2025) and rebuild
+the week number and VA/VB status dict on every ``/start``, menu and schedule
+render. :class:`SemesterCalendar` is built once from configuration (start date,
+break weeks such as UTS/UAS that shift the VA/VB alternation, and any number
+of semesters). At startup it is precomputed into a date-indexed table of
+shared read-only week statuses, so a lookup is a single dict access.
+
+A calendar file looks like::
+
+    {
+      "semesters": [
+        {
+          "name": "Ganjil 2025/2026",
+          "start": "2025-09-29",
+          "weeks": 16,
+          "first_week": "VA",
+          "breaks": {"8": "UTS", "16": "UAS"}
+        }
+      ]
+    }
+
+Break weeks keep their calendar week number (``Minggu ke-8``) but are not
+counted for VA/VB, so the week after a break continues the alternation.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+
+
+class Semester:
+    """One semester: start date, length, first week type and break weeks"""
+
+    __slots__ = ('name', 'start', 'weeks', 'first_is_va', 'breaks')
+
+    def __init__(
+        self,
+        start: datetime.date,
+        weeks: int = 16,
+        name: str = '',
+        first_week: str = 'VA',
+        breaks: Optional[Dict[int, str]] = None,
+    ):
+        """
+        Args:
+            start: First day of week 1
+            weeks: Number of weeks precomputed for this semester
+            name: Display name (e.g. 'Ganjil 2025/2026')
+            first_week: Type of the first teaching week, 'VA' or 'VB'
+            breaks: Week number -> label of weeks without VA/VB (e.g. {8: 'UTS'})
+        """
+        first_week = first_week.upper()
+        if first_week not in ('VA', 'VB'):
+            raise ValueError(f"first_week must be 'VA' or 'VB', got {first_week!r}")
+        if weeks < 1:
+            raise ValueError(f"Semester needs at least one week, got {weeks}")
+
+        self.name = name
+        self.start = start
+        self.weeks = weeks
+        self.first_is_va = first_week == 'VA'
+        self.breaks = {int(week): str(label) for week, label in (breaks or {}).items()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Semester':
+        return cls(
+            start=datetime.date.fromisoformat(data['start']),
+            weeks=int(data.get('weeks', 16)),
+            name=data.get('name', ''),
+            first_week=data.get('first_week', 'VA'),
+            breaks=data.get('breaks'),
+        )
+
+
+def _format_range(week_start: datetime.date, week_end: datetime.date) -> str:
+    return f"{week_start.strftime('%d %b')} - {week_end.strftime('%d %b %Y')}"
+
+
+def build_week_status(
+    week_num: int,
+    week_start: datetime.date,
+    is_va: Optional[bool],
+    break_label: Optional[str] = None,
+) -> Mapping:
+    """
+    Read-only VA/VB status of one week
+
+    Args:
+        week_num: Calendar week number within the semester (1-based)
+        week_start: First day of the week
+        is_va: True for VA, False for VB; ignored for break weeks
+        break_label: Label of a break week (e.g. 'UTS'), None for teaching weeks
+
+    Returns:
+        Mapping with is_va, week_type, week_num, icon, label, description,
+        detailed_header, detailed_info (and joined as detailed_text),
+        week_start and week_end
+    """
+    week_end = week_start + datetime.timedelta(days=6)
+    date_range = _format_range(week_start, week_end)
+
+    if break_label:
+        status = {
+            'is_va': False,
+            'week_type': break_label.upper(),
+            'week_num': week_num,
+            'icon': '🗓️',
+            'label': f'{break_label} - Tanpa VA/VB',
+            'description': f'Minggu {break_label}, tidak dihitung sebagai VA/VB',
+            'detailed_header': f'🗓️ MINGGU {break_label.upper()}',
+            'detailed_info': (
+                f'📅 Minggu ke-{week_num} ({date_range})',
+                f'📝 Minggu {break_label}: ikuti pengumuman kampus',
+                '🔁 Pola VA/VB berlanjut setelah minggu ini',
+            ),
+        }
+    elif is_va:
+        status = {
+            'is_va': True,
+            'week_type': 'VA',
+            'week_num': week_num,
+            'icon': '🏠',
+            'label': 'Online - Minggu VA',
+            'description': 'Semua kelas online (tidak ada tatap muka)',
+            'detailed_header': '🏠 MINGGU VA - KELAS ONLINE',
+            'detailed_info': (
+                f'📅 Minggu ke-{week_num} ({date_range})',
+                '💻 Semua kelas dilaksanakan secara ONLINE',
+                '⚠️ TIDAK ADA tatap muka di kampus minggu ini',
+                '🏠 Kuliah dari rumah',
+            ),
+        }
+    else:
+        status = {
+            'is_va': False,
+            'week_type': 'VB',
+            'week_num': week_num,
+            'icon': '🏫',
+            'label': 'Tatap Muka - Minggu VB',
+            'description': 'Semua kelas dilaksanakan tatap muka',
+            'detailed_header': '🏫 MINGGU VB - TATAP MUKA',
+            'detailed_info': (
+                f'📅 Minggu ke-{week_num} ({date_range})',
+                '🏫 Semua kelas dilaksanakan TATAP MUKA di kampus',
+                '✅ Hadir ke lokasi sesuai jadwal',
+                '📍 Cek lokasi ruangan di jadwal',
+            ),
+        }
+
+    status['detailed_text'] = '\n'.join(status['detailed_info'])
+    status['week_start'] = week_start
+    status['week_end'] = week_end
+    return MappingProxyType(status)
+
+
+class SemesterCalendar:
+    """Date-indexed table of week statuses, precomputed for all semesters"""
+
+    def __init__(self, semesters: List[Semester]):
+        if not semesters:
+            raise ValueError("Semester calendar needs at least one semester")
+
+        self.semesters: Tuple[Semester, ...] = tuple(sorted(semesters, key=lambda s: s.start))
+        # Statuses past the precomputed range, built once per week on demand
+        self._overflow: Dict[Tuple[int, int], Mapping] = {}
+        self._table: Dict[datetime.date, Mapping] = {}
+
+        for index, semester in enumerate(self.semesters):
+            for week_index in range(semester.weeks):
+                status = self._week(index, week_index)
+                for offset in range(7):
+                    self._table.setdefault(status['week_start'] + datetime.timedelta(days=offset), status)
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def status(self, day) -> Mapping:
+        """
+        Week status of a date (or datetime; its own date is used)
+
+        Dates before the first semester map to its first week, dates after a
+        semester's precomputed weeks continue its numbering until the next
+        semester starts.
+        """
+        if isinstance(day, datetime.datetime):
+            day = day.date()
+
+        status = self._table.get(day)
+        if status is not None:
+            return status
+
+        index = self._semester_index(day)
+        if index is None:
+            return self._table[self.semesters[0].start]
+        week_index = (day - self.semesters[index].start).days // 7
+        return self._week(index, week_index)
+
+    def week_number(self, day) -> int:
+        return self.status(day)['week_num']
+
+    def is_va_week(self, day) -> bool:
+        return self.status(day)['is_va']
+
+    def week_range(self, day) -> Tuple[datetime.date, datetime.date]:
+        status = self.status(day)
+        return status['week_start'], status['week_end']
+
+    def _semester_index(self, day: datetime.date) -> Optional[int]:
+        found = None
+        for index, semester in enumerate(self.semesters):
+            if semester.start > day:
+                break
+            found = index
+        return found
+
+    def _week(self, index: int, week_index: int) -> Mapping:
+        key = (index, week_index)
+        status = self._overflow.get(key)
+        if status is not None:
+            return status
+
+        semester = self.semesters[index]
+        week_num = week_index + 1
+        week_start = semester.start + datetime.timedelta(days=week_index * 7)
+        break_label = semester.breaks.get(week_num)
+        teaching_weeks = week_num - sum(1 for week in semester.breaks if week < week_num)
+        is_va = (teaching_weeks % 2 == 1) == semester.first_is_va
+        status = build_week_status(week_num, week_start, is_va, break_label)
+
+        if week_index >= semester.weeks:
+            self._overflow[key] = status
+        return status
+
+
+def load_semester_calendar(
+    path: Optional[Path] = None,
+    default_start: str = '2025-09-29',
+    default_weeks: int = 16,
+) -> SemesterCalendar:
+    """
+    Load the semester calendar from a JSON file
+
+    Args:
+        path: Calendar file; if missing, a single semester is built from the defaults
+        default_start: Start date (YYYY-MM-DD) of the fallback semester
+        default_weeks: Length of the fallback semester
+
+    Returns:
+        Precomputed SemesterCalendar
+    """
+    if path is not None and Path(path).exists():
+        with Path(path).open('r', encoding='utf-8') as handle:
+            data = json.load(handle)
+        return SemesterCalendar([Semester.from_dict(entry) for entry in data.get('semesters', [])])
+
+    return SemesterCalendar([Semester(datetime.date.fromisoformat(default_start), weeks=default_weeks)])
@@ -0,0 +1,119 @@
+"""Collapse duplicate work on the read path.
+
+:class:`SingleFlight` lets concurrent callers asking for the same key share
+one call: the first caller runs it, the others wait and get the same result
+(or the same exception). Nothing is cached; the next call after it returns
+runs again. Results are shared objects and must not be mutated by callers.
+
+:class:`RecentCallbacks` remembers which button each chat pressed in the last
+few seconds, so a double tap (or Telegram's resend of an unanswered
+callback) is answered once.
+"""
+
+from __future__ import annotations
+
+import datetime
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .clock import SYSTEM_CLOCK, Clock
+from .metrics import SINGLE_FLIGHT_SHARED
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """One in-flight call per key, shared by every concurrent caller"""
+
+    def __init__(self, name: str):
+        """
+        Args:
+            name: Source label of the shared-call metric (e.g. 'supabase')
+        """
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn, or wait for the identical call already running
+
+        Args:
+            key: Identity of the call (same key = same result)
+            fn: Performs the call
+
+        Returns:
+            Result of fn (raises its exception)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            SINGLE_FLIGHT_SHARED.inc(source=self.name)
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class RecentCallbacks:
+    """Per-chat dedupe window for repeated button callbacks"""
+
+    # Time source for the window
+    clock: Clock = SYSTEM_CLOCK
+
+    def __init__(self, window_seconds: float, clock: Optional[Clock] = None):
+        """
+        Args:
+            window_seconds: Same button from the same chat within this many
+                seconds is a repeat (0 disables deduplication)
+            clock: Time source (default: system clock)
+        """
+        if clock is not None:
+            self.clock = clock
+        self.window = datetime.timedelta(seconds=max(0.0, window_seconds))
+        self._seen: 'OrderedDict[Hashable, datetime.datetime]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def is_repeat(self, chat_id, data: str) -> bool:
+        """True if the chat pressed this button within the window; otherwise remember it"""
+        if not self.window:
+            return False
+        now = self.clock.utcnow()
+        key = (chat_id, data)
+        with self._lock:
+            # Entries are in press order: expired ones are at the front
+            while self._seen:
+                oldest_key, pressed = next(iter(self._seen.items()))
+                if now - pressed < self.window:
+                    break
+                del self._seen[oldest_key]
+            if key in self._seen:
+                return True
+            self._seen[key] = now
+            return False
@@ -0,0 +1,199 @@
+"""Local snapshot of upcoming schedules for offline serving and fast startup.
+
+After every complete sweep the bot writes what it just read: the users it
+swept, their active sessions (user -> chat bindings) and their upcoming
+schedule rows, or the Calendar events in single-user mode. The file is a
+small SQLite database indexed by user and start time, replaced atomically,
+so a crash mid-write leaves the previous snapshot intact.
+
+On startup :func:`load_snapshot` reads it back in a few milliseconds; the
+bot registers reminders from it before the remote source has answered and
+reconciles with the first real sweep in the background.
+
+Credentials are left out: user rows keep only id and username, session rows
+lose their token.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Bumped when the file layout changes; other versions are ignored on load
+SNAPSHOT_VERSION = 1
+# user_id of the Calendar events of single-user mode
+SINGLE_USER = ''
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE users (user_id TEXT PRIMARY KEY, username TEXT NOT NULL);
+CREATE TABLE sessions (telegram_chat_id INTEGER NOT NULL, user_id TEXT NOT NULL, row TEXT NOT NULL);
+CREATE TABLE events (user_id TEXT NOT NULL, start_time TEXT NOT NULL, row TEXT NOT NULL);
+CREATE INDEX idx_events_user_start ON events (user_id, start_time);
+CREATE INDEX idx_sessions_user ON sessions (user_id);
+"""
+
+_SESSION_COLUMNS = ('session_id', 'user_id', 'telegram_chat_id', 'is_active', 'expires_at', 'created_at')
+
+
+def _utc(raw: str) -> datetime:
+    value = datetime.fromisoformat(raw.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _start_key(row: Dict) -> str:
+    """Sortable UTC start of a schedules row or Calendar event"""
+    raw = row.get('start_time') or (row.get('start') or {}).get('dateTime') or (row.get('start') or {}).get('date') or ''
+    try:
+        return _utc(raw).isoformat()
+    except ValueError:
+        return raw
+
+
+class ScheduleSnapshot:
+    """Users, chat bindings and upcoming events as of one sweep"""
+
+    def __init__(
+        self,
+        mode: str,
+        written_at: datetime,
+        window_end: datetime,
+        users: List[Dict],
+        sessions: List[Dict],
+        events: Dict[str, List[Dict]],
+    ):
+        """
+        Args:
+            mode: 'multi' (schedules rows per user) or 'single' (Calendar events)
+            written_at: When the data was read (timezone-aware)
+            window_end: End of the window the sweep read
+            users: User rows (only user_id and username are kept)
+            sessions: Active session rows
+            events: user_id (SINGLE_USER in single-user mode) -> rows ordered by start
+        """
+        self.mode = mode
+        self.written_at = written_at
+        self.window_end = window_end
+        self.users = [{'user_id': user['user_id'], 'username': user.get('username', '')} for user in users]
+        self.sessions = [
+            {column: session.get(column) for column in _SESSION_COLUMNS if column in session}
+            for session in sessions
+        ]
+        self.events = events
+
+    def chats_of(self, user_id: str, now: Optional[datetime] = None) -> List[int]:
+        """Chats bound to a user (by sessions not expired at `now`), without repeats"""
+        return list(dict.fromkeys(
+            session['telegram_chat_id'] for session in self.sessions
+            if session.get('user_id') == user_id
+            and (now is None or not session.get('expires_at') or _utc(session['expires_at']) > now)
+        ))
+
+    @property
+    def event_count(self) -> int:
+        return sum(len(rows) for rows in self.events.values())
+
+
+def write_snapshot(path: Union[str, Path], snapshot: ScheduleSnapshot) -> int:
+    """
+    Write a snapshot, replacing the previous one atomically
+
+    Args:
+        path: Snapshot file (directory created if needed)
+        snapshot: Data to write
+
+    Returns:
+        Size of the file in bytes
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + '.tmp')
+    if temporary.exists():
+        temporary.unlink()
+
+    conn = sqlite3.connect(str(temporary), isolation_level=None)
+    try:
+        conn.execute('PRAGMA journal_mode=OFF')
+        conn.execute('PRAGMA synchronous=OFF')
+        conn.executescript(SCHEMA)
+        conn.execute('BEGIN')
+        conn.executemany('INSERT INTO meta (key, value) VALUES (?, ?)', [
+            ('version', str(SNAPSHOT_VERSION)),
+            ('mode', snapshot.mode),
+            ('written_at', snapshot.written_at.isoformat()),
+            ('window_end', snapshot.window_end.isoformat()),
+        ])
+        conn.executemany(
+            'INSERT OR REPLACE INTO users (user_id, username) VALUES (?, ?)',
+            [(user['user_id'], user['username']) for user in snapshot.users]
+        )
+        conn.executemany(
+            'INSERT INTO sessions (telegram_chat_id, user_id, row) VALUES (?, ?, ?)',
+            [(session['telegram_chat_id'], session['user_id'], json.dumps(session)) for session in snapshot.sessions]
+        )
+        conn.executemany(
+            'INSERT INTO events (user_id, start_time, row) VALUES (?, ?, ?)',
+            [
+                (user_id, _start_key(row), json.dumps(row, default=str))
+                for user_id, rows in snapshot.events.items()
+                for row in rows
+            ]
+        )
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+
+    # The rename is the commit point: readers see the old or the new file
+    with temporary.open('rb') as handle:
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+    return path.stat().st_size
+
+
+def load_snapshot(path: Union[str, Path]) -> Optional[ScheduleSnapshot]:
+    """
+    Read a snapshot
+
+    Returns:
+        The snapshot, or None if the file is missing, unreadable or of another version
+    """
+    path = Path(path)
+    if not path.exists():
+        return None
+    try:
+        conn = sqlite3.connect(f'file:{path}?mode=ro', uri=True)
+        try:
+            meta = dict(conn.execute('SELECT key, value FROM meta').fetchall())
+            if meta.get('version') != str(SNAPSHOT_VERSION):
+                logger.warning("Ignoring snapshot %s of version %s", path, meta.get('version'))
+                return None
+            users = [
+                {'user_id': user_id, 'username': username}
+                for user_id, username in conn.execute('SELECT user_id, username FROM users')
+            ]
+            sessions = [json.loads(row) for (row,) in conn.execute('SELECT row FROM sessions ORDER BY rowid')]
+            events: Dict[str, List[Dict]] = {}
+            for user_id, row in conn.execute('SELECT user_id, row FROM events ORDER BY user_id, start_time'):
+                events.setdefault(user_id, []).append(json.loads(row))
+        finally:
+            conn.close()
+        return ScheduleSnapshot(
+            meta['mode'],
+            datetime.fromisoformat(meta['written_at']),
+            datetime.fromisoformat(meta['window_end']),
+            users,
+            sessions,
+            events,
+        )
+    except (sqlite3.Error, KeyError, ValueError) as e:
+        logger.warning("Ignoring unreadable snapshot %s: %s", path, e)
+        return None
@@ -0,0 +1,571 @@
+"""Local SQLite storage backend.
+
+Same tables, constraints and indexes as ``migrations/001_initial_schema.sql``
+(UUIDs and timestamps stored as text), in a single file opened in WAL mode,
+so other processes (backups, the sqlite3 shell) can read while the bot
+writes. The bot's threads share one connection; queries take well under a
+millisecond, so they are simply serialised by a lock. Every query is a
+constant, parameterised SQL string; ``sqlite3`` keeps those statements
+prepared in its per-connection statement cache. Calls are recorded in the
+same latency/error metrics as PostgREST requests, with the matching HTTP
+verb as method.
+
+Timestamps are stored in UTC with a fixed-width ISO format, so comparing
+the text compares the times.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from .clock import SYSTEM_CLOCK, Clock
+from .metrics import DB_REQUEST_ERRORS, DB_REQUEST_SECONDS, track
+from .storage import Storage
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user_id TEXT PRIMARY KEY,
+    username VARCHAR(50) UNIQUE NOT NULL,
+    secret_key_hash VARCHAR(255) NOT NULL,
+    google_calendar_token_encrypted TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
+
+CREATE TABLE IF NOT EXISTS schedules (
+    schedule_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    course_name VARCHAR(255) NOT NULL,
+    course_code VARCHAR(50),
+    day_of_week INTEGER,
+    start_time TEXT NOT NULL,
+    end_time TEXT NOT NULL,
+    location VARCHAR(255),
+    facilitator VARCHAR(255),
+    class_type VARCHAR(50),
+    google_event_id VARCHAR(255),
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    UNIQUE(user_id, google_event_id)
+);
+CREATE INDEX IF NOT EXISTS idx_schedules_user_id ON schedules(user_id);
+CREATE INDEX IF NOT EXISTS idx_schedules_start_time ON schedules(start_time);
+CREATE INDEX IF NOT EXISTS idx_schedules_user_start ON schedules(user_id, start_time);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    telegram_chat_id BIGINT NOT NULL,
+    session_token VARCHAR(255) UNIQUE NOT NULL,
+    is_active BOOLEAN DEFAULT 1,
+    created_at TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    last_activity TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_telegram_chat_id ON sessions(telegram_chat_id);
+CREATE INDEX IF NOT EXISTS idx_sessions_active ON sessions(is_active, expires_at);
+CREATE INDEX IF NOT EXISTS idx_sessions_token ON sessions(session_token);
+
+CREATE TABLE IF NOT EXISTS admins (
+    admin_id TEXT PRIMARY KEY,
+    telegram_chat_id BIGINT UNIQUE NOT NULL,
+    permissions TEXT DEFAULT '{"can_add_user": true, "can_delete_user": true, "can_import_schedule": true, "can_view_all_users": true}',
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_admins_telegram_chat_id ON admins(telegram_chat_id);
+
+CREATE TABLE IF NOT EXISTS reminders (
+    reminder_id TEXT PRIMARY KEY,
+    user_id TEXT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    schedule_id TEXT NOT NULL REFERENCES schedules(schedule_id) ON DELETE CASCADE,
+    reminder_type VARCHAR(20) NOT NULL,
+    scheduled_time TEXT NOT NULL,
+    sent_at TEXT,
+    status VARCHAR(20) DEFAULT 'pending',
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reminders_user_schedule ON reminders(user_id, schedule_id);
+CREATE INDEX IF NOT EXISTS idx_reminders_status_time ON reminders(status, scheduled_time);
+CREATE INDEX IF NOT EXISTS idx_reminders_pending ON reminders(status) WHERE status = 'pending';
+"""
+
+# Initial admin (owner), as inserted by the migration
+OWNER_ADMIN = (
+    5476148500,
+    {"can_add_user": True, "can_delete_user": True, "can_import_schedule": True,
+     "can_view_all_users": True, "is_owner": True},
+)
+
+# Primary key column and the columns callers may set, per table
+_TABLES = {
+    'users': ('user_id', ('username', 'secret_key_hash', 'google_calendar_token_encrypted')),
+    'schedules': ('schedule_id', (
+        'user_id', 'course_name', 'course_code', 'day_of_week', 'start_time', 'end_time',
+        'location', 'facilitator', 'class_type', 'google_event_id',
+    )),
+    'sessions': ('session_id', ('user_id', 'telegram_chat_id', 'session_token', 'is_active', 'expires_at')),
+    'admins': ('admin_id', ('telegram_chat_id', 'permissions')),
+    'reminders': ('reminder_id', ('user_id', 'schedule_id', 'reminder_type', 'scheduled_time', 'sent_at', 'status')),
+}
+# Timestamp columns set by the database (NOW() defaults in the migration)
+_DEFAULT_TIMES = {
+    'users': ('created_at', 'updated_at'),
+    'schedules': ('created_at', 'updated_at'),
+    'sessions': ('created_at', 'last_activity'),
+    'admins': ('created_at',),
+    'reminders': ('created_at',),
+}
+_TIME_COLUMNS = frozenset({'start_time', 'end_time', 'expires_at', 'scheduled_time', 'sent_at'})
+
+
+def _timestamp(value: Union[datetime, str]) -> str:
+    """UTC, fixed-width ISO text of a timestamp (naive values are UTC, as in Postgres)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).isoformat(timespec='microseconds')
+
+
+class SQLiteStorage(Storage):
+    """Storage backend on a local SQLite file"""
+
+    # Time source for session expiry and timestamps
+    clock: Clock = SYSTEM_CLOCK
+
+    def __init__(self, path: Union[str, Path] = ':memory:', clock: Optional[Clock] = None, seed_owner: bool = True):
+        """
+        Args:
+            path: Database file (created with its directory), or ':memory:'
+            clock: Time source (default: system clock)
+            seed_owner: Insert the owner admin like the migration does
+        """
+        if clock is not None:
+            self.clock = clock
+        self.path = str(path)
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # One connection shared by the polling, scheduler and sweep threads
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, cached_statements=256)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute('PRAGMA foreign_keys=ON')
+            self._conn.execute('PRAGMA busy_timeout=5000')
+            self._conn.executescript(SCHEMA)
+            if seed_owner:
+                chat_id, permissions = OWNER_ADMIN
+                self._conn.execute(
+                    'INSERT OR IGNORE INTO admins (admin_id, telegram_chat_id, permissions, created_at) VALUES (?, ?, ?, ?)',
+                    (str(uuid.uuid4()), chat_id, json.dumps(permissions), self._now())
+                )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _now(self) -> str:
+        return _timestamp(self.clock.utcnow())
+
+    @staticmethod
+    def _row(table: str, row: sqlite3.Row) -> Dict:
+        data = dict(row)
+        if table == 'sessions':
+            data['is_active'] = bool(data['is_active'])
+        elif table == 'admins' and data.get('permissions') is not None:
+            data['permissions'] = json.loads(data['permissions'])
+        return data
+
+    def _query(self, table: str, sql: str, params: Iterable = ()) -> List[Dict]:
+        with track(DB_REQUEST_SECONDS, DB_REQUEST_ERRORS, endpoint=table, method='GET'), self._lock:
+            rows = self._conn.execute(sql, tuple(params)).fetchall()
+        return [self._row(table, row) for row in rows]
+
+    def _execute(self, table: str, method: str, sql: str, params: Iterable = ()) -> int:
+        with track(DB_REQUEST_SECONDS, DB_REQUEST_ERRORS, endpoint=table, method=method), self._lock:
+            return self._conn.execute(sql, tuple(params)).rowcount
+
+    def insert(self, table: str, rows: Union[Dict, List[Dict]]) -> List[Dict]:
+        """
+        Insert rows in one transaction (all or none)
+
+        Args:
+            table: Table name
+            rows: Row or rows; ids and creation timestamps are filled in
+
+        Returns:
+            Inserted rows as stored
+        """
+        key, columns = _TABLES[table]
+        rows = [rows] if isinstance(rows, dict) else rows
+        now = self._now()
+        prepared = []
+        for row in rows:
+            unknown = set(row) - set(columns) - {key}
+            if unknown:
+                raise ValueError(f"Unknown {table} column(s): {', '.join(sorted(unknown))}")
+            values = {column: row.get(column) for column in columns if column in row}
+            for column in _TIME_COLUMNS.intersection(values):
+                if values[column] is not None:
+                    values[column] = _timestamp(values[column])
+            if 'permissions' in values and not isinstance(values['permissions'], str):
+                values['permissions'] = json.dumps(values['permissions'])
+            values[key] = row.get(key) or str(uuid.uuid4())
+            for column in _DEFAULT_TIMES[table]:
+                values[column] = now
+            prepared.append(values)
+
+        with track(DB_REQUEST_SECONDS, DB_REQUEST_ERRORS, endpoint=table, method='POST'), self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                # Rows with the same columns share one prepared INSERT
+                for values in prepared:
+                    names = sorted(values)
+                    self._conn.execute(
+                        f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                        [values[name] for name in names]
+                    )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+            ids = [values[key] for values in prepared]
+            stored = {
+                row[key]: row
+                for row in self._conn.execute(
+                    f"SELECT * FROM {table} WHERE {key} IN ({', '.join('?' * len(ids))})", ids
+                ).fetchall()
+            } if ids else {}
+        return [self._row(table, stored[row_id]) for row_id in ids]
+
+    def _insert_one(self, table: str, row: Dict) -> Optional[Dict]:
+        inserted = self.insert(table, row)
+        return inserted[0] if inserted else None
+
+    # ============================================================
+    # USER OPERATIONS
+    # ============================================================
+
+    def create_user(self, username: str, secret_key_hash: str) -> Optional[Dict]:
+        """Create a new user"""
+        try:
+            return self._insert_one('users', {'username': username, 'secret_key_hash': secret_key_hash})
+        except Exception as e:
+            logger.error("Error creating user: %s", e)
+            return None
+
+    def get_user_by_username(self, username: str) -> Optional[Dict]:
+        """Get user by username"""
+        try:
+            rows = self._query('users', 'SELECT * FROM users WHERE username = ? LIMIT 1', (username,))
+            return rows[0] if rows else None
+        except Exception as e:
+            logger.error("Error getting user: %s", e)
+            return None
+
+    def get_user_by_id(self, user_id: str) -> Optional[Dict]:
+        """Get user by ID"""
+        try:
+            rows = self._query('users', 'SELECT * FROM users WHERE user_id = ? LIMIT 1', (user_id,))
+            return rows[0] if rows else None
+        except Exception as e:
+            logger.error("Error getting user: %s", e)
+            return None
+
+    def update_user_calendar_token(self, user_id: str, encrypted_token: str) -> bool:
+        """Update user's Google Calendar token"""
+        try:
+            self._execute(
+                'users', 'PATCH',
+                'UPDATE users SET google_calendar_token_encrypted = ?, updated_at = ? WHERE user_id = ?',
+                (encrypted_token, self._now(), user_id)
+            )
+            return True
+        except Exception as e:
+            logger.error("Error updating calendar token: %s", e)
+            return False
+
+    def delete_user(self, user_id: str) -> bool:
+        """Delete a user"""
+        try:
+            self._execute('users', 'DELETE', 'DELETE FROM users WHERE user_id = ?', (user_id,))
+            return True
+        except Exception as e:
+            logger.error("Error deleting user: %s", e)
+            return False
+
+    def list_all_users(self) -> List[Dict]:
+        """List all users"""
+        try:
+            return self._query('users', 'SELECT * FROM users ORDER BY rowid')
+        except Exception as e:
+            logger.error("Error listing users: %s", e)
+            return []
+
+    # ============================================================
+    # SCHEDULE OPERATIONS
+    # ============================================================
+
+    def create_schedule(self, user_id: str, schedule_data: Dict) -> Optional[Dict]:
+        """Create a new schedule entry"""
+        try:
+            return self._insert_one('schedules', {'user_id': user_id, **schedule_data})
+        except Exception as e:
+            logger.error("Error creating schedule: %s", e)
+            return None
+
+    def get_user_schedules(self, user_id: str, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> List[Dict]:
+        """Get schedules for a user"""
+        try:
+            if start_time and end_time:
+                return self._query(
+                    'schedules',
+                    'SELECT * FROM schedules WHERE user_id = ? AND start_time >= ? AND start_time <= ? ORDER BY start_time',
+                    (user_id, _timestamp(start_time), _timestamp(end_time))
+                )
+            if start_time:
+                return self._query(
+                    'schedules',
+                    'SELECT * FROM schedules WHERE user_id = ? AND start_time >= ? ORDER BY start_time',
+                    (user_id, _timestamp(start_time))
+                )
+            if end_time:
+                return self._query(
+                    'schedules',
+                    'SELECT * FROM schedules WHERE user_id = ? AND start_time <= ? ORDER BY start_time',
+                    (user_id, _timestamp(end_time))
+                )
+            return self._query('schedules', 'SELECT * FROM schedules WHERE user_id = ? ORDER BY start_time', (user_id,))
+        except Exception as e:
+            logger.error("Error getting schedules: %s", e)
+            return []
+
+    def get_user_schedules_for_day(self, user_id: str, day_start: datetime, day_end: datetime) -> List[Dict]:
+        """Get schedules starting within one local day (idx_schedules_user_start)"""
+        try:
+            return self._query(
+                'schedules',
+                'SELECT * FROM schedules WHERE user_id = ? AND start_time >= ? AND start_time < ? ORDER BY start_time',
+                (user_id, _timestamp(day_start), _timestamp(day_end))
+            )
+        except Exception as e:
+            logger.error("Error getting day schedules: %s", e)
+            return []
+
+    def delete_user_schedules(self, user_id: str) -> bool:
+        """Delete all schedules for a user"""
+        try:
+            self._execute('schedules', 'DELETE', 'DELETE FROM schedules WHERE user_id = ?', (user_id,))
+            return True
+        except Exception as e:
+            logger.error("Error deleting schedules: %s", e)
+            return False
+
+    def bulk_create_schedules(self, schedules: List[Dict]) -> bool:
+        """Bulk create schedules"""
+        try:
+            self.insert('schedules', schedules)
+            return True
+        except Exception as e:
+            logger.error("Error bulk creating schedules: %s", e)
+            return False
+
+    # ============================================================
+    # SESSION OPERATIONS
+    # ============================================================
+
+    def create_session(self, user_id: str, telegram_chat_id: int, session_token: str, expires_hours: int = 24) -> Optional[Dict]:
+        """Create a new session"""
+        try:
+            return self._insert_one('sessions', {
+                'user_id': user_id,
+                'telegram_chat_id': telegram_chat_id,
+                'session_token': session_token,
+                'expires_at': self.clock.utcnow() + timedelta(hours=expires_hours),
+                'is_active': True
+            })
+        except Exception as e:
+            logger.error("Error creating session: %s", e)
+            return None
+
+    def get_active_session(self, telegram_chat_id: int) -> Optional[Dict]:
+        """Get active session for a Telegram chat"""
+        try:
+            rows = self._query(
+                'sessions',
+                'SELECT * FROM sessions WHERE telegram_chat_id = ? AND is_active = 1 AND expires_at > ? '
+                'ORDER BY created_at DESC, rowid DESC LIMIT 1',
+                (telegram_chat_id, self._now())
+            )
+            return rows[0] if rows else None
+        except Exception as e:
+            logger.error("Error getting session: %s", e)
+            return None
+
+    def get_active_sessions_for_user(self, user_id: str) -> List[Dict]:
+        """Get all active sessions of a user (one per logged-in chat)"""
+        try:
+            return self._query(
+                'sessions',
+                'SELECT * FROM sessions WHERE user_id = ? AND is_active = 1 AND expires_at > ? '
+                'ORDER BY created_at DESC, rowid DESC',
+                (user_id, self._now())
+            )
+        except Exception as e:
+            logger.error("Error getting user sessions: %s", e)
+            return []
+
+    def invalidate_session(self, session_id: str) -> bool:
+        """Invalidate a session"""
+        try:
+            self._execute(
+                'sessions', 'PATCH',
+                'UPDATE sessions SET is_active = 0, last_activity = ? WHERE session_id = ?',
+                (self._now(), session_id)
+            )
+            return True
+        except Exception as e:
+            logger.error("Error invalidating session: %s", e)
+            return False
+
+    def invalidate_user_sessions(self, telegram_chat_id: int) -> bool:
+        """Invalidate all sessions for a Telegram chat"""
+        try:
+            self._execute(
+                'sessions', 'PATCH',
+                'UPDATE sessions SET is_active = 0, last_activity = ? WHERE telegram_chat_id = ?',
+                (self._now(), telegram_chat_id)
+            )
+            return True
+        except Exception as e:
+            logger.error("Error invalidating sessions: %s", e)
+            return False
+
+    def cleanup_expired_sessions(self) -> int:
+        """Cleanup expired sessions"""
+        try:
+            now = self._now()
+            return self._execute(
+                'sessions', 'PATCH',
+                'UPDATE sessions SET is_active = 0, last_activity = ? WHERE expires_at < ? AND is_active = 1',
+                (now, now)
+            )
+        except Exception as e:
+            logger.error("Error cleaning up sessions: %s", e)
+            return 0
+
+    # ============================================================
+    # ADMIN OPERATIONS
+    # ============================================================
+
+    def is_admin(self, telegram_chat_id: int) -> bool:
+        """Check if a Telegram user is an admin"""
+        try:
+            return bool(self._query(
+                'admins', 'SELECT * FROM admins WHERE telegram_chat_id = ? LIMIT 1', (telegram_chat_id,)
+            ))
+        except Exception as e:
+            logger.error("Error checking admin: %s", e)
+            return False
+
+    def add_admin(self, telegram_chat_id: int, permissions: Optional[Dict] = None) -> bool:
+        """Add a new admin"""
+        if permissions is None:
+            permissions = {
+                'can_add_user': True,
+                'can_delete_user': True,
+                'can_import_schedule': True,
+                'can_view_all_users': True
+            }
+        try:
+            self.insert('admins', {'telegram_chat_id': telegram_chat_id, 'permissions': permissions})
+            return True
+        except Exception as e:
+            logger.error("Error adding admin: %s", e)
+            return False
+
+    def list_admins(self, limit: Optional[int] = None) -> List[Dict]:
+        """List admins"""
+        try:
+            return self._query('admins', 'SELECT * FROM admins ORDER BY rowid LIMIT ?', (limit or -1,))
+        except Exception as e:
+            logger.error("Error listing admins: %s", e)
+            return []
+
+    # ============================================================
+    # REMINDER OPERATIONS
+    # ============================================================
+
+    def create_reminder(self, user_id: str, schedule_id: str, reminder_type: str, scheduled_time: datetime) -> Optional[Dict]:
+        """Create a reminder"""
+        try:
+            return self._insert_one('reminders', {
+                'user_id': user_id,
+                'schedule_id': schedule_id,
+                'reminder_type': reminder_type,
+                'scheduled_time': scheduled_time,
+                'status': 'pending'
+            })
+        except Exception as e:
+            logger.error("Error creating reminder: %s", e)
+            return None
+
+    def mark_reminder_sent(self, reminder_id: str) -> bool:
+        """Mark reminder as sent"""
+        try:
+            self._execute(
+                'reminders', 'PATCH',
+                "UPDATE reminders SET status = 'sent', sent_at = ? WHERE reminder_id = ?",
+                (self._now(), reminder_id)
+            )
+            return True
+        except Exception as e:
+            logger.error("Error marking reminder sent: %s", e)
+            return False
+
+    # ============================================================
+    # BATCH WRITES
+    # ============================================================
+
+    def bulk_insert(self, table: str, rows: List[Dict]):
+        """Insert rows in one transaction (raises on failure)"""
+        if rows:
+            self.insert(table, rows)
+
+    def bulk_update(self, table: str, data: Dict, column: str, values: List):
+        """Set data on every row whose column is in values (raises on failure)"""
+        key, columns = _TABLES[table]
+        unknown = (set(data) | {column}) - set(columns) - {key}
+        if unknown:
+            raise ValueError(f"Unknown {table} column(s): {', '.join(sorted(unknown))}")
+        if not values:
+            return
+        changes = dict(data)
+        for name in _TIME_COLUMNS.intersection(changes):
+            if changes[name] is not None:
+                changes[name] = _timestamp(changes[name])
+        if 'permissions' in changes and not isinstance(changes['permissions'], str):
+            changes['permissions'] = json.dumps(changes['permissions'])
+        # Same bookkeeping column the single-row updates touch
+        for touched in ('updated_at', 'last_activity'):
+            if touched in _DEFAULT_TIMES[table]:
+                changes[touched] = self._now()
+        names = sorted(changes)
+        self._execute(
+            table, 'PATCH',
+            f"UPDATE {table} SET {', '.join(f'{name} = ?' for name in names)} "
+            f"WHERE {column} IN ({', '.join('?' * len(values))})",
+            [changes[name] for name in names] + list(values)
+        )
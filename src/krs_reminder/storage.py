@@ -0,0 +1,190 @@
+"""Storage interface for multi-user data.
+
+The bot, :class:`~krs_reminder.auth.AuthManager` and
+:class:`~krs_reminder.admin.AdminManager` only use the methods of
+:class:`Storage`. Two backends implement it:
+
+* :class:`~krs_reminder.database.SupabaseClient`: hosted Supabase over
+  PostgREST (``KRS_STORAGE=supabase``, the default)
+* :class:`~krs_reminder.sqlite_storage.SQLiteStorage`: a local SQLite file
+  with the schema of ``migrations/001_initial_schema.sql``
+  (``KRS_STORAGE=sqlite``), for small deployments, tests and benchmarks
+  without network latency
+
+Rows are plain dicts keyed by column name, ids are UUID strings and
+timestamps ISO 8601 strings, as PostgREST returns them. Backends never raise
+on database errors: they log them and return None, [] or False. While the
+hosted database is unreachable, SupabaseClient answers reads of sessions,
+users and schedules from their last good result, marked as stale (see
+:func:`~krs_reminder.resilience.stale_since`).
+
+Storage is an abstract base class: a backend missing one of its methods
+fails when it is constructed.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from . import config
+from .clock import Clock
+
+
+class Storage(ABC):
+    """Multi-user data access (users, schedules, sessions, admins, reminders)"""
+
+    # ============================================================
+    # USER OPERATIONS
+    # ============================================================
+
+    @abstractmethod
+    def create_user(self, username: str, secret_key_hash: str) -> Optional[Dict]:
+        """Create a new user (None if the username is taken or on error)"""
+
+    @abstractmethod
+    def get_user_by_username(self, username: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def get_user_by_id(self, user_id: str) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def update_user_calendar_token(self, user_id: str, encrypted_token: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete_user(self, user_id: str) -> bool:
+        """Delete a user with their schedules, sessions and reminders"""
+
+    @abstractmethod
+    def list_all_users(self) -> List[Dict]:
+        ...
+
+    # ============================================================
+    # SCHEDULE OPERATIONS
+    # ============================================================
+
+    @abstractmethod
+    def create_schedule(self, user_id: str, schedule_data: Dict) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def get_user_schedules(self, user_id: str, start_time: Optional[datetime] = None, end_time: Optional[datetime] = None) -> List[Dict]:
+        """Schedules of a user starting within [start_time, end_time], by start time"""
+
+    @abstractmethod
+    def get_user_schedules_for_day(self, user_id: str, day_start: datetime, day_end: datetime) -> List[Dict]:
+        """Schedules of a user starting within [day_start, day_end), by start time"""
+
+    @abstractmethod
+    def delete_user_schedules(self, user_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def bulk_create_schedules(self, schedules: List[Dict]) -> bool:
+        """Insert all rows or none"""
+
+    # ============================================================
+    # SESSION OPERATIONS
+    # ============================================================
+
+    @abstractmethod
+    def create_session(self, user_id: str, telegram_chat_id: int, session_token: str, expires_hours: int = 24) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def get_active_session(self, telegram_chat_id: int) -> Optional[Dict]:
+        """Newest active, unexpired session of a chat"""
+
+    @abstractmethod
+    def get_active_sessions_for_user(self, user_id: str) -> List[Dict]:
+        ...
+
+    @abstractmethod
+    def invalidate_session(self, session_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def invalidate_user_sessions(self, telegram_chat_id: int) -> bool:
+        ...
+
+    @abstractmethod
+    def cleanup_expired_sessions(self) -> int:
+        """Deactivate expired sessions; returns how many (0 when the backend cannot tell)"""
+
+    # ============================================================
+    # ADMIN OPERATIONS
+    # ============================================================
+
+    @abstractmethod
+    def is_admin(self, telegram_chat_id: int) -> bool:
+        ...
+
+    @abstractmethod
+    def add_admin(self, telegram_chat_id: int, permissions: Optional[Dict] = None) -> bool:
+        ...
+
+    @abstractmethod
+    def list_admins(self, limit: Optional[int] = None) -> List[Dict]:
+        ...
+
+    # ============================================================
+    # REMINDER OPERATIONS
+    # ============================================================
+
+    @abstractmethod
+    def create_reminder(self, user_id: str, schedule_id: str, reminder_type: str, scheduled_time: datetime) -> Optional[Dict]:
+        ...
+
+    @abstractmethod
+    def mark_reminder_sent(self, reminder_id: str) -> bool:
+        ...
+
+    # ============================================================
+    # BATCH WRITES (used by the write-behind buffer)
+    # ============================================================
+
+    @abstractmethod
+    def bulk_insert(self, table: str, rows: List[Dict]):
+        """Insert `rows` into `table` in one request; raises on failure"""
+
+    @abstractmethod
+    def bulk_update(self, table: str, data: Dict, column: str, values: List):
+        """Set `data` on every row whose `column` is in `values` in one request; raises on failure"""
+
+    def prime_reads(self, users: List[Dict], sessions: List[Dict], schedules: Dict[str, List[Dict]], read_at: datetime):
+        """
+        Offer results read earlier (e.g. a local snapshot) as the fallback for
+        reads while the backend is unreachable. Backends without such a
+        fallback ignore them.
+
+        Args:
+            users: User rows
+            sessions: Active session rows
+            schedules: user_id -> upcoming schedule rows
+            read_at: When the rows were read (timezone-aware)
+        """
+
+
+def open_storage(backend: Optional[str] = None, clock: Optional[Clock] = None) -> Storage:
+    """
+    Storage backend selected by configuration
+
+    Args:
+        backend: "supabase" or "sqlite" (default: KRS_STORAGE)
+        clock: Time source passed to the backend
+
+    Returns:
+        Connected backend; raises if it cannot be opened (e.g. no Supabase config)
+    """
+    backend = (backend or config.STORAGE_BACKEND).lower()
+    if backend == 'sqlite':
+        from .sqlite_storage import SQLiteStorage
+        return SQLiteStorage(config.SQLITE_PATH, clock=clock)
+    if backend == 'supabase':
+        from .database import SupabaseClient
+        return SupabaseClient(clock=clock)
+    raise ValueError(f"Unknown storage backend: {backend!r} (expected 'supabase' or 'sqlite')")
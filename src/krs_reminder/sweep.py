@@ -0,0 +1,343 @@
+"""Sweep planning for the KRS Reminder bot.
+
+A sweep reads upcoming events (Google Calendar or the ``schedules`` table)
+and registers reminder jobs for them. Instead of sweeping on a fixed
+interval, :class:`SweepPlanner` picks the next sweep time from the next
+pending reminder, the edge of the lookahead window and how often recent
+sweeps found changes. In multi-user mode :func:`run_user_sweep` fans the
+per-user work out onto a bounded thread pool and aggregates a
+:class:`SweepReport`.
+"""
+
+from __future__ import annotations
+
+import datetime
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+
+class SweepPlanner:
+    """Plan the next event sweep between configurable bounds."""
+
+    def __init__(
+        self,
+        min_minutes: int,
+        max_minutes: int,
+        lookahead_hours: int,
+        reminder_hours: Iterable[int],
+        change_smoothing: float = 0.5,
+    ):
+        """
+        Initialize SweepPlanner
+
+        Args:
+            min_minutes: Shortest allowed gap between two sweeps
+            max_minutes: Longest allowed gap between two sweeps
+            lookahead_hours: Requested size of the event window read per sweep
+            reminder_hours: Reminder offsets (hours before class)
+            change_smoothing: Weight of the latest sweep in the change rate (0-1)
+        """
+        self.min_interval = datetime.timedelta(minutes=max(1, min_minutes))
+        self.max_interval = max(self.min_interval, datetime.timedelta(minutes=max_minutes))
+        self.max_reminder = datetime.timedelta(hours=max(reminder_hours, default=0))
+        self.change_smoothing = change_smoothing
+
+        # The window must reach past the earliest reminder of any class that
+        # could start before the sweep after next, otherwise that reminder is
+        # registered too late.
+        required = self.max_reminder + self.max_interval + datetime.timedelta(hours=1)
+        self.lookahead = max(datetime.timedelta(hours=lookahead_hours), required)
+
+        self.change_rate = 0.0
+        self.last_changes = 0
+        self.last_delay: Optional[datetime.timedelta] = None
+        self._known: Optional[Dict[str, datetime.datetime]] = None
+        self._known_at: Optional[datetime.datetime] = None
+
+    def window_end(self, now: datetime.datetime) -> datetime.datetime:
+        """End of the event window a sweep starting at ``now`` should read."""
+        return now + self.lookahead
+
+    def _count_changes(self, now: datetime.datetime, pending: Dict[str, datetime.datetime]) -> int:
+        """
+        Reminders added, removed or moved since the previous sweep
+
+        Only reminders both sweeps could see are compared: still due, and of
+        classes inside the previous (shorter reaching) window. Reminders that
+        fired in between or just entered the window are not changes.
+        """
+        if self._known is None or self._known_at is None:
+            return 0
+        window_end = self.window_end(self._known_at) - self.max_reminder
+
+        def comparable(reminders: Dict[str, datetime.datetime]) -> Dict[str, datetime.datetime]:
+            return {key: fire_time for key, fire_time in reminders.items() if now < fire_time <= window_end}
+
+        before, after = comparable(self._known), comparable(pending)
+        changed = set(before) ^ set(after)
+        changed.update(key for key in before.keys() & after.keys() if before[key] != after[key])
+        return len(changed)
+
+    def plan(
+        self,
+        now: datetime.datetime,
+        pending: Dict[str, datetime.datetime],
+        complete: bool = True,
+    ) -> datetime.datetime:
+        """
+        Record a finished sweep and return when the next one should run
+
+        Args:
+            now: Time the sweep finished
+            pending: Reminder key -> fire time for every future reminder seen
+            complete: False if some users failed or timed out (or were read
+                from stale data): pending then misses their reminders, so it
+                neither replaces the known set nor counts as changes, and the
+                next sweep runs as soon as allowed
+
+        Returns:
+            Datetime of the next sweep
+        """
+        if complete:
+            changes = self._count_changes(now, pending)
+            self._known = dict(pending)
+            self._known_at = now
+            self.change_rate = (
+                self.change_smoothing * changes + (1 - self.change_smoothing) * self.change_rate
+            )
+        else:
+            changes = 0
+            # Reminders of the users it missed are still registered from earlier sweeps
+            pending = {**(self._known or {}), **pending}
+        self.last_changes = changes
+
+        delay = self.max_interval
+
+        # Events beyond the window are unseen; sweep again before the first of
+        # them could need its earliest reminder.
+        horizon = self.lookahead - self.max_reminder - self.min_interval
+        delay = min(delay, horizon)
+
+        # Re-check halfway to the next reminder so last-minute edits land in time.
+        upcoming = [fire_time for fire_time in pending.values() if fire_time > now]
+        if upcoming:
+            delay = min(delay, (min(upcoming) - now) / 2)
+
+        # Data that keeps changing is swept more often.
+        if self.change_rate > 0:
+            delay = delay / (1 + self.change_rate)
+
+        # Retry the users the sweep missed
+        if not complete:
+            delay = self.min_interval
+
+        delay = max(self.min_interval, min(delay, self.max_interval))
+        self.last_delay = delay
+        return now + delay
+
+
+class UserSweepResult:
+    """Outcome of sweeping a single user"""
+
+    def __init__(self, user: Dict):
+        self.user_id = user.get('user_id')
+        self.username = user.get('username', self.user_id)
+        self.status = 'pending'  # ok | failed | timeout
+        self.events = 0
+        self.pending: Dict[str, datetime.datetime] = {}
+        self.duration = 0.0
+        self.error: Optional[str] = None
+        # Rows read (kept for the local snapshot); stale if served from the outage fallback
+        self.schedules: List[Dict] = []
+        self.sessions: List[Dict] = []
+        self.stale = False
+
+
+class SweepReport:
+    """Aggregated result of one multi-user sweep"""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.duration = 0.0
+        self.results: List[UserSweepResult] = []
+        # The user list itself came from the outage fallback
+        self.users_stale = False
+
+    def finish(self):
+        self.duration = time.monotonic() - self.started_at
+
+    def _with_status(self, status: str) -> List[UserSweepResult]:
+        return [result for result in self.results if result.status == status]
+
+    @property
+    def users(self) -> int:
+        return len(self.results)
+
+    @property
+    def failures(self) -> List[UserSweepResult]:
+        return self._with_status('failed')
+
+    @property
+    def timeouts(self) -> List[UserSweepResult]:
+        return self._with_status('timeout')
+
+    @property
+    def stale(self) -> List[UserSweepResult]:
+        return [result for result in self.results if result.stale]
+
+    @property
+    def complete(self) -> bool:
+        """Every user swept with fresh data (the result reflects the database)"""
+        return not self.failures and not self.timeouts and not self.stale and not self.users_stale
+
+    @property
+    def events(self) -> int:
+        return sum(result.events for result in self.results)
+
+    @property
+    def pending(self) -> Dict[str, datetime.datetime]:
+        merged: Dict[str, datetime.datetime] = {}
+        for result in self._with_status('ok'):
+            merged.update(result.pending)
+        return merged
+
+    @property
+    def slowest(self) -> Optional[UserSweepResult]:
+        finished = [result for result in self.results if result.status != 'timeout']
+        return max(finished, key=lambda result: result.duration, default=None)
+
+    def summary(self) -> str:
+        """One-line summary for the log"""
+        line = (
+            f"Sweep: {self.users} users, {self.events} events, "
+            f"{len(self.pending)} reminders, {len(self.failures)} failed, "
+            f"{len(self.timeouts)} timeout in {self.duration * 1000:.0f} ms"
+        )
+        if self.stale:
+            line += f", {len(self.stale)} from stale data"
+
+        slowest = self.slowest
+        if slowest:
+            line += f" (slowest: {slowest.username} {slowest.duration * 1000:.0f} ms)"
+        return line
+
+    def fields(self) -> Dict[str, object]:
+        """Structured log fields of the sweep"""
+        return {
+            'users': self.users,
+            'events': self.events,
+            'pending': len(self.pending),
+            'failed': len(self.failures),
+            'timeouts': len(self.timeouts),
+            'stale': len(self.stale),
+            'duration_ms': round(self.duration * 1000),
+        }
+
+
+def run_user_sweep(
+    users: List[Dict],
+    worker: Callable[[Dict], UserSweepResult],
+    max_workers: int,
+    timeout: float,
+    deadline: Optional[float] = None,
+) -> SweepReport:
+    """
+    Sweep users concurrently on a bounded thread pool
+
+    Each user gets its own timeout, counted from when its work actually
+    starts. A user that times out is reported and no longer waited for;
+    its thread finishes in the background without holding up the others.
+    Hung threads keep their pool slot, so users still queued when every
+    slot is hung, or when the whole sweep passes its deadline, are reported
+    as timeouts without being started.
+
+    Args:
+        users: User rows to sweep
+        worker: Callable that sweeps one user and fills a UserSweepResult
+        max_workers: Maximum number of users swept at the same time; 0 sweeps
+            them in order on the calling thread, without timeouts
+            (deterministic runs such as simulations)
+        timeout: Per-user timeout in seconds
+        deadline: Seconds after which the sweep returns whatever is left
+            unfinished as timeouts (default: no overall limit)
+
+    Returns:
+        SweepReport with one result per user
+    """
+    report = SweepReport()
+    if not users:
+        report.finish()
+        return report
+
+    started: Dict[int, float] = {}
+    started_lock = threading.Lock()
+
+    def run(index: int, user: Dict) -> UserSweepResult:
+        begin = time.monotonic()
+        with started_lock:
+            started[index] = begin
+        try:
+            result = worker(user)
+            result.status = 'ok'
+        except Exception as e:
+            result = UserSweepResult(user)
+            result.status = 'failed'
+            result.error = str(e)
+        result.duration = time.monotonic() - begin
+        return result
+
+    if max_workers <= 0:
+        report.results.extend(run(index, user) for index, user in enumerate(users))
+        report.finish()
+        return report
+
+    def timed_out(future: Future, now: float, error: str) -> UserSweepResult:
+        index, user = futures[future]
+        result = UserSweepResult(user)
+        result.status = 'timeout'
+        result.duration = now - started.get(index, now)
+        result.error = error
+        return result
+
+    ends_at = time.monotonic() + deadline if deadline else None
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='krs-sweep')
+    abandoned: Set[Future] = set()
+    try:
+        futures = {executor.submit(run, index, user): (index, user) for index, user in enumerate(users)}
+        waiting = set(futures)
+
+        while waiting:
+            done, waiting = wait(waiting, timeout=min(1.0, timeout), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                report.results.append(future.result())
+
+            now = time.monotonic()
+            with started_lock:
+                expired = {
+                    future for future in waiting
+                    if futures[future][0] in started and now - started[futures[future][0]] > timeout
+                }
+                for future in expired:
+                    report.results.append(timed_out(future, now, f"timeout after {timeout:.0f}s"))
+            waiting -= expired
+            abandoned |= expired
+
+            if not waiting:
+                break
+            stuck = sum(1 for future in abandoned if not future.done()) >= max_workers
+            if stuck or (ends_at is not None and now >= ends_at):
+                # Queued users cannot start (or the sweep ran out of time)
+                error = "all sweep workers hung" if stuck else f"sweep deadline of {deadline:.0f}s passed"
+                with started_lock:
+                    for future in waiting:
+                        future.cancel()
+                        report.results.append(timed_out(future, now, error))
+                waiting = set()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    report.finish()
+    return report
@@ -0,0 +1,236 @@
+"""Frozen UI assets for the KRS Reminder bot.
+
+Inline keyboards, reminder themes, locale tables and the static parts of the
+menu texts never change at runtime, yet they used to be rebuilt (and the
+keyboards ``json.dumps``-ed) for every message. They are built once here at
+import time. Keyboards carry their serialized JSON, so a send only attaches
+the precomputed string. All shared structures are read-only; mutating one
+raises ``TypeError`` instead of silently changing every later message.
+"""
+
+from __future__ import annotations
+
+import json
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional, Sequence, Tuple
+
+
+def _read_only(self, *args, **kwargs):
+    raise TypeError(f"{type(self).__name__} is read-only")
+
+
+class FrozenList(list):
+    """List that rejects mutation (still a list for json and isinstance)"""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+
+
+class FrozenDict(dict):
+    """Dict that rejects mutation (still a dict for json and isinstance)"""
+
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+
+class InlineKeyboard(FrozenDict):
+    """Read-only inline keyboard with its Telegram JSON precomputed"""
+
+    __slots__ = ('serialized',)
+
+    def __init__(self, rows: Iterable[Iterable[Tuple[str, str]]]):
+        """
+        Args:
+            rows: Rows of (text, callback_data) buttons
+        """
+        super().__init__(inline_keyboard=FrozenList(
+            FrozenList(FrozenDict(text=text, callback_data=data) for text, data in row)
+            for row in rows
+        ))
+        self.serialized = json.dumps(self)
+
+
+def serialize_markup(markup) -> str:
+    """Telegram ``reply_markup`` value; prebuilt keyboards skip json.dumps"""
+    if isinstance(markup, InlineKeyboard):
+        return markup.serialized
+    return json.dumps(markup)
+
+
+# Locale tables -----------------------------------------------------------------
+DAY_NAMES: Tuple[str, ...] = ('Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu')
+DAY_SHORT: Tuple[str, ...] = ('Sen', 'Sel', 'Rab', 'Kam', 'Jum', 'Sab', 'Min')
+MONTH_NAMES: Tuple[str, ...] = (
+    'Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
+    'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember',
+)
+MONTH_SHORT: Tuple[str, ...] = (
+    'Jan', 'Feb', 'Mar', 'Apr', 'Mei', 'Jun',
+    'Jul', 'Agu', 'Sep', 'Okt', 'Nov', 'Des',
+)
+
+
+def format_date_id(dt) -> str:
+    """e.g. ``Senin, 06 Oktober 2025``"""
+    return f"{DAY_NAMES[dt.weekday()]}, {dt.day:02d} {MONTH_NAMES[dt.month - 1]} {dt.year}"
+
+
+def format_short_date(dt) -> str:
+    """e.g. ``Sen 06 Okt``"""
+    return f"{DAY_SHORT[dt.weekday()]} {dt.day:02d} {MONTH_SHORT[dt.month - 1]}"
+
+
+# Keyboards ---------------------------------------------------------------------
+MAIN_MENU_KEYBOARD = InlineKeyboard([
+    [('📅 Lihat Jadwal - Mingguan', 'jadwal_weekly')],
+    [('📆 Lihat Jadwal - Harian', 'jadwal_daily_menu')],
+    [('📊 Stats', 'stats')],
+])
+
+_DAY_CALLBACKS: Sequence[str] = (
+    'day_monday', 'day_tuesday', 'day_wednesday', 'day_thursday',
+    'day_friday', 'day_saturday', 'day_sunday',
+)
+# Day button callback -> weekday (0 = Monday)
+DAY_CALLBACKS: Mapping[str, int] = MappingProxyType({
+    callback: weekday for weekday, callback in enumerate(_DAY_CALLBACKS)
+})
+
+# Days in rows of 2, then the back button
+DAILY_MENU_KEYBOARD = InlineKeyboard(
+    [list(zip(DAY_NAMES[i:i + 2], _DAY_CALLBACKS[i:i + 2])) for i in range(0, len(DAY_NAMES), 2)]
+    + [[('🔙 Kembali ke Menu', 'back_to_main')]]
+)
+
+
+# Static message fragments ------------------------------------------------------
+DIVIDER = '━━━━━━━━━━━━━━━━━━━'
+QUICK_COMMAND_FOOTER = '🔁 /start • /jadwal • /stats'
+MENU_PROMPT = '💡 <b>Pilih menu di bawah ini:</b>'
+DAILY_MENU_TEXT = (
+    "📆 <b>PILIH HARI</b>\n"
+    "\n"
+    "Pilih hari untuk melihat jadwal:"
+)
+MAIN_MENU_INTRO = (
+    "🏠 <b>MENU UTAMA</b>\n"
+    "\n"
+)
+WELCOME_INTRO = (
+    "👋 <b>Selamat Datang!</b>\n"
+    "\n"
+    "🎓 <b>KRS Reminder Bot</b>\n"
+    "Asisten pintar untuk jadwal kuliahmu\n"
+    "\n"
+    f"{DIVIDER}\n"
+    "\n"
+)
+WELCOME_FEATURES = (
+    "<b>✨ Fitur Utama</b>\n"
+    "  🔔 Reminder otomatis (5j, 3j, 2j, 1j sebelum)\n"
+    "  📅 Sinkronisasi Google Calendar\n"
+    "  ⏰ Notifikasi tepat waktu\n"
+    "  📊 Monitoring real-time\n"
+)
+
+
+def week_status_block(status: Mapping) -> str:
+    """VA/VB header and details of a week, as shown in menus"""
+    return f"<b>{status['detailed_header']}</b>\n{status['detailed_text']}\n"
+
+
+def welcome_message(status: Mapping) -> str:
+    """Single-user /start message for the given week"""
+    return (
+        f"{WELCOME_INTRO}{week_status_block(status)}\n{DIVIDER}\n\n"
+        f"{WELCOME_FEATURES}\n{DIVIDER}\n\n{MENU_PROMPT}"
+    )
+
+
+def main_menu_message(status: Mapping) -> str:
+    """Main menu message (back button) for the given week"""
+    return f"{MAIN_MENU_INTRO}{week_status_block(status)}\n{DIVIDER}\n\n{MENU_PROMPT}"
+
+
+# Reminder themes ---------------------------------------------------------------
+def _theme(headline: str, tagline: str, checklist_title: str, checklist: Tuple[str, ...], cta: str) -> Mapping:
+    return MappingProxyType({
+        'headline': headline,
+        'tagline': tagline,
+        'checklist_title': checklist_title,
+        'checklist': checklist,
+        'cta': cta,
+    })
+
+
+THEME_EXACT = _theme(
+    '🔔 <b>KULIAH DIMULAI SEKARANG</b>',
+    'Sesi telah dibuka — fokus penuh di kelas dan catat poin penting.',
+    'Fokus Di Kelas',
+    (
+        'Lakukan absensi di awal sesi',
+        'Aktif dalam diskusi dan tanya jawab',
+        'Catat insight utama langsung di laptop/notes',
+    ),
+    '🎯 Tetap engaged dan follow up setelah kelas',
+)
+
+# (minimum hours before class, theme), highest first; the last one is the fallback
+REMINDER_THEMES: Tuple[Tuple[int, Mapping], ...] = (
+    (5, _theme(
+        '🟢 <b>PREP MODE • 5 JAM LAGI</b>',
+        'Waktu longgar — persiapkan materi dan kebutuhan logistik dari sekarang.',
+        'Modal Awal',
+        (
+            'Review silabus & catatan pekan lalu',
+            'Pastikan transport & outfit sudah siap',
+            'Sync jadwal dengan teman satu kelas',
+        ),
+        '💡 Semakin siap sekarang, semakin tenang nanti',
+    )),
+    (3, _theme(
+        '🟡 <b>FOCUS MODE • 3 JAM LAGI</b>',
+        'Masuk fase belajar inti — review materi dan susun pertanyaan.',
+        'Perdalam Materi',
+        (
+            'Highlight konsep penting & rumus kunci',
+            'Rangkum pertanyaan untuk dosen',
+            'Update progress kelompok bila ada proyek',
+        ),
+        '📝 Mantapkan pemahaman sebelum sesi dimulai',
+    )),
+    (2, _theme(
+        '🟠 <b>SET MODE • 2 JAM LAGI</b>',
+        'Final gear check — siap-siapkan perangkat dan file pendukung.',
+        'Persiapan Teknis',
+        (
+            'Charge laptop & perangkat pendukung',
+            'Unduh materi/slide terbaru dari LMS',
+            'Konfirmasi lokasi kelas & akses gedung',
+        ),
+        '📦 Lengkapi perlengkapan sebelum berangkat',
+    )),
+    (0, _theme(
+        '🔴 <b>RUSH MODE • 1 JAM LAGI</b>',
+        'Hitung mundur final — waktunya berangkat dan hindari keterlambatan.',
+        'Prioritas Sekarang',
+        (
+            'Berangkat menuju kampus/ruang kelas',
+            'Pastikan baterai perangkat aman',
+            'Info kelompok jika ada perubahan',
+        ),
+        '🚀 Bergerak sekarang untuk tiba tepat waktu',
+    )),
+)
+
+
+def reminder_theme(hours_before: Optional[int]) -> Mapping:
+    """Shared theme of a reminder slot (None = class starts now)"""
+    if hours_before is None:
+        return THEME_EXACT
+    for min_hours, theme in REMINDER_THEMES:
+        if hours_before >= min_hours:
+            return theme
+    return REMINDER_THEMES[-1][1]
@@ -0,0 +1,371 @@
+"""Write-behind buffering of bookkeeping writes.
+
+Delivery logging (``create_reminder`` / ``mark_reminder_sent``) and the
+invalidation of expired sessions do not have to reach the database before
+the caller moves on. :class:`BufferedStorage` queues them in a
+:class:`WriteBehindBuffer` and returns at once; a background thread flushes
+the queue every ``interval_seconds`` or as soon as ``max_rows`` writes are
+pending, coalesced per table:
+
+* inserts of one table become one bulk insert (one POST)
+* updates setting the same values on one table become one update with an
+  ``in.(...)`` filter (one PATCH)
+* maintenance calls (``cleanup_expired_sessions``) run once per flush
+
+Writes that still fail when the database is unreachable (connection errors,
+timeouts, 5xx, a locked SQLite file) are spilled to a local JSONL file and
+retried, oldest first, with backoff. While backing off, ``max_rows`` new
+writes are appended to the spill file rather than triggering a flush. A batch the database rejects (4xx,
+constraint violation) is retried row by row and only the failing rows are
+dropped. ``close()`` flushes whatever is left on shutdown.
+
+Only writes whose delay no reader can observe go through the buffer:
+reminder bookkeeping is never read back by the bot, and invalidating an
+expired session changes nothing for ``get_active_session``, which already
+filters on ``expires_at``. Login and logout stay synchronous.
+"""
+
+from __future__ import annotations
+
+import abc
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .clock import SYSTEM_CLOCK, Clock
+from .metrics import WRITE_BEHIND_PENDING, WRITE_BEHIND_ROWS
+from .resilience import is_transient
+from .storage import Storage
+
+logger = logging.getLogger(__name__)
+
+# Longest wait between retries while the database is unreachable
+MAX_BACKOFF_SECONDS = 60.0
+
+
+class WriteBehindBuffer:
+    """Queue of pending writes, flushed in batches by a background thread"""
+
+    def __init__(
+        self,
+        storage: Storage,
+        interval_seconds: float = 0.5,
+        max_rows: int = 200,
+        spill_path: Optional[Path] = None,
+    ):
+        """
+        Args:
+            storage: Backend the batches are written to (bulk_insert/bulk_update)
+            interval_seconds: Flush period
+            max_rows: Pending writes that trigger an early flush, and the batch size
+            spill_path: JSONL file holding writes while the database is unreachable
+                (None: keep them in memory)
+        """
+        self.storage = storage
+        self.interval_seconds = interval_seconds
+        self.max_rows = max(1, max_rows)
+        self.spill_path = Path(spill_path) if spill_path else None
+        self._ops: List[Dict] = []
+        self._retry: List[Dict] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # Consecutive failed flushes of the background thread (0: database reachable)
+        self._failures = 0
+        WRITE_BEHIND_PENDING.set_function(lambda: self.pending)
+
+    @property
+    def pending(self) -> int:
+        """Writes not yet in the database (queued, retried or spilled)"""
+        with self._lock:
+            return len(self._ops) + len(self._retry) + self._spilled_count()
+
+    def _spilled_count(self) -> int:
+        if not self.spill_path or not self.spill_path.exists():
+            return 0
+        with self.spill_path.open('r', encoding='utf-8') as handle:
+            return sum(1 for line in handle if line.strip())
+
+    # Queueing ---------------------------------------------------------------
+
+    def _enqueue(self, op: Dict):
+        with self._lock:
+            self._ops.append(op)
+            full = len(self._ops) >= self.max_rows
+        if not full:
+            return
+        if not self._failures:
+            self._wake.set()
+        elif self.spill_path is not None:
+            # The database is unreachable: park the writes on disk, the flusher keeps its backoff
+            self._spill_queued()
+
+    def insert(self, table: str, row: Dict):
+        self._enqueue({'op': 'insert', 'table': table, 'row': row})
+
+    def update(self, table: str, data: Dict, column: str, value):
+        """Set `data` on the row(s) where `column` equals `value`"""
+        self._enqueue({'op': 'update', 'table': table, 'data': data, 'column': column, 'value': value})
+
+    def call(self, method: str):
+        """Run the storage method `method()` once on the next flush"""
+        self._enqueue({'op': 'call', 'method': method})
+
+    # Flushing ---------------------------------------------------------------
+
+    def start(self):
+        """Start the background flusher (idempotent)"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            delay = min(self.interval_seconds * (2 ** self._failures), MAX_BACKOFF_SECONDS)
+            # While backing off, only close() cuts the wait short
+            (self._stop if self._failures else self._wake).wait(delay)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            self._failures = 0 if self.flush() else min(self._failures + 1, 16)
+
+    def close(self, timeout: float = 10.0) -> bool:
+        """Stop the flusher and write (or spill) everything still pending"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        return self.flush()
+
+    def flush(self) -> bool:
+        """
+        Write every pending operation now
+
+        Returns:
+            True if nothing is left pending, False if writes were kept for a retry
+        """
+        with self._flush_lock:
+            with self._lock:
+                ops, self._ops = self._retry + self._ops, []
+                self._retry = []
+            ops = self._load_spill() + ops
+            if not ops:
+                return True
+
+            remaining = self._apply(ops)
+            if remaining:
+                self._keep(remaining)
+                return False
+            self._clear_spill()
+            return True
+
+    def _batches(self, ops: List[Dict]) -> List[Tuple[List[Dict], str, Tuple]]:
+        """Coalesced (operations, kind, key) batches: inserts, then updates, then calls"""
+        inserts: Dict[str, List[Dict]] = {}
+        updates: Dict[Tuple[str, str, str], List[Dict]] = {}
+        calls: Dict[str, List[Dict]] = {}
+        for op in ops:
+            if op['op'] == 'insert':
+                inserts.setdefault(op['table'], []).append(op)
+            elif op['op'] == 'update':
+                key = (op['table'], op['column'], json.dumps(op['data'], sort_keys=True))
+                updates.setdefault(key, []).append(op)
+            else:
+                calls.setdefault(op['method'], []).append(op)
+
+        batches = []
+        for table, group in inserts.items():
+            for start in range(0, len(group), self.max_rows):
+                batches.append((group[start:start + self.max_rows], 'insert', (table,)))
+        for key, group in updates.items():
+            for start in range(0, len(group), self.max_rows):
+                batches.append((group[start:start + self.max_rows], 'update', key))
+        for method, group in calls.items():
+            batches.append((group, 'call', (method,)))
+        return batches
+
+    def _write(self, kind: str, key: Tuple, ops: List[Dict]):
+        if kind == 'insert':
+            self.storage.bulk_insert(key[0], [op['row'] for op in ops])
+        elif kind == 'update':
+            table, column, _ = key
+            values = list(dict.fromkeys(op['value'] for op in ops))
+            self.storage.bulk_update(table, ops[0]['data'], column, values)
+        else:
+            getattr(self.storage, key[0])()
+
+    def _apply(self, ops: List[Dict]) -> List[Dict]:
+        """Write all batches; returns the operations left for a retry"""
+        batches = self._batches(ops)
+        for index, (group, kind, key) in enumerate(batches):
+            table = key[0] if kind != 'call' else 'call'
+            try:
+                self._write(kind, key, group)
+                WRITE_BEHIND_ROWS.inc(len(group), table=table, outcome='written')
+            except Exception as e:
+                if is_transient(e):
+                    logger.warning("Database unreachable, keeping %d pending write(s): %s",
+                                   sum(len(rest) for rest, _, _ in batches[index:]), e)
+                    return [op for rest, _, _ in batches[index:] for op in rest]
+                logger.warning("Batch of %d %s write(s) to %s rejected, retrying one by one: %s",
+                               len(group), kind, table, e)
+                retry = self._write_each(kind, key, group)
+                if retry:
+                    return retry + [op for rest, _, _ in batches[index + 1:] for op in rest]
+        return []
+
+    def _write_each(self, kind: str, key: Tuple, ops: List[Dict]) -> List[Dict]:
+        """Write operations singly, dropping rejected ones; returns the rest if the database went away"""
+        table = key[0] if kind != 'call' else 'call'
+        for index, op in enumerate(ops):
+            try:
+                self._write(kind, key, [op])
+                WRITE_BEHIND_ROWS.inc(table=table, outcome='written')
+            except Exception as e:
+                if is_transient(e):
+                    return ops[index:]
+                logger.error("Dropping rejected %s write to %s: %s", kind, table, e, extra={'write': op})
+                WRITE_BEHIND_ROWS.inc(table=table, outcome='dropped')
+        return []
+
+    # Spill file ---------------------------------------------------------------
+
+    def _keep(self, ops: List[Dict]):
+        """Hold failed writes for the next flush, on disk when a spill file is set"""
+        if self.spill_path is None:
+            with self._lock:
+                self._retry = ops
+            return
+        try:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.spill_path.with_suffix(self.spill_path.suffix + '.tmp')
+            with temporary.open('w', encoding='utf-8') as handle:
+                for op in ops:
+                    handle.write(json.dumps(op, default=str) + '\n')
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(temporary, self.spill_path)
+            WRITE_BEHIND_ROWS.inc(len(ops), table='all', outcome='spilled')
+        except OSError as e:
+            logger.error("Cannot spill %d write(s) to %s, keeping them in memory: %s", len(ops), self.spill_path, e)
+            with self._lock:
+                self._retry = ops
+
+    def _spill_queued(self):
+        """Move the queued writes to the spill file (skipped while a flush is running)"""
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            with self._lock:
+                ops, self._ops = self._ops, []
+            try:
+                self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+                with self.spill_path.open('a', encoding='utf-8') as handle:
+                    for op in ops:
+                        handle.write(json.dumps(op, default=str) + '\n')
+                    handle.flush()
+                    os.fsync(handle.fileno())
+                WRITE_BEHIND_ROWS.inc(len(ops), table='all', outcome='spilled')
+            except OSError as e:
+                logger.error("Cannot spill %d write(s) to %s, keeping them in memory: %s", len(ops), self.spill_path, e)
+                with self._lock:
+                    self._ops = ops + self._ops
+        finally:
+            self._flush_lock.release()
+
+    def _load_spill(self) -> List[Dict]:
+        if self.spill_path is None or not self.spill_path.exists():
+            return []
+        with self.spill_path.open('r', encoding='utf-8') as handle:
+            ops = [json.loads(line) for line in handle if line.strip()]
+        if ops:
+            logger.info("Retrying %d spilled write(s) from %s", len(ops), self.spill_path)
+        return ops
+
+    def _clear_spill(self):
+        if self.spill_path is not None and self.spill_path.exists():
+            self.spill_path.unlink()
+
+
+class BufferedStorage(Storage):
+    """Storage whose bookkeeping writes go through a WriteBehindBuffer"""
+
+    # Time source for sent_at
+    clock: Clock = SYSTEM_CLOCK
+
+    def __init__(self, backend: Storage, buffer: WriteBehindBuffer, clock: Optional[Clock] = None):
+        """
+        Args:
+            backend: Storage used for reads and synchronous writes
+            buffer: Buffer flushing into `backend`
+            clock: Time source (default: system clock)
+        """
+        if clock is not None:
+            self.clock = clock
+        self.backend = backend
+        self.buffer = buffer
+
+    def create_reminder(self, user_id: str, schedule_id: str, reminder_type: str, scheduled_time: datetime) -> Optional[Dict]:
+        """Queue a reminder row; its id is assigned here so it can be updated before the flush"""
+        row = {
+            'reminder_id': str(uuid.uuid4()),
+            'user_id': user_id,
+            'schedule_id': schedule_id,
+            'reminder_type': reminder_type,
+            'scheduled_time': scheduled_time.isoformat(),
+            'status': 'pending'
+        }
+        self.buffer.insert('reminders', row)
+        return dict(row)
+
+    def mark_reminder_sent(self, reminder_id: str) -> bool:
+        # Whole seconds, so reminders sent in the same second share one PATCH
+        sent_at = self.clock.utcnow().replace(microsecond=0).isoformat()
+        self.buffer.update('reminders', {'status': 'sent', 'sent_at': sent_at}, 'reminder_id', reminder_id)
+        return True
+
+    def invalidate_session(self, session_id: str) -> bool:
+        self.buffer.update('sessions', {'is_active': False}, 'session_id', session_id)
+        return True
+
+    def cleanup_expired_sessions(self) -> int:
+        self.buffer.call('cleanup_expired_sessions')
+        return 0
+
+    def bulk_insert(self, table: str, rows: List[Dict]):
+        self.backend.bulk_insert(table, rows)
+
+    def bulk_update(self, table: str, data: Dict, column: str, values: List):
+        self.backend.bulk_update(table, data, column, values)
+
+
+def _delegate(name: str):
+    def method(self, *args, **kwargs):
+        return getattr(self.backend, name)(*args, **kwargs)
+
+    method.__name__ = name
+    method.__doc__ = getattr(Storage, name).__doc__
+    return method
+
+
+# Reads and writes whose effect callers see immediately go straight to the backend
+for _name in (
+    'create_user', 'get_user_by_username', 'get_user_by_id', 'update_user_calendar_token', 'delete_user',
+    'list_all_users', 'create_schedule', 'get_user_schedules', 'get_user_schedules_for_day',
+    'delete_user_schedules', 'bulk_create_schedules', 'create_session', 'get_active_session',
+    'get_active_sessions_for_user', 'invalidate_user_sessions', 'is_admin', 'add_admin', 'list_admins',
+    'prime_reads',
+):
+    setattr(BufferedStorage, _name, _delegate(_name))
+# The delegates were added after the class was created
+abc.update_abstractmethods(BufferedStorage)
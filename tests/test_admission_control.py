@@ -0,0 +1,110 @@
+"""Test per-chat admission control and load shedding in the update dispatcher."""
+
+import datetime
+
+from krs_reminder.admission import SHED_NOTICE, THROTTLED_NOTICE
+from krs_reminder.bench import BenchEnv
+from krs_reminder.clock import VirtualClock
+
+
+def _message(chat_id, text, update_id=1):
+    return {'update_id': update_id, 'message': {'chat': {'id': chat_id}, 'text': text}}
+
+
+def _texts_to(env, chat_id):
+    return [message['text'] for message in env.telegram.sent if str(message.get('chat_id')) == str(chat_id)]
+
+
+def test_spamming_chat_is_throttled():
+    """A chat repeating /login is cut off early with one notice; others are served"""
+    print("🧪 Testing per-chat admission\n")
+
+    env = BenchEnv()
+    try:
+        people = env.add_users(1, 3)
+        clock = VirtualClock(datetime.datetime(2025, 10, 6, 1, 0, tzinfo=datetime.timezone.utc))
+        env.bot.admission.clock = clock
+        spammer = 777001
+        scans = env.postgrest.calls.get(('GET', 'users'), 0)
+
+        for _ in range(20):
+            env.bot.handle_update(_message(spammer, '/login salah'))
+        replies = _texts_to(env, spammer)
+        print(f"20 x /login: {env.postgrest.calls[('GET', 'users')] - scans} user scans, {len(replies)} replies")
+        assert env.postgrest.calls[('GET', 'users')] - scans == 2, "Only the first two /login reach the database"
+        assert len(replies) == 3 and replies[-1] == THROTTLED_NOTICE, "One notice for the whole run"
+
+        for _ in range(5):
+            env.bot.handle_update(_message(spammer, '/login salah'))
+            env.bot.handle_update(_message(people[0]['chat_id'], '/start'))
+        assert len(_texts_to(env, spammer)) == 3, "Still throttled, no further notices"
+        assert len(_texts_to(env, people[0]['chat_id'])) == 5, "Other chats are not affected"
+
+        clock.advance(datetime.timedelta(seconds=10))
+        env.bot.handle_update(_message(spammer, '/login salah'))
+        assert len(_texts_to(env, spammer)) == 4 and _texts_to(env, spammer)[-1] != THROTTLED_NOTICE
+    finally:
+        env.close()
+    print("✅ PASS: Spamming chat throttled")
+
+
+def test_backlog_sheds_expensive_updates():
+    """Above the backlog threshold only cheap updates are handled"""
+    print("🧪 Testing load shedding\n")
+
+    env = BenchEnv()
+    try:
+        people = env.add_users(2, 3)
+        env.bot.admission.shed_backlog = 50
+        batch = [_message(people[0]['chat_id'], '/jadwal', 1)]
+        batch += [_message(900000 + index, 'halo', 2 + index) for index in range(58)]
+        batch.append(_message(people[1]['chat_id'], '/jadwal', 60))
+        env.telegram.updates = batch
+        env.bot.check_telegram_updates()
+
+        assert _texts_to(env, people[0]['chat_id']) == [SHED_NOTICE], "Shed while 60 updates were pending"
+        assert _texts_to(env, people[1]['chat_id']) and SHED_NOTICE not in _texts_to(env, people[1]['chat_id'])
+        assert env.bot.admission.backlog == 0 and env.bot.last_update_id == 60
+    finally:
+        env.close()
+    print("✅ PASS: Expensive updates shed under backlog")
+
+
+def test_rejected_taps_are_answered_and_repeats_free():
+    """Every rejected tap loses its spinner; a double tap is charged once"""
+    print("🧪 Testing admission of button taps\n")
+
+    env = BenchEnv()
+    try:
+        chat_id = env.add_users(1, 3)[0]['chat_id']
+        clock = VirtualClock(datetime.datetime(2025, 10, 6, 1, 0, tzinfo=datetime.timezone.utc))
+        env.bot.admission.clock = clock
+        env.bot.recent_callbacks.clock = clock
+        answers = []
+        answer = env.bot.answer_callback_query
+
+        def recording_answer(callback_query_id, text=None):
+            answers.append(text)
+            answer(callback_query_id, text)
+
+        env.bot.answer_callback_query = recording_answer
+
+        # Burst of 10: the double tap costs 1, day_1..day_9 the other 9
+        taps = ['day_0', 'day_0'] + [f'day_{index}' for index in range(1, 12)]
+        for index, data in enumerate(taps):
+            env.bot.handle_update({'update_id': index, 'callback_query': {
+                'id': f'cb{index}', 'data': data, 'message': {'chat': {'id': chat_id}},
+            }})
+        print(f"{len(taps)} taps, {env.telegram.calls['answerCallbackQuery']} answers")
+        assert env.telegram.calls['answerCallbackQuery'] == len(taps), "Every tap is answered"
+        assert answers[-2:] == [THROTTLED_NOTICE, None], "day_10 and day_11 rejected, one notice"
+        assert THROTTLED_NOTICE not in answers[:-2]
+    finally:
+        env.close()
+    print("✅ PASS: Rejected taps answered, double tap charged once")
+
+
+if __name__ == "__main__":
+    test_spamming_chat_is_throttled()
+    test_backlog_sheds_expensive_updates()
+    test_rejected_taps_are_answered_and_repeats_free()
@@ -0,0 +1,110 @@
+"""Test the precompiled class classifier."""
+
+import datetime
+
+from krs_reminder.bench import BenchEnv
+from krs_reminder.classifier import (
+    classify,
+    extract_description_highlights,
+    extract_facilitator,
+    profile_for_class_type,
+)
+
+
+def test_classify_priority_and_delivery():
+    """Category priority and online detection match the keyword table"""
+    print("🧪 Testing classifier\n")
+
+    cases = [
+        (('📚 Basis Data', 'Ruang 2.1', ''), 'Kuliah Teori', 'Sesi Tatap Muka'),
+        (('📚 Cloud Computing', 'Lab. AI', ''), 'Praktikum', 'Sesi Tatap Muka'),
+        (('Seminar Proposal', 'Zoom', ''), 'Seminar', 'Sesi Daring'),
+        (('Quiz Seminar Praktikum', '', 'online'), 'Praktikum', 'Sesi Daring'),
+        (('Studio Desain', '', 'evaluasi akhir'), 'Workshop / Studio', 'Sesi Tatap Muka'),
+        (('UJIAN Tengah Semester', 'Virtual room', ''), 'Evaluasi / Ujian', 'Sesi Daring'),
+        # Overlapping keywords all count, as substring checks would find them
+        (('teamseminar', '', ''), 'Seminar', 'Sesi Daring'),
+        (('virtualab ', '', ''), 'Praktikum', 'Sesi Daring'),
+        (('Studio', 'onlinequiz', ''), 'Workshop / Studio', 'Sesi Daring'),
+    ]
+    for args, category, delivery in cases:
+        profile = classify(*args)
+        print(f"  {args[0]!r}: {profile['category_label']} / {profile['delivery_label']}")
+        assert profile['category_label'] == category
+        assert profile['delivery_label'] == delivery
+
+    assert classify('a', '', '') is classify('b', '', ''), "Profiles should be shared"
+    try:
+        classify('a', '', '')['category_label'] = 'x'
+        assert False, "Profiles should be read-only"
+    except TypeError:
+        pass
+
+    stored = profile_for_class_type('Seminar', '📚 Kewirausahaan', 'Zoom')
+    assert (stored['category_icon'], stored['delivery_label']) == ('🎤', 'Sesi Daring')
+    assert profile_for_class_type(None, 'Praktikum Jarkom', '')['category_label'] == 'Praktikum'
+    # 'Kuliah Teori' was the fallback of the old three-way import: classified again
+    assert profile_for_class_type('Kuliah Teori', 'Studio Desain', 'Ruang 2')['category_label'] == 'Workshop / Studio'
+    assert profile_for_class_type('Kuliah Teori', 'Ujian Akhir', '')['category_label'] == 'Evaluasi / Ujian'
+    assert profile_for_class_type('Kuliah Teori', 'Basis Data', 'Ruang 2')['category_label'] == 'Kuliah Teori'
+    print("✅ PASS: Classification matches the keyword table")
+
+
+def test_facilitator_and_highlights():
+    """Facilitator keyword priority and highlight cleanup"""
+    description = "1. Materi: Normalisasi\nPengajar: Dr. Sari\nDosen: Pak Budi\n- Bawa modul"
+
+    assert extract_facilitator(description) == 'Pak Budi', "dosen has priority over pengajar"
+    assert extract_facilitator('') is None
+    assert extract_description_highlights(description) == ['Materi: Normalisasi', 'Bawa modul'], \
+        "Bullets are stripped and facilitator lines skipped"
+    print("✅ PASS: Facilitator and highlights extracted")
+
+
+def test_import_stores_classification():
+    """/admin_import_schedule stores class type and facilitator, then refreshes cache and reminders"""
+    print("🧪 Testing schedule import\n")
+
+    env = BenchEnv()
+    try:
+        user = env.add_users(1, 0)[0]
+        admin_chat = 4242
+        assert env.bot.db.add_admin(admin_chat)
+        assert env.bot.admin.setup_calendar(user['user_id'], '{"token": "x"}')['success']
+        start = env.bot.clock.now(env.bot.tz).replace(microsecond=0) + datetime.timedelta(days=1)
+        env.calendar.items = [
+            {
+                'id': f'evt{index}', 'summary': summary, 'location': location, 'description': description,
+                'start': {'dateTime': (start + datetime.timedelta(hours=index)).isoformat()},
+                'end': {'dateTime': (start + datetime.timedelta(hours=index, minutes=50)).isoformat()},
+            }
+            for index, (summary, location, description) in enumerate([
+                ('Studio Desain', 'Ruang 2', 'Dosen: Bu Rina'),
+                ('Basis Data', 'Zoom', 'Pengajar: Pak Budi\nMateri: ujian akhir'),
+            ])
+        ]
+        sweeps = []
+        env.bot.request_sweep = lambda reason='': sweeps.append(reason)
+        version = env.bot.schedule_cache.version(user['user_id'])
+
+        reply = env.bot.cmd_handler.handle_admin_import_schedule(admin_chat, ['/admin_import_schedule', user['user_id']])
+        print(reply.splitlines()[0])
+        assert 'Import Berhasil' in reply
+        rows = sorted(
+            (row for row in env.postgrest.tables['schedules'] if row['user_id'] == user['user_id']),
+            key=lambda row: row['start_time']
+        )
+        assert [(row['class_type'], row['facilitator']) for row in rows] == [
+            ('Workshop / Studio', 'Bu Rina'), ('Evaluasi / Ujian', 'Pak Budi'),
+        ]
+        assert sweeps == [f"import jadwal {user['user_id']}"], "Reminders scheduled right away"
+        assert env.bot.schedule_cache.version(user['user_id']) != version, "Rendered schedule invalidated"
+    finally:
+        env.close()
+    print("✅ PASS: Import stores the classification")
+
+
+if __name__ == "__main__":
+    test_classify_priority_and_delivery()
+    test_facilitator_and_highlights()
+    test_import_stores_classification()
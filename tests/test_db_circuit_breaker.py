@@ -0,0 +1,121 @@
+"""Test the Supabase circuit breaker and stale reads during an outage."""
+
+import datetime
+
+from krs_reminder.bench import BenchEnv, FakePostgREST
+from krs_reminder.clock import VirtualClock
+from krs_reminder.resilience import CircuitBreaker, stale_since
+
+NOW = datetime.datetime(2025, 10, 6, 1, 0, tzinfo=datetime.timezone.utc)
+
+
+def test_breaker_fails_fast_and_probes():
+    """Open after repeated failures, serve stale reads, recover through one probe"""
+    print("🧪 Testing circuit breaker\n")
+
+    fake = FakePostgREST()
+    clock = VirtualClock(NOW)
+    breaker = CircuitBreaker('supabase', failure_threshold=2, reset_seconds=30, clock=clock)
+    client = fake.client(clock=clock)
+    client.breaker = breaker
+    user = client.create_user('mhs01', 'hash')
+    client.create_session(user['user_id'], 42, 'token')
+    for hours in (2, 30):
+        start = NOW + datetime.timedelta(hours=hours)
+        client.create_schedule(user['user_id'], {
+            'course_name': f'Kelas {hours}', 'start_time': start.isoformat(),
+            'end_time': (start + datetime.timedelta(hours=2)).isoformat(),
+        })
+    week = client.get_user_schedules(user['user_id'], NOW, NOW + datetime.timedelta(days=7))
+    assert client.get_active_session(42) and client.get_user_by_id(user['user_id'])
+    assert stale_since(week) is None
+
+    fake.down = True
+    session = client.get_active_session(42)
+    assert session['session_token'] == 'token' and stale_since(session) == NOW
+    assert breaker.state == 'closed'
+    assert client.get_user_by_id(user['user_id'])['username'] == 'mhs01'
+    assert breaker.state == 'open', "Second consecutive failure opens the breaker"
+
+    calls = dict(fake.calls)
+    fake.down = False
+    today = client.get_user_schedules(user['user_id'], NOW, NOW + datetime.timedelta(hours=24))
+    assert [row['course_name'] for row in today] == ['Kelas 2'], "Window filtered from the cached week"
+    assert stale_since(today) == NOW
+    assert client.get_active_session(99) is None, "Nothing cached: plain failure"
+    assert fake.calls == calls, "Open breaker does not touch the database"
+
+    clock.advance(datetime.timedelta(seconds=31))
+    fresh = client.get_user_schedules(user['user_id'], NOW, NOW + datetime.timedelta(hours=24))
+    assert stale_since(fresh) is None and breaker.state == 'closed', "Probe succeeded"
+
+    fake.down = True
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.advance(datetime.timedelta(seconds=31))
+    client.get_active_session(42)
+    assert breaker.state == 'open', "Failed probe re-opens the breaker"
+    print("✅ PASS: Fail fast, stale reads, half-open probe")
+
+
+def test_jadwal_marks_stale_schedule():
+    """/jadwal still answers during an outage, with a notice, and does not cache it"""
+    print("🧪 Testing stale /jadwal\n")
+
+    env = BenchEnv()
+    try:
+        people = env.add_users(1, 3, first_hours=6, span_hours=24)
+        chat_id = people[0]['chat_id']
+        handler = env.bot.cmd_handler
+        ok, _, fresh = handler.handle_jadwal_sections(chat_id)
+        assert ok
+        env.bot.schedule_cache.bump(people[0]['user_id'])
+
+        env.postgrest.down = True
+        ok, _, stale = handler.handle_jadwal_sections(chat_id)
+        assert ok, "Logged in and schedule shown from the last good reads"
+        assert tuple(stale[:-1]) == tuple(fresh) and 'tidak dapat dihubungi' in stale[-1]
+
+        env.postgrest.down = False
+        env.bot.db.backend.breaker.record_success()
+        _, _, again = handler.handle_jadwal_sections(chat_id)
+        assert tuple(again) == tuple(fresh), "Stale answer was not cached"
+    finally:
+        env.close()
+    print("✅ PASS: Stale schedule shown with a notice")
+
+
+def test_probe_error_releases_breaker():
+    """A probe failing with something other than a request error does not block later probes"""
+    print("🧪 Testing a failed half-open probe\n")
+
+    fake = FakePostgREST()
+    clock = VirtualClock(NOW)
+    breaker = CircuitBreaker('supabase', failure_threshold=1, reset_seconds=30, clock=clock)
+    client = fake.client(clock=clock)
+    client.breaker = breaker
+    user = client.create_user('mhs01', 'hash')
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    get = fake.get
+
+    def broken_get(*args, **kwargs):
+        raise ValueError("not JSON")
+
+    fake.get = broken_get
+    clock.advance(datetime.timedelta(seconds=31))
+    assert client.get_user_by_id(user['user_id']) is None
+    assert breaker.state == 'open', "Errored probe re-opens the breaker"
+
+    fake.get = get
+    clock.advance(datetime.timedelta(seconds=31))
+    assert client.get_user_by_id(user['user_id'])['username'] == 'mhs01'
+    assert breaker.state == 'closed', "Next probe still runs"
+    print("✅ PASS: Probe released after an unexpected error")
+
+
+if __name__ == "__main__":
+    test_breaker_fails_fast_and_probes()
+    test_jadwal_marks_stale_schedule()
+    test_probe_error_releases_breaker()
@@ -0,0 +1,91 @@
+"""Test the parsed event model shared by formatters and the scheduler."""
+
+import pytz
+
+from krs_reminder.events import EventView, as_event_view, to_event_views
+
+
+TZ = pytz.timezone('Asia/Jakarta')
+
+
+def _event():
+    return {
+        'id': 'evt1',
+        'summary': '📚 Praktikum <Basis Data>',
+        'location': ' Lab. Komputer 2 ',
+        'description': 'Materi: Normalisasi\nDosen: Pak Budi\nBawa modul',
+        'start': {'dateTime': '2025-10-13T01:00:00Z'},
+        'end': {'dateTime': '2025-10-13T02:40:00Z'},
+    }
+
+
+def test_event_view_parses_once():
+    """Times are localized and text fields derived when the view is built"""
+    print("🧪 Testing EventView parsing\n")
+
+    view = EventView(_event(), TZ)
+
+    print(f"{view.time_range} | {view.summary} | {view.facilitator} | {view.profile['category_label']}")
+    assert view.start.hour == 8 and view.end.hour == 9, "UTC times should be localized to WIB"
+    assert view.time_range == '08:00—09:40'
+    assert view.summary == '📚 Praktikum &lt;Basis Data&gt;', "Summary should be HTML escaped"
+    assert view.location == 'Lab. Komputer 2'
+    assert view.facilitator == 'Pak Budi'
+    assert view.profile['category_label'] == 'Praktikum'
+    assert view.highlights == ['Materi: Normalisasi', 'Bawa modul']
+    assert as_event_view(view, TZ) is view, "Views must not be parsed again"
+
+    try:
+        view.extra = 1
+        assert False, "EventView should use __slots__"
+    except AttributeError:
+        pass
+    print("✅ PASS: EventView parses once")
+
+
+def test_schedule_row_view():
+    """Schedule rows use their columns without description parsing"""
+    print("🧪 Testing EventView from schedule rows\n")
+
+    row = {
+        'schedule_id': 's1',
+        'google_event_id': 'g1',
+        'course_name': 'Cloud Computing',
+        'start_time': '2025-10-13T08:00:00+07:00',
+        'end_time': '2025-10-13T09:40:00+07:00',
+        'location': 'Ruang 3.1',
+        'facilitator': 'Ibu Erina',
+        'class_type': 'Seminar',
+        'course_code': 'IF301',
+    }
+    view = as_event_view(row, TZ)
+    other_user = EventView.from_schedule(dict(row, schedule_id='s2', google_event_id='g2'), TZ)
+
+    print(f"{view.summary} | {view.facilitator} | {view.profile['category_label']}")
+    assert view.summary == '📚 Cloud Computing'
+    assert view.facilitator == 'Ibu Erina' and view.description == ''
+    assert view.profile['category_label'] == 'Seminar', "class_type column should be used as-is"
+    assert view.event_id == 'g1'
+    assert view.fingerprint == other_user.fingerprint, "Identical sessions should share a fingerprint"
+    print("✅ PASS: Schedule rows rendered natively")
+
+
+def test_all_day_and_invalid_events():
+    """All-day events are flagged, events without start are skipped"""
+    print("🧪 Testing all-day/invalid events\n")
+
+    views = to_event_views([
+        {'summary': 'Libur', 'start': {'date': '2025-10-14'}, 'end': {'date': '2025-10-15'}},
+        {'summary': 'Rusak', 'start': {}},
+    ], TZ)
+
+    assert len(views) == 1, "Event without start should be skipped"
+    assert views[0].all_day and views[0].time_range == 'Sepanjang hari'
+    assert views[0].start.tzinfo is not None
+    print("✅ PASS: All-day and invalid events handled")
+
+
+if __name__ == "__main__":
+    test_event_view_parses_once()
+    test_schedule_row_view()
+    test_all_day_and_invalid_events()
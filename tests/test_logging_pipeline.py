@@ -0,0 +1,72 @@
+"""Test the queued JSON logging pipeline."""
+
+import io
+import json
+import logging
+
+from krs_reminder.logging_setup import configure_logging, parse_module_levels, stop_logging
+
+
+def _run_pipeline(**kwargs):
+    root = logging.getLogger()
+    saved_handlers, saved_level = list(root.handlers), root.level
+    stream = io.StringIO()
+    try:
+        configure_logging(stream=stream, **kwargs)
+        yield stream
+    finally:
+        stop_logging()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+
+def test_json_records_written_off_thread():
+    """Records are JSON lines with extra fields, written by the listener"""
+    print("🧪 Testing JSON logging pipeline\n")
+
+    pipeline = _run_pipeline(level='INFO')
+    stream = next(pipeline)
+    logger = logging.getLogger('krs_reminder.test')
+    logger.info("Sweep: %d users", 3, extra={'pending': 12})
+    logger.debug("hidden")
+    next(pipeline, None)  # stop_logging flushes the queue
+
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    print(lines)
+    assert len(lines) == 1
+    assert lines[0]['msg'] == 'Sweep: 3 users'
+    assert lines[0]['pending'] == 12 and lines[0]['level'] == 'INFO'
+    assert lines[0]['logger'] == 'krs_reminder.test'
+    print("✅ PASS: Structured records emitted")
+
+
+def test_debug_sampling_and_module_levels():
+    """Debug lines of one template are sampled; module levels apply"""
+    print("🧪 Testing debug sampling\n")
+
+    levels = parse_module_levels("krs_reminder.quiet=WARNING, bad, krs_reminder.loud=debug")
+    assert levels == {'krs_reminder.quiet': 'WARNING', 'krs_reminder.loud': 'DEBUG'}
+
+    pipeline = _run_pipeline(level='DEBUG', module_levels=levels, debug_sample_rate=10)
+    stream = next(pipeline)
+    loud = logging.getLogger('krs_reminder.loud')
+    for slot in range(25):
+        loud.debug("Scheduled slot %d", slot)
+    logging.getLogger('krs_reminder.quiet').info("dropped")
+    logging.getLogger('krs_reminder.quiet').warning("kept")
+    next(pipeline, None)
+
+    messages = [json.loads(line)['msg'] for line in stream.getvalue().splitlines()]
+    print(messages)
+    assert messages == ['Scheduled slot 0', 'Scheduled slot 10', 'Scheduled slot 20', 'kept']
+    logging.getLogger('krs_reminder.quiet').setLevel(logging.NOTSET)
+    logging.getLogger('krs_reminder.loud').setLevel(logging.NOTSET)
+    print("✅ PASS: Debug lines sampled 1 in 10")
+
+
+if __name__ == "__main__":
+    test_json_records_written_off_thread()
+    test_debug_sampling_and_module_levels()
@@ -0,0 +1,85 @@
+"""Test the streaming message chunker used for long Telegram outputs."""
+
+import re
+
+from krs_reminder.chunking import chunk_blocks, split_message, utf16_len
+
+
+def test_utf16_limit_and_block_boundaries():
+    """Sections respect the UTF-16 limit and never split a block"""
+    print("🧪 Testing chunker limits\n")
+
+    blocks = [['', "⏰ <b>08:00—09:40</b>", f"📚 Kelas {i} 🧪🧪🧪", '🏛️ Kuliah Teori', ''] for i in range(200)]
+    sections = list(chunk_blocks(blocks, ['📅 <b>JADWAL</b>'], ['🗓️ <b>JADWAL (LANJUTAN)</b>'], limit=1000))
+
+    print(f"Sections: {len(sections)}, sizes: {[utf16_len(s) for s in sections[:3]]}")
+    assert len(sections) > 1, "Long output should be split"
+    assert all(utf16_len(section) <= 1000 for section in sections), "Emoji must count as two units"
+    assert sections[0].startswith('📅 <b>JADWAL</b>')
+    assert all(section.startswith('🗓️ <b>JADWAL (LANJUTAN)</b>') for section in sections[1:])
+    combined = '\n'.join(sections)
+    assert all(f"📚 Kelas {i} 🧪🧪🧪\n🏛️ Kuliah Teori" in combined for i in range(200)), \
+        "Blocks must stay intact"
+    print("✅ PASS: Limits and boundaries respected")
+
+
+def test_lazy_sections_and_split_message():
+    """Sections are produced before all blocks are consumed"""
+    print("🧪 Testing lazy chunking\n")
+
+    consumed = []
+
+    def blocks():
+        for i in range(50):
+            consumed.append(i)
+            yield ['x' * 90]
+
+    first = next(chunk_blocks(blocks(), limit=200))
+    assert first == 'x' * 90 + '\n' + 'x' * 90
+    assert len(consumed) < 50, "Chunker should not render everything up front"
+
+    assert split_message('short') == ['short']
+    parts = split_message('\n\n'.join('paragraf ' * 20 for _ in range(10)), limit=500)
+    assert len(parts) > 1 and all(utf16_len(part) <= 500 for part in parts)
+    assert split_message('y' * 1200, limit=500) == ['y' * 500, 'y' * 500, 'y' * 200], \
+        "Oversized lines are hard-split"
+    print("✅ PASS: Chunking is lazy")
+
+
+def test_oversized_line_is_tag_safe():
+    """An oversized HTML line fits under the continuation header and keeps tags whole"""
+    print("🧪 Testing oversized line split\n")
+
+    line = '<b>' + 'Ruang A&amp;B 🧪 ' * 120 + '</b>'
+    sections = list(chunk_blocks([['intro'], [line]], ['📅 <b>JADWAL</b>'], ['🗓️ <b>LANJUTAN</b>'], limit=300))
+
+    print(f"Sections: {len(sections)}, sizes: {[utf16_len(s) for s in sections[:4]]}")
+    assert all(utf16_len(section) <= 300 for section in sections), "Pieces must fit beside the header"
+    assert all(section != '🗓️ <b>LANJUTAN</b>' for section in sections), "No header-only sections"
+    for section in sections[1:]:
+        body = section.split('\n', 1)[1]
+        assert body.startswith('<b>') and body.endswith('</b>'), "Tags closed and reopened at cuts"
+        assert body.count('<b>') == body.count('</b>')
+        assert not re.search(r'&(?!amp;)|<(?![/b])', body), "Entities and tags are never cut"
+    combined = ''.join(section.split('\n', 1)[1].replace('<b>', '').replace('</b>', '') for section in sections[1:])
+    assert combined == 'Ruang A&amp;B 🧪 ' * 120, "Nothing lost between pieces"
+    print("✅ PASS: Oversized lines split at tag-safe boundaries")
+
+
+def test_trailing_empty_block_adds_no_section():
+    """A blank block after an exactly full section does not emit a header-only message"""
+    print("🧪 Testing trailing empty blocks\n")
+
+    body = 'x' * 294  # 'HEAD' + newline + body = 299
+    for trailing in ([], [''], ['', '']):
+        sections = list(chunk_blocks([[body], trailing], ['HEAD'], ['CONT'], limit=299))
+        print(f"Trailing {trailing!r}: {[utf16_len(section) for section in sections]}")
+        assert sections == ['HEAD\n' + body], "Only the full section is sent"
+    print("✅ PASS: No continuation header without body")
+
+
+if __name__ == "__main__":
+    test_utf16_limit_and_block_boundaries()
+    test_lazy_sections_and_split_message()
+    test_oversized_line_is_tag_safe()
+    test_trailing_empty_block_adds_no_section()
@@ -0,0 +1,113 @@
+"""Test the metrics registry, Prometheus endpoint and I/O instrumentation."""
+
+import urllib.request
+
+import pytest
+import requests
+
+from krs_reminder import database
+from krs_reminder.database import SupabaseClient
+from krs_reminder.metrics import (
+    DB_REQUEST_ERRORS,
+    DB_REQUEST_SECONDS,
+    MetricsRegistry,
+    MetricsServer,
+    track,
+)
+
+
+def test_registry_renders_prometheus_text():
+    """Counters, gauges and cumulative histogram buckets"""
+    print("🧪 Testing metrics registry\n")
+
+    registry = MetricsRegistry()
+    sent = registry.counter('krs_test_sent_total', 'Sent messages', ('method',))
+    depth = registry.gauge('krs_test_depth', 'Queue depth')
+    latency = registry.histogram('krs_test_seconds', 'Latency', ('method',), buckets=(0.1, 1))
+
+    sent.inc(method='sendMessage')
+    sent.inc(2, method='sendMessage')
+    depth.set_function(lambda: 7)
+    for value in (0.05, 0.1, 0.5, 3):
+        latency.observe(value, method='getUpdates')
+
+    assert registry.counter('krs_test_sent_total', 'Sent messages', ('method',)) is sent
+    with pytest.raises(ValueError):
+        sent.inc(verb='GET')
+
+    text = registry.render()
+    print(text)
+    assert 'krs_test_sent_total{method="sendMessage"} 3' in text
+    assert 'krs_test_depth 7' in text
+    assert 'krs_test_seconds_bucket{method="getUpdates",le="0.1"} 2' in text
+    assert 'krs_test_seconds_bucket{method="getUpdates",le="1"} 3' in text
+    assert 'krs_test_seconds_bucket{method="getUpdates",le="+Inf"} 4' in text
+    assert 'krs_test_seconds_count{method="getUpdates"} 4' in text
+    assert '# TYPE krs_test_seconds histogram' in text
+    print("✅ PASS: Prometheus text format")
+
+
+def test_metrics_endpoint_serves_registry():
+    """Local HTTP endpoint returns the registry on /metrics"""
+    print("🧪 Testing metrics endpoint\n")
+
+    registry = MetricsRegistry()
+    calls = registry.histogram('krs_test_call_seconds', 'Calls', ('call',))
+    errors = registry.counter('krs_test_call_errors_total', 'Call errors', ('call',))
+    with track(calls, errors, call='events.list'):
+        pass
+    with pytest.raises(RuntimeError):
+        with track(calls, errors, call='events.list'):
+            raise RuntimeError("calendar down")
+
+    server = MetricsServer(registry, port=0)
+    server.start()
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{server.port}/metrics', timeout=5) as response:
+            body = response.read().decode('utf-8')
+    finally:
+        server.stop()
+
+    assert 'krs_test_call_seconds_count{call="events.list"} 2' in body
+    assert 'krs_test_call_errors_total{call="events.list"} 1' in body
+    print("✅ PASS: /metrics served")
+
+
+def test_supabase_requests_are_instrumented(monkeypatch):
+    """Every REST call is timed per endpoint and verb; failures are counted"""
+    print("🧪 Testing Supabase instrumentation\n")
+
+    class Response:
+        def __init__(self, status):
+            self.status_code = status
+            self.text = '[]'
+
+        def raise_for_status(self):
+            if self.status_code >= 400:
+                raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+        def json(self):
+            return []
+
+    statuses = iter([200, 503])
+    monkeypatch.setattr(database.requests, 'get', lambda *args, **kwargs: Response(next(statuses)))
+
+    client = object.__new__(SupabaseClient)
+    client.base_url = 'http://supabase.invalid/rest/v1'
+    client.headers = {}
+
+    before = DB_REQUEST_SECONDS.count(endpoint='schedules', method='GET')
+    errors_before = DB_REQUEST_ERRORS.value(endpoint='schedules', method='GET')
+    client._request('GET', 'schedules', params={'user_id': 'eq.u1'})
+    with pytest.raises(requests.HTTPError):
+        client._request('GET', 'schedules')
+
+    assert DB_REQUEST_SECONDS.count(endpoint='schedules', method='GET') == before + 2
+    assert DB_REQUEST_ERRORS.value(endpoint='schedules', method='GET') == errors_before + 1
+    print("✅ PASS: Supabase requests instrumented")
+
+
+if __name__ == "__main__":
+    test_registry_renders_prometheus_text()
+    test_metrics_endpoint_serves_registry()
+    pytest.main([__file__, '-k', 'supabase'])
@@ -0,0 +1,54 @@
+"""Test the background metrics sampler behind /stats."""
+
+import time
+
+from krs_reminder.monitoring import MetricsSampler
+
+
+def test_sampler_ring_buffer_and_snapshot():
+    """Samples are buffered, bounded and read without blocking"""
+    print("🧪 Testing metrics sampler\n")
+
+    calls = []
+
+    def collect():
+        calls.append(1)
+        return {'jobs': 3, 'pending_jobs': 2, 'next_run': None, 'queue_depth': len(calls)}
+
+    sampler = MetricsSampler(collect, interval_seconds=0.5, history_seconds=1)
+    for _ in range(5):
+        sampler.sample_once()
+
+    start = time.monotonic()
+    sample = sampler.snapshot()
+    elapsed = time.monotonic() - start
+
+    print(f"Snapshot in {elapsed * 1000:.2f} ms, queue depth {sample.queue_depth}")
+    assert elapsed < 0.05, "Reading stats must not block"
+    assert sample.queue_depth == 5 and sample.jobs == 3
+    assert len(sampler._samples) == 3, "Ring buffer should keep history_seconds / interval + 1 samples"
+    assert sampler.average('queue_depth', 60) == 4.0, "Average over buffered samples"
+    print("✅ PASS: Snapshot is O(1) and buffer bounded")
+
+
+def test_sampler_thread_and_failures():
+    """Background thread samples periodically; collection errors are tolerated"""
+    print("🧪 Testing sampler thread\n")
+
+    def collect():
+        raise RuntimeError("scheduler gone")
+
+    sampler = MetricsSampler(collect, interval_seconds=0.5)
+    sampler.start()
+    time.sleep(0.2)
+    sampler.stop()
+
+    sample = sampler.latest
+    assert sample is not None, "Thread should have taken a sample"
+    assert sample.jobs == 0 and sample.rss_bytes > 0
+    print("✅ PASS: Sampler thread runs and survives failures")
+
+
+if __name__ == "__main__":
+    test_sampler_ring_buffer_and_snapshot()
+    test_sampler_thread_and_failures()
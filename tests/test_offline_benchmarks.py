@@ -0,0 +1,107 @@
+"""Test the offline benchmark fakes, scenarios and baseline comparison."""
+
+import datetime
+import json
+
+from krs_reminder.bench import BenchEnv, BenchResult, FakePostgREST, compare, percentile
+from krs_reminder.bench.__main__ import main as bench_main
+from krs_reminder.bench.scenarios import run
+
+
+def test_fake_postgrest_filters():
+    """SupabaseClient queries are answered like PostgREST would"""
+    print("🧪 Testing fake PostgREST\n")
+
+    fake = FakePostgREST()
+    db = fake.client()
+    base = datetime.datetime(2025, 10, 6, 8, 0, tzinfo=datetime.timezone.utc)
+    user = db.create_user('mhs01', 'hash')
+    for hours in (0, 5, 30):
+        start = base + datetime.timedelta(hours=hours)
+        db.create_schedule(user['user_id'], {
+            'course_name': f'Kelas {hours}',
+            'start_time': start.isoformat(),
+            'end_time': (start + datetime.timedelta(hours=2)).isoformat(),
+        })
+
+    window = db.get_user_schedules(user['user_id'], base, base + datetime.timedelta(hours=24))
+    assert [row['course_name'] for row in window] == ['Kelas 0', 'Kelas 5']
+    assert db.get_user_schedules('someone-else') == []
+
+    db.create_session(user['user_id'], 42, 'token')
+    assert db.get_active_session(42)['user_id'] == user['user_id']
+    assert db.invalidate_user_sessions(42)
+    assert db.get_active_session(42) is None
+    assert fake.calls[('GET', 'schedules')] == 2
+    print("✅ PASS: eq/and/order filters and PATCH behave like PostgREST")
+
+
+def test_scenarios_run_offline():
+    """Small scenarios run against the fakes and report stable work counts"""
+    print("🧪 Testing benchmark scenarios\n")
+
+    env = BenchEnv(telegram_latency=0.001)
+    try:
+        env.add_users(3, 4, shared=True, first_hours=6, span_hours=12)
+        env.bot.check_and_schedule_events()
+        report = env.bot.last_sweep_report
+        assert report.events == 12 and not report.failures
+        assert env.bot.coalescer.queue_depth == 3 * 4 * 5, "4 classes × 5 reminders per chat"
+    finally:
+        env.close()
+
+    durations, sent = run('reminder_burst', {'users': 3, 'events': 2})
+    print(f"Burst: {len(durations)} groups, {sent} messages")
+    assert len(durations) == 10 and sent > 0
+
+    durations, logins = run('login', {'users': 3})
+    assert logins == 3 and len(durations) == 3
+
+    durations, renders = run('weekly_render', {'events': 5, 'iterations': 3})
+    assert renders == 3 and all(duration > 0 for duration in durations)
+    print("✅ PASS: Scenarios run without network access")
+
+
+def test_baseline_comparison():
+    """Regressions beyond the tolerance are reported, noise is not"""
+    print("🧪 Testing baseline comparison\n")
+
+    assert percentile([0.1, 0.2, 0.3, 0.4], 0.5) == 0.2
+    assert percentile([0.1, 0.2, 0.3, 0.4], 0.95) == 0.4
+
+    result = BenchResult('sweep', {'users': 2}, [0.010] * 10, 20)
+    baseline = {'params': {'users': 2}, 'p95_ms': 10.0, 'throughput': 200.0}
+    assert compare(result, baseline) == []
+
+    slower = BenchResult('sweep', {'users': 2}, [0.020] * 10, 20)
+    problems = compare(slower, baseline)
+    print("\n".join(problems))
+    assert len(problems) == 2, "p95 and throughput both regressed"
+
+    assert compare(slower, {**baseline, 'params': {'users': 5}}) == [], "Different parameters are not compared"
+    tiny = BenchResult('render', {}, [0.0004] * 10, 10)
+    assert compare(tiny, {'params': {}, 'p95_ms': 0.2}) == [], "Sub-millisecond jitter is ignored"
+    print("✅ PASS: Baseline comparison")
+
+
+def test_baseline_matches_environment(tmp_path):
+    """A run with injected latency is not compared against a zero-latency baseline"""
+    baseline = tmp_path / 'baseline.json'
+    args = ['sweep_single', '--events', '5', '--iterations', '3', '--baseline', str(baseline)]
+    assert bench_main(args + ['--update-baseline']) == 0
+    assert bench_main(args + ['--calendar-latency', '0.02']) == 0, "Different environment, no regression"
+    recorded = json.loads(baseline.read_text())['sweep_single']['params']
+    assert recorded['calendar_latency'] == 0.0 and recorded['storage'] == 'postgrest'
+    print("✅ PASS: Baselines keyed by environment")
+
+
+if __name__ == "__main__":
+    test_fake_postgrest_filters()
+    test_scenarios_run_offline()
+    test_baseline_comparison()
+
+    import pathlib
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_baseline_matches_environment(pathlib.Path(directory))
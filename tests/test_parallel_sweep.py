@@ -0,0 +1,112 @@
+"""Test the bounded parallel multi-user sweep and its report."""
+
+import threading
+import time
+
+from krs_reminder.sweep import UserSweepResult, run_user_sweep
+
+
+def _users(count):
+    return [{'user_id': f'u{i}', 'username': f'user{i}'} for i in range(count)]
+
+
+def test_parallel_sweep_bounded_width():
+    """No more than max_workers users are swept at the same time"""
+    print("🧪 Testing bounded sweep width\n")
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def worker(user):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        result = UserSweepResult(user)
+        result.events = 2
+        return result
+
+    report = run_user_sweep(_users(8), worker, max_workers=3, timeout=5)
+
+    print(report.summary())
+    assert peak <= 3, f"Expected at most 3 concurrent users, got {peak}"
+    assert report.users == 8, "Every user should be reported"
+    assert report.events == 16, "Event counts should be aggregated"
+    print("✅ PASS: Sweep width is bounded")
+
+
+def test_failing_and_slow_users_isolated():
+    """A failing or hanging user does not block the others"""
+    print("🧪 Testing failure/timeout isolation\n")
+
+    release = threading.Event()
+
+    def worker(user):
+        if user['user_id'] == 'u0':
+            raise RuntimeError("database down")
+        if user['user_id'] == 'u1':
+            release.wait(5)
+        result = UserSweepResult(user)
+        result.pending = {f"{user['user_id']}_1h": None}
+        return result
+
+    start = time.monotonic()
+    report = run_user_sweep(_users(4), worker, max_workers=4, timeout=0.3)
+    elapsed = time.monotonic() - start
+    release.set()
+
+    print(report.summary())
+    assert elapsed < 3, f"Sweep should not wait for the hanging user ({elapsed:.1f}s)"
+    assert [r.username for r in report.failures] == ['user0'], "u0 should be reported as failed"
+    assert [r.username for r in report.timeouts] == ['user1'], "u1 should be reported as timeout"
+    assert set(report.pending) == {'u2_1h', 'u3_1h'}, "Healthy users' reminders should be kept"
+    print("✅ PASS: Failing and slow users are isolated")
+
+
+def test_hung_workers_do_not_block_the_sweep():
+    """Users queued behind hung workers are reported instead of waited for"""
+    print("🧪 Testing hung sweep workers\n")
+
+    release = threading.Event()
+
+    def worker(user):
+        if user['user_id'] in ('u0', 'u1'):
+            release.wait(10)
+        return UserSweepResult(user)
+
+    start = time.monotonic()
+    report = run_user_sweep(_users(4), worker, max_workers=2, timeout=0.5)
+    elapsed = time.monotonic() - start
+    release.set()
+
+    print(report.summary())
+    assert elapsed < 3, f"Sweep should return once every worker hangs ({elapsed:.1f}s)"
+    assert report.users == 4 and len(report.timeouts) == 4 and not report.complete
+    print("✅ PASS: Hung workers do not block the sweep")
+
+
+def test_sweep_deadline():
+    """Users not swept before the deadline count as timeouts"""
+    def worker(user):
+        time.sleep(0.3)
+        return UserSweepResult(user)
+
+    start = time.monotonic()
+    report = run_user_sweep(_users(20), worker, max_workers=2, timeout=5, deadline=1)
+    elapsed = time.monotonic() - start
+
+    print(report.summary())
+    assert elapsed < 2.5 and report.users == 20, "Every user is reported by the deadline"
+    assert report.timeouts and len(report.timeouts) < 20
+    print("✅ PASS: Sweep deadline enforced")
+
+
+if __name__ == "__main__":
+    test_parallel_sweep_bounded_width()
+    test_failing_and_slow_users_isolated()
+    test_hung_workers_do_not_block_the_sweep()
+    test_sweep_deadline()
@@ -0,0 +1,98 @@
+"""Test coalescing of reminders for users with back-to-back classes."""
+
+import datetime
+
+import pytz
+
+from krs_reminder.delivery import DedupStats, PendingReminder, ReminderCoalescer, build_coalesced_messages
+from krs_reminder.rendering import COUNTDOWN_MARKER, ReminderTemplate
+
+
+TZ = pytz.timezone('Asia/Jakarta')
+NOW = TZ.localize(datetime.datetime(2025, 10, 13, 7, 0))
+
+
+def _reminder(key, chat_id, fire_minutes, start_minutes, group=None):
+    start = NOW + datetime.timedelta(minutes=start_minutes)
+    template = ReminderTemplate(
+        f"FULL {key} {COUNTDOWN_MARKER}",
+        start,
+        f"📚 <b>{key}</b>\n⏳ <b>{COUNTDOWN_MARKER}</b>"
+    )
+    fire_time = NOW + datetime.timedelta(minutes=fire_minutes)
+    return PendingReminder(f"{chat_id}:{key}", group or key, chat_id, fire_time, 1, template)
+
+
+def test_same_chat_reminders_merged():
+    """Reminders of one chat due within the window are delivered together"""
+    print("🧪 Testing reminder coalescing\n")
+
+    cancelled = []
+    coalescer = ReminderCoalescer(window_seconds=300, cancel_job=cancelled.append)
+    coalescer.register(_reminder('a_1h', '42', 0, 60))
+    coalescer.register(_reminder('b_1h', '42', 3, 63))
+    coalescer.register(_reminder('c_3h', '42', 30, 210))
+    coalescer.register(_reminder('d_1h', '99', 1, 61))
+
+    due = coalescer.take_group('a_1h', NOW)['42']
+
+    print(f"Due: {[r.key for r in due]}, cancelled: {cancelled}")
+    assert [r.key for r in due] == ['42:a_1h', '42:b_1h'], "Only same-chat reminders in window merge"
+    assert cancelled == ['b_1h'], "Merged reminder's own job should be cancelled"
+    assert coalescer.take_group('b_1h', NOW) == {}, "Merged reminder must not be sent twice"
+    assert [r.key for r in coalescer.take_group('d_1h', NOW)['99']] == ['99:d_1h'], "Other chats are untouched"
+    assert coalescer.merged == 1
+    print("✅ PASS: Same-chat reminders are merged")
+
+
+def test_identical_sessions_fan_out():
+    """One group fires for all chats; a chat with more due reminders is merged separately"""
+    print("🧪 Testing fan-out of identical sessions\n")
+
+    cancelled = []
+    coalescer = ReminderCoalescer(window_seconds=300, cancel_job=cancelled.append)
+    for chat_id in ('1', '2', '3'):
+        coalescer.register(_reminder('algo_1h', chat_id, 0, 60, group='algo-session_1h'))
+    coalescer.register(_reminder('basdat_1h', '3', 2, 62, group='basdat-session_1h'))
+    coalescer.register(_reminder('basdat_1h', '4', 2, 62, group='basdat-session_1h'))
+
+    by_chat = coalescer.take_group('algo-session_1h', NOW)
+
+    print(f"Chats: {sorted(by_chat)}, cancelled: {cancelled}")
+    assert sorted(by_chat) == ['1', '2', '3'], "Every subscriber should be served"
+    assert [len(by_chat[chat]) for chat in ('1', '2', '3')] == [1, 1, 2], "Chat 3 gets both classes"
+    assert cancelled == [], "basdat group still has chat 4 and must keep its job"
+    assert list(coalescer.take_group('basdat-session_1h', NOW)) == ['4']
+    print("✅ PASS: Identical sessions fan out from one group")
+
+
+def test_dedup_ratio():
+    """Dedup ratio counts chats served per render"""
+    stats = DedupStats()
+    stats.record(renders=1, deliveries=40)
+    stats.record(renders=2, deliveries=2)
+    assert stats.ratio == 14.0, f"Expected 14.0, got {stats.ratio}"
+    print("✅ PASS: Dedup ratio computed")
+
+
+def test_combined_message_length_bound():
+    """Combined messages never exceed the configured length"""
+    print("🧪 Testing combined message length bound\n")
+
+    reminders = [_reminder(f'kelas_{i}_1h', '42', 0, 60 + i) for i in range(30)]
+    messages = build_coalesced_messages(reminders, NOW, max_length=400, footer='🔁 /start • /jadwal • /stats')
+
+    print(f"Messages: {len(messages)}")
+    assert len(messages) > 1, "Long digest should be split"
+    assert all(len(message) <= 400 for message in messages), "Each message must respect the bound"
+    combined = '\n'.join(messages)
+    assert all(f'kelas_{i}_1h' in combined for i in range(30)), "Every class should be listed"
+    assert messages[0].startswith('🔔 <b>30 PENGINGAT KULIAH</b>')
+    print("✅ PASS: Combined messages are bounded")
+
+
+if __name__ == "__main__":
+    test_same_chat_reminders_merged()
+    test_identical_sessions_fan_out()
+    test_dedup_ratio()
+    test_combined_message_length_bound()
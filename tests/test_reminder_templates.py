@@ -0,0 +1,79 @@
+"""Test reminder templates rendered at schedule time and their cache."""
+
+import datetime
+
+import pytz
+
+from krs_reminder.rendering import (
+    COUNTDOWN_MARKER,
+    ReminderRenderCache,
+    ReminderTemplate,
+    event_fingerprint,
+)
+
+
+TZ = pytz.timezone('Asia/Jakarta')
+
+
+def _event(event_id):
+    return {
+        'id': event_id,
+        'summary': '📚 Cloud Computing',
+        'location': 'Lab. Artificial Intelligen',
+        'description': 'Dosen: Ibu Erina Rahmazani',
+        'start': {'dateTime': '2025-10-13T08:00:00+07:00'},
+        'end': {'dateTime': '2025-10-13T09:40:00+07:00'},
+    }
+
+
+def test_template_fills_countdown_only():
+    """Fire-time render only substitutes the countdown"""
+    print("🧪 Testing template countdown substitution\n")
+
+    start = TZ.localize(datetime.datetime(2025, 10, 13, 8, 0))
+    template = ReminderTemplate(f"HEAD\n⏳ <b>{COUNTDOWN_MARKER}</b>\nTAIL", start)
+
+    two_hours = template.render(start - datetime.timedelta(hours=2, minutes=15))
+    started = template.render(start)
+
+    print(two_hours)
+    assert two_hours == "HEAD\n⏳ <b>2j 15m</b>\nTAIL", "Countdown should be filled in"
+    assert "Dimulai sekarang!" in started, "Started class should say it has started"
+
+    try:
+        template.prefix = 'changed'
+        assert False, "Template should be immutable"
+    except AttributeError:
+        pass
+    print("✅ PASS: Template fills countdown only")
+
+
+def test_cache_shared_across_users():
+    """Identical events of different users share one render"""
+    print("🧪 Testing render cache sharing\n")
+
+    assert event_fingerprint(_event('user_a_evt')) == event_fingerprint(_event('user_b_evt')), \
+        "Fingerprint should ignore event id"
+
+    renders = []
+    cache = ReminderRenderCache(max_entries=2)
+
+    def render():
+        renders.append(1)
+        return ReminderTemplate(COUNTDOWN_MARKER, TZ.localize(datetime.datetime(2025, 10, 13, 8, 0)))
+
+    for event in (_event('user_a_evt'), _event('user_b_evt')):
+        cache.get_or_render((event_fingerprint(event), '1h'), render)
+
+    print(f"Renders: {len(renders)}, hits: {cache.hits}, misses: {cache.misses}")
+    assert len(renders) == 1, "Second user should hit the cache"
+
+    cache.get_or_render(('other', '1h'), render)
+    cache.get_or_render(('another', '1h'), render)
+    assert len(cache) == 2, "Cache should stay within max_entries"
+    print("✅ PASS: Render cache is shared and bounded")
+
+
+if __name__ == "__main__":
+    test_template_fills_countdown_only()
+    test_cache_shared_across_users()
@@ -0,0 +1,133 @@
+"""Test the per-user rendered schedule cache and its invalidation."""
+
+import datetime
+
+import pytz
+
+from krs_reminder.bot import KRSReminderBotV2
+from krs_reminder.commands import CommandHandler
+from krs_reminder.schedule_cache import RenderedScheduleCache, WeekPrefetchBuffer
+from krs_reminder.semester import load_semester_calendar
+
+
+TZ = pytz.timezone('Asia/Jakarta')
+
+
+class FakeDB:
+    def __init__(self):
+        self.schedule_queries = 0
+        self.day_queries = 0
+
+    def get_user_schedules(self, user_id, start_time=None, end_time=None):
+        self.schedule_queries += 1
+        return self._rows(start_time + datetime.timedelta(days=1))
+
+    def get_user_schedules_for_day(self, user_id, day_start, day_end):
+        self.day_queries += 1
+        tomorrow = datetime.datetime.now(TZ).replace(hour=0, minute=0, second=0, microsecond=0) \
+            + datetime.timedelta(days=1)
+        return self._rows(tomorrow) if day_start.date() == tomorrow.date() else []
+
+    def _rows(self, day):
+        start = day + datetime.timedelta(hours=8)
+        return [{
+            'schedule_id': 's1',
+            'course_name': 'Cloud Computing',
+            'start_time': start.isoformat(),
+            'end_time': (start + datetime.timedelta(minutes=100)).isoformat(),
+            'location': 'Ruang 3.1',
+            'facilitator': 'Ibu Erina',
+            'class_type': 'Kuliah Teori',
+        }]
+
+
+class FakeAuth:
+    def require_login(self, chat_id):
+        return (True, self.get_user_from_session(chat_id), '')
+
+    def get_user_from_session(self, chat_id):
+        return {'user_id': 'u1', 'username': 'tama'}
+
+
+def _handler():
+    bot = object.__new__(KRSReminderBotV2)
+    bot.tz = TZ
+    bot.multi_user_enabled = True
+    bot.db = FakeDB()
+    bot.auth = FakeAuth()
+    bot.admin = None
+    bot.schedule_cache = RenderedScheduleCache()
+    bot.week_prefetch = WeekPrefetchBuffer(ttl_seconds=60)
+    bot.semester_calendar = load_semester_calendar()
+    return bot, CommandHandler(bot)
+
+
+def test_repeated_browsing_hits_cache():
+    """Second weekly and daily request cost no query and no formatting"""
+    print("🧪 Testing rendered schedule cache\n")
+
+    bot, cmd = _handler()
+    tomorrow = datetime.datetime.now(TZ) + datetime.timedelta(days=1)
+
+    ok, _, weekly = cmd.handle_jadwal_sections(42)
+    ok_daily, _, daily = cmd.handle_jadwal_sections(42, tomorrow)
+    _, _, weekly_again = cmd.handle_jadwal_sections(42)
+    _, _, daily_again = cmd.handle_jadwal_sections(42, tomorrow)
+
+    print(f"Queries: {bot.db.schedule_queries}, hits: {bot.schedule_cache.hits}, bytes: {bot.schedule_cache.bytes}")
+    assert ok and ok_daily
+    assert 'Cloud Computing' in weekly[0] and 'Cloud Computing' in daily[0]
+    assert weekly_again is weekly and daily_again is daily, "Cached sections should be reused"
+    assert (bot.db.schedule_queries, bot.db.day_queries) == (1, 1), \
+        "Only the first weekly and daily request query the database"
+    assert bot.schedule_cache.bytes > 0
+
+    bot.schedule_cache.bump('u1')
+    assert len(bot.schedule_cache) == 0, "Bump should drop the user's entries"
+    cmd.handle_jadwal_sections(42)
+    assert bot.db.schedule_queries == 2, "New version should re-render"
+    print("✅ PASS: Repeated browsing served from cache")
+
+
+def test_daily_menu_prefetch():
+    """Day taps after opening the daily menu are served from the prefetched week"""
+    print("🧪 Testing week prefetch for day taps\n")
+
+    bot, cmd = _handler()
+    now = datetime.datetime.now(TZ)
+    cmd.prefetch_week(42)
+    cmd.prefetch_week(42)  # Re-opening the menu reuses the fresh copy
+
+    days = [now + datetime.timedelta(days=offset) for offset in range(7)]
+    rendered = [cmd.handle_jadwal_sections(42, day)[2][0] for day in days]
+
+    print(f"Week queries: {bot.db.schedule_queries}, day queries: {bot.db.day_queries}")
+    assert bot.db.schedule_queries == 1, "The week should be fetched once per interaction"
+    assert bot.db.day_queries == 0, "Day taps should not hit the database"
+    assert 'Cloud Computing' in rendered[1]
+    assert 'Tidak ada jadwal untuk hari ini' in rendered[2]
+    assert bot.week_prefetch.hits == 7
+    print("✅ PASS: Day taps served from memory")
+
+
+def test_cache_memory_bound():
+    """LRU eviction keeps the cache within its byte budget"""
+    print("🧪 Testing schedule cache memory bound\n")
+
+    cache = RenderedScheduleCache(max_bytes=4000)
+    today = datetime.date(2025, 10, 13)
+    for i in range(20):
+        cache.put(cache.key(f'u{i}', 'weekly', today, 'VB7'), ['x' * 500])
+
+    print(f"Entries: {len(cache)}, bytes: {cache.bytes}, evictions: {cache.evictions}")
+    assert cache.bytes <= 4000
+    assert cache.evictions > 0
+    assert cache.get(cache.key('u19', 'weekly', today, 'VB7')) is not None, "Newest entry should stay"
+    assert cache.get(cache.key('u0', 'weekly', today, 'VB7')) is None, "Oldest entry should be evicted"
+    print("✅ PASS: Cache stays within budget")
+
+
+if __name__ == "__main__":
+    test_repeated_browsing_hits_cache()
+    test_daily_menu_prefetch()
+    test_cache_memory_bound()
@@ -0,0 +1,43 @@
+"""Test the schedule query parameters sent to Supabase."""
+
+import datetime
+
+import pytz
+
+from krs_reminder.database import SupabaseClient
+
+
+TZ = pytz.timezone('Asia/Jakarta')
+
+
+def _client(calls):
+    db = object.__new__(SupabaseClient)
+    db._request = lambda method, endpoint, data=None, params=None: calls.append(params) or []
+    return db
+
+
+def test_range_and_day_filters():
+    """Both start_time bounds are sent; day bounds are the local day in UTC"""
+    print("🧪 Testing schedule query filters\n")
+
+    calls = []
+    db = _client(calls)
+    day_start = TZ.localize(datetime.datetime(2025, 10, 13))
+
+    db.get_user_schedules('u1', day_start, day_start + datetime.timedelta(days=7))
+    db.get_user_schedules_for_day('u1', day_start, day_start + datetime.timedelta(days=1))
+
+    print(calls)
+    assert calls[0]['and'] == (
+        '(start_time.gte.2025-10-13T00:00:00+07:00,start_time.lte.2025-10-20T00:00:00+07:00)'
+    ), "Range query must keep both bounds"
+    assert 'start_time' not in calls[0]
+    assert calls[1]['and'] == (
+        '(start_time.gte.2025-10-12T17:00:00+00:00,start_time.lt.2025-10-13T17:00:00+00:00)'
+    ), "Day query should cover the local day in UTC"
+    assert calls[1]['user_id'] == 'eq.u1'
+    print("✅ PASS: Query filters are correct")
+
+
+if __name__ == "__main__":
+    test_range_and_day_filters()
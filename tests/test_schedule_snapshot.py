@@ -0,0 +1,59 @@
+"""Test the local schedule snapshot: written after a sweep, restored offline at startup."""
+
+import time
+
+from krs_reminder.bench import BenchEnv
+from krs_reminder.bot import KRSReminderBotV2
+from krs_reminder.snapshot import load_snapshot
+
+
+def test_snapshot_restores_reminders_offline(tmp_path):
+    """A new bot schedules and answers /jadwal from the snapshot while Supabase is down"""
+    print("🧪 Testing schedule snapshot\n")
+
+    path = tmp_path / 'snapshot.db'
+    env = BenchEnv()
+    try:
+        people = env.add_users(3, 4, first_hours=6, span_hours=24)
+        env.bot.snapshot_path = str(path)
+        env.bot.check_and_schedule_events()
+        scheduled = env.bot.coalescer.queue_depth
+        snapshot = load_snapshot(path)
+        assert snapshot.event_count == 12 and len(snapshot.users) == 3
+        assert all('session_token' not in session for session in snapshot.sessions), "No credentials on disk"
+
+        # Restart while the database is unreachable
+        env.postgrest.down = True
+        bot = KRSReminderBotV2(db=env.postgrest.client(), http_session=env.telegram, calendar_service=env.calendar)
+        bot.snapshot_path = str(path)
+        started = time.perf_counter()
+        restored = bot.restore_snapshot()
+        elapsed = time.perf_counter() - started
+        print(f"Restored {restored} reminders in {elapsed * 1000:.1f} ms")
+        assert restored == scheduled and bot.coalescer.queue_depth == scheduled
+
+        ok, _, sections = bot.cmd_handler.handle_jadwal_sections(people[0]['chat_id'])
+        assert ok and 'tidak dapat dihubungi' in sections[-1], "Answered from the snapshot, marked stale"
+
+        bot.check_and_schedule_events()
+        assert bot.coalescer.queue_depth == scheduled, "A sweep on stale data does not reconcile"
+
+        # The database is back; one user's classes were removed meanwhile
+        env.postgrest.down = False
+        bot.db.backend.breaker.record_success()
+        assert bot.db.delete_user_schedules(people[0]['user_id'])
+        bot.check_and_schedule_events()
+        assert bot.coalescer.queue_depth == scheduled * 2 // 3, "Removed classes dropped on reconcile"
+        assert load_snapshot(path).event_count == 8, "Snapshot rewritten after the complete sweep"
+        bot.scheduler.remove_all_jobs()
+    finally:
+        env.close()
+    print("✅ PASS: Offline restore and reconcile")
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_snapshot_restores_reminders_offline(pathlib.Path(directory))
@@ -0,0 +1,79 @@
+"""Test the precomputed semester calendar behind VA/VB weeks."""
+
+import datetime
+import json
+
+import pytest
+
+from krs_reminder.semester import Semester, SemesterCalendar, load_semester_calendar
+
+
+def test_break_weeks_shift_va_vb():
+    """UTS week keeps its number but the alternation continues after it"""
+    print("🧪 Testing semester calendar with break weeks\n")
+
+    calendar = SemesterCalendar([
+        Semester(datetime.date(2025, 9, 29), weeks=16, breaks={3: 'UTS'}),
+    ])
+    types = [calendar.status(datetime.date(2025, 9, 29) + datetime.timedelta(weeks=week))['week_type']
+             for week in range(5)]
+
+    print(f"Weeks 1-5: {types}")
+    assert types == ['VA', 'VB', 'UTS', 'VA', 'VB']
+    assert calendar.week_number(datetime.date(2025, 10, 15)) == 3
+    assert calendar.week_range(datetime.date(2025, 10, 15)) == \
+        (datetime.date(2025, 10, 13), datetime.date(2025, 10, 19))
+    print("✅ PASS: Break weeks shift VA/VB")
+
+
+def test_statuses_shared_and_read_only():
+    """Every day of a week returns the same immutable status"""
+    print("🧪 Testing shared week statuses\n")
+
+    calendar = load_semester_calendar()
+    monday = calendar.status(datetime.datetime(2025, 10, 6, 8, 0))
+    sunday = calendar.status(datetime.date(2025, 10, 12))
+
+    assert monday is sunday, "Status should be cached per week"
+    assert len(calendar) == 16 * 7
+    with pytest.raises(TypeError):
+        monday['week_type'] = 'VA'
+
+    # Before the semester clamps to week 1; after it the numbering continues
+    assert calendar.week_number(datetime.date(2025, 9, 1)) == 1
+    assert calendar.status(datetime.date(2026, 3, 2)) is calendar.status(datetime.date(2026, 3, 8))
+    assert calendar.week_number(datetime.date(2026, 3, 2)) == 23
+    print("✅ PASS: Statuses are shared and immutable")
+
+
+def test_multiple_semesters_from_file(tmp_path):
+    """A new semester is configuration only"""
+    print("🧪 Testing semester calendar file\n")
+
+    path = tmp_path / 'semester.json'
+    path.write_text(json.dumps({'semesters': [
+        {'name': 'Ganjil 2025/2026', 'start': '2025-09-29', 'weeks': 16},
+        {'name': 'Genap 2025/2026', 'start': '2026-02-16', 'weeks': 16, 'first_week': 'VB',
+         'breaks': {'8': 'UTS'}},
+    ]}), encoding='utf-8')
+
+    calendar = load_semester_calendar(path)
+    first_week = calendar.status(datetime.date(2026, 2, 18))
+    after_uts = calendar.status(datetime.date(2026, 4, 13))
+
+    print(f"Genap week 1: {first_week['week_type']}, week 9: {after_uts['week_type']}")
+    assert (first_week['week_num'], first_week['week_type']) == (1, 'VB')
+    assert calendar.status(datetime.date(2026, 4, 6))['week_type'] == 'UTS'
+    assert (after_uts['week_num'], after_uts['week_type']) == (9, 'VA')
+    # Between semesters the previous one keeps counting
+    assert calendar.week_number(datetime.date(2026, 2, 10)) == 20
+    print("✅ PASS: Multiple semesters loaded from file")
+
+
+if __name__ == "__main__":
+    test_break_weeks_shift_va_vb()
+    test_statuses_shared_and_read_only()
+    import tempfile
+    from pathlib import Path
+    with tempfile.TemporaryDirectory() as tmp:
+        test_multiple_semesters_from_file(Path(tmp))
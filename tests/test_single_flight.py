@@ -0,0 +1,92 @@
+"""Test request coalescing of identical reads and the button double-tap window."""
+
+import datetime
+import threading
+
+from krs_reminder.bench import BenchEnv
+from krs_reminder.clock import VirtualClock
+
+
+def _concurrently(count, operation):
+    """Run operation from `count` threads released together; return the results"""
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(index):
+        barrier.wait()
+        results[index] = operation()
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_reads_share_one_request():
+    """Concurrent identical database and Calendar reads are sent once"""
+    print("🧪 Testing single-flight reads\n")
+
+    env = BenchEnv(db_latency=0.05)
+    try:
+        user = env.add_users(1, 5)[0]
+        db = env.bot.db
+        start = env.bot.clock.now(env.bot.tz)
+        end = start + datetime.timedelta(days=7)
+        calls = env.postgrest.calls.get(('GET', 'schedules'), 0)
+        results = _concurrently(8, lambda: db.get_user_schedules(user['user_id'], start, end))
+        print(f"8 readers, {env.postgrest.calls[('GET', 'schedules')] - calls} request(s)")
+        assert env.postgrest.calls[('GET', 'schedules')] == calls + 1
+        assert all(result == results[0] for result in results) and len(results[0]) == 5
+
+        db.delete_user_schedules(user['user_id'])
+        assert db.get_user_schedules(user['user_id'], start, end) == [], "Reads after a write are sent again"
+    finally:
+        env.close()
+
+    env = BenchEnv(multi_user=False, calendar_latency=0.05)
+    try:
+        env.calendar.items = env.calendar_events(10)
+        service = env.bot._get_calendar_service()
+        results = _concurrently(8, lambda: env.bot.get_weekly_events(service)[0])
+        print(f"8 /jadwal, {env.calendar.calls} Calendar request(s)")
+        assert env.calendar.calls == 1 and all(len(result) == 10 for result in results)
+    finally:
+        env.close()
+    print("✅ PASS: One request per identical concurrent read")
+
+
+def test_double_tap_answered_once():
+    """The same button pressed twice by one chat within the window is handled once"""
+    print("🧪 Testing callback dedupe window\n")
+
+    env = BenchEnv()
+    try:
+        people = env.add_users(2, 3)
+        clock = VirtualClock(datetime.datetime(2025, 10, 6, 1, 0, tzinfo=datetime.timezone.utc))
+        env.bot.recent_callbacks.clock = clock
+
+        def tap(chat_id, data='jadwal_weekly'):
+            env.bot.handle_update({'update_id': 1, 'callback_query': {
+                'id': 'cb', 'data': data, 'message': {'chat': {'id': chat_id}},
+            }})
+            return env.telegram.calls.get('sendMessage', 0)
+
+        once = tap(people[0]['chat_id'])
+        assert tap(people[0]['chat_id']) == once, "Double tap not handled again"
+        assert env.telegram.calls['answerCallbackQuery'] == 2, "Both taps lose their spinner"
+        assert tap(people[1]['chat_id']) > once, "Another chat is not affected"
+        assert tap(people[0]['chat_id'], 'jadwal_daily_menu') > once, "Another button is not affected"
+
+        sent = env.telegram.calls['sendMessage']
+        clock.advance(datetime.timedelta(seconds=3))
+        assert tap(people[0]['chat_id']) > sent, "Pressed again after the window"
+    finally:
+        env.close()
+    print("✅ PASS: Double taps answered once")
+
+
+if __name__ == "__main__":
+    test_identical_reads_share_one_request()
+    test_double_tap_answered_once()
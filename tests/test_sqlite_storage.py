@@ -0,0 +1,132 @@
+"""Test the SQLite storage backend against the PostgREST client's behaviour."""
+
+import datetime
+
+from krs_reminder.bench import BenchEnv, FakePostgREST
+from krs_reminder.clock import VirtualClock
+from krs_reminder.database import SupabaseClient
+from krs_reminder.sqlite_storage import SQLiteStorage
+from krs_reminder.storage import Storage, open_storage
+from krs_reminder.write_behind import BufferedStorage
+
+BASE = datetime.datetime(2025, 10, 6, 8, 0, tzinfo=datetime.timezone.utc)
+
+
+def _exercise(db: Storage, clock: VirtualClock) -> dict:
+    """Same calls on any backend; returns what a caller would observe"""
+    user = db.create_user('mhs01', 'hash')
+    other = db.create_user('mhs02', 'hash')
+    for hours in (0, 5, 30):
+        start = BASE + datetime.timedelta(hours=hours)
+        db.create_schedule(user['user_id'], {
+            'course_name': f'Kelas {hours}',
+            'start_time': start.isoformat(),
+            'end_time': (start + datetime.timedelta(hours=2)).isoformat(),
+            'google_event_id': f'evt{hours}',
+        })
+    wib = datetime.timezone(datetime.timedelta(hours=7))
+    day_start = datetime.datetime(2025, 10, 6, tzinfo=wib)
+
+    db.create_session(user['user_id'], 42, 'token-1', expires_hours=2)
+    active_before = db.get_active_session(42)
+    clock.advance(datetime.timedelta(hours=3))
+    active_after = db.get_active_session(42)
+    db.create_session(other['user_id'], 43, 'token-2')
+
+    return {
+        'user': db.get_user_by_username('mhs01')['username'],
+        'by_id': db.get_user_by_id(other['user_id'])['username'],
+        'users': [row['username'] for row in db.list_all_users()],
+        'duplicate_user': db.create_user('mhs01', 'again'),
+        'window': [row['course_name'] for row in db.get_user_schedules(user['user_id'], BASE, BASE + datetime.timedelta(hours=24))],
+        'all': [row['course_name'] for row in db.get_user_schedules(user['user_id'])],
+        'day': [row['course_name'] for row in db.get_user_schedules_for_day(user['user_id'], day_start, day_start + datetime.timedelta(days=1))],
+        'duplicate_event': db.bulk_create_schedules([
+            {'user_id': user['user_id'], 'course_name': 'Baru', 'start_time': BASE.isoformat(), 'end_time': BASE.isoformat(), 'google_event_id': 'new'},
+            {'user_id': user['user_id'], 'course_name': 'Dup', 'start_time': BASE.isoformat(), 'end_time': BASE.isoformat(), 'google_event_id': 'evt0'},
+        ]),
+        'count_after_failed_bulk': len(db.get_user_schedules(user['user_id'])),
+        'session_before': active_before['session_token'] if active_before else None,
+        'session_after': active_after,
+        'user_sessions': [row['session_token'] for row in db.get_active_sessions_for_user(other['user_id'])],
+        'logout': db.invalidate_user_sessions(43) and db.get_active_session(43),
+        'admin': db.add_admin(7) and db.is_admin(7),
+        'not_admin': db.is_admin(8),
+    }
+
+
+def test_sqlite_matches_postgrest_client():
+    """SQLiteStorage answers like SupabaseClient on PostgREST"""
+    print("🧪 Testing SQLite storage parity\n")
+
+    start = datetime.datetime(2025, 10, 6, 0, 0, tzinfo=datetime.timezone.utc)
+    postgrest_clock, sqlite_clock = VirtualClock(start), VirtualClock(start)
+    expected = _exercise(FakePostgREST().client(clock=postgrest_clock), postgrest_clock)
+    sqlite = SQLiteStorage(clock=sqlite_clock, seed_owner=False)
+    actual = _exercise(sqlite, sqlite_clock)
+    print(actual)
+
+    # The fake does not enforce UNIQUE constraints; the real schema (and SQLite) does
+    expected.update(duplicate_user=None, duplicate_event=False, count_after_failed_bulk=3)
+    assert actual == expected
+    assert isinstance(sqlite, Storage)
+    print("✅ PASS: Same results on both backends")
+
+
+def test_sqlite_file_schema_and_bot(tmp_path, monkeypatch):
+    """File database uses WAL, cascades deletes and runs the bot"""
+    print("🧪 Testing SQLite file backend\n")
+
+    monkeypatch.setattr('krs_reminder.config.SQLITE_PATH', tmp_path / 'var' / 'krs.db')
+    db = open_storage('sqlite')
+    try:
+        assert db._conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert db.is_admin(5476148500), "Owner admin seeded like the migration"
+        user = db.create_user('mhs01', 'hash')
+        schedule = db.create_schedule(user['user_id'], {
+            'course_name': 'Basis Data', 'start_time': BASE, 'end_time': BASE + datetime.timedelta(hours=2),
+        })
+        reminder = db.create_reminder(user['user_id'], schedule['schedule_id'], '1h', BASE - datetime.timedelta(hours=1))
+        assert reminder['status'] == 'pending' and db.mark_reminder_sent(reminder['reminder_id'])
+        db.create_session(user['user_id'], 42, 'token')
+        assert db.delete_user(user['user_id'])
+        assert db.get_user_schedules(user['user_id']) == [] and db.get_active_session(42) is None
+        assert db._conn.execute('SELECT COUNT(*) FROM reminders').fetchone()[0] == 0
+    finally:
+        db.close()
+
+    env = BenchEnv(storage='sqlite')
+    try:
+        env.add_users(3, 4, shared=True, first_hours=6, span_hours=12)
+        env.bot.check_and_schedule_events()
+        report = env.bot.last_sweep_report
+        assert report.events == 12 and not report.failures
+        assert env.bot.coalescer.queue_depth == 3 * 4 * 5
+    finally:
+        env.close()
+    print("✅ PASS: WAL file, cascades and a bot sweep on SQLite")
+
+
+def test_incomplete_backend_fails_at_construction():
+    """A backend missing a Storage method cannot be created; the shipped ones are complete"""
+    print("🧪 Testing the Storage interface\n")
+
+    class Partial(Storage):
+        def create_user(self, username, secret_key_hash):
+            return None
+
+    try:
+        Partial()
+    except TypeError as e:
+        print(f"Rejected: {str(e)[:60]}...")
+    else:
+        raise AssertionError("Partial backend was constructed")
+
+    for backend in (SQLiteStorage, SupabaseClient, BufferedStorage):
+        assert not backend.__abstractmethods__, f"{backend.__name__} misses {sorted(backend.__abstractmethods__)}"
+    print("✅ PASS: Missing methods fail at construction")
+
+
+if __name__ == "__main__":
+    test_sqlite_matches_postgrest_client()
+    test_incomplete_backend_fails_at_construction()
@@ -0,0 +1,106 @@
+"""Test adaptive sweep planning (next sweep time from upcoming reminders)."""
+
+import datetime
+
+import pytz
+
+from krs_reminder.sweep import SweepPlanner
+
+
+TZ = pytz.timezone('Asia/Jakarta')
+
+
+def _planner():
+    return SweepPlanner(min_minutes=5, max_minutes=180, lookahead_hours=36, reminder_hours=[5, 3, 2, 1])
+
+
+def test_idle_sweep_uses_max_interval():
+    """No upcoming reminders → sweep as rarely as allowed"""
+    print("🧪 Testing idle sweep interval\n")
+
+    planner = _planner()
+    now = TZ.localize(datetime.datetime(2025, 10, 11, 22, 0))
+    next_run = planner.plan(now, {})
+
+    print(f"Next sweep: {next_run}")
+    assert next_run - now == datetime.timedelta(minutes=180), "Idle sweep should use max interval"
+    print("✅ PASS: Idle sweep uses max interval")
+
+
+def test_upcoming_reminder_shortens_interval():
+    """Next reminder in 1 hour → sweep again within 30 minutes"""
+    print("🧪 Testing interval near upcoming reminder\n")
+
+    planner = _planner()
+    now = TZ.localize(datetime.datetime(2025, 10, 13, 6, 0))
+    pending = {'evt_1h': now + datetime.timedelta(hours=1)}
+    next_run = planner.plan(now, pending)
+
+    print(f"Next sweep: {next_run}")
+    assert next_run - now == datetime.timedelta(minutes=30), "Should re-check halfway to the next reminder"
+    print("✅ PASS: Upcoming reminder shortens interval")
+
+
+def test_changes_shorten_interval_within_bounds():
+    """Frequent changes → shorter interval, never below min"""
+    print("🧪 Testing change-rate adaption\n")
+
+    planner = _planner()
+    now = TZ.localize(datetime.datetime(2025, 10, 13, 6, 0))
+    far = now + datetime.timedelta(hours=10)
+
+    planner.plan(now, {'a_5h': far})
+    stable = planner.plan(now, {'a_5h': far}) - now
+    changed = planner.plan(now, {f'evt{i}_5h': far for i in range(20)}) - now
+
+    print(f"Stable: {stable}, Changed: {changed}")
+    assert changed < stable, "Changes should shorten the interval"
+    assert changed >= datetime.timedelta(minutes=5), "Interval must respect min bound"
+    print("✅ PASS: Change rate adapts interval within bounds")
+
+
+def test_fired_and_new_reminders_are_not_changes():
+    """Reminders that fired or just entered the window leave the change rate at zero"""
+    print("🧪 Testing change counting\n")
+
+    planner = _planner()
+    now = TZ.localize(datetime.datetime(2025, 10, 13, 6, 0))
+    later = now + datetime.timedelta(hours=2)
+    planner.plan(now, {'fired_1h': now + datetime.timedelta(hours=1), 'kept_5h': now + datetime.timedelta(hours=10)})
+    edge = planner.window_end(later) - datetime.timedelta(hours=5)
+    planner.plan(later, {'kept_5h': now + datetime.timedelta(hours=10), 'new_5h': edge})
+    assert planner.last_changes == 0 and planner.change_rate == 0, "Nothing was edited"
+
+    planner.plan(later, {'kept_5h': now + datetime.timedelta(hours=11), 'new_5h': edge})
+    assert planner.last_changes == 1, "A moved class is a change"
+    print("✅ PASS: Only edits inside both windows count")
+
+
+def test_incomplete_sweep_retries_without_forgetting():
+    """A sweep that missed users is retried soon and does not count as changes"""
+    planner = _planner()
+    now = TZ.localize(datetime.datetime(2025, 10, 13, 6, 0))
+    known = {'a_5h': now + datetime.timedelta(hours=10), 'b_5h': now + datetime.timedelta(hours=12)}
+    planner.plan(now, known)
+
+    retry = planner.plan(now, {'a_5h': known['a_5h']}, complete=False)
+    assert retry - now == datetime.timedelta(minutes=5) and planner.last_changes == 0
+    planner.plan(now, known)
+    assert planner.last_changes == 0, "Reminders of the missed user were still known"
+    print("✅ PASS: Incomplete sweep retried")
+
+
+def test_lookahead_covers_max_interval():
+    """Window must cover the earliest reminder of classes before the next sweep"""
+    planner = SweepPlanner(min_minutes=5, max_minutes=600, lookahead_hours=6, reminder_hours=[5, 3, 2, 1])
+    assert planner.lookahead >= datetime.timedelta(hours=5 + 10), "Lookahead should widen with max interval"
+    print("✅ PASS: Lookahead widened to cover max interval")
+
+
+if __name__ == "__main__":
+    test_idle_sweep_uses_max_interval()
+    test_upcoming_reminder_shortens_interval()
+    test_changes_shorten_interval_within_bounds()
+    test_fired_and_new_reminders_are_not_changes()
+    test_incomplete_sweep_retries_without_forgetting()
+    test_lookahead_covers_max_interval()
@@ -0,0 +1,61 @@
+"""Test the frozen, pre-serialized UI assets."""
+
+import json
+
+import pytest
+
+from krs_reminder.bot import KRSReminderBotV2
+from krs_reminder.ui_assets import (
+    DAILY_MENU_KEYBOARD,
+    MAIN_MENU_KEYBOARD,
+    reminder_theme,
+    serialize_markup,
+)
+
+
+def test_keyboards_frozen_and_preserialized():
+    """Keyboards are shared, read-only and carry their Telegram JSON"""
+    print("🧪 Testing frozen keyboards\n")
+
+    for keyboard in (MAIN_MENU_KEYBOARD, DAILY_MENU_KEYBOARD):
+        assert keyboard.serialized == json.dumps(keyboard)
+        assert serialize_markup(keyboard) is keyboard.serialized
+        with pytest.raises(TypeError):
+            keyboard['inline_keyboard'].append([])
+        with pytest.raises(TypeError):
+            keyboard['inline_keyboard'][0][0]['text'] = 'x'
+
+    assert serialize_markup({'inline_keyboard': []}) == '{"inline_keyboard": []}'
+    assert reminder_theme(5) is reminder_theme(7), "Themes should be shared"
+    assert reminder_theme(None)['headline'].startswith('🔔')
+    print("✅ PASS: Keyboards are frozen and pre-serialized")
+
+
+def test_send_attaches_preserialized_markup():
+    """The send path posts the stored JSON string"""
+    print("🧪 Testing send path with shared keyboard\n")
+
+    class Response:
+        status_code = 200
+
+    posted = []
+
+    class Session:
+        def post(self, url, data=None, timeout=None):
+            posted.append(data)
+            return Response()
+
+    bot = object.__new__(KRSReminderBotV2)
+    bot.http_session = Session()
+    bot.total_reminders_sent = 0
+
+    assert bot._create_main_menu_keyboard() is bot._create_main_menu_keyboard()
+    bot.send_telegram_message('Menu', chat_id=1, reply_markup=bot._create_main_menu_keyboard())
+
+    assert posted[0]['reply_markup'] is MAIN_MENU_KEYBOARD.serialized
+    print("✅ PASS: Markup sent without re-serializing")
+
+
+if __name__ == "__main__":
+    test_keyboards_frozen_and_preserialized()
+    test_send_attaches_preserialized_markup()
@@ -0,0 +1,115 @@
+"""Test update recording (PII scrubbing) and replay against the fakes."""
+
+import datetime
+import gzip
+import json
+
+from krs_reminder.bench import BenchEnv
+from krs_reminder.bench.replay import replay, seed_recorded_users
+from krs_reminder.clock import VirtualClock
+from krs_reminder.recording import UpdateRecorder, UpdateScrubber, read_recording
+
+
+def _message(update_id, chat_id, text, command=True):
+    message = {
+        'message_id': update_id,
+        'date': 1727571600,
+        'chat': {'id': chat_id, 'type': 'private', 'first_name': 'Budi', 'username': 'budi_s'},
+        'from': {'id': chat_id, 'is_bot': False, 'first_name': 'Budi', 'last_name': 'Santoso', 'language_code': 'id'},
+        'text': text,
+    }
+    if command:
+        message['entities'] = [{'type': 'bot_command', 'offset': 0, 'length': len(text.split()[0])}]
+    return {'update_id': update_id, 'message': message}
+
+
+def _callback(update_id, chat_id, data):
+    return {'update_id': update_id, 'callback_query': {
+        'id': f'cb{update_id}',
+        'from': {'id': chat_id, 'first_name': 'Budi'},
+        'message': {'message_id': 1, 'chat': {'id': chat_id, 'type': 'private'}, 'text': 'Jadwal Senin ...'},
+        'data': data,
+    }}
+
+
+def test_recorder_scrubs_personal_data(tmp_path):
+    """Recorded updates keep their shape but no names, ids or secrets"""
+    print("🧪 Testing update recording\n")
+
+    scrubber = UpdateScrubber('salt')
+    login = scrubber.scrub(_message(1, 123456, '/login rahasia123'))
+    text = json.dumps(login)
+    assert 'Budi' not in text and 'budi_s' not in text and 'rahasia123' not in text and '123456' not in text
+    assert login['message']['text'].startswith('/login secret-')
+    assert login['message']['chat']['id'] == scrubber.pseudo_id(123456), "Pseudonyms are stable"
+    assert scrubber.scrub_text('halo kak, jadwal besok apa?') == '<text 27>'
+    assert scrubber.pseudo_id(-100123) < 0, "Group chats stay negative"
+
+    env = BenchEnv()
+    try:
+        clock = VirtualClock(datetime.datetime(2025, 9, 29, 7, 0, tzinfo=datetime.timezone.utc))
+        path = tmp_path / 'updates.jsonl.gz'
+        env.bot.update_recorder = UpdateRecorder(path, salt='salt', clock=clock)
+        env.telegram.updates = [_message(1, 123456, '/jadwal'), _callback(2, 123456, 'jadwal_daily_menu')]
+        env.bot.check_telegram_updates()
+        clock.advance(datetime.timedelta(seconds=3))
+        env.telegram.updates = [_message(3, 123456, '/stats')]
+        env.bot.check_telegram_updates()
+    finally:
+        env.close()
+
+    with gzip.open(path, 'ab') as handle:
+        handle.write(b'{"ts": 1, "upd')
+    data = path.read_bytes()
+    path.write_bytes(data[:-8])  # Crash while writing a batch
+
+    records = list(read_recording(path))
+    assert [record['update']['update_id'] for record in records] == [1, 2, 3]
+    assert records[2]['ts'] - records[0]['ts'] == 3
+    assert records[1]['update']['callback_query']['data'] == 'jadwal_daily_menu'
+    assert 'text' not in records[1]['update']['callback_query']['message']
+    print("✅ PASS: Scrubbed batches recorded and read back")
+
+
+def test_replay_reports_per_command_latency():
+    """Replayed traffic hits the dispatcher with per-command stats"""
+    print("🧪 Testing replay\n")
+
+    scrubber = UpdateScrubber('salt')
+    updates = [
+        _message(1, 1001, '/start'),
+        _message(2, 1001, '/login rahasia123'),
+        _message(3, 1001, '/jadwal'),
+        _callback(4, 1001, 'jadwal_daily_menu'),
+        _message(5, 1002, '/jadwal'),
+        _message(6, 1002, 'terima kasih', command=False),
+    ]
+    records = [{'ts': 1000.0 + index * 0.02, 'update': scrubber.scrub(update)} for index, update in enumerate(updates)]
+
+    report = replay(records, speed=0, logged_in=False, events=5)
+    data = report.to_dict()
+    print(report.summary())
+    assert data['updates'] == 6 and data['errors'] == 0
+    assert set(data['commands']) == {'/start', '/login', '/jadwal', 'callback:jadwal_daily_menu', 'text'}
+    assert data['commands']['/jadwal']['count'] == 2
+
+    env = BenchEnv()
+    try:
+        seed_recorded_users(env, records, events=5, logged_in=False)
+        paced = replay(records, speed=4, env=env)
+        replies = [message['text'] for message in env.telegram.sent]
+    finally:
+        env.close()
+    assert any('Login Berhasil' in reply for reply in replies), "Pseudonymized secret logs in"
+    assert paced.wall_seconds >= 0.1 / 4 * 0.9, "Paced replay follows the recorded gaps"
+    assert len(paced.lag) == 6
+    print("✅ PASS: Replay reports latency and errors per command")
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_recorder_scrubs_personal_data(pathlib.Path(directory))
+    test_replay_reports_per_command_latency()
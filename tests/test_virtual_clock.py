@@ -0,0 +1,62 @@
+"""Test the injectable clock and the virtual-time semester simulation."""
+
+import datetime
+
+import pytz
+
+from krs_reminder.auth import AuthManager
+from krs_reminder.bench import FakePostgREST
+from krs_reminder.bench.simulation import SemesterSimulation
+from krs_reminder.clock import VirtualClock
+from krs_reminder.monitoring import MetricsSampler
+
+
+def test_virtual_clock_drives_session_expiry():
+    """Sessions expire on the injected clock, not the wall clock"""
+    print("🧪 Testing virtual clock\n")
+
+    tz = pytz.timezone('Asia/Jakarta')
+    clock = VirtualClock(tz.localize(datetime.datetime(2025, 9, 29, 7, 0)))
+    assert clock.now(tz).hour == 7
+    assert clock.utcnow() == datetime.datetime(2025, 9, 29, 0, 0)
+
+    clock.advance(datetime.timedelta(hours=2))
+    clock.set(tz.localize(datetime.datetime(2025, 9, 29, 8, 0)))
+    assert clock.now(tz).hour == 9, "Time never moves backwards"
+
+    db = FakePostgREST().client(clock=clock)
+    auth = AuthManager(db, clock=clock)
+    user = db.create_user('mhs01', 'hash')
+    db.create_session(user['user_id'], 42, 'token', expires_hours=24)
+    assert auth.validate_session(42) is not None
+
+    clock.advance(datetime.timedelta(hours=25))
+    assert auth.validate_session(42) is None, "Session should expire after 24 virtual hours"
+
+    sampler = MetricsSampler(dict, tz=tz, clock=clock)
+    assert sampler.sample_once().taken_at == clock.now(tz), "Metrics samples are stamped in virtual time"
+    print("✅ PASS: Expiry follows virtual time")
+
+
+def test_semester_simulation_delivers_every_reminder():
+    """A simulated week sends each expected reminder once, on time"""
+    print("🧪 Testing semester simulation\n")
+
+    simulation = SemesterSimulation(users=3, courses_per_user=3, weeks=1)
+    report = simulation.run()
+    data = report.to_dict()
+    print(report.summary())
+
+    assert data['expected'] == 3 * 3 * 5, "3 users × 3 classes × 5 reminder slots"
+    assert data['missed'] == 0 and data['duplicates'] == 0 and data['unexpected'] == 0
+    assert data['late'] == 0, "Virtual scheduler fires jobs exactly on time"
+    assert data['virtual_days'] > 5 and data['sweeps'] > 1
+
+    expiring = SemesterSimulation(users=2, courses_per_user=3, weeks=1, session_hours=24).run()
+    assert expiring.missed, "Reminders after session expiry are not delivered"
+    print("✅ PASS: Simulation is complete and exact")
+
+
+if __name__ == "__main__":
+    test_virtual_clock_drives_session_expiry()
+    test_semester_simulation_delivers_every_reminder()
@@ -0,0 +1,162 @@
+"""Test write-behind batching of reminder and session writes."""
+
+import datetime
+
+from krs_reminder.bench import BenchEnv, FakePostgREST
+from krs_reminder.clock import VirtualClock
+from krs_reminder.write_behind import BufferedStorage, WriteBehindBuffer
+
+NOW = datetime.datetime(2025, 10, 6, 8, 0, tzinfo=datetime.timezone.utc)
+
+
+def test_writes_coalesce_and_survive_outage(tmp_path):
+    """Queued writes become one request per table and are spilled while the database is down"""
+    print("🧪 Testing write-behind batching\n")
+
+    fake = FakePostgREST()
+    clock = VirtualClock(NOW)
+    spill = tmp_path / 'spill.jsonl'
+    buffer = WriteBehindBuffer(fake.client(clock=clock), interval_seconds=60, max_rows=100, spill_path=spill)
+    db = BufferedStorage(buffer.storage, buffer, clock=clock)
+    sessions = fake.insert('sessions', [
+        {'user_id': 'u1', 'telegram_chat_id': chat_id, 'session_token': f't{chat_id}', 'is_active': True}
+        for chat_id in range(3)
+    ])
+
+    for index in range(10):
+        reminder = db.create_reminder('u1', f's{index}', '1h', NOW)
+        assert db.mark_reminder_sent(reminder['reminder_id'])
+    for session in sessions:
+        db.invalidate_session(session['session_id'])
+    assert fake.calls == {}, "Nothing is written before the flush"
+    assert buffer.pending == 23
+
+    fake.down = True
+    assert not buffer.flush()
+    assert spill.exists() and buffer.pending == 23, "Outage keeps every write on disk"
+
+    fake.down = False
+    clock.advance(datetime.timedelta(minutes=5))
+    assert buffer.close()
+    print(fake.calls)
+    assert fake.calls == {('POST', 'reminders'): 1, ('PATCH', 'reminders'): 1, ('PATCH', 'sessions'): 1}
+    assert [row['status'] for row in fake.tables['reminders']] == ['sent'] * 10
+    assert not any(row['is_active'] for row in fake.tables['sessions'])
+    assert not spill.exists() and buffer.pending == 0
+    print("✅ PASS: 23 writes in 3 requests, none lost to the outage")
+
+
+def test_delivery_does_not_wait_for_database(tmp_path, monkeypatch):
+    """Reminders go out while the database is down; the log is written on close"""
+    print("🧪 Testing delivery with write-behind\n")
+
+    monkeypatch.setattr('krs_reminder.config.WRITE_BEHIND_SPILL_FILE', tmp_path / 'spill.jsonl')
+    env = BenchEnv()
+    try:
+        env.bot.log_deliveries = True
+        env.add_users(3, 2, shared=True, first_hours=6, span_hours=12)
+        env.bot.check_and_schedule_events()
+        scheduled = env.bot.coalescer.queue_depth
+        groups = list(dict.fromkeys(job.id for job in env.bot.scheduler.get_jobs() if job.id != 'periodic_check'))
+
+        env.postgrest.down = True
+        for group in groups:
+            env.bot.send_reminder(group)
+        assert env.telegram.sent, "Delivery does not need the database"
+        assert env.bot.write_buffer.pending == 2 * scheduled + 1, "Plus the sweep's session cleanup"
+
+        env.postgrest.down = False
+        assert env.bot.write_buffer.close()
+        rows = env.postgrest.tables['reminders']
+        assert len(rows) == scheduled and all(row['status'] == 'sent' and row['sent_at'] for row in rows)
+        assert {row['reminder_type'] for row in rows} == {'5h', '3h', '2h', '1h', 'exact'}
+    finally:
+        env.close()
+    print(f"✅ PASS: {scheduled} deliveries logged after the outage")
+
+
+def test_full_buffer_spills_while_backing_off(tmp_path):
+    """A full buffer goes to the spill file instead of cutting the backoff short"""
+    print("🧪 Testing write-behind backoff\n")
+
+    fake = FakePostgREST()
+    clock = VirtualClock(NOW)
+    spill = tmp_path / 'spill.jsonl'
+    buffer = WriteBehindBuffer(fake.client(clock=clock), interval_seconds=60, max_rows=5, spill_path=spill)
+    db = BufferedStorage(buffer.storage, buffer, clock=clock)
+
+    fake.down = True
+    buffer._failures = 3  # the flusher is backing off after failed flushes
+    for index in range(12):
+        db.create_reminder('u1', f's{index}', '1h', NOW)
+    assert not buffer._wake.is_set(), "Flusher not woken during its backoff"
+    assert len(spill.read_text().splitlines()) == 10 and buffer.pending == 12
+    assert fake.calls == {}
+
+    fake.down = False
+    assert buffer.close()
+    assert len(fake.tables['reminders']) == 12 and not spill.exists()
+    print("✅ PASS: 10 writes spilled, 12 written after the outage")
+
+
+def test_sweep_cleans_expired_sessions(tmp_path, monkeypatch):
+    """A complete sweep queues the expired-session cleanup"""
+    print("🧪 Testing expired session cleanup\n")
+
+    monkeypatch.setattr('krs_reminder.config.WRITE_BEHIND_SPILL_FILE', tmp_path / 'spill.jsonl')
+    env = BenchEnv()
+    try:
+        env.add_users(1, 2, first_hours=6)
+        expired = env.postgrest.insert('sessions', [{
+            'user_id': 'gone', 'telegram_chat_id': 1, 'session_token': 'old', 'is_active': True,
+            'expires_at': (env.bot.clock.utcnow() - datetime.timedelta(hours=1)).isoformat(),
+        }])[0]
+        env.bot.check_and_schedule_events()
+        assert env.bot.last_sweep_report.complete
+        assert env.bot.write_buffer.close()
+        row = next(row for row in env.postgrest.tables['sessions'] if row['session_id'] == expired['session_id'])
+        assert not row['is_active'], "Expired session deactivated by the flush"
+    finally:
+        env.close()
+    print("✅ PASS: Expired sessions cleaned after the sweep")
+
+
+def test_delivery_log_is_opt_in_and_per_user(tmp_path, monkeypatch):
+    """One reminders row per user, class and slot however many chats got it; none unless enabled"""
+    print("🧪 Testing the delivery log\n")
+
+    monkeypatch.setattr('krs_reminder.config.WRITE_BEHIND_SPILL_FILE', tmp_path / 'spill.jsonl')
+    for enabled in (False, True):
+        env = BenchEnv()
+        try:
+            env.bot.log_deliveries = enabled
+            user = env.add_users(1, 2, first_hours=6, span_hours=12)[0]
+            env.postgrest.insert('sessions', {
+                'user_id': user['user_id'], 'telegram_chat_id': 900100, 'session_token': 'second-chat',
+                'expires_at': (env.bot.clock.utcnow() + datetime.timedelta(hours=24)).isoformat(),
+                'is_active': True,
+            })
+            env.bot.check_and_schedule_events()
+            scheduled = env.bot.coalescer.queue_depth
+            for group in dict.fromkeys(job.id for job in env.bot.scheduler.get_jobs() if job.id != 'periodic_check'):
+                env.bot.send_reminder(group)
+            assert env.bot.write_buffer.close()
+            rows = env.postgrest.tables.get('reminders', [])
+            print(f"Logging {'on' if enabled else 'off'}: {scheduled} deliveries to 2 chats, {len(rows)} row(s)")
+            if not enabled:
+                assert rows == [], "No reminders rows unless KRS_REMINDER_LOG is set"
+                continue
+            assert len(rows) == scheduled // 2
+            assert len({(row['schedule_id'], row['reminder_type']) for row in rows}) == len(rows)
+        finally:
+            env.close()
+    print("✅ PASS: Delivery log opt-in, deduplicated across chats")
+
+
+if __name__ == "__main__":
+    import pathlib
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as directory:
+        test_writes_coalesce_and_survive_outage(pathlib.Path(directory))
+        test_full_buffer_spills_while_backing_off(pathlib.Path(directory))